@@ -160,14 +160,73 @@ class AgentBaseEventHandler(nfp_api.NfpEventHandler):
         self.rpcmgr = rpcmgr
         self.notify = AgentBaseNotification(self.sc)
 
+    def _prepare_notification(self, notification_data, request, result):
+        """Adds notification of a processed request to notification data.
+
+        Whether it is a data batch or single data blob request, notification
+        generated will be single dictionary. In case of batch, multiple
+        notifications are sent in the kwargs list.
+
+        Returns: True if request succeeded, False otherwise.
+
+        """
+
+        agent_info = request['agent_info']
+        if result in const.SUCCESS:
+            data = {'status_code': const.SUCCESS}
+        else:
+            data = {'status_code': const.FAILURE,
+                    'error_msg': result}
+
+        msg = {'info': {'service_type': agent_info['resource_type'],
+                        'context': agent_info['context']},
+               'notification': [{'resource': agent_info['resource'],
+                                 'data': data}]
+               }
+        # If the data processed is first one, then prepare notification
+        # dict. Otherwise, append the notification to the kwargs list.
+        if not notification_data:
+            notification_data.update(msg)
+        else:
+            notification_data['notification'].append(
+                {'resource': agent_info['resource'], 'data': data})
+        return result == const.SUCCESS
+
+    def _get_driver_batches(self, sa_req_list):
+        """Splits the request list into batches, one per driver.
+
+        Consecutive requests to the same service driver form one batch
+        so that the driver can push them to the service VM together.
+
+        Returns: list of (driver, requests) where driver is None if it
+        could not be found, with the error as the only request result.
+
+        """
+
+        batches = []
+        for request in sa_req_list:
+            agent_info = request['agent_info']
+            try:
+                driver = self._get_driver(agent_info['resource_type'],
+                                          agent_info['service_vendor'])
+            except Exception as err:
+                batches.append((None, [(request, err)]))
+                continue
+            if batches and batches[-1][0] is driver:
+                batches[-1][1].append((request, None))
+            else:
+                batches.append((driver, [(request, None)]))
+        return batches
+
     def process_batch(self, ev):
         """Processes a request with multiple data blobs.
 
         Configurator processes the request with multiple data blobs and sends
-        a list of service information to be processed. This function goes
-        through the list of service information and invokes specific service
-        driver methods. After processing each request data blob, notification
-        data blob is prepared.
+        a list of service information to be processed. The list is handed
+        over to the service drivers in batches, so that a driver can push
+        the configuration to the service VM in fewer REST calls. After
+        processing, notification data blob is prepared for each request
+        data blob. Processing stops at the first failed request.
 
         :param ev: Event instance that contains information of event type and
         corresponding event data to be processed.
@@ -179,68 +238,39 @@ class AgentBaseEventHandler(nfp_api.NfpEventHandler):
         sa_req_list = ev.data.get('sa_req_list')
         notification_data = ev.data.get('notification_data')
 
-        for request in sa_req_list:
-            try:
-                # Process the first data blob from the request list.
-                # Get necessary parameters needed for driver method invocation.
-                method = request['method']
-                is_generic_config = request['is_generic_config']
-                resource_data = request['resource_data']
-                agent_info = request['agent_info']
-                resource = agent_info['resource']
-                # agent_info contains the API context.
-                context = agent_info['context']
-                service_vendor = agent_info['service_vendor']
-                service_type = agent_info['resource_type']
-
-                if not is_generic_config:
-                    sa_req_list[0]['resource_data']['context'] = sa_req_list[
-                                    0]['resource_data'].pop('neutron_context')
-
-                # Get the service driver and invoke its method
-                driver = self._get_driver(service_type, service_vendor)
-
+        for driver, requests in self._get_driver_batches(sa_req_list):
+            if driver is None:
+                request, err = requests[0]
+                results = [("Failed to process %s request. %s" %
+                            (request['method'], str(err).capitalize()))]
+            else:
+                batch = []
+                for request, _ in requests:
+                    resource_data = request['resource_data']
+                    if not request['is_generic_config']:
+                        resource_data['context'] = resource_data.pop(
+                                                        'neutron_context')
+                    # agent_info contains the API context.
+                    batch.append({
+                        'method': request['method'],
+                        'context': request['agent_info']['context'],
+                        'resource_data': resource_data,
+                        'is_generic_config': request['is_generic_config']})
                 # Service driver should return "success" on successful API
                 # processing. All other return values and exceptions are
                 # treated as failures.
-                if is_generic_config:
-                    result = getattr(driver, method)(context, resource_data)
-                else:
-                    result = getattr(driver, method)(**resource_data)
-                success = True if result == 'SUCCESS' else False
-            except Exception as err:
-                result = ("Failed to process %s request. %s" %
-                          (method, str(err).capitalize()))
-                success = False
-            finally:
-                # Prepare success notification and populate notification
-                # data list
-                if result in const.SUCCESS:
-                    data = {'status_code': const.SUCCESS}
-                else:
-                    data = {'status_code': const.FAILURE,
-                            'error_msg': result}
-
-                msg = {'info': {'service_type': service_type,
-                                'context': context},
-                       'notification': [{'resource': resource,
-                                         'data': data}]
-                       }
-                # If the data processed is first one, then prepare notification
-                # dict. Otherwise, append the notification to the kwargs list.
-                # Whether it is a data batch or single data blob request,
-                # notification generated will be single dictionary. In case of
-                # batch, multiple notifications are sent in the kwargs list.
-                if not notification_data:
-                    notification_data.update(msg)
-                else:
-                    data = {'resource': resource,
-                            'data': data}
-                    notification_data['notification'].append(data)
-
-            if not success:
-                self.notify._notification(notification_data)
-                raise Exception(msg)
+                try:
+                    results = driver.process_batch(batch)
+                except Exception as err:
+                    results = [("Failed to process %s request. %s" %
+                                (batch[0]['method'], str(err).capitalize()))]
+
+            for (request, _), result in zip(requests, results):
+                success = self._prepare_notification(
+                    notification_data, request, result)
+                if not success:
+                    self.notify._notification(notification_data)
+                    raise Exception(notification_data)
 
         self.notify._notification(notification_data)
 
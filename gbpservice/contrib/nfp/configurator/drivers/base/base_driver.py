@@ -10,6 +10,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import copy
 import requests
 import subprocess
 
@@ -17,6 +18,7 @@ from oslo_serialization import jsonutils
 
 from gbpservice.contrib.nfp.configurator.lib import constants as const
 from gbpservice.nfp.core import log as nfp_logging
+from gbpservice.nfp.lib import http_pool
 
 LOG = nfp_logging.getLogger(__name__)
 
@@ -29,9 +31,88 @@ class BaseDriver(object):
     add method definition here and implement the method in their driver
     """
 
+    # Generic config methods whose consecutive requests to a service VM
+    # can be sent as one REST call by merging their source_cidrs, mapped
+    # to the resource_data keys which must match for requests to merge.
+    # Vendor drivers list the methods for which their service VM API
+    # accepts a list of cidrs.
+    coalesce_methods = {}
+
     def __init__(self, conf):
         pass
 
+    def _can_coalesce(self, first, request):
+        method = request['method']
+        if (method not in self.coalesce_methods or
+                method != first['method'] or
+                not (first['is_generic_config'] and
+                     request['is_generic_config'])):
+            return False
+        return all(first['resource_data'].get(key) ==
+                   request['resource_data'].get(key)
+                   for key in self.coalesce_methods[method])
+
+    def _coalesce(self, batch):
+        """Groups consecutive requests which can be sent together.
+
+        Returns: list of (request, count) where request is the merged
+        request and count the number of requests merged into it.
+
+        """
+
+        groups = []
+        for request in batch:
+            if groups and self._can_coalesce(groups[-1][0], request):
+                merged, count = groups[-1]
+                if count == 1:
+                    merged = copy.deepcopy(merged)
+                cidrs = merged['resource_data'].setdefault('source_cidrs', [])
+                for cidr in request['resource_data'].get('source_cidrs') or []:
+                    if cidr not in cidrs:
+                        cidrs.append(cidr)
+                groups[-1] = (merged, count + 1)
+            else:
+                groups.append((request, 1))
+        return groups
+
+    def process_batch(self, batch):
+        """Processes a batch of configuration requests.
+
+        Consecutive requests which can be merged (see coalesce_methods)
+        are issued as a single REST call to the service VM, the others
+        are processed one after other. Processing stops at the first
+        request which fails, as the following requests may depend on it.
+
+        :param batch: list of requests, dicts with keys method, context,
+        resource_data and is_generic_config.
+
+        Returns: list of results, one per request processed, in the order
+        of requests. A request which raised has the error message as the
+        result.
+
+        """
+
+        results = []
+        for request, count in self._coalesce(batch):
+            method = request['method']
+            try:
+                if request['is_generic_config']:
+                    result = getattr(self, method)(request['context'],
+                                                   request['resource_data'])
+                else:
+                    result = getattr(self, method)(**request['resource_data'])
+            except Exception as err:
+                result = ("Failed to process %s request. %s" %
+                          (method, str(err).capitalize()))
+            if count > 1:
+                msg = ("Processed %d %s requests in one call. Result: %s"
+                       % (count, method, result))
+                LOG.info(msg)
+            results.extend([result] * count)
+            if result != const.SUCCESS:
+                break
+        return results
+
     def configure_healthmonitor(self, context, resource_data):
         """Checks if the Service VM is reachable.
 
@@ -123,7 +204,7 @@ class BaseDriver(object):
         LOG.info(msg)
 
         try:
-            resp = requests.post(url, data, timeout=self.timeout)
+            resp = http_pool.get_pool().post(url, data, timeout=self.timeout)
         except requests.exceptions.ConnectionError as err:
             msg = ("Failed to establish connection to service at: "
                    "%r for configuring log forwarding. ERROR: %r" %
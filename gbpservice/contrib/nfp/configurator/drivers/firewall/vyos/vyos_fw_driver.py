@@ -14,6 +14,7 @@ import ast
 import requests
 
 from gbpservice.nfp.core import log as nfp_logging
+from gbpservice.nfp.lib import http_pool
 
 from oslo_serialization import jsonutils
 
@@ -36,10 +37,12 @@ class RestApi(object):
 
     def __init__(self, timeout):
         self.timeout = timeout
+        # Shared keep-alive connections to the service VMs
+        self.pool = http_pool.get_pool()
 
     def request_type_to_api_map(self, url, data, request_type):
-        return getattr(requests, request_type)(url,
-                                               data=data, timeout=self.timeout)
+        return getattr(self.pool, request_type)(
+            url, data=data, timeout=self.timeout)
 
     def fire(self, url, data, request_type):
         """ Invokes REST POST call to the Service VM.
@@ -84,6 +87,9 @@ class FwGenericConfigDriver(base_driver.BaseDriver):
     configuration requests from Orchestrator.
     """
 
+    coalesce_methods = {'configure_routes': ('mgmt_ip', 'gateway_ip'),
+                        'clear_routes': ('mgmt_ip',)}
+
     def __init__(self):
         pass
 
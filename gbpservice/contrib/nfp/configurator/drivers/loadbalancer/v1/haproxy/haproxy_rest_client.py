@@ -11,10 +11,10 @@
 #    under the License.
 
 import json as jsonutils
-import requests
 import urlparse
 
 from gbpservice.nfp.core import log as nfp_logging
+from gbpservice.nfp.lib import http_pool
 
 LOG = nfp_logging.getLogger(__name__)
 
@@ -31,7 +31,8 @@ class HttpRequests(object):
         self._retries = retries
         self._request_timeout = request_timeout
         self.rest_server_url = 'http://' + self._host + ':' + str(self._port)
-        self.pool = requests.Session()
+        # Shared keep-alive connections to the service VMs
+        self.pool = http_pool.get_pool()
 
     def do_request(self, method, url=None, headers=None, data=None,
                    timeout=30):
@@ -39,7 +40,8 @@ class HttpRequests(object):
         try:
             response = self.pool.request(method, url=url,
                                          headers=headers, data=data,
-                                         timeout=timeout)
+                                         timeout=timeout,
+                                         retries=self._retries)
         except Exception as e:
             msg = ("[Request:%s, URL:%s, Body:%s] Failed.Reason:%s"
                    % (method, url, data, e))
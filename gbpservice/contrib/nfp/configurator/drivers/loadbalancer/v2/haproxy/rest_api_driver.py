@@ -34,6 +34,7 @@ import six
 from gbpservice.contrib.nfp.configurator.drivers.loadbalancer.v2.haproxy.\
     local_cert_manager import LocalCertManager
 from gbpservice.nfp.core import log as nfp_logging
+from gbpservice.nfp.lib import http_pool
 
 LOG = nfp_logging.getLogger(__name__)
 API_VERSION = rest_api_driver.API_VERSION
@@ -61,7 +62,8 @@ class AmphoraAPIClient(rest_api_driver.AmphoraAPIClient):
     """Removed SSL verification from original api client"""
     def __init__(self):
         super(AmphoraAPIClient, self).__init__()
-        self.session = requests.Session()
+        # Shared keep-alive connections to the amphorae
+        self.session = http_pool.get_pool()
 
     def _base_url(self, ip):
         return "http://{ip}:{port}/{version}/".format(
@@ -78,7 +80,9 @@ class AmphoraAPIClient(rest_api_driver.AmphoraAPIClient):
                          CONF.haproxy_amphora.rest_request_read_timeout)
         reqargs = {
             'url': _url,
-            'timeout': timeout_tuple, }
+            'timeout': timeout_tuple,
+            # Retried below as per haproxy_amphora config
+            'retries': 0, }
         reqargs.update(kwargs)
         headers = reqargs.setdefault('headers', {})
 
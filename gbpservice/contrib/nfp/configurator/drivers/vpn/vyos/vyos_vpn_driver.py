@@ -20,6 +20,7 @@ from gbpservice.contrib.nfp.configurator.drivers.vpn.vyos import (
 from gbpservice.contrib.nfp.configurator.lib import constants as common_const
 from gbpservice.contrib.nfp.configurator.lib import vpn_constants as vpn_const
 from gbpservice.nfp.core import log as nfp_logging
+from gbpservice.nfp.lib import http_pool
 
 from oslo_concurrency import lockutils
 from oslo_serialization import jsonutils
@@ -72,7 +73,8 @@ class RestApi(object):
         data = jsonutils.dumps(args)
 
         try:
-            resp = requests.post(url, data=data, timeout=self.timeout)
+            resp = http_pool.get_pool().post(
+                url, data=data, timeout=self.timeout)
             message = jsonutils.loads(resp.text)
             msg = "POST url %s %d" % (url, resp.status_code)
             LOG.info(msg)
@@ -107,7 +109,8 @@ class RestApi(object):
         data = jsonutils.dumps(args)
 
         try:
-            resp = requests.put(url, data=data, timeout=self.timeout)
+            resp = http_pool.get_pool().put(
+                url, data=data, timeout=self.timeout)
             msg = "PUT url %s %d" % (url, resp.status_code)
             LOG.debug(msg)
             if resp.status_code == 200:
@@ -143,7 +146,8 @@ class RestApi(object):
         if data:
             data = jsonutils.dumps(data)
         try:
-            resp = requests.delete(url, timeout=self.timeout, data=data)
+            resp = http_pool.get_pool().delete(
+                url, timeout=self.timeout, data=data)
             message = jsonutils.loads(resp.text)
             msg = "DELETE url %s %d" % (url, resp.status_code)
             LOG.debug(msg)
@@ -178,7 +182,8 @@ class RestApi(object):
             const.CONFIGURATION_SERVER_PORT, api)
 
         try:
-            resp = requests.get(url, params=args, timeout=self.timeout)
+            resp = http_pool.get_pool().get(
+                url, params=args, timeout=self.timeout)
             msg = "GET url %s %d" % (url, resp.status_code)
             LOG.debug(msg)
             if resp.status_code == 200:
@@ -301,6 +306,9 @@ class VpnGenericConfigDriver(base_driver.BaseDriver):
     This driver class implements VPN configuration.
     """
 
+    coalesce_methods = {'configure_routes': ('mgmt_ip', 'gateway_ip'),
+                        'clear_routes': ('mgmt_ip', 'gateway_ip')}
+
     def __init__(self):
         self.timeout = const.REST_TIMEOUT
 
@@ -339,7 +347,7 @@ class VpnGenericConfigDriver(base_driver.BaseDriver):
                "service at: %r" % mgmt_ip)
         LOG.info(msg)
         try:
-            resp = requests.post(url, data, timeout=self.timeout)
+            resp = http_pool.get_pool().post(url, data, timeout=self.timeout)
         except requests.exceptions.ConnectionError as err:
             msg = ("Failed to establish connection to primary service at: "
                    "%r. ERROR: %r" %
@@ -429,7 +437,7 @@ class VpnGenericConfigDriver(base_driver.BaseDriver):
                "service at: %r" % mgmt_ip)
         LOG.info(msg)
         try:
-            resp = requests.post(url, data, timeout=self.timeout)
+            resp = http_pool.get_pool().post(url, data, timeout=self.timeout)
         except requests.exceptions.ConnectionError as err:
             msg = ("Failed to establish connection to primary service at: "
                    "%r. ERROR: %r" %
@@ -490,7 +498,8 @@ class VpnGenericConfigDriver(base_driver.BaseDriver):
                "service at: %r" % mgmt_ip)
         LOG.info(msg)
         try:
-            resp = requests.delete(url, data=data, timeout=self.timeout)
+            resp = http_pool.get_pool().delete(
+                url, data=data, timeout=self.timeout)
         except requests.exceptions.ConnectionError as err:
             msg = ("Failed to establish connection to primary service at: "
                    "%r. ERROR: %r" %
@@ -564,7 +573,8 @@ class VpnGenericConfigDriver(base_driver.BaseDriver):
 
         try:
             data = jsonutils.dumps(rule_info)
-            resp = requests.delete(url, data=data, timeout=self.timeout)
+            resp = http_pool.get_pool().delete(
+                url, data=data, timeout=self.timeout)
         except requests.exceptions.ConnectionError as err:
             msg = ("Failed to establish connection to service at: %r. "
                    "ERROR: %r" %
@@ -615,7 +625,7 @@ class VpnGenericConfigDriver(base_driver.BaseDriver):
                                              'add-stitching-route')
         st_data = jsonutils.dumps({'gateway_ip': gateway_ip})
         try:
-            resp = requests.post(
+            resp = http_pool.get_pool().post(
                 stitching_url, data=st_data, timeout=self.timeout)
         except requests.exceptions.ConnectionError as err:
             msg = ("Failed to establish connection to service at: "
@@ -636,7 +646,8 @@ class VpnGenericConfigDriver(base_driver.BaseDriver):
                "primary service at: %r" % mgmt_ip)
         LOG.info(msg)
         try:
-            resp = requests.post(url, data=data, timeout=self.timeout)
+            resp = http_pool.get_pool().post(
+                url, data=data, timeout=self.timeout)
         except requests.exceptions.ConnectionError as err:
             msg = ("Failed to establish connection to service at: "
                    "%r. ERROR: %r" % (mgmt_ip, str(err).capitalize()))
@@ -694,7 +705,7 @@ class VpnGenericConfigDriver(base_driver.BaseDriver):
         st_data = jsonutils.dumps(
             {'gateway_ip': resource_data.get('gateway_ip')})
         try:
-            resp = requests.post(
+            resp = http_pool.get_pool().post(
                 stitching_url, data=st_data, timeout=self.timeout)
         except requests.exceptions.ConnectionError as err:
             msg = ("Failed to establish connection to service at: "
@@ -714,7 +725,8 @@ class VpnGenericConfigDriver(base_driver.BaseDriver):
                % mgmt_ip)
         LOG.info(msg)
         try:
-            resp = requests.delete(url, data=data, timeout=self.timeout)
+            resp = http_pool.get_pool().delete(
+                url, data=data, timeout=self.timeout)
         except requests.exceptions.ConnectionError as err:
             msg = ("Failed to establish connection to primary service at: "
                    " %r. ERROR: %r" % (mgmt_ip, err))
@@ -360,3 +360,72 @@ class GenericConfigEventHandlerTestCase(base.BaseTestCase):
         ev = fo.FakeEventGenericConfig()
         ev.id = const.EVENT_CONFIGURE_HEALTHMONITOR
         self._test_handle_periodic_event(ev)
+
+    def _get_batch_event(self):
+        ev = mock.Mock(id=common_const.EVENT_PROCESS_BATCH)
+        ev.data = {'sa_req_list': self.fo.fake_sa_req_list(),
+                   'notification_data': {}}
+        return ev
+
+    def test_process_batch_genericconfigeventhandler(self):
+        """ Implements test case for process batch method of generic
+        config event handler. Requests are handed over to the driver
+        in one batch and notified per resource.
+
+        Returns: none
+
+        """
+
+        agent, sc = self._get_GenericConfigEventHandler_object()
+        driver = mock.Mock()
+        ev = self._get_batch_event()
+
+        with mock.patch.object(
+                agent, '_get_driver', return_value=driver), (
+            mock.patch.object(
+                driver, 'process_batch',
+                return_value=[common_const.SUCCESS] * 2)) as mock_batch, (
+            mock.patch.object(agent.notify, '_notification')) as mock_notify:
+            agent.handle_event(ev)
+
+            batch = mock_batch.call_args[0][0]
+            self.assertEqual(1, mock_batch.call_count)
+            self.assertEqual(['configure_interfaces', 'configure_routes'],
+                             [request['method'] for request in batch])
+            notification_data = mock_notify.call_args[0][0]
+            self.assertEqual(
+                [('interfaces', common_const.SUCCESS),
+                 ('routes', common_const.SUCCESS)],
+                [(notification['resource'],
+                  notification['data']['status_code'])
+                 for notification in notification_data['notification']])
+
+    def test_process_batch_failure_genericconfigeventhandler(self):
+        """ Implements test case for process batch method of generic
+        config event handler when a request of the batch fails.
+
+        Returns: none
+
+        """
+
+        agent, sc = self._get_GenericConfigEventHandler_object()
+        driver = mock.Mock()
+        ev = self._get_batch_event()
+
+        with mock.patch.object(
+                agent, '_get_driver', return_value=driver), (
+            mock.patch.object(
+                driver, 'process_batch',
+                return_value=[common_const.SUCCESS,
+                              'Route failed'])), (
+            mock.patch.object(agent.notify, '_notification')) as mock_notify:
+            agent.handle_event(ev)
+
+            notification_data = mock_notify.call_args[0][0]
+            notifications = notification_data['notification']
+            self.assertEqual(common_const.SUCCESS,
+                             notifications[0]['data']['status_code'])
+            self.assertEqual(common_const.FAILURE,
+                             notifications[1]['data']['status_code'])
+            self.assertEqual('Route failed',
+                             notifications[1]['data']['error_msg'])
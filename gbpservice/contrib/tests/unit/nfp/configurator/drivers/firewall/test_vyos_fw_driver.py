@@ -10,8 +10,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import copy
 import mock
-import requests
 
 from neutron.tests import base
 from oslo_config import cfg
@@ -22,6 +22,7 @@ from gbpservice.contrib.nfp.configurator.drivers.firewall.vyos import (
 from gbpservice.contrib.nfp.configurator.lib import constants as const
 from gbpservice.contrib.tests.unit.nfp.configurator.test_data import (
                                                         fw_test_data as fo)
+from gbpservice.nfp.lib import http_pool
 
 
 class FwGenericConfigDriverTestCase(base.BaseTestCase):
@@ -49,7 +50,8 @@ class FwGenericConfigDriverTestCase(base.BaseTestCase):
         """
 
         with mock.patch.object(
-                requests, 'post', return_value=self.resp) as mock_post, (
+                http_pool.HttpPool, 'post',
+                return_value=self.resp) as mock_post, (
             mock.patch.object(
                 self.resp, 'json', return_value=self.fake_resp_dict)), (
             mock.patch.object(
@@ -71,7 +73,8 @@ class FwGenericConfigDriverTestCase(base.BaseTestCase):
         """
 
         with mock.patch.object(
-                requests, 'post', return_value=self.resp) as mock_post, (
+                http_pool.HttpPool, 'post',
+                return_value=self.resp) as mock_post, (
             mock.patch.object(
                 self.resp, 'json', return_value=self.fake_resp_dict)), (
             mock.patch.object(
@@ -97,7 +100,8 @@ class FwGenericConfigDriverTestCase(base.BaseTestCase):
 
         self.resp = mock.Mock(status_code=200)
         with mock.patch.object(
-                requests, 'delete', return_value=self.resp) as mock_delete, (
+                http_pool.HttpPool, 'delete',
+                return_value=self.resp) as mock_delete, (
             mock.patch.object(
                 self.resp, 'json', return_value=self.fake_resp_dict)):
             self.driver.clear_interfaces(self.fo.context, self.kwargs)
@@ -117,7 +121,8 @@ class FwGenericConfigDriverTestCase(base.BaseTestCase):
         """
 
         with mock.patch.object(
-                requests, 'post', return_value=self.resp) as mock_post, (
+                http_pool.HttpPool, 'post',
+                return_value=self.resp) as mock_post, (
             mock.patch.object(
                 self.resp, 'json', return_value=self.fake_resp_dict)):
 
@@ -139,7 +144,8 @@ class FwGenericConfigDriverTestCase(base.BaseTestCase):
         """
 
         with mock.patch.object(
-                requests, 'delete', return_value=self.resp) as mock_delete, (
+                http_pool.HttpPool, 'delete',
+                return_value=self.resp) as mock_delete, (
             mock.patch.object(
                 self.resp, 'json', return_value=self.fake_resp_dict)):
             self.driver.clear_routes(
@@ -152,6 +158,84 @@ class FwGenericConfigDriverTestCase(base.BaseTestCase):
                 self.fo.get_url_for_api('del_src_route'),
                 data=data, timeout=self.fo.timeout)
 
+    def _get_batch_request(self, method, **kwargs):
+        resource_data = copy.deepcopy(self.kwargs)
+        resource_data.update(kwargs)
+        return {'method': method,
+                'context': self.fo.context,
+                'resource_data': resource_data,
+                'is_generic_config': True}
+
+    def test_process_batch_coalesces_routes(self):
+        """ Implements test case for process batch method of generic
+        config driver, consecutive routes requests to the service VM
+        are sent in one REST call.
+
+        Returns: none
+
+        """
+
+        batch = [self._get_batch_request('configure_interfaces'),
+                 self._get_batch_request('configure_routes',
+                                         source_cidrs=['11.0.1.0/24']),
+                 self._get_batch_request('configure_routes',
+                                         source_cidrs=['11.0.2.0/24',
+                                                       '11.0.1.0/24']),
+                 self._get_batch_request('configure_routes',
+                                         source_cidrs=['11.0.3.0/24'])]
+        self.resp.status_code = 200
+        with mock.patch.object(
+                http_pool.HttpPool, 'post',
+                return_value=self.resp) as mock_post, (
+            mock.patch.object(
+                self.resp, 'json', return_value=self.fake_resp_dict)), (
+            mock.patch.object(
+                self.driver, 'configure_interfaces',
+                return_value=const.STATUS_SUCCESS)) as mock_inte:
+            results = self.driver.process_batch(batch)
+
+            self.assertEqual([const.STATUS_SUCCESS] * 4, results)
+            mock_inte.assert_called_once_with(
+                self.fo.context, batch[0]['resource_data'])
+            data = jsonutils.dumps(
+                [{'source_cidr': cidr, 'gateway_ip': '1.2.3.4'}
+                 for cidr in ['11.0.1.0/24', '11.0.2.0/24', '11.0.3.0/24']])
+            mock_post.assert_called_once_with(
+                self.fo.get_url_for_api('add_src_route'),
+                data=data, timeout=self.fo.timeout)
+            # Requests of the batch are left as they were
+            self.assertEqual(['11.0.1.0/24'],
+                             batch[1]['resource_data']['source_cidrs'])
+
+    def test_process_batch_stops_on_failure(self):
+        """ Implements test case for process batch method of generic
+        config driver, requests following a failed request are not
+        processed.
+
+        Returns: none
+
+        """
+
+        batch = [self._get_batch_request('configure_interfaces'),
+                 self._get_batch_request('configure_routes',
+                                         gateway_ip='1.2.3.1'),
+                 self._get_batch_request('configure_routes',
+                                         gateway_ip='1.2.3.2')]
+        with mock.patch.object(
+                self.driver, 'configure_interfaces',
+                return_value=const.STATUS_SUCCESS), (
+            mock.patch.object(
+                self.driver, 'configure_routes',
+                side_effect=Exception('unreachable'))) as mock_routes:
+            results = self.driver.process_batch(batch)
+
+            self.assertEqual(2, len(results))
+            self.assertEqual(const.STATUS_SUCCESS, results[0])
+            self.assertIn('Unreachable', results[1])
+            # Different gateways are not merged, second one never sent
+            mock_routes.assert_called_once_with(
+                self.fo.context, batch[1]['resource_data'])
+
 
 class FwaasDriverTestCase(base.BaseTestCase):
     """ Implements test cases for driver methods
@@ -182,7 +266,8 @@ class FwaasDriverTestCase(base.BaseTestCase):
         """
 
         with mock.patch.object(
-                requests, 'post', return_value=self.resp) as mock_post, (
+                http_pool.HttpPool, 'post',
+                return_value=self.resp) as mock_post, (
             mock.patch.object(
                 self.resp, 'json', return_value=self.fake_resp_dict)):
             mock_post.configure_mock(status_code=200)
@@ -201,7 +286,8 @@ class FwaasDriverTestCase(base.BaseTestCase):
         """
 
         with mock.patch.object(
-                requests, 'put', return_value=self.resp) as mock_put, (
+                http_pool.HttpPool, 'put',
+                return_value=self.resp) as mock_put, (
             mock.patch.object(
                 self.resp, 'json', return_value=self.fake_resp_dict)):
             self.driver.update_firewall(self.fo.context,
@@ -219,7 +305,8 @@ class FwaasDriverTestCase(base.BaseTestCase):
         """
 
         with mock.patch.object(
-                requests, 'delete', return_value=self.resp) as mock_delete, (
+                http_pool.HttpPool, 'delete',
+                return_value=self.resp) as mock_delete, (
             mock.patch.object(
                 self.resp, 'json', return_value=self.fake_resp_dict)):
             self.driver.delete_firewall(self.fo.context,
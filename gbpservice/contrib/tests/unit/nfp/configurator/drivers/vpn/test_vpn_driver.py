@@ -10,8 +10,6 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import requests
-
 import json
 import mock
 
@@ -21,6 +19,7 @@ from gbpservice.contrib.nfp.configurator.drivers.vpn.vyos import (
     vyos_vpn_driver)
 from gbpservice.contrib.tests.unit.nfp.configurator.test_data import (
     vpn_test_data)
+from gbpservice.nfp.lib import http_pool
 
 from neutron.tests import base
 
@@ -78,7 +77,7 @@ class VpnaasIpsecDriverTestCase(base.BaseTestCase):
         with mock.patch.object(
                 bdobj.agent, 'update_status') as mock_update_status, (
             mock.patch.object(jsonutils, 'loads')) as mock_resp, (
-            mock.patch.object(requests, 'post')) as mock_post, (
+            mock.patch.object(http_pool.HttpPool, 'post')) as mock_post, (
             mock.patch.object(
                 self.driver.agent, 'get_vpn_servicecontext',
                 return_value=[self.test_dict.svc_context])):
@@ -107,7 +106,7 @@ class VpnaasIpsecDriverTestCase(base.BaseTestCase):
                                                    service_type='ipsec')
         with mock.patch.object(self.plugin_rpc, 'ipsec_site_conn_deleted'), (
                 mock.patch.object(json, 'loads')) as mock_resp, (
-                mock.patch.object(requests, 'delete')) as (
+                mock.patch.object(http_pool.HttpPool, 'delete')) as (
                 mock_delete):
             mock_resp.return_value = self.fake_resp_dict
             mock_delete.return_value = self.resp
@@ -139,7 +138,7 @@ class VpnaasIpsecDriverTestCase(base.BaseTestCase):
         svc_context = self.test_dict.svc_context
         with mock.patch.object(self.plugin_rpc, 'update_status'), (
                 mock.patch.object(self.resp, 'json')) as mock_json, (
-                mock.patch.object(requests, 'get')) as mock_get:
+                mock.patch.object(http_pool.HttpPool, 'get')) as mock_get:
             mock_get.return_value = self.resp
             mock_json.return_value = {'state': 'DOWN'}
             state = self.driver.check_status(self.context, svc_context)
@@ -182,7 +181,8 @@ class VpnGenericConfigDriverTestCase(base.BaseTestCase):
         """
 
         with mock.patch.object(
-                requests, 'post', return_value=self.resp) as mock_post, (
+                http_pool.HttpPool, 'post',
+                return_value=self.resp) as mock_post, (
             mock.patch.object(self.resp,
                               'json',
                               return_value=self.fake_resp_dict)):
@@ -206,7 +206,8 @@ class VpnGenericConfigDriverTestCase(base.BaseTestCase):
 
         self.resp = mock.Mock(status_code=200)
         with mock.patch.object(
-                requests, 'delete', return_value=self.resp) as mock_delete, (
+                http_pool.HttpPool, 'delete',
+                return_value=self.resp) as mock_delete, (
             mock.patch.object(
                 self.resp, 'json', return_value=self.fake_resp_dict)):
             self.driver.clear_interfaces(self.test_dict.context_device,
@@ -228,7 +229,8 @@ class VpnGenericConfigDriverTestCase(base.BaseTestCase):
         """
 
         with mock.patch.object(
-                requests, 'post', return_value=self.resp) as mock_post, (
+                http_pool.HttpPool, 'post',
+                return_value=self.resp) as mock_post, (
             mock.patch.object(jsonutils, 'loads',
                               return_value=self.fake_resp_dict)):
             self.driver.configure_routes(self.test_dict.context_device,
@@ -249,9 +251,11 @@ class VpnGenericConfigDriverTestCase(base.BaseTestCase):
 
         """
 
-        with mock.patch.object(requests, 'post', return_value=self.resp), (
+        with mock.patch.object(http_pool.HttpPool, 'post',
+                               return_value=self.resp), (
             mock.patch.object(
-                requests, 'delete', return_value=self.resp)) as mock_delete:
+                http_pool.HttpPool, 'delete',
+                return_value=self.resp)) as mock_delete:
             self.driver.clear_routes(
                 self.test_dict.context_device, self.kwargs)
 
@@ -331,7 +335,8 @@ class RestApiTestCase(base.BaseTestCase):
 
         self.resp = mock.Mock(status_code=200)
         self.fake_resp_dict.update({'status': True})
-        with mock.patch.object(requests, 'post', return_value=self.resp) as (
+        with mock.patch.object(http_pool.HttpPool, 'post',
+                               return_value=self.resp) as (
             mock_post), (
             mock.patch.object(jsonutils, 'loads',
                               return_value=self.fake_resp_dict)):
@@ -348,7 +353,8 @@ class RestApiTestCase(base.BaseTestCase):
         """
 
         self.resp = mock.Mock(status_code=200)
-        with mock.patch.object(requests, 'put', return_value=self.resp) as (
+        with mock.patch.object(http_pool.HttpPool, 'put',
+                               return_value=self.resp) as (
                 mock_put):
             self.rest_obj.put('create-ipsec-site-conn', self.data)
             mock_put.assert_called_with(
@@ -363,7 +369,8 @@ class RestApiTestCase(base.BaseTestCase):
         """
 
         self.resp = mock.Mock(status_code=404)
-        with mock.patch.object(requests, 'put', return_value=self.resp) as (
+        with mock.patch.object(http_pool.HttpPool, 'put',
+                               return_value=self.resp) as (
                 mock_put):
 
             self.rest_obj.put('create-ipsec-site-conn', self.data)
@@ -379,7 +386,8 @@ class RestApiTestCase(base.BaseTestCase):
         """
         self.resp = mock.Mock(status_code=200)
         self.fake_resp_dict.update({'status': True})
-        with mock.patch.object(requests, 'delete', return_value=self.resp) as (
+        with mock.patch.object(http_pool.HttpPool, 'delete',
+                               return_value=self.resp) as (
             mock_delete), (
             mock.patch.object(jsonutils, 'loads',
                               return_value=self.fake_resp_dict)):
@@ -398,7 +406,8 @@ class RestApiTestCase(base.BaseTestCase):
         """
 
         self.resp = mock.Mock(status_code=200)
-        with mock.patch.object(requests, 'get', return_value=self.resp) as (
+        with mock.patch.object(http_pool.HttpPool, 'get',
+                               return_value=self.resp) as (
                 mock_get):
             self.rest_obj.get('create-ipsec-site-tunnel', self.data)
             mock_get.assert_called_with(
@@ -413,7 +422,8 @@ class RestApiTestCase(base.BaseTestCase):
         """
 
         self.resp = mock.Mock(status_code=404)
-        with mock.patch.object(requests, 'get', return_value=self.resp) as (
+        with mock.patch.object(http_pool.HttpPool, 'get',
+                               return_value=self.resp) as (
                 mock_get):
             self.rest_obj.get('create-ipsec-site-tunnel', self.data)
             mock_get.assert_called_with(
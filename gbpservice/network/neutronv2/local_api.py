@@ -181,24 +181,26 @@ class LocalAPI(object):
                 # explicit resource creation request, and hence the above
                 # method will be invoked in the API layer.
             if do_notify:
-                if BATCH_NOTIFICATIONS and not clean_session:
-                    outer_transaction = (_get_outer_transaction(
-                        context._session.transaction))
-                else:
-                    outer_transaction = None
-                args = [action, {}, {resource: obj}]
-                send_or_queue_notification(
-                    outer_transaction, self._nova_notifier,
-                    'send_network_change', args)
-                # REVISIT(rkukura): Do create.end notification?
-                if cfg.CONF.dhcp_agent_notification:
-                    args = [context, {resource: obj},
-                            resource + '.create.end']
-                    send_or_queue_notification(
-                        outer_transaction, self._dhcp_agent_notifier,
-                        'notify', args)
+                self._notify_created(context, resource, obj, clean_session)
         return obj
 
+    def _notify_created(self, context, resource, obj, clean_session):
+        if BATCH_NOTIFICATIONS and not clean_session:
+            outer_transaction = (_get_outer_transaction(
+                context._session.transaction))
+        else:
+            outer_transaction = None
+        args = ['create_' + resource, {}, {resource: obj}]
+        send_or_queue_notification(
+            outer_transaction, self._nova_notifier,
+            'send_network_change', args)
+        # REVISIT(rkukura): Do create.end notification?
+        if cfg.CONF.dhcp_agent_notification:
+            args = [context, {resource: obj}, resource + '.create.end']
+            send_or_queue_notification(
+                outer_transaction, self._dhcp_agent_notifier,
+                'notify', args)
+
     def _update_resource(self, plugin, context, resource, resource_id, attrs,
                          do_notify=True, clean_session=True):
         # REVISIT(rkukura): Do update.start notification?
@@ -276,6 +278,18 @@ class LocalAPI(object):
         return self._create_resource(self._core_plugin, plugin_context, 'port',
                                      attrs, clean_session=clean_session)
 
+    def _create_ports(self, plugin_context, attrs_list, clean_session=True):
+        # The core plugin creates the ports in one transaction.
+        with utils.clean_session(plugin_context.session) if (
+                clean_session) else dummy_context_mgr():
+            ports = self._core_plugin.create_port_bulk(
+                plugin_context,
+                {'ports': [{'port': attrs} for attrs in attrs_list]})
+            for port in ports:
+                self._notify_created(plugin_context, 'port', port,
+                                     clean_session)
+        return ports
+
     def _update_port(self, plugin_context, port_id, attrs, clean_session=True):
         return self._update_resource(self._core_plugin, plugin_context, 'port',
                                      port_id, attrs,
@@ -457,6 +471,22 @@ class LocalAPI(object):
             LOG.warning(_LW('Security Group already exists %s'), ex.message)
             return
 
+    def _create_sg_rules(self, plugin_context, attrs_list, clean_session=True):
+        # The core plugin creates the rules in one transaction and notifies
+        # the agents once for all of them.
+        try:
+            with utils.clean_session(plugin_context.session) if (
+                    clean_session) else dummy_context_mgr():
+                return self._core_plugin.create_security_group_rule_bulk(
+                    plugin_context,
+                    {'security_group_rules': [{'security_group_rule': attrs}
+                                              for attrs in attrs_list]})
+        except ext_sg.SecurityGroupRuleExists as ex:
+            LOG.warning(_LW('Security Group already exists %s'), ex.message)
+            return [self._create_sg_rule(plugin_context, attrs,
+                                         clean_session=clean_session)
+                    for attrs in attrs_list]
+
     def _update_sg_rule(self, plugin_context, sg_rule_id, attrs,
                         clean_session=True):
         return self._update_resource(self._core_plugin, plugin_context,
@@ -29,6 +29,15 @@ class ApicSegmentationLabelDBMixin(object):
                 policy_target_id=policy_target_id).all())
         return rows
 
+    def get_policy_targets_segmentation_labels(self, session,
+                                               policy_target_ids):
+        if not policy_target_ids:
+            return []
+        rows = (session.query(ApicSegmentationLabelDB).filter(
+                ApicSegmentationLabelDB.policy_target_id.in_(
+                    policy_target_ids)).all())
+        return rows
+
     def get_policy_target_segmentation_label(self, session, policy_target_id,
                                              segmentation_label):
         row = (session.query(ApicSegmentationLabelDB).filter_by(
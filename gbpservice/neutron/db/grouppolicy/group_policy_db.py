@@ -12,7 +12,6 @@
 
 import netaddr
 from neutron.api.v2 import attributes as attr
-from neutron import context
 from neutron.db import common_db_mixin
 from neutron.db import model_base
 from neutron.db import models_v2
@@ -46,6 +45,11 @@ class BaseSharedGbpResource(BaseGbpResource):
 class PolicyTarget(model_base.BASEV2, BaseGbpResource):
     """Lowest unit of abstraction on which a policy is applied."""
     __tablename__ = 'gp_policy_targets'
+    # Proxy targets are looked up by description
+    __table_args__ = (
+        sa.Index('ix_gp_policy_targets_description', 'description'),
+        model_base.BASEV2.__table_args__
+    )
     type = sa.Column(sa.String(15))
     __mapper_args__ = {
         'polymorphic_on': type,
@@ -54,8 +58,8 @@ class PolicyTarget(model_base.BASEV2, BaseGbpResource):
     policy_target_group_id = sa.Column(sa.String(36),
                                        sa.ForeignKey(
                                            'gp_policy_target_groups.id'),
-                                       nullable=True)
-    cluster_id = sa.Column(sa.String(255))
+                                       nullable=True, index=True)
+    cluster_id = sa.Column(sa.String(255), index=True)
 
 
 class PTGToPRSProvidingAssociation(model_base.BASEV2):
@@ -85,6 +89,11 @@ class PTGToPRSConsumingAssociation(model_base.BASEV2):
 class PolicyTargetGroup(model_base.BASEV2, BaseSharedGbpResource):
     """It is a collection of policy_targets."""
     __tablename__ = 'gp_policy_target_groups'
+    # Proxy groups are looked up by description
+    __table_args__ = (
+        sa.Index('ix_gp_policy_target_groups_description', 'description'),
+        model_base.BASEV2.__table_args__
+    )
     type = sa.Column(sa.String(15))
     __mapper_args__ = {
         'polymorphic_on': type,
@@ -94,7 +103,7 @@ class PolicyTargetGroup(model_base.BASEV2, BaseSharedGbpResource):
                                       backref='policy_target_group')
     l2_policy_id = sa.Column(sa.String(36),
                              sa.ForeignKey('gp_l2_policies.id'),
-                             nullable=True)
+                             nullable=True, index=True)
     network_service_policy_id = sa.Column(
         sa.String(36), sa.ForeignKey('gp_network_service_policies.id'),
         nullable=True)
@@ -119,7 +128,7 @@ class L2Policy(model_base.BASEV2, BaseSharedGbpResource):
                                             backref='l2_policy')
     l3_policy_id = sa.Column(sa.String(36),
                              sa.ForeignKey('gp_l3_policies.id'),
-                             nullable=True)
+                             nullable=True, index=True)
     inject_default_route = sa.Column(sa.Boolean, default=True,
                                      server_default=sa.sql.true())
 
@@ -375,9 +384,46 @@ class GroupPolicyDbPlugin(gpolicy.GroupPolicyPluginBase,
     __native_pagination_support = True
     __native_sorting_support = True
 
+    # Collections the _make_*_dict methods walk, which are not joined
+    # loaded with the resource. A list loads each of them for all the
+    # listed resources with one query, rather than one query per resource.
+    _list_eager_loads = {
+        PolicyTargetGroup: ['policy_targets', 'provided_policy_rule_sets',
+                            'consumed_policy_rule_sets'],
+        L2Policy: ['policy_target_groups'],
+        L3Policy: ['l2_policies', 'external_segments'],
+        NetworkServicePolicy: ['policy_target_groups',
+                               'network_service_params'],
+        PolicyClassifier: ['policy_rules'],
+        PolicyAction: ['policy_rules'],
+        PolicyRuleSet: ['child_policy_rule_sets'],
+        ExternalSegment: ['nat_pools', 'external_policies', 'l3_policies',
+                          'external_routes'],
+        ExternalPolicy: ['external_segments', 'provided_policy_rule_sets',
+                         'consumed_policy_rule_sets'],
+    }
+
     def __init__(self, *args, **kwargs):
         super(GroupPolicyDbPlugin, self).__init__(*args, **kwargs)
 
+    def _get_collection(self, context, model, dict_func, filters=None,
+                        fields=None, sorts=None, limit=None, marker_obj=None,
+                        page_reverse=False):
+        query = self._get_collection_query(context, model, filters=filters,
+                                           sorts=sorts, limit=limit,
+                                           marker_obj=marker_obj,
+                                           page_reverse=page_reverse)
+        for base in model.__mro__:
+            if base in self._list_eager_loads:
+                query = query.options(*[
+                    orm.subqueryload(attr)
+                    for attr in self._list_eager_loads[base]])
+                break
+        items = [dict_func(c, fields) for c in query]
+        if limit and page_reverse:
+            items.reverse()
+        return items
+
     def _find_gbp_resource(self, context, type, id, on_fail=None):
         try:
             return self._get_by_id(context, type, id)
@@ -873,23 +919,9 @@ class GroupPolicyDbPlugin(gpolicy.GroupPolicyPluginBase,
 
     def _make_policy_rule_set_dict(self, prs, fields=None):
         res = self._populate_common_fields_in_dict(prs)
-        if prs['parent']:
-            res['parent_id'] = prs['parent']['id']
-        else:
-            res['parent_id'] = None
-        ctx = context.get_admin_context()
-        if 'child_policy_rule_sets' in prs:
-            # They have been updated
-            res['child_policy_rule_sets'] = [
-                child_prs['id'] for child_prs in prs['child_policy_rule_sets']]
-        else:
-            with ctx.session.begin(subtransactions=True):
-                filters = {'parent_id': [prs['id']]}
-                child_prs_in_db = self._get_collection_query(
-                    ctx, PolicyRuleSet, filters=filters)
-                res['child_policy_rule_sets'] = [child_prs['id']
-                                                 for child_prs
-                                                 in child_prs_in_db]
+        res['parent_id'] = prs['parent_id']
+        res['child_policy_rule_sets'] = [
+            child_prs['id'] for child_prs in prs['child_policy_rule_sets']]
 
         res['policy_rules'] = [pr['policy_rule_id']
                                for pr in prs['policy_rules']]
@@ -44,7 +44,7 @@ class PTGToSubnetAssociation(model_base.BASEV2):
         sa.String(36), sa.ForeignKey('gp_policy_target_groups.id'),
         primary_key=True)
     subnet_id = sa.Column(sa.String(36), sa.ForeignKey('subnets.id'),
-                          primary_key=True)
+                          primary_key=True, index=True)
 
 
 class PolicyTargetGroupMapping(gpdb.PolicyTargetGroup):
@@ -0,0 +1,60 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""L3P subnet blocks
+
+Revision ID: 3e11d4a5a8f2
+Revises: 75aa8a37a8de
+Create Date: 2016-11-28 10:12:43.518274
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '3e11d4a5a8f2'
+down_revision = '75aa8a37a8de'
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade():
+
+    op.create_table(
+        'gpm_l3p_subnet_pools',
+        sa.Column('l3_policy_id', sa.String(length=36), nullable=False),
+        sa.Column('ip_pool', sa.String(length=64), nullable=False),
+        sa.ForeignKeyConstraint(['l3_policy_id'], ['gp_l3_policies.id'],
+                                ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('l3_policy_id', 'ip_pool')
+    )
+    op.create_table(
+        'gpm_l3p_subnet_blocks',
+        sa.Column('l3_policy_id', sa.String(length=36), nullable=False),
+        sa.Column('ip_pool', sa.String(length=64), nullable=False),
+        sa.Column('cidr', sa.String(length=64), nullable=False),
+        sa.Column('prefixlen', sa.Integer(), nullable=False),
+        sa.Column('address', sa.String(length=32), nullable=False),
+        sa.Column('allocated', sa.Boolean(), nullable=False),
+        sa.Column('subnet_id', sa.String(length=36), nullable=True),
+        sa.ForeignKeyConstraint(['l3_policy_id'], ['gp_l3_policies.id'],
+                                ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('l3_policy_id', 'ip_pool', 'cidr')
+    )
+    op.create_index('ix_gpm_l3p_subnet_blocks_free', 'gpm_l3p_subnet_blocks',
+                    ['l3_policy_id', 'ip_pool', 'allocated', 'prefixlen',
+                     'address'])
+    op.create_index('ix_gpm_l3p_subnet_blocks_subnet_id',
+                    'gpm_l3p_subnet_blocks', ['subnet_id'])
+
+
+def downgrade():
+    pass
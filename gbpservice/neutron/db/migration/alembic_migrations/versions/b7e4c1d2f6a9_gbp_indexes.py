@@ -0,0 +1,63 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""GBP indexes
+
+Revision ID: b7e4c1d2f6a9
+Revises: 3e11d4a5a8f2
+Create Date: 2016-12-05 14:37:09.281604
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = 'b7e4c1d2f6a9'
+down_revision = '3e11d4a5a8f2'
+
+from alembic import op
+
+
+TENANT_TABLES = [
+    'gp_policy_targets', 'gp_policy_target_groups', 'gp_l2_policies',
+    'gp_l3_policies', 'gp_network_service_policies', 'gp_policy_rules',
+    'gp_policy_classifiers', 'gp_policy_actions', 'gp_policy_rule_sets',
+    'gp_nat_pools', 'gp_external_segments', 'gp_external_policies',
+    'sc_nodes', 'sc_instances', 'sc_specs', 'service_profiles']
+
+INDEXES = [
+    ('gp_policy_targets', 'policy_target_group_id'),
+    ('gp_policy_targets', 'description'),
+    ('gp_policy_targets', 'cluster_id'),
+    ('gp_policy_target_groups', 'l2_policy_id'),
+    ('gp_policy_target_groups', 'description'),
+    ('gp_l2_policies', 'l3_policy_id'),
+    ('gp_ptg_to_subnet_associations', 'subnet_id'),
+    ('sc_instances', 'provider_ptg_id'),
+    ('sc_instances', 'consumer_ptg_id'),
+    ('sc_instances', 'classifier_id'),
+    ('nfp_network_function_instances', 'network_function_device_id'),
+    # Declared by the NFP models since they were added
+    ('nfp_network_functions', 'status'),
+    ('nfp_network_function_instances', 'status'),
+    ('nfp_network_function_devices', 'status'),
+    ('nfp_network_function_devices', 'service_vendor')]
+
+
+def upgrade():
+
+    for table in TENANT_TABLES:
+        op.create_index('ix_%s_tenant_id' % table, table, ['tenant_id'])
+    for table, column in INDEXES:
+        op.create_index('ix_%s_%s' % (table, column), table, [column])
+
+
+def downgrade():
+    pass
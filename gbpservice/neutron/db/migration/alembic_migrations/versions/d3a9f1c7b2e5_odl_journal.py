@@ -0,0 +1,49 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""ODL journal
+
+Revision ID: d3a9f1c7b2e5
+Revises: b7e4c1d2f6a9
+Create Date: 2016-12-12 10:21:43.517260
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = 'd3a9f1c7b2e5'
+down_revision = 'b7e4c1d2f6a9'
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade():
+    op.create_table(
+        'gp_odl_journal',
+        sa.Column('seqnum', sa.Integer(), autoincrement=True,
+                  nullable=False),
+        sa.Column('tenant_id', sa.String(length=255), nullable=True),
+        sa.Column('operation', sa.String(length=16), nullable=False),
+        sa.Column('object_type', sa.String(length=64), nullable=False),
+        sa.Column('object_id', sa.String(length=255), nullable=True),
+        sa.Column('data', sa.Text(), nullable=True),
+        sa.Column('state', sa.String(length=16), nullable=False),
+        sa.Column('retry_count', sa.Integer(), nullable=False),
+        sa.Column('last_attempt', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('seqnum')
+    )
+    op.create_index('ix_gp_odl_journal_state_seqnum', 'gp_odl_journal',
+                    ['state', 'seqnum'])
+
+
+def downgrade():
+    pass
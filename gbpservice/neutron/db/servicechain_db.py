@@ -95,16 +95,16 @@ class ServiceChainInstance(model_base.BASEV2, BaseSCResource):
     provider_ptg_id = sa.Column(sa.String(36),
                              # FixMe(Magesh) Issue with cascade on Delete
                              # sa.ForeignKey('gp_policy_target_groups.id'),
-                             nullable=True)
+                             nullable=True, index=True)
     consumer_ptg_id = sa.Column(sa.String(36),
                              # sa.ForeignKey('gp_policy_target_groups.id'),
-                             nullable=True)
+                             nullable=True, index=True)
     management_ptg_id = sa.Column(sa.String(36),
                                   # sa.ForeignKey('gp_policy_target_groups.id'),
                                   nullable=True)
     classifier_id = sa.Column(sa.String(36),
                               # sa.ForeignKey('gp_policy_classifiers.id'),
-                              nullable=True)
+                              nullable=True, index=True)
 
 
 class ServiceChainSpec(model_base.BASEV2, BaseSharedSCResource):
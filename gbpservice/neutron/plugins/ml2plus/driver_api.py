@@ -297,6 +297,36 @@ class MechanismDriver(driver_api.MechanismDriver):
 @six.add_metaclass(abc.ABCMeta)
 class ExtensionDriver(driver_api.ExtensionDriver):
 
+    def extend_network_dict_bulk(self, session, results):
+        """Add extended attributes to the dictionaries of many networks.
+
+        :param session: database session
+        :param results: list of (network dictionary, network model) tuples
+
+        Called inside transaction context on session, instead of
+        extend_network_dict, for the networks of a list operation.
+        Drivers can override it to retrieve their extended attributes
+        for all the networks at once. By default, extend_network_dict
+        is called for each network.
+        """
+        for result, base_model in results:
+            self.extend_network_dict(session, base_model, result)
+
+    def extend_subnet_dict_bulk(self, session, results):
+        """Add extended attributes to the dictionaries of many subnets.
+
+        :param session: database session
+        :param results: list of (subnet dictionary, subnet model) tuples
+
+        Called inside transaction context on session, instead of
+        extend_subnet_dict, for the subnets of a list operation.
+        Drivers can override it to retrieve their extended attributes
+        for all the subnets at once. By default, extend_subnet_dict is
+        called for each subnet.
+        """
+        for result, base_model in results:
+            self.extend_subnet_dict(session, base_model, result)
+
     def process_create_subnetpool(self, plugin_context, data, result):
         """Process extended attributes for create subnet pool.
 
@@ -13,12 +13,20 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
+import threading
+import time
+
+import eventlet
 from keystoneclient import auth as ksc_auth
+from keystoneclient import exceptions as ksc_exc
 from keystoneclient import session as ksc_session
 from keystoneclient.v3 import client as ksc_client
+from neutron._i18n import _
 from neutron._i18n import _LW
 from oslo_config import cfg
 from oslo_log import log as logging
+from oslo_service import loopingcall
 
 LOG = logging.getLogger(__name__)
 
@@ -31,13 +39,98 @@ AUTH_GROUP = 'apic_aim_auth'
 ksc_session.Session.register_conf_options(cfg.CONF, AUTH_GROUP)
 ksc_auth.register_conf_options(cfg.CONF, AUTH_GROUP)
 
+project_name_cache_opts = [
+    cfg.IntOpt('project_name_cache_ttl',
+               default=3600,
+               help=_("Seconds after which the name of a project is "
+                      "looked up in Keystone again, so that renamed "
+                      "projects are picked up.")),
+    cfg.IntOpt('project_name_cache_size',
+               default=10000,
+               help=_("Maximum number of project names cached, the least "
+                      "recently used ones are evicted first.")),
+    cfg.IntOpt('project_name_cache_refresh_interval',
+               default=0,
+               help=_("Interval in seconds at which all the projects are "
+                      "listed from Keystone in bulk to refresh the cached "
+                      "names. 0 disables the bulk refresh, names are then "
+                      "only looked up on demand.")),
+]
+
+cfg.CONF.register_opts(project_name_cache_opts, AUTH_GROUP)
+
+# Seconds during which an ensured name is not evicted, so that the
+# caller of ensure_project() finds it with get_project_name().
+ENSURED_RETENTION = 60
+
 
 class ProjectNameCache(object):
-    """Cache of Keystone project ID to project name mappings."""
+    """Cache of Keystone project ID to project name mappings.
+
+    A project missing from the cache is looked up by ID in Keystone.
+    Names cached for more than ttl seconds are still returned, while
+    they are looked up again in a background thread. At most size names
+    are kept, the least recently used ones are evicted first, but never
+    within ENSURED_RETENTION seconds of being ensured. refresh() lists
+    all the projects at once to update the cached names.
+    """
 
-    def __init__(self):
-        self.project_names = {}
+    def __init__(self, ttl=None, size=None, timefunc=time.time):
         self.keystone = None
+        self._ttl = (cfg.CONF.apic_aim_auth.project_name_cache_ttl
+                     if ttl is None else ttl)
+        self._size = (cfg.CONF.apic_aim_auth.project_name_cache_size
+                      if size is None else size)
+        self.timefunc = timefunc
+        # {project_id: (name, expires_at, ensured_at)}, least recently
+        # used first
+        self.project_names = collections.OrderedDict()
+        self._lock = threading.Lock()
+        # IDs of expired names to look up again, and whether a thread is
+        # looking them up
+        self._expired = set()
+        self._refreshing = False
+        self._counters = dict.fromkeys(
+            ['hits', 'stale_hits', 'misses', 'evictions', 'errors',
+             'keystone_gets', 'keystone_lists'], 0)
+
+    def __len__(self):
+        return len(self.project_names)
+
+    def _get_keystone(self):
+        # TODO(rkukura): It seems load_from_conf_options() and
+        # keystoneclient auth plugins have been deprecated, and we
+        # should use keystoneauth instead.
+        if self.keystone is None:
+            LOG.debug("Getting keystone client")
+            auth = ksc_auth.load_from_conf_options(cfg.CONF, AUTH_GROUP)
+            LOG.debug("Got auth: %s" % auth)
+            if not auth:
+                LOG.warning(_LW('No auth_plugin configured in %s'),
+                            AUTH_GROUP)
+            session = ksc_session.Session.load_from_conf_options(
+                cfg.CONF, AUTH_GROUP, auth=auth)
+            LOG.debug("Got session: %s" % session)
+            self.keystone = ksc_client.Client(session=session)
+            LOG.debug("Got client: %s" % self.keystone)
+        return self.keystone
+
+    def _count(self, counter):
+        with self._lock:
+            self._counters[counter] += 1
+
+    def _set_name(self, project_id, name, expires_at, ensured_at):
+        # Called with the lock held
+        self.project_names.pop(project_id, None)
+        self.project_names[project_id] = (name, expires_at, ensured_at)
+        now = self.timefunc()
+        while len(self.project_names) > self._size:
+            oldest = next(iter(self.project_names.values()))
+            if oldest[2] + ENSURED_RETENTION > now:
+                # Names just ensured are kept, the cache shrinks later
+                break
+            self.project_names.popitem(last=False)
+            self._counters['evictions'] += 1
 
     def ensure_project(self, project_id):
         """Ensure cache contains mapping for project.
@@ -45,34 +138,96 @@ class ProjectNameCache(object):
         :param project_id: ID of the project
 
         Ensure that the cache contains a mapping for the project
-        identified by project_id. If it is not, Keystone will be
-        queried for the current list of projects, and any new mappings
-        will be added to the cache. This method should never be called
-        inside a transaction with a project_id not already in the
-        cache.
+        identified by project_id. If it does not, Keystone will be
+        queried for that project and the mapping will be added to the
+        cache. An expired mapping is kept and looked up again in the
+        background, Keystone is not queried inline for it. This method
+        should never be called inside a transaction with a project_id
+        not already in the cache.
         """
+        now = self.timefunc()
+        with self._lock:
+            entry = self.project_names.get(project_id)
+            if entry:
+                self._set_name(project_id, entry[0], entry[1], now)
+                if entry[1] > now:
+                    self._counters['hits'] += 1
+                    return
+                self._counters['stale_hits'] += 1
+                self._expired.add(project_id)
+                if self._refreshing:
+                    return
+                self._refreshing = True
+            else:
+                self._counters['misses'] += 1
+        if entry:
+            eventlet.spawn_n(self._refresh_expired)
+        else:
+            self._get_project(project_id, now)
 
-        # TODO(rkukura): It seems load_from_conf_options() and
-        # keystoneclient auth plugins have been deprecated, and we
-        # should use keystoneauth instead.
-        if project_id not in self.project_names:
-            if self.keystone is None:
-                LOG.debug("Getting keystone client")
-                auth = ksc_auth.load_from_conf_options(cfg.CONF, AUTH_GROUP)
-                LOG.debug("Got auth: %s" % auth)
-                if not auth:
-                    LOG.warning(_LW('No auth_plugin configured in %s'),
-                                AUTH_GROUP)
-                session = ksc_session.Session.load_from_conf_options(
-                    cfg.CONF, AUTH_GROUP, auth=auth)
-                LOG.debug("Got session: %s" % session)
-                self.keystone = ksc_client.Client(session=session)
-                LOG.debug("Got client: %s" % self.keystone)
-            LOG.debug("Calling project API")
-            projects = self.keystone.projects.list()
-            LOG.debug("Received projects: %s" % projects)
+    def _refresh_expired(self):
+        while True:
+            with self._lock:
+                if not self._expired:
+                    self._refreshing = False
+                    return
+                project_id = self._expired.pop()
+                entry = self.project_names.get(project_id)
+            # Names evicted meanwhile are looked up when ensured again
+            if entry:
+                self._get_project(project_id, entry[2])
+
+    def _get_project(self, project_id, ensured_at):
+        LOG.debug("Calling project API for %s", project_id)
+        self._count('keystone_gets')
+        try:
+            project = self._get_keystone().projects.get(project_id)
+        except ksc_exc.NotFound:
+            LOG.warning(_LW("Keystone returned NotFound for project: %s"),
+                        project_id)
+            return
+        except Exception as e:
+            # A stale name is still used until Keystone answers
+            self._count('errors')
+            LOG.warning(_LW("Failed to get project %(id)s from Keystone: "
+                            "%(error)s"), {'id': project_id, 'error': e})
+            return
+        LOG.debug("Received project: %s" % project)
+        with self._lock:
+            self._set_name(project.id, project.name,
+                           self.timefunc() + self._ttl, ensured_at)
+
+    def refresh(self):
+        """Lists all the projects from Keystone in one request.
+
+        Names of the projects already cached are updated, others are
+        added while there is room for them.
+        """
+        self._count('keystone_lists')
+        try:
+            projects = self._get_keystone().projects.list()
+        except Exception as e:
+            self._count('errors')
+            LOG.warning(_LW("Failed to list the projects from Keystone: "
+                            "%s"), e)
+            return
+        expires_at = self.timefunc() + self._ttl
+        with self._lock:
             for project in projects:
-                self.project_names[project.id] = project.name
+                entry = self.project_names.get(project.id)
+                if entry:
+                    self.project_names[project.id] = (
+                        project.name, expires_at, entry[2])
+                elif len(self.project_names) < self._size:
+                    self.project_names[project.id] = (project.name,
+                                                      expires_at, 0)
+
+    def start_refresh(self):
+        """Starts refreshing periodically, when an interval is set."""
+        interval = cfg.CONF.apic_aim_auth.project_name_cache_refresh_interval
+        if interval > 0:
+            loopingcall.FixedIntervalLoopingCall(self.refresh).start(
+                interval=interval)
 
     def get_project_name(self, project_id):
         """Get name of project from cache.
@@ -81,6 +236,15 @@ class ProjectNameCache(object):
 
         Get the name of the project identified by project_id from the
         cache. If the cache contains project_id, the project's name is
-        returned. If not, None is returned.
+        returned, even if it is due to be looked up again. If not, None
+        is returned.
         """
-        return self.project_names.get(project_id)
+        with self._lock:
+            entry = self.project_names.pop(project_id, None)
+            if entry:
+                self.project_names[project_id] = entry
+                return entry[0]
+
+    def counters(self):
+        with self._lock:
+            return dict(self._counters)
@@ -69,19 +69,38 @@ class ExtensionDbMixin(object):
             res_dict[res_attr] = db_attr
 
     def get_network_extn_db(self, session, network_id):
-        db_obj = (session.query(NetworkExtensionDb).filter_by(
-                  network_id=network_id).first())
-        db_cidrs = (session.query(NetworkExtensionCidrDb).filter_by(
-                    network_id=network_id).all())
-        result = {}
-        if db_obj:
+        return self.get_network_extn_db_bulk(
+            session, [network_id]).get(network_id, {})
+
+    def get_network_extn_db_bulk(self, session, network_ids):
+        """Extension attributes of many networks, by network ID.
+
+        Networks without extension attributes are left out.
+        """
+        if not network_ids:
+            return {}
+        db_objs = (session.query(NetworkExtensionDb).filter(
+                   NetworkExtensionDb.network_id.in_(network_ids)).all())
+        results = {}
+        for db_obj in db_objs:
+            result = {}
             self._set_if_not_none(result, cisco_apic.EXTERNAL_NETWORK,
                                   db_obj['external_network_dn'])
             self._set_if_not_none(result, cisco_apic.NAT_TYPE,
                                   db_obj['nat_type'])
-        if result.get(cisco_apic.EXTERNAL_NETWORK):
-            result[cisco_apic.EXTERNAL_CIDRS] = [c['cidr'] for c in db_cidrs]
-        return result
+            if result:
+                results[db_obj['network_id']] = result
+        cidrs = {}
+        for network_id, result in results.items():
+            if result.get(cisco_apic.EXTERNAL_NETWORK):
+                cidrs[network_id] = result[cisco_apic.EXTERNAL_CIDRS] = []
+        if cidrs:
+            db_cidrs = (session.query(NetworkExtensionCidrDb).filter(
+                        NetworkExtensionCidrDb.network_id.in_(
+                            list(cidrs))).all())
+            for c in db_cidrs:
+                cidrs[c['network_id']].append(c['cidr'])
+        return results
 
     def set_network_extn_db(self, session, network_id, res_dict):
         with session.begin(subtransactions=True):
@@ -101,13 +120,22 @@ class ExtensionDbMixin(object):
         return True
 
     def get_subnet_extn_db(self, session, subnet_id):
-        db_obj = (session.query(SubnetExtensionDb).filter_by(
-                  subnet_id=subnet_id).first())
-        result = {}
-        if db_obj:
+        return self.get_subnet_extn_db_bulk(
+            session, [subnet_id]).get(subnet_id, {})
+
+    def get_subnet_extn_db_bulk(self, session, subnet_ids):
+        """Extension attributes of many subnets, by subnet ID. """
+        if not subnet_ids:
+            return {}
+        db_objs = (session.query(SubnetExtensionDb).filter(
+                   SubnetExtensionDb.subnet_id.in_(subnet_ids)).all())
+        results = {}
+        for db_obj in db_objs:
+            result = {}
             self._set_if_not_none(result, cisco_apic.SNAT_HOST_POOL,
                                   db_obj['snat_host_pool'])
-        return result
+            results[db_obj['subnet_id']] = result
+        return results
 
     def set_subnet_extn_db(self, session, subnet_id, res_dict):
         db_obj = (session.query(SubnetExtensionDb).filter_by(
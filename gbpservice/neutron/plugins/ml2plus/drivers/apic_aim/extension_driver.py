@@ -60,14 +60,20 @@ class ApicExtensionDriver(api_plus.ExtensionDriver,
         return "cisco-apic"
 
     def extend_network_dict(self, session, base_model, result):
+        self.extend_network_dict_bulk(session, [(result, base_model)])
+
+    def extend_network_dict_bulk(self, session, results):
         try:
-            self._md.extend_network_dict(session, base_model, result)
-            res_dict = self.get_network_extn_db(session, result['id'])
-            if cisco_apic.EXTERNAL_NETWORK in res_dict:
-                result.setdefault(cisco_apic.DIST_NAMES, {})[
-                    cisco_apic.EXTERNAL_NETWORK] = res_dict.pop(
-                        cisco_apic.EXTERNAL_NETWORK)
-            result.update(res_dict)
+            self._md.extend_network_dict_bulk(session, results)
+            res_dicts = self.get_network_extn_db_bulk(
+                session, [result['id'] for result, base_model in results])
+            for result, base_model in results:
+                res_dict = res_dicts.get(result['id'], {})
+                if cisco_apic.EXTERNAL_NETWORK in res_dict:
+                    result.setdefault(cisco_apic.DIST_NAMES, {})[
+                        cisco_apic.EXTERNAL_NETWORK] = res_dict.pop(
+                            cisco_apic.EXTERNAL_NETWORK)
+                result.update(res_dict)
         except Exception:
             with excutils.save_and_reraise_exception():
                 LOG.exception(_LE("APIC AIM extend_network_dict failed"))
@@ -106,11 +112,17 @@ class ApicExtensionDriver(api_plus.ExtensionDriver,
             result.update(res_dict)
 
     def extend_subnet_dict(self, session, base_model, result):
+        self.extend_subnet_dict_bulk(session, [(result, base_model)])
+
+    def extend_subnet_dict_bulk(self, session, results):
         try:
-            self._md.extend_subnet_dict(session, base_model, result)
-            res_dict = self.get_subnet_extn_db(session, result['id'])
-            result[cisco_apic.SNAT_HOST_POOL] = (
-                res_dict.get(cisco_apic.SNAT_HOST_POOL, False))
+            self._md.extend_subnet_dict_bulk(session, results)
+            res_dicts = self.get_subnet_extn_db_bulk(
+                session, [result['id'] for result, base_model in results])
+            for result, base_model in results:
+                res_dict = res_dicts.get(result['id'], {})
+                result[cisco_apic.SNAT_HOST_POOL] = (
+                    res_dict.get(cisco_apic.SNAT_HOST_POOL, False))
         except Exception:
             with excutils.save_and_reraise_exception():
                 LOG.exception(_LE("APIC AIM extend_subnet_dict failed"))
@@ -13,6 +13,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
+
 from aim.aim_lib import nat_strategy
 from aim import aim_manager
 from aim.api import resource as aim_resource
@@ -82,6 +84,7 @@ class ApicMechanismDriver(api_plus.MechanismDriver):
     def initialize(self):
         LOG.info(_LI("APIC AIM MD initializing"))
         self.project_name_cache = cache.ProjectNameCache()
+        self.project_name_cache.start_refresh()
         self.db = model.DbModel()
         self.name_mapper = apic_mapper.APICNameMapper(self.db, log)
         self.aim = aim_manager.AimManager()
@@ -227,82 +230,153 @@ class ApicMechanismDriver(api_plus.MechanismDriver):
             self.name_mapper.delete_apic_name(session, current['id'])
 
     def extend_network_dict(self, session, network_db, result):
-        LOG.debug("APIC AIM MD extending dict for network: %s", result)
+        self.extend_network_dict_bulk(session, [(result, network_db)])
 
-        sync_state = cisco_apic.SYNC_NOT_APPLICABLE
-        dist_names = {}
+    def extend_network_dict_bulk(self, session, results):
+        """Extend the dicts of many networks, e.g. of a list call.
+
+        :param results: list of (network dict, network model) tuples
+
+        The routers, scopes and APIC names of the networks are
+        retrieved with a query for all of them, the AIM statuses with a
+        lookup of each distinct AIM object.
+        """
+        LOG.debug("APIC AIM MD extending dict for %d networks",
+                  len(results))
         aim_ctx = aim_context.AimContext(session)
 
-        if network_db.external is not None:
-            l3out, ext_net, ns = self._get_aim_nat_strategy_db(session,
-                                                               network_db)
-            if ext_net:
-                sync_state = self._merge_status(aim_ctx, sync_state, ext_net)
-                kls = {aim_resource.BridgeDomain: cisco_apic.BD,
-                       aim_resource.EndpointGroup: cisco_apic.EPG,
-                       aim_resource.VRF: cisco_apic.VRF}
-                for o in (ns.get_l3outside_resources(aim_ctx, l3out) or []):
-                    if type(o) in kls:
-                        dist_names[kls[type(o)]] = o.dn
-                        sync_state = self._merge_status(aim_ctx, sync_state,
-                                                        o)
-        else:
-            # REVISIT(rkukura): Consider optimizing this method by
-            # persisting the network->VRF relationship.
-
-            bd, epg = self._map_network(session, network_db)
-
-            dist_names[cisco_apic.BD] = bd.dn
-            sync_state = self._merge_status(aim_ctx, sync_state, bd)
-
-            dist_names[cisco_apic.EPG] = epg.dn
-            sync_state = self._merge_status(aim_ctx, sync_state, epg)
-
-            # See if this network is interfaced to any routers.
-            rp = (session.query(l3_db.RouterPort).
-                  join(models_v2.Port).
-                  filter(models_v2.Port.network_id == network_db.id,
-                         l3_db.RouterPort.port_type ==
-                         n_constants.DEVICE_OWNER_ROUTER_INTF).first())
-            if rp:
-                # A network is constrained to only one subnetpool per
-                # address family. To support both single and dual
-                # stack, use the IPv4 address scope's VRF if it
-                # exists, and otherwise use the IPv6 address scope's
-                # VRF. For dual stack, the plan is for identity NAT to
-                # move IPv6 traffic from the IPv4 address scope's VRF
-                # to the IPv6 address scope's VRF.
-                #
-                # REVISIT(rkukura): Ignore subnets that are not
-                # attached to any router, or maybe just do a query
-                # joining RouterPorts, Ports, Subnets, SubnetPools and
-                # AddressScopes.
-                pool_dbs = {subnet.subnetpool
-                            for subnet in network_db.subnets
-                            if subnet.subnetpool}
-                scope_id = None
-                for pool_db in pool_dbs:
-                    if pool_db.ip_version == 4:
-                        scope_id = pool_db.address_scope_id
-                        break
-                    elif pool_db.ip_version == 6:
-                        scope_id = pool_db.address_scope_id
-                if scope_id:
-                    scope_db = self._scope_by_id(session, scope_id)
-                    vrf = self._map_address_scope(session, scope_db)
-                else:
-                    router_db = (session.query(l3_db.Router).
-                                 filter_by(id=rp.router_id).
-                                 one())
-                    vrf = self._map_default_vrf(session, router_db)
+        network_dbs = [network_db for result, network_db in results
+                       if network_db.external is None]
+        names = self._get_apic_names(
+            session, [x.id for x in network_dbs] +
+            [x.tenant_id for x in network_dbs])
+        vrfs = self._map_network_vrfs(session, network_dbs)
+
+        # (network dict, DNs, AIM objects to merge the status of)
+        mapped = []
+        for result, network_db in results:
+            dist_names = {}
+            aim_objs = []
+            if network_db.external is not None:
+                l3out, ext_net, ns = self._get_aim_nat_strategy_db(
+                    session, network_db)
+                if ext_net:
+                    aim_objs.append(ext_net)
+                    kls = {aim_resource.BridgeDomain: cisco_apic.BD,
+                           aim_resource.EndpointGroup: cisco_apic.EPG,
+                           aim_resource.VRF: cisco_apic.VRF}
+                    for o in (ns.get_l3outside_resources(aim_ctx, l3out)
+                              or []):
+                        if type(o) in kls:
+                            dist_names[kls[type(o)]] = o.dn
+                            aim_objs.append(o)
             else:
-                vrf = self._map_unrouted_vrf()
-
-            dist_names[cisco_apic.VRF] = vrf.dn
-            sync_state = self._merge_status(aim_ctx, sync_state, vrf)
+                bd, epg = self._map_network(session, network_db,
+                                            names=names)
+                vrf = vrfs[network_db.id]
+                dist_names[cisco_apic.BD] = bd.dn
+                dist_names[cisco_apic.EPG] = epg.dn
+                dist_names[cisco_apic.VRF] = vrf.dn
+                aim_objs.extend([bd, epg, vrf])
+            mapped.append((result, dist_names, aim_objs))
+
+        statuses = self._get_aim_statuses(
+            aim_ctx, [o for result, dist_names, aim_objs in mapped
+                      for o in aim_objs])
+        for result, dist_names, aim_objs in mapped:
+            sync_state = cisco_apic.SYNC_NOT_APPLICABLE
+            for o in aim_objs:
+                sync_state = self._merge_status(aim_ctx, sync_state, o,
+                                                statuses=statuses)
+            result[cisco_apic.DIST_NAMES] = dist_names
+            result[cisco_apic.SYNC_STATE] = sync_state
+
+    def _map_network_vrfs(self, session, network_dbs):
+        """Map non-external networks to their VRF, by network ID. """
+        if not network_dbs:
+            return {}
+        # REVISIT(rkukura): Consider optimizing this method by
+        # persisting the network->VRF relationship.
 
-        result[cisco_apic.DIST_NAMES] = dist_names
-        result[cisco_apic.SYNC_STATE] = sync_state
+        # See which of these networks are interfaced to any routers.
+        router_by_network = {}
+        for network_id, router_id in (
+                session.query(models_v2.Port.network_id,
+                              l3_db.RouterPort.router_id).
+                join(l3_db.RouterPort,
+                     l3_db.RouterPort.port_id == models_v2.Port.id).
+                filter(models_v2.Port.network_id.in_(
+                    [x.id for x in network_dbs]),
+                    l3_db.RouterPort.port_type ==
+                    n_constants.DEVICE_OWNER_ROUTER_INTF)):
+            router_by_network.setdefault(network_id, router_id)
+
+        # A network is constrained to only one subnetpool per address
+        # family. To support both single and dual stack, use the IPv4
+        # address scope's VRF if it exists, and otherwise use the IPv6
+        # address scope's VRF. For dual stack, the plan is for
+        # identity NAT to move IPv6 traffic from the IPv4 address
+        # scope's VRF to the IPv6 address scope's VRF.
+        #
+        # REVISIT(rkukura): Ignore subnets that are not attached to
+        # any router, or maybe just do a query joining RouterPorts,
+        # Ports, Subnets, SubnetPools and AddressScopes.
+        scope_by_network = {}
+        for network_db in network_dbs:
+            if network_db.id not in router_by_network:
+                continue
+            pool_dbs = {subnet.subnetpool
+                        for subnet in network_db.subnets
+                        if subnet.subnetpool}
+            scope_id = None
+            for pool_db in pool_dbs:
+                if pool_db.ip_version == 4:
+                    scope_id = pool_db.address_scope_id
+                    break
+                elif pool_db.ip_version == 6:
+                    scope_id = pool_db.address_scope_id
+            if scope_id:
+                scope_by_network[network_db.id] = scope_id
+
+        scope_dbs = {}
+        if scope_by_network:
+            scope_dbs = {x.id: x for x in
+                         session.query(address_scope_db.AddressScope).
+                         filter(address_scope_db.AddressScope.id.in_(
+                             set(scope_by_network.values())))}
+        router_ids = set(router_id for network_id, router_id in
+                         router_by_network.items()
+                         if network_id not in scope_by_network)
+        router_dbs = {}
+        if router_ids:
+            router_dbs = {x.id: x for x in
+                          session.query(l3_db.Router).
+                          filter(l3_db.Router.id.in_(router_ids))}
+        names = self._get_apic_names(
+            session, list(scope_dbs) +
+            [x.tenant_id for x in scope_dbs.values()] +
+            [x.tenant_id for x in router_dbs.values()])
+
+        # Networks of a scope or router share its VRF
+        vrfs = {}
+        vrf_by_network = {}
+        for network_db in network_dbs:
+            if network_db.id in scope_by_network:
+                key = scope_by_network[network_db.id]
+                if key not in vrfs:
+                    vrfs[key] = self._map_address_scope(
+                        session, scope_dbs[key], names=names)
+            elif network_db.id in router_by_network:
+                key = router_by_network[network_db.id]
+                if key not in vrfs:
+                    vrfs[key] = self._map_default_vrf(
+                        session, router_dbs[key], names=names)
+            else:
+                key = None
+                if key not in vrfs:
+                    vrfs[key] = self._map_unrouted_vrf()
+            vrf_by_network[network_db.id] = vrfs[key]
+        return vrf_by_network
 
     def create_subnet_precommit(self, context):
         current = context.current
@@ -387,35 +461,71 @@ class ApicMechanismDriver(api_plus.MechanismDriver):
         # they are removed from routers.
 
     def extend_subnet_dict(self, session, subnet_db, result):
-        LOG.debug("APIC AIM MD extending dict for subnet: %s", result)
-
-        sync_state = cisco_apic.SYNC_NOT_APPLICABLE
-        dist_names = {}
-        aim_ctx = aim_context.AimContext(session)
+        self.extend_subnet_dict_bulk(session, [(result, subnet_db)])
 
-        network_db = (session.query(models_v2.Network).
-                      filter_by(id=subnet_db.network_id).
-                      one())
-        if network_db.external is not None:
-            l3out, ext_net, ns = self._get_aim_nat_strategy_db(session,
-                                                               network_db)
-            if ext_net:
-                sub = ns.get_subnet(aim_ctx, l3out,
-                                    self._subnet_to_gw_ip_mask(subnet_db))
-                if sub:
-                    dist_names[cisco_apic.SUBNET] = sub.dn
-                    sync_state = self._merge_status(aim_ctx, sync_state, sub)
-        else:
-            bd = self._map_network(session, network_db, True)
+    def extend_subnet_dict_bulk(self, session, results):
+        """Extend the dicts of many subnets, e.g. of a list call.
 
-            for gw_ip, router_id in self._subnet_router_ips(session,
-                                                            subnet_db.id):
-                sn = self._map_subnet(subnet_db, gw_ip, bd)
-                dist_names[gw_ip] = sn.dn
-                sync_state = self._merge_status(aim_ctx, sync_state, sn)
+        :param results: list of (subnet dict, subnet model) tuples
+        """
+        LOG.debug("APIC AIM MD extending dict for %d subnets", len(results))
+        aim_ctx = aim_context.AimContext(session)
 
-        result[cisco_apic.DIST_NAMES] = dist_names
-        result[cisco_apic.SYNC_STATE] = sync_state
+        network_dbs = {}
+        network_ids = set(subnet_db.network_id
+                          for result, subnet_db in results)
+        if network_ids:
+            network_dbs = {x.id: x for x in
+                           session.query(models_v2.Network).
+                           filter(models_v2.Network.id.in_(network_ids))}
+        internal = [x for x in network_dbs.values() if x.external is None]
+        names = self._get_apic_names(
+            session, [x.id for x in internal] +
+            [x.tenant_id for x in internal])
+        router_ips = collections.defaultdict(list)
+        subnet_ids = [subnet_db.id for result, subnet_db in results
+                      if network_dbs[subnet_db.network_id].external is None]
+        for subnet_id, gw_ip, router_id in self._subnets_router_ips(
+                session, subnet_ids):
+            router_ips[subnet_id].append(gw_ip)
+
+        bds = {}
+        # (subnet dict, DNs, AIM objects to merge the status of)
+        mapped = []
+        for result, subnet_db in results:
+            dist_names = {}
+            aim_objs = []
+            network_db = network_dbs[subnet_db.network_id]
+            if network_db.external is not None:
+                l3out, ext_net, ns = self._get_aim_nat_strategy_db(
+                    session, network_db)
+                if ext_net:
+                    sub = ns.get_subnet(aim_ctx, l3out,
+                                        self._subnet_to_gw_ip_mask(subnet_db))
+                    if sub:
+                        dist_names[cisco_apic.SUBNET] = sub.dn
+                        aim_objs.append(sub)
+            else:
+                bd = bds.get(network_db.id)
+                if not bd:
+                    bd = bds[network_db.id] = self._map_network(
+                        session, network_db, True, names=names)
+                for gw_ip in router_ips[subnet_db.id]:
+                    sn = self._map_subnet(subnet_db, gw_ip, bd)
+                    dist_names[gw_ip] = sn.dn
+                    aim_objs.append(sn)
+            mapped.append((result, dist_names, aim_objs))
+
+        statuses = self._get_aim_statuses(
+            aim_ctx, [o for result, dist_names, aim_objs in mapped
+                      for o in aim_objs])
+        for result, dist_names, aim_objs in mapped:
+            sync_state = cisco_apic.SYNC_NOT_APPLICABLE
+            for o in aim_objs:
+                sync_state = self._merge_status(aim_ctx, sync_state, o,
+                                                statuses=statuses)
+            result[cisco_apic.DIST_NAMES] = dist_names
+            result[cisco_apic.SYNC_STATE] = sync_state
 
     # TODO(rkukura): Implement update_subnetpool_precommit to handle
     # changing subnetpool's address_scope_id.
@@ -939,8 +1049,27 @@ class ApicMechanismDriver(api_plus.MechanismDriver):
             self._l3_plugin = plugins[pconst.L3_ROUTER_NAT]
         return self._l3_plugin
 
-    def _merge_status(self, aim_ctx, sync_state, resource):
-        status = self.aim.get_status(aim_ctx, resource)
+    def _get_aim_statuses(self, aim_ctx, resources):
+        """Get the AIM status of many AIM objects, by DN.
+
+        Each distinct object is looked up once, AIM versions which can
+        get the statuses of a list of objects at once do so.
+        """
+        resources = list({x.dn: x for x in resources}.values())
+        if not resources:
+            return {}
+        if hasattr(self.aim, 'get_statuses'):
+            statuses = dict.fromkeys([x.dn for x in resources])
+            statuses.update((status.resource_dn, status) for status in
+                            self.aim.get_statuses(aim_ctx, resources))
+            return statuses
+        return {x.dn: self.aim.get_status(aim_ctx, x) for x in resources}
+
+    def _merge_status(self, aim_ctx, sync_state, resource, statuses=None):
+        if statuses is not None:
+            status = statuses.get(resource.dn)
+        else:
+            status = self.aim.get_status(aim_ctx, resource)
         if not status:
             # REVISIT(rkukura): This should only occur if the AIM
             # resource has not yet been created when
@@ -981,17 +1110,32 @@ class ApicMechanismDriver(api_plus.MechanismDriver):
                     n_constants.DEVICE_OWNER_ROUTER_INTF
                 ))
 
+    def _subnets_router_ips(self, session, subnet_ids):
+        if not subnet_ids:
+            return []
+        return (session.query(models_v2.IPAllocation.subnet_id,
+                              models_v2.IPAllocation.ip_address,
+                              l3_db.RouterPort.router_id).
+                join(models_v2.Port).
+                filter(
+                    models_v2.IPAllocation.subnet_id.in_(subnet_ids),
+                    l3_db.RouterPort.port_type ==
+                    n_constants.DEVICE_OWNER_ROUTER_INTF
+                ))
+
     def _scope_by_id(self, session, scope_id):
         return (session.query(address_scope_db.AddressScope).
                 filter_by(id=scope_id).
                 one())
 
-    def _map_network(self, session, network, bd_only=False):
-        tenant_aname = self._get_tenant_name(session, network['tenant_id'])
+    def _map_network(self, session, network, bd_only=False, names=None):
+        tenant_aname = self._get_tenant_name(session, network['tenant_id'],
+                                             names=names)
 
         id = network['id']
         name = network['name']
-        aname = self.name_mapper.network(session, id, name)
+        aname = ((names or {}).get((apic_mapper.NAME_TYPE_NETWORK, id)) or
+                 self.name_mapper.network(session, id, name))
         LOG.debug("Mapped network_id %(id)s with name %(name)s to %(aname)s",
                   {'id': id, 'name': name, 'aname': aname})
 
@@ -1013,12 +1157,14 @@ class ApicMechanismDriver(api_plus.MechanismDriver):
                                  gw_ip_mask=gw_ip_mask)
         return sn
 
-    def _map_address_scope(self, session, scope):
-        tenant_aname = self._get_tenant_name(session, scope['tenant_id'])
+    def _map_address_scope(self, session, scope, names=None):
+        tenant_aname = self._get_tenant_name(session, scope['tenant_id'],
+                                             names=names)
 
         id = scope['id']
         name = scope['name']
-        aname = self.name_mapper.address_scope(session, id, name)
+        aname = ((names or {}).get((apic_mapper.NAME_TYPE_ADDRESS_SCOPE, id))
+                 or self.name_mapper.address_scope(session, id, name))
         LOG.debug("Mapped address_scope_id %(id)s with name %(name)s to "
                   "%(aname)s",
                   {'id': id, 'name': name, 'aname': aname})
@@ -1046,8 +1192,9 @@ class ApicMechanismDriver(api_plus.MechanismDriver):
                                                name=ROUTER_SUBJECT_NAME)
         return contract, subject
 
-    def _map_default_vrf(self, session, router):
-        tenant_aname = self._get_tenant_name(session, router['tenant_id'])
+    def _map_default_vrf(self, session, router, names=None):
+        tenant_aname = self._get_tenant_name(session, router['tenant_id'],
+                                             names=names)
 
         vrf = aim_resource.VRF(tenant_name=tenant_aname,
                                name=DEFAULT_VRF_NAME)
@@ -1058,7 +1205,17 @@ class ApicMechanismDriver(api_plus.MechanismDriver):
                                name=UNROUTED_VRF_NAME)
         return vrf
 
-    def _get_tenant_name(self, session, project_id):
+    def _get_apic_names(self, session, neutron_ids):
+        """Saved APIC names of Neutron resources, by (type, ID). """
+        return {(neutron_type, neutron_id): apic_name
+                for neutron_id, neutron_type, apic_name in
+                self.db.get_apic_names(session, set(neutron_ids))}
+
+    def _get_tenant_name(self, session, project_id, names=None):
+        tenant_aname = (names or {}).get(
+            (apic_mapper.NAME_TYPE_TENANT, project_id))
+        if tenant_aname:
+            return tenant_aname
         project_name = self.project_name_cache.get_project_name(project_id)
         # REVISIT(rkukura): This should be name_mapper.project.
         tenant_aname = self.name_mapper.tenant(session, project_id,
@@ -43,6 +43,15 @@ class DbModel(object):
         return session.query(old_model.ApicName.apic_name).filter_by(
             neutron_id=neutron_id, neutron_type=neutron_type).first()
 
+    def get_apic_names(self, session, neutron_ids):
+        """Returns (neutron_id, neutron_type, apic_name) of the IDs. """
+        if not neutron_ids:
+            return []
+        return session.query(old_model.ApicName.neutron_id,
+                             old_model.ApicName.neutron_type,
+                             old_model.ApicName.apic_name).filter(
+            old_model.ApicName.neutron_id.in_(neutron_ids)).all()
+
     def delete_apic_name(self, session, neutron_id):
         with session.begin(subtransactions=True):
             try:
@@ -160,6 +160,35 @@ class ExtensionManager(managers.ExtensionManager):
         self._call_on_extended_drivers("process_update_subnetpool",
                                        plugin_context, data, result)
 
+    def _call_on_dict_drivers_bulk(self, method_name, session, results):
+        """Extend the dicts of many resources, on all extension drivers.
+
+        Extended extension drivers are called once for all the
+        resources, other extension drivers once per resource.
+        """
+        for driver in self.ordered_ext_drivers:
+            try:
+                if isinstance(driver.obj, driver_api.ExtensionDriver):
+                    getattr(driver.obj, method_name + '_bulk')(session,
+                                                               results)
+                else:
+                    for result, base_model in results:
+                        getattr(driver.obj, method_name)(session,
+                                                         base_model, result)
+            except Exception:
+                LOG.error(_LE("Extension driver '%(name)s' failed in "
+                              "%(method)s"),
+                          {'name': driver.name, 'method': method_name})
+                raise ml2_exc.ExtensionDriverError(driver=driver.name)
+
+    def extend_network_dict_bulk(self, session, results):
+        self._call_on_dict_drivers_bulk("extend_network_dict", session,
+                                        results)
+
+    def extend_subnet_dict_bulk(self, session, results):
+        self._call_on_dict_drivers_bulk("extend_subnet_dict", session,
+                                        results)
+
     def extend_subnetpool_dict(self, session, base_model, result):
         self._call_on_dict_extended_drivers("extend_subnetpool_dict",
                                             session, base_model, result)
@@ -13,6 +13,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import contextlib
+
 from neutron._i18n import _LE
 from neutron._i18n import _LI
 from neutron.api.v2 import attributes
@@ -34,6 +36,9 @@ from gbpservice.neutron.plugins.ml2plus import patch_neutron  # noqa
 
 LOG = log.getLogger(__name__)
 
+# Session info key of the dicts made but not yet extended, per collection
+DEFERRED_EXTENSION = 'ml2plus_deferred_extension'
+
 
 class Ml2PlusPlugin(ml2_plugin.Ml2Plugin):
 
@@ -84,8 +89,34 @@ class Ml2PlusPlugin(ml2_plugin.Ml2Plugin):
     db_base_plugin_v2.NeutronDbPluginV2.register_dict_extend_funcs(
                as_ext.ADDRESS_SCOPES, ['_ml2_md_extend_address_scope_dict'])
 
+    @contextlib.contextmanager
+    def _defer_dict_extension(self, session, collection):
+        """Collect the dicts of collection made within, unextended.
+
+        The (result, model) tuples of the dicts made while in this
+        context are yielded, for them to be extended all at once.
+        """
+        key = (DEFERRED_EXTENSION, collection)
+        saved = session.info.get(key)
+        deferred = session.info[key] = []
+        try:
+            yield deferred
+        finally:
+            if saved is None:
+                del session.info[key]
+            else:
+                session.info[key] = saved
+
+    def _deferred_dict_extension(self, session, collection):
+        return session.info.get((DEFERRED_EXTENSION, collection))
+
     def _ml2_md_extend_network_dict(self, result, netdb):
         session = inspect(netdb).session
+        deferred = self._deferred_dict_extension(session,
+                                                 attributes.NETWORKS)
+        if deferred is not None:
+            deferred.append((result, netdb))
+            return
         with session.begin(subtransactions=True):
             self.extension_manager.extend_network_dict(session, netdb, result)
 
@@ -96,6 +127,10 @@ class Ml2PlusPlugin(ml2_plugin.Ml2Plugin):
 
     def _ml2_md_extend_subnet_dict(self, result, subnetdb):
         session = inspect(subnetdb).session
+        deferred = self._deferred_dict_extension(session, attributes.SUBNETS)
+        if deferred is not None:
+            deferred.append((result, subnetdb))
+            return
         with session.begin(subtransactions=True):
             self.extension_manager.extend_subnet_dict(
                 session, subnetdb, result)
@@ -123,6 +158,36 @@ class Ml2PlusPlugin(ml2_plugin.Ml2Plugin):
                                           address_scope)
         return self._fields(res, fields)
 
+    def get_networks(self, context, filters=None, fields=None,
+                     sorts=None, limit=None, marker=None, page_reverse=False):
+        # The networks listed are extended all at once, so that
+        # extension drivers can retrieve their attributes in bulk.
+        session = context.session
+        with session.begin(subtransactions=True):
+            with self._defer_dict_extension(
+                    session, attributes.NETWORKS) as deferred:
+                nets = super(Ml2PlusPlugin, self).get_networks(
+                    context, filters, None, sorts, limit, marker,
+                    page_reverse)
+            if deferred:
+                self.extension_manager.extend_network_dict_bulk(session,
+                                                                deferred)
+        return [self._fields(net, fields) for net in nets]
+
+    def get_subnets(self, context, filters=None, fields=None,
+                    sorts=None, limit=None, marker=None, page_reverse=False):
+        session = context.session
+        with session.begin(subtransactions=True):
+            with self._defer_dict_extension(
+                    session, attributes.SUBNETS) as deferred:
+                subnets = super(Ml2PlusPlugin, self).get_subnets(
+                    context, filters, None, sorts, limit, marker,
+                    page_reverse)
+            if deferred:
+                self.extension_manager.extend_subnet_dict_bulk(session,
+                                                               deferred)
+        return [self._fields(subnet, fields) for subnet in subnets]
+
     def create_network(self, context, network):
         self._ensure_tenant(context, network[attributes.NETWORK])
         return super(Ml2PlusPlugin, self).create_network(context, network)
@@ -24,6 +24,7 @@ from oslo_log import log as logging
 from gbpservice.neutron.extensions import cisco_apic
 from gbpservice.neutron.extensions import cisco_apic_gbp as aim_ext
 from gbpservice.neutron.extensions import group_policy as gpolicy
+from gbpservice.neutron.plugins.ml2plus.drivers.apic_aim import apic_mapper
 from gbpservice.neutron.plugins.ml2plus.drivers.apic_aim import model
 from gbpservice.neutron.services.grouppolicy.common import (
     constants as gp_const)
@@ -398,9 +399,18 @@ class AIMMappingDriver(nrd.CommonNeutronBase, aim_rpc.AIMMappingRPCMixin):
 
     @log.log_method_call
     def extend_policy_target_group_dict(self, session, result):
-        epg = self._aim_endpoint_group(session, result)
-        if epg:
-            result[cisco_apic.DIST_NAMES] = {cisco_apic.EPG: epg.dn}
+        self.extend_policy_target_group_dicts(session, [result])
+
+    @log.log_method_call
+    def extend_policy_target_group_dicts(self, session, results):
+        # Get the saved APIC names of all the PTGs and their tenants at once
+        names = self._get_apic_names(
+            session, [x['id'] for x in results] +
+            [x['tenant_id'] for x in results])
+        for result in results:
+            epg = self._aim_endpoint_group(session, result, names=names)
+            if epg:
+                result[cisco_apic.DIST_NAMES] = {cisco_apic.EPG: epg.dn}
 
     @log.log_method_call
     def get_policy_target_group_status(self, context):
@@ -408,6 +418,20 @@ class AIMMappingDriver(nrd.CommonNeutronBase, aim_rpc.AIMMappingRPCMixin):
         epg = self._aim_endpoint_group(session, context.current)
         context.current['status'] = self._map_aim_status(session, epg)
 
+    @log.log_method_call
+    def get_policy_target_group_statuses(self, contexts):
+        if not contexts:
+            return
+        session = contexts[0]._plugin_context.session
+        ptgs = [context.current for context in contexts]
+        names = self._get_apic_names(
+            session, [x['id'] for x in ptgs] + [x['tenant_id'] for x in ptgs])
+        epgs = [[self._aim_endpoint_group(session, ptg, names=names)]
+                for ptg in ptgs]
+        for context, status in zip(
+                contexts, self._merge_aim_statuses(session, epgs)):
+            context.current['status'] = status
+
     @log.log_method_call
     def create_policy_target_precommit(self, context):
         if not context.current['port_id']:
@@ -507,6 +531,22 @@ class AIMMappingDriver(nrd.CommonNeutronBase, aim_rpc.AIMMappingRPCMixin):
         context.current['status'] = self._merge_aim_status(
             session, aim_filters.values() + aim_filter_entries.values())
 
+    @log.log_method_call
+    def get_policy_rule_statuses(self, contexts):
+        if not contexts:
+            return
+        session = contexts[0]._plugin_context.session
+        aim_objs_list = []
+        for context in contexts:
+            aim_filters = self._get_aim_filters(session, context.current)
+            aim_filter_entries = self._get_aim_filter_entries(
+                session, context.current)
+            aim_objs_list.append(
+                aim_filters.values() + aim_filter_entries.values())
+        for context, status in zip(
+                contexts, self._merge_aim_statuses(session, aim_objs_list)):
+            context.current['status'] = status
+
     @log.log_method_call
     def create_policy_rule_set_precommit(self, context):
         if context.current['child_policy_rule_sets']:
@@ -558,9 +598,32 @@ class AIMMappingDriver(nrd.CommonNeutronBase, aim_rpc.AIMMappingRPCMixin):
         context.current['status'] = self._merge_aim_status(
             session, [aim_contract, aim_contract_subject])
 
-    def _aim_tenant_name(self, session, tenant_id):
+    @log.log_method_call
+    def get_policy_rule_set_statuses(self, contexts):
+        if not contexts:
+            return
+        session = contexts[0]._plugin_context.session
+        aim_objs_list = []
+        for context in contexts:
+            aim_contract = self._aim_contract(session, context.current)
+            aim_objs_list.append(
+                [aim_contract, self._aim_contract_subject(aim_contract)])
+        for context, status in zip(
+                contexts, self._merge_aim_statuses(session, aim_objs_list)):
+            context.current['status'] = status
+
+    def _get_apic_names(self, session, ids):
+        """Saved APIC names of GBP and Neutron resources, by (type, ID). """
+        return dict(((neutron_type, neutron_id), apic_name)
+                    for neutron_id, neutron_type, apic_name in
+                    self.db.get_apic_names(session, set(ids)))
+
+    def _aim_tenant_name(self, session, tenant_id, names=None):
         # TODO(ivar): manage shared objects
-        tenant_name = self.name_mapper.tenant(session, tenant_id)
+        tenant_name = (names or {}).get(
+            (apic_mapper.NAME_TYPE_TENANT, tenant_id))
+        if not tenant_name:
+            tenant_name = self.name_mapper.tenant(session, tenant_id)
         LOG.debug("Mapped tenant_id %(id)s to %(apic_name)s",
                   {'id': tenant_id, 'apic_name': tenant_name})
         return tenant_name
@@ -568,14 +631,17 @@ class AIMMappingDriver(nrd.CommonNeutronBase, aim_rpc.AIMMappingRPCMixin):
     def _aim_endpoint_group(self, session, ptg, bd_name=None,
                             bd_tenant_name=None,
                             provided_contracts=None,
-                            consumed_contracts=None):
+                            consumed_contracts=None, names=None):
         # This returns a new AIM EPG resource
         # TODO(Sumit): Use _aim_resource_by_name
         tenant_id = ptg['tenant_id']
-        tenant_name = self._aim_tenant_name(session, tenant_id)
+        tenant_name = self._aim_tenant_name(session, tenant_id, names=names)
         id = ptg['id']
         name = ptg['name']
-        epg_name = self.name_mapper.policy_target_group(session, id, name)
+        epg_name = (names or {}).get(
+            (apic_mapper.NAME_TYPE_POLICY_TARGET_GROUP, id))
+        if not epg_name:
+            epg_name = self.name_mapper.policy_target_group(session, id, name)
         display_name = self.aim_display_name(ptg['name'])
         LOG.debug("Mapped ptg_id %(id)s with name %(name)s to %(apic_name)s",
                   {'id': id, 'name': name, 'apic_name': epg_name})
@@ -1029,12 +1095,15 @@ class AIMMappingDriver(nrd.CommonNeutronBase, aim_rpc.AIMMappingRPCMixin):
         aim_resource = aim_resource_class(**kwargs)
         return aim_resource
 
-    def _map_aim_status(self, session, aim_resource_obj):
+    def _map_aim_status(self, session, aim_resource_obj, aim_ctx=None):
         # Note that this implementation assumes that this driver
         # is the only policy driver configured, and no merging
         # with any previous status is required.
-        aim_ctx = aim_context.AimContext(session)
-        aim_status = self.aim.get_status(aim_ctx, aim_resource_obj)
+        aim_ctx = aim_ctx or aim_context.AimContext(session)
+        return self._gbp_status(self.aim.get_status(aim_ctx,
+                                                    aim_resource_obj))
+
+    def _gbp_status(self, aim_status):
         if not aim_status:
             # REVIST(Sumit)
             return gp_const.STATUS_BUILD
@@ -1045,21 +1114,40 @@ class AIMMappingDriver(nrd.CommonNeutronBase, aim_rpc.AIMMappingRPCMixin):
         else:
             return gp_const.STATUS_ACTIVE
 
-    def _merge_aim_status(self, session, aim_resource_obj_list):
+    def _merge_aim_status(self, session, aim_resource_obj_list,
+                          aim_ctx=None, statuses=None):
         # Note that this implementation assumes that this driver
         # is the only policy driver configured, and no merging
         # with any previous status is required.
         # When merging states of multiple AIM objects, the status
         # priority is ERROR > BUILD > ACTIVE.
+        # statuses, when passed, are the AIM statuses of the AIM objects
+        # by DN, fetched beforehand.
         merged_status = gp_const.STATUS_ACTIVE
         for aim_obj in aim_resource_obj_list:
-            status = self._map_aim_status(session, aim_obj)
+            if statuses is None:
+                status = self._map_aim_status(session, aim_obj,
+                                              aim_ctx=aim_ctx)
+            else:
+                status = self._gbp_status(statuses.get(aim_obj.dn))
             if status != gp_const.STATUS_ACTIVE:
                 merged_status = status
             if merged_status == gp_const.STATUS_ERROR:
                 break
         return merged_status
 
+    def _merge_aim_statuses(self, session, aim_resource_obj_lists):
+        # Merged status of each list of AIM objects, as by
+        # _merge_aim_status, with the statuses of all the AIM objects
+        # fetched at once.
+        aim_ctx = aim_context.AimContext(session)
+        statuses = self.aim_mech_driver._get_aim_statuses(
+            aim_ctx, [aim_obj for aim_objs in aim_resource_obj_lists
+                      for aim_obj in aim_objs])
+        return [self._merge_aim_status(session, aim_objs, aim_ctx=aim_ctx,
+                                       statuses=statuses)
+                for aim_objs in aim_resource_obj_lists]
+
     def _db_plugin(self, plugin_obj):
             return super(gbp_plugin.GroupPolicyPlugin, plugin_obj)
 
@@ -1102,7 +1190,10 @@ class AIMMappingDriver(nrd.CommonNeutronBase, aim_rpc.AIMMappingRPCMixin):
 
     def _get_subnet_details(self, plugin_context, port, details):
         # L2P might not exist for a pure Neutron port
-        l2p = self._network_id_to_l2p(plugin_context, port['network_id'])
+        l2p = self._get_batch_cached(
+            details['_cache'], ('l2p_by_network', port['network_id']),
+            lambda: self._network_id_to_l2p(plugin_context,
+                                            port['network_id']))
         # TODO(ivar): support shadow network
         # if not l2p and self._ptg_needs_shadow_network(context, ptg):
         #    l2p = self._get_l2_policy(context._plugin_context,
@@ -1112,15 +1203,9 @@ class AIMMappingDriver(nrd.CommonNeutronBase, aim_rpc.AIMMappingRPCMixin):
             plugin_context,
             filters={'id': [ip['subnet_id'] for ip in port['fixed_ips']]})
         for subnet in subnets:
-            dhcp_ips = set()
-            for port in self._get_ports(
-                    plugin_context,
-                    filters={
-                        'network_id': [subnet['network_id']],
-                        'device_owner': [n_constants.DEVICE_OWNER_DHCP]}):
-                dhcp_ips |= set([x['ip_address'] for x in port['fixed_ips']
-                                 if x['subnet_id'] == subnet['id']])
-            dhcp_ips = list(dhcp_ips)
+            dhcp_ips = list(self._get_batch_cached(
+                details['_cache'], ('dhcp_ips', subnet['id']),
+                lambda: self._get_dhcp_ips(plugin_context, subnet)))
             if not subnet['dns_nameservers']:
                 # Use DHCP namespace port IP
                 subnet['dns_nameservers'] = dhcp_ips
@@ -1155,6 +1240,17 @@ class AIMMappingDriver(nrd.CommonNeutronBase, aim_rpc.AIMMappingRPCMixin):
             subnet['dhcp_server_ips'] = dhcp_ips
         return subnets
 
+    def _get_dhcp_ips(self, plugin_context, subnet):
+        dhcp_ips = set()
+        for port in self._get_ports(
+                plugin_context,
+                filters={
+                    'network_id': [subnet['network_id']],
+                    'device_owner': [n_constants.DEVICE_OWNER_DHCP]}):
+            dhcp_ips |= set([x['ip_address'] for x in port['fixed_ips']
+                             if x['subnet_id'] == subnet['id']])
+        return dhcp_ips
+
     def _get_aap_details(self, plugin_context, port, details):
         pt = self._port_id_to_pt(plugin_context, port['id'])
         aaps = port['allowed_address_pairs']
@@ -1183,16 +1279,21 @@ class AIMMappingDriver(nrd.CommonNeutronBase, aim_rpc.AIMMappingRPCMixin):
 
     def _get_port_address_scope_cached(self, plugin_context, port, cache):
         if not cache.get('gbp_map_address_scope'):
-            cache['gbp_map_address_scope'] = (
-                self._get_port_address_scope(plugin_context, port))
+            subnet_ids = tuple(sorted(ip['subnet_id']
+                                      for ip in port['fixed_ips']))
+            cache['gbp_map_address_scope'] = self._get_batch_cached(
+                cache, ('address_scope_by_subnets', subnet_ids),
+                lambda: self._get_port_address_scope(plugin_context, port))
         return cache['gbp_map_address_scope']
 
     def _get_address_scope_cached(self, plugin_context, vrf_id, cache):
         if not cache.get('gbp_map_address_scope'):
-            address_scope = self._get_address_scopes(
-                plugin_context, filters={'id': [vrf_id]})
-            cache['gbp_map_address_scope'] = (address_scope[0] if
-                                              address_scope else None)
+            def _get_address_scope():
+                address_scope = self._get_address_scopes(
+                    plugin_context, filters={'id': [vrf_id]})
+                return address_scope[0] if address_scope else None
+            cache['gbp_map_address_scope'] = self._get_batch_cached(
+                cache, ('address_scope', vrf_id), _get_address_scope)
         return cache['gbp_map_address_scope']
 
     def _get_vrf_id(self, plugin_context, port, details):
@@ -1203,6 +1304,11 @@ class AIMMappingDriver(nrd.CommonNeutronBase, aim_rpc.AIMMappingRPCMixin):
         return address_scope['id'] if address_scope else None
 
     def _get_port_vrf(self, plugin_context, vrf_id, details):
+        return self._get_batch_cached(
+            details['_cache'], ('aim_vrf', vrf_id),
+            lambda: self._get_aim_vrf(plugin_context, vrf_id, details))
+
+    def _get_aim_vrf(self, plugin_context, vrf_id, details):
         address_scope = self._get_address_scope_cached(
             plugin_context, vrf_id, details['_cache'])
         if address_scope:
@@ -1216,6 +1322,12 @@ class AIMMappingDriver(nrd.CommonNeutronBase, aim_rpc.AIMMappingRPCMixin):
             return self.aim.get(aim_ctx, epg)
 
     def _get_vrf_subnets(self, plugin_context, vrf_id, details):
+        return list(self._get_batch_cached(
+            details['_cache'], ('vrf_subnets', vrf_id),
+            lambda: self._get_address_scope_subnets(plugin_context, vrf_id,
+                                                    details)))
+
+    def _get_address_scope_subnets(self, plugin_context, vrf_id, details):
         subnets = []
         address_scope = self._get_address_scope_cached(
             plugin_context, vrf_id, details['_cache'])
@@ -1234,6 +1346,25 @@ class AIMMappingDriver(nrd.CommonNeutronBase, aim_rpc.AIMMappingRPCMixin):
             'segmentation_labels' in pt):
             return pt['segmentation_labels']
 
+    def _get_subnets_ext_nets(self, plugin_context, subnet_ids):
+        """External networks of the routers the subnets are attached to.
+        """
+        router_intf_ports = self._get_ports(
+            plugin_context,
+            filters={'device_owner': [n_constants.DEVICE_OWNER_ROUTER_INTF],
+                     'fixed_ips': {'subnet_id': subnet_ids}})
+        if not router_intf_ports:
+            return []
+        routers = self._get_routers(
+             plugin_context,
+             filters={'device_id': [x['device_id']
+                                    for x in router_intf_ports]})
+        return self._get_networks(
+            plugin_context,
+            filters={'id': [r['external_gateway_info']['network_id']
+                            for r in routers
+                            if r.get('external_gateway_info')]})
+
     def _get_nat_details(self, plugin_context, port, host, details):
         """ Add information about IP mapping for DNAT/SNAT """
 
@@ -1244,23 +1375,10 @@ class AIMMappingDriver(nrd.CommonNeutronBase, aim_rpc.AIMMappingRPCMixin):
         # Find all external networks connected to the port.
         # Handle them depending on whether there is a FIP on that
         # network.
-        ext_nets = []
-
         port_sn = set([x['subnet_id'] for x in port['fixed_ips']])
-        router_intf_ports = self._get_ports(
-            plugin_context,
-            filters={'device_owner': [n_constants.DEVICE_OWNER_ROUTER_INTF],
-                     'fixed_ips': {'subnet_id': port_sn}})
-        if router_intf_ports:
-            routers = self._get_routers(
-                 plugin_context,
-                 filters={'device_id': [x['device_id']
-                                        for x in router_intf_ports]})
-            ext_nets = self._get_networks(
-                plugin_context,
-                filters={'id': [r['external_gateway_info']['network_id']
-                                for r in routers
-                                if r.get('external_gateway_info')]})
+        ext_nets = self._get_batch_cached(
+            details['_cache'], ('ext_nets', tuple(sorted(port_sn))),
+            lambda: self._get_subnets_ext_nets(plugin_context, port_sn))
         if not ext_nets:
             return fips, ipms, host_snat_ips
 
@@ -22,6 +22,8 @@ from oslo_log import log
 
 from gbpservice.neutron.services.grouppolicy.drivers.cisco.apic import (
     nova_client as nclient)
+from gbpservice.neutron.services.grouppolicy.drivers.cisco.apic import (
+    opflex_rpc)
 
 LOG = log.getLogger(__name__)
 
@@ -41,7 +43,7 @@ class AIMMappingRPCMixin(ha_ip_db.HAIPOwnerDbMixin):
         self.notifier = o_rpc.AgentNotifierApi(topics.AGENT)
         LOG.debug("Set up Opflex RPC listeners.")
         self.opflex_endpoints = [
-            o_rpc.GBPServerRpcCallback(self, self.notifier)]
+            opflex_rpc.GBPServerRpcCallback(self, self.notifier)]
         self.opflex_topic = o_rpc.TOPIC_OPFLEX
         self.opflex_conn = n_rpc.create_connection(new=True)
         self.opflex_conn.create_consumer(
@@ -60,10 +62,23 @@ class AIMMappingRPCMixin(ha_ip_db.HAIPOwnerDbMixin):
 
     def get_gbp_details(self, context, **kwargs):
         LOG.debug("APIC AIM MD handling get_gbp_details for: %s", kwargs)
+        return self._get_gbp_details_or_error(context, kwargs)
+
+    def get_gbp_details_list(self, context, **kwargs):
+        LOG.debug("APIC AIM MD handling get_gbp_details_list for: %s",
+                  kwargs)
+        # Shared by all the devices of the request
+        batch_cache = {}
+        devices = kwargs.pop('devices', None) or []
+        return [self._get_gbp_details_or_error(
+                    context, dict(kwargs, device=device), batch_cache)
+                for device in devices]
+
+    def _get_gbp_details_or_error(self, context, request, batch_cache=None):
         try:
-            return self._get_gbp_details(context, kwargs)
+            return self._get_gbp_details(context, request, batch_cache)
         except Exception as e:
-            device = kwargs.get('device')
+            device = request.get('device')
             LOG.error(_LE("An exception has occurred while retrieving device "
                           "gbp details for %s"), device)
             LOG.exception(e)
@@ -71,12 +86,23 @@ class AIMMappingRPCMixin(ha_ip_db.HAIPOwnerDbMixin):
 
     def request_endpoint_details(self, context, **kwargs):
         LOG.debug("APIC AIM handling get_endpoint_details for: %s", kwargs)
+        return self._request_endpoint_details(context, kwargs.get('request'))
+
+    def request_endpoint_details_list(self, context, **kwargs):
+        LOG.debug("APIC AIM handling request_endpoint_details_list for: %s",
+                  kwargs)
+        # Shared by all the devices of the request
+        batch_cache = {}
+        return [self._request_endpoint_details(context, request, batch_cache)
+                for request in kwargs.get('requests') or []]
+
+    def _request_endpoint_details(self, context, request, batch_cache=None):
         try:
-            request = kwargs.get('request')
             result = {'device': request['device'],
                       'timestamp': request['timestamp'],
                       'request_id': request['request_id'],
-                      'gbp_details': self._get_gbp_details(context, request),
+                      'gbp_details': self._get_gbp_details(
+                          context, request, batch_cache),
                       'neutron_details': ml2_rpc.RpcCallbacks(
                           None, None).get_device_details(context, **request)}
             return result
@@ -96,7 +122,10 @@ class AIMMappingRPCMixin(ha_ip_db.HAIPOwnerDbMixin):
     # - self._is_dhcp_optimized(context, port);
     # - self._is_metadata_optimized(context, port);
     # - self._get_vrf_id(context, port, details): VRF identified for the port;
-    def _get_gbp_details(self, context, request):
+    # batch_cache is shared by the devices of a bulk request, the child
+    # class stores there the objects common to the devices, see
+    # _get_batch_cached().
+    def _get_gbp_details(self, context, request, batch_cache=None):
         # TODO(ivar): should this happen within a single transaction? what are
         # the concurrency risks?
         device = request.get('device')
@@ -143,15 +172,16 @@ class AIMMappingRPCMixin(ha_ip_db.HAIPOwnerDbMixin):
 
         # Set VM name if needed.
         if port['device_owner'].startswith('compute:') and port['device_id']:
-            vm = nclient.NovaClient().get_server(port['device_id'])
-            details['vm-name'] = vm.name if vm else port['device_id']
+            details['vm-name'] = nclient.get_vm_name_cache().get_vm_name(
+                port['device_id'])
 
         # NOTE(ivar): having these methods cleanly separated actually makes
         # things less efficient by requiring lots of calls duplication.
         # we could alleviate this by passing down a cache that stores commonly
         # requested objects (like EPGs). 'details' itself could be used for
         # such caching.
-        details['_cache'] = {}
+        details['_cache'] = {
+            '_batch': batch_cache if batch_cache is not None else {}}
         details['l3_policy_id'] = self._get_vrf_id(context, port, details)
         self._add_subnet_details(context, port, details)
         self._add_allowed_address_pairs_details(context, port, details)
@@ -164,6 +194,16 @@ class AIMMappingRPCMixin(ha_ip_db.HAIPOwnerDbMixin):
         LOG.debug("Details for port %s : %s" % (port['id'], details))
         return details
 
+    def _get_batch_cached(self, cache, key, fetch):
+        """Returns fetch(), retrieved once for all devices of the request.
+
+            cache is the '_cache' of the details being built.
+        """
+        batch_cache = cache.setdefault('_batch', {})
+        if key not in batch_cache:
+            batch_cache[key] = fetch()
+        return batch_cache[key]
+
     def _get_owned_addresses(self, plugin_context, port_id):
         return set(self.ha_ip_handler.get_ha_ipaddresses_for_port(port_id))
 
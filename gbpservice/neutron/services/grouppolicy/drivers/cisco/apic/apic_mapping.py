@@ -34,8 +34,10 @@ from neutron.common import exceptions as n_exc
 from neutron.common import rpc as n_rpc
 from neutron.common import topics
 from neutron import context as nctx
+from neutron.db import allowedaddresspairs_db as addr_pair_db
 from neutron.db import db_base_plugin_v2 as n_db
 from neutron.db import model_base
+from neutron.db import models_v2
 from neutron.extensions import portbindings
 from neutron.extensions import providernet
 from neutron import manager
@@ -64,6 +66,8 @@ from gbpservice.neutron.services.grouppolicy.drivers.cisco.apic import (
     name_manager as name_manager)
 from gbpservice.neutron.services.grouppolicy.drivers.cisco.apic import (
     nova_client as nclient)
+from gbpservice.neutron.services.grouppolicy.drivers.cisco.apic import (
+    opflex_rpc)
 from gbpservice.neutron.services.grouppolicy import group_policy_context
 from gbpservice.neutron.services.grouppolicy import plugin as gbp_plugin
 
@@ -330,7 +334,8 @@ class ApicMappingDriver(api.ResourceMappingDriver,
                          'per L2 Policy'))
 
     def _setup_rpc_listeners(self):
-        self.endpoints = [rpc.GBPServerRpcCallback(self, self.notifier)]
+        self.endpoints = [opflex_rpc.GBPServerRpcCallback(self,
+                                                          self.notifier)]
         self.topic = rpc.TOPIC_OPFLEX
         self.conn = n_rpc.create_connection(new=True)
         self.conn.create_consumer(self.topic, self.endpoints,
@@ -387,8 +392,19 @@ class ApicMappingDriver(api.ResourceMappingDriver,
     def request_vrf_details(self, context, **kwargs):
         return self.get_vrf_details(context, **kwargs)
 
-    # RPC Method
-    def _get_gbp_details(self, context, **kwargs):
+    def _cached(self, cache, key, fetch):
+        """Returns fetch(), retrieved once per cache.
+
+            cache is shared by the devices of a bulk request, None for a
+            single device.
+        """
+        if cache is None:
+            return fetch()
+        if key not in cache:
+            cache[key] = fetch()
+        return cache[key]
+
+    def _get_gbp_details(self, context, cache=None, **kwargs):
         port_id = self._core_plugin._device_to_port_id(
             context, kwargs['device'])
         port_context = self._core_plugin.get_bound_port_context(
@@ -401,7 +417,7 @@ class ApicMappingDriver(api.ResourceMappingDriver,
             return {'device': kwargs.get('device')}
         port = port_context.current
         # retrieve PTG from a given Port
-        ptg, pt = self._port_id_to_ptg(context, port['id'])
+        ptg, pt = self._port_id_to_ptg(context, port['id'], cache=cache)
         context._plugin = self.gbp_plugin
         context._plugin_context = context
         switched = False
@@ -411,13 +427,16 @@ class ApicMappingDriver(api.ResourceMappingDriver,
             try:
                 LOG.debug("Replace port %s with port %s", port_id, new_id)
                 port = self._get_port(context, new_id)
-                ptg, pt = self._port_id_to_ptg(context, port['id'])
+                ptg, pt = self._port_id_to_ptg(context, port['id'],
+                                               cache=cache)
                 switched = True
             except n_exc.PortNotFound:
                 LOG.warning(_LW("Proxied port %s could not be found"),
                             new_id)
 
-        l2p = self._network_id_to_l2p(context, port['network_id'])
+        l2p = self._cached(
+            cache, ('l2p_by_network', port['network_id']),
+            lambda: self._network_id_to_l2p(context, port['network_id']))
         if not l2p and self._ptg_needs_shadow_network(context, ptg):
             l2p = self._get_l2_policy(context._plugin_context,
                                       ptg['l2_policy_id'])
@@ -465,10 +484,12 @@ class ApicMappingDriver(api.ResourceMappingDriver,
             details['fixed_ips'] = port['fixed_ips']
         if port['device_owner'].startswith('compute:') and port[
                 'device_id']:
-            vm = nclient.NovaClient().get_server(port['device_id'])
-            details['vm-name'] = vm.name if vm else port['device_id']
-        l3_policy = context._plugin.get_l3_policy(context,
-                                                  l2p['l3_policy_id'])
+            details['vm-name'] = nclient.get_vm_name_cache().get_vm_name(
+                port['device_id'])
+        l3_policy = self._cached(
+            cache, ('l3p', l2p['l3_policy_id']),
+            lambda: context._plugin.get_l3_policy(context,
+                                                  l2p['l3_policy_id']))
         own_addr = set()
         if pt:
             own_addr = set(self._get_owned_addresses(context,
@@ -478,11 +499,12 @@ class ApicMappingDriver(api.ResourceMappingDriver,
             details['host_snat_ips']) = (
                 self._get_ip_mapping_details(
                     context, port['id'], l3_policy, pt=pt,
-                    owned_addresses=own_addr, host=kwargs['host']))
+                    owned_addresses=own_addr, host=kwargs['host'],
+                    cache=cache))
         self._add_network_details(context, port, details, pt=pt,
                                   owned=own_addr, inject_default_route=
-                                  l2p['inject_default_route'])
-        self._add_vrf_details(context, details)
+                                  l2p['inject_default_route'], cache=cache)
+        self._add_vrf_details(context, details, cache=cache)
         if self._is_pt_chain_head(context, pt, ptg, owned_ips=own_addr,
                                   port_id=port_id):
             # is a relevant proxy_gateway, push all the addresses from this
@@ -496,8 +518,6 @@ class ApicMappingDriver(api.ResourceMappingDriver,
                     {'extra_ips': [], 'floating_ip': [],
                      'ip_mapping': [], 'host_snat_ips': []})
             if bool(master_port) == bool(pt['cluster_id']):
-                l3_policy = context._plugin.get_l3_policy(
-                    context, l2p['l3_policy_id'])
                 proxied_ptgs = []
                 while ptg.get('proxied_group_id'):
                     proxied = self.gbp_plugin.get_policy_target_group(
@@ -520,7 +540,7 @@ class ApicMappingDriver(api.ResourceMappingDriver,
                         (fips, ipms, host_snat_ips) = (
                             self._get_ip_mapping_details(
                                 context, port['id'], l3_policy,
-                                host=kwargs['host']))
+                                host=kwargs['host'], cache=cache))
                         extra_map['floating_ip'].extend(fips)
                         if not extra_map['ip_mapping']:
                             extra_map['ip_mapping'].extend(ipms)
@@ -549,9 +569,9 @@ class ApicMappingDriver(api.ResourceMappingDriver,
         return self._allocate_snat_ip(context, vrf_id, network, es_name)
 
     # RPC Method
-    def get_gbp_details(self, context, **kwargs):
+    def get_gbp_details(self, context, cache=None, **kwargs):
         try:
-            return self._get_gbp_details(context, **kwargs)
+            return self._get_gbp_details(context, cache=cache, **kwargs)
         except Exception as e:
             LOG.error(_LE(
                 "An exception has occurred while retrieving device "
@@ -561,7 +581,21 @@ class ApicMappingDriver(api.ResourceMappingDriver,
         return details
 
     # RPC Method
-    def request_endpoint_details(self, context, **kwargs):
+    def get_gbp_details_list(self, context, **kwargs):
+        """Returns the gbp details of all the devices of a host.
+
+            Same as get_gbp_details for every device in kwargs['devices'],
+            groups, policies & external segments the devices share are
+            retrieved once for all of them.
+        """
+        cache = {}
+        devices = kwargs.pop('devices', None) or []
+        return [self.get_gbp_details(context, cache=cache,
+                                     **dict(kwargs, device=device))
+                for device in devices]
+
+    # RPC Method
+    def request_endpoint_details(self, context, cache=None, **kwargs):
         try:
             LOG.debug("Request GBP details: %s", kwargs)
             kwargs.update(kwargs['request'])
@@ -570,7 +604,8 @@ class ApicMappingDriver(api.ResourceMappingDriver,
                       'request_id': kwargs['request_id'],
                       'gbp_details': None,
                       'neutron_details': None}
-            result['gbp_details'] = self._get_gbp_details(context, **kwargs)
+            result['gbp_details'] = self._get_gbp_details(
+                context, cache=cache, **kwargs)
             result['neutron_details'] = neu_rpc.RpcCallbacks(
                 None, None).get_device_details(context, **kwargs)
             return result
@@ -580,6 +615,18 @@ class ApicMappingDriver(api.ResourceMappingDriver,
             LOG.exception(e)
             return None
 
+    # RPC Method
+    def request_endpoint_details_list(self, context, **kwargs):
+        """Same as request_endpoint_details for every kwargs['requests'].
+
+            Objects the devices share are retrieved once for all of them.
+        """
+        cache = {}
+        requests = kwargs.pop('requests', None) or []
+        return [self.request_endpoint_details(
+                    context, cache=cache, **dict(kwargs, request=request))
+                for request in requests]
+
     def _allocate_snat_ip(self, context, host_or_vrf, network, es_name):
         """Allocate SNAT IP for a host for an external network."""
         snat_subnets = self._get_subnets(context,
@@ -640,7 +687,7 @@ class ApicMappingDriver(api.ResourceMappingDriver,
                     netaddr.IPNetwork(snat_subnets[0]['cidr']).prefixlen}
 
     def _get_ip_mapping_details(self, context, port_id, l3_policy, pt=None,
-                                owned_addresses=None, host=None):
+                                owned_addresses=None, host=None, cache=None):
         """ Add information about IP mapping for DNAT/SNAT """
         if not l3_policy['external_segments']:
             return [], [], []
@@ -650,17 +697,9 @@ class ApicMappingDriver(api.ResourceMappingDriver,
             # owning port.
             # REVISIT(ivar): should be done for allowed_address_pairs in
             # general?
-            ptg_pts = self._get_policy_targets(
-                context, {'policy_target_group_id':
-                          [pt['policy_target_group_id']]})
-            ports = self._get_ports(context,
-                                    {'id': [x['port_id'] for x in ptg_pts]})
-            for port in ports:
-                # Whenever a owned address belongs to a port, steal its FIPs
-                if owned_addresses & set([x['ip_address'] for x in
-                                          port['fixed_ips'] + port.get(
-                                              'allowed_address_pairs', [])]):
-                    fips_filter.append(port['id'])
+            # Whenever a owned address belongs to a port, steal its FIPs
+            fips_filter.extend(self._get_ptg_ports_by_addresses(
+                context, pt['policy_target_group_id'], owned_addresses))
 
         fips = self._get_fips(context, filters={'port_id': fips_filter})
         ipms = []
@@ -670,8 +709,11 @@ class ApicMappingDriver(api.ResourceMappingDriver,
         #    'prefixlen': <prefix_length_of_host_snat_pool_subnet>},
         #    {..}, ... ]
         host_snat_ips = []
-        ess = context._plugin.get_external_segments(context._plugin_context,
-                filters={'id': l3_policy['external_segments'].keys()})
+        ess = self._cached(
+            cache, ('external_segments', l3_policy['id']),
+            lambda: context._plugin.get_external_segments(
+                context._plugin_context,
+                filters={'id': l3_policy['external_segments'].keys()}))
         for es in ess:
             if not self._is_nat_enabled_on_es(es):
                 continue
@@ -685,16 +727,21 @@ class ApicMappingDriver(api.ResourceMappingDriver,
             fips_in_es = []
 
             if es['subnet_id']:
-                subnet = self._get_subnet(context._plugin_context,
-                                          es['subnet_id'])
+                subnet = self._cached(
+                    cache, ('subnet', es['subnet_id']),
+                    lambda: self._get_subnet(context._plugin_context,
+                                             es['subnet_id']))
                 ext_net_id = subnet['network_id']
                 fips_in_es = filter(
                     lambda x: x['floating_network_id'] == ext_net_id, fips)
-                ext_network = self._get_network(context._plugin_context,
-                        ext_net_id)
+                ext_network = self._cached(
+                    cache, ('network', ext_net_id),
+                    lambda: self._get_network(context._plugin_context,
+                                              ext_net_id))
                 if host:
-                    host_snat_ip_allocation = (
-                        self._allocate_snat_ip(
+                    host_snat_ip_allocation = self._cached(
+                        cache, ('host_snat_ip', host, es['id']),
+                        lambda: self._allocate_snat_ip(
                             context._plugin_context, host, ext_network,
                             es['name']))
                     if host_snat_ip_allocation:
@@ -712,7 +759,8 @@ class ApicMappingDriver(api.ResourceMappingDriver,
         return fips, ipms, host_snat_ips
 
     def _add_network_details(self, context, port, details, pt=None,
-                             owned=None, inject_default_route=True):
+                             owned=None, inject_default_route=True,
+                             cache=None):
         details['allowed_address_pairs'] = port['allowed_address_pairs']
         if pt:
             # Set the correct address ownership for this port
@@ -728,14 +776,9 @@ class ApicMappingDriver(api.ResourceMappingDriver,
         details['subnets'] = self._get_subnets(context,
             filters={'id': [ip['subnet_id'] for ip in port['fixed_ips']]})
         for subnet in details['subnets']:
-            dhcp_ips = set()
-            for port in self._get_ports(
-                    context, filters={
-                        'network_id': [subnet['network_id']],
-                        'device_owner': [n_constants.DEVICE_OWNER_DHCP]}):
-                dhcp_ips |= set([x['ip_address'] for x in port['fixed_ips']
-                                 if x['subnet_id'] == subnet['id']])
-            dhcp_ips = list(dhcp_ips)
+            dhcp_ips = list(self._cached(
+                cache, ('dhcp_ips', subnet['id']),
+                lambda: self._get_dhcp_ips(context, subnet)))
             if not subnet['dns_nameservers']:
                 # Use DHCP namespace port IP
                 subnet['dns_nameservers'] = dhcp_ips
@@ -769,8 +812,21 @@ class ApicMappingDriver(api.ResourceMappingDriver,
                              'nexthop': dhcp_ips[0]})
             subnet['dhcp_server_ips'] = dhcp_ips
 
-    def _add_vrf_details(self, context, details):
-        l3p = self.gbp_plugin.get_l3_policy(context, details['l3_policy_id'])
+    def _get_dhcp_ips(self, context, subnet):
+        dhcp_ips = set()
+        for port in self._get_ports(
+                context, filters={
+                    'network_id': [subnet['network_id']],
+                    'device_owner': [n_constants.DEVICE_OWNER_DHCP]}):
+            dhcp_ips |= set([x['ip_address'] for x in port['fixed_ips']
+                             if x['subnet_id'] == subnet['id']])
+        return dhcp_ips
+
+    def _add_vrf_details(self, context, details, cache=None):
+        l3p = self._cached(
+            cache, ('l3p', details['l3_policy_id']),
+            lambda: self.gbp_plugin.get_l3_policy(
+                context, details['l3_policy_id']))
         details['vrf_tenant'] = self.apic_manager.apic.fvTenant.name(
             self._tenant_by_sharing_policy(l3p))
         details['vrf_name'] = self.apic_manager.apic.fvCtx.name(
@@ -854,6 +910,12 @@ class ApicMappingDriver(api.ResourceMappingDriver,
         if shadow_net and context.current['port_id']:
             self._check_explicit_port(context, ptg, shadow_net)
 
+    def create_policy_target_bulk_postcommit(self, contexts):
+        # Implicit ports are created along with the shadow ones, on the
+        # subnets reserved for the group, so one at a time.
+        for context in contexts:
+            self.create_policy_target_postcommit(context)
+
     def create_policy_target_postcommit(self, context):
         ptg = self.gbp_plugin.get_policy_target_group(
             context._plugin_context,
@@ -1903,11 +1965,14 @@ class ApicMappingDriver(api.ResourceMappingDriver,
         if pts:
             return pts[0]
 
-    def _port_id_to_ptg(self, context, port_id):
+    def _port_id_to_ptg(self, context, port_id, cache=None):
         pt = self._port_id_to_pt(context, port_id)
         if pt:
-            return self.gbp_plugin.get_policy_target_group(
-                context, pt['policy_target_group_id']), pt
+            ptg_id = pt['policy_target_group_id']
+            return self._cached(
+                cache, ('ptg', ptg_id),
+                lambda: self.gbp_plugin.get_policy_target_group(
+                    context, ptg_id)), pt
         return None, None
 
     def _l2p_id_to_network(self, context, l2p_id):
@@ -3521,6 +3586,28 @@ class ApicMappingDriver(api.ResourceMappingDriver,
     def _get_owned_addresses(self, plugin_context, port_id):
         return set(self.ha_ip_handler.get_ha_ipaddresses_for_port(port_id))
 
+    def _get_ptg_ports_by_addresses(self, plugin_context, ptg_id, addresses):
+        """Ids of the ports of a PTG with any of the addresses.
+
+        The addresses are looked up as fixed IPs & allowed address pairs
+        of the PTG ports, i.e, through the indexes of these tables rather
+        than going over all the ports of the PTG.
+        """
+        if not addresses:
+            return set()
+        session = plugin_context.session
+        ptg_ports = session.query(gpdb.PolicyTargetMapping.port_id).filter(
+            gpdb.PolicyTargetMapping.policy_target_group_id ==
+            ptg_id).subquery()
+        port_ids = set()
+        for model in (models_v2.IPAllocation,
+                      addr_pair_db.AllowedAddressPair):
+            port_ids.update(x.port_id for x in session.query(
+                model.port_id).filter(
+                    model.ip_address.in_(list(addresses)),
+                    model.port_id.in_(ptg_ports)))
+        return port_ids
+
     def _get_pt_cluster_master(self, plugin_context, pt):
         return (self._get_policy_target(plugin_context, pt['cluster_id'])
                 if pt['cluster_id'] != pt['id'] else pt)
@@ -3617,9 +3704,7 @@ class ApicMappingDriver(api.ResourceMappingDriver,
                                    clean_session=True):
         l2ps = self._get_l2_policies(context._plugin_context,
                                      {'l3_policy_id': [l3p_id]})
-        subnets = [x['cidr'] for x in
-                   self._get_l2ps_subnets(context._plugin_context, l2ps)]
-        return subnets
+        return self._get_l2ps_subnets(context._plugin_context, l2ps)
 
     def _is_supported_non_opflex_network_type(self, net_type):
         return net_type in [p_const.TYPE_VLAN]
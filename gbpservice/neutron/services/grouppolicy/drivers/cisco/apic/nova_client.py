@@ -10,16 +10,41 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import threading
+import time
+
 from keystoneauth1 import loading as ks_loading
+from neutron._i18n import _
 from neutron._i18n import _LW
 from neutron.notifiers import nova as n_nova
 from novaclient import client as nclient
 from novaclient import exceptions as nova_exceptions
 from oslo_config import cfg
 from oslo_log import log as logging
+from oslo_service import loopingcall
 
 LOG = logging.getLogger(__name__)
 
+# VM names of failed lookups are retried after these many seconds
+VM_NAME_FAILURE_TTL = 30
+
+vm_name_cache_opts = [
+    cfg.IntOpt('vm_name_cache_ttl',
+               default=300,
+               help=_("Seconds for which the name of a VM looked up in "
+                      "Nova is used for the endpoint details of its "
+                      "ports. VM renames are reflected after this time.")),
+    cfg.IntOpt('vm_name_cache_refresh_interval',
+               default=0,
+               help=_("Interval in seconds at which the names of all the "
+                      "VMs are listed from Nova in bulk, so that endpoint "
+                      "details requests do not need to look VMs up. "
+                      "0 disables the bulk refresh, names are then only "
+                      "looked up on demand.")),
+]
+
+cfg.CONF.register_opts(vm_name_cache_opts, "apic_mapping")
+
 
 class NovaClient(object):
 
@@ -42,3 +67,111 @@ class NovaClient(object):
                         server_id)
         except Exception as e:
             LOG.exception(e)
+
+    def list_servers(self):
+        """Returns id & name of the VMs of all the tenants. """
+        return self.nclient.servers.list(detailed=False,
+                                         search_opts={'all_tenants': 1})
+
+
+_CLIENT = None
+
+
+def get_client():
+    """Returns the process wide Nova client.
+
+    Building a client sets up a keystone session, sharing it lets the
+    lookups reuse its token & connections.
+    """
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = NovaClient()
+    return _CLIENT
+
+
+class VMNameCache(object):
+    """Names of the VMs, by id, as used in the endpoint details.
+
+    Names are looked up in Nova on a miss and kept for ttl seconds, or
+    are all listed at once by refresh(). A VM Nova fails to return is
+    named after its id, as before, and is looked up again only after
+    VM_NAME_FAILURE_TTL seconds so that a slow or unavailable Nova does
+    not delay every request for its ports.
+    """
+
+    def __init__(self, client=None, ttl=None, timefunc=time.time):
+        self._client = client
+        self._ttl = (cfg.CONF.apic_mapping.vm_name_cache_ttl
+                     if ttl is None else ttl)
+        self.timefunc = timefunc
+        # {vm_id: (name, expires_at)}
+        self._names = {}
+        self._lock = threading.Lock()
+        self._counters = dict.fromkeys(
+            ['hits', 'misses', 'errors', 'refreshes'], 0)
+
+    def __len__(self):
+        return len(self._names)
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = get_client()
+        return self._client
+
+    def clear(self):
+        with self._lock:
+            self._names.clear()
+
+    def get_vm_name(self, vm_id):
+        now = self.timefunc()
+        entry = self._names.get(vm_id)
+        if entry and entry[1] > now:
+            self._counters['hits'] += 1
+            return entry[0]
+        self._counters['misses'] += 1
+        vm = self.client.get_server(vm_id)
+        if vm:
+            name, expires_at = vm.name, now + self._ttl
+        else:
+            self._counters['errors'] += 1
+            name, expires_at = vm_id, now + VM_NAME_FAILURE_TTL
+        with self._lock:
+            self._names[vm_id] = (name, expires_at)
+        return name
+
+    def refresh(self):
+        """Lists the names of all the VMs from Nova in one request. """
+        try:
+            servers = self.client.list_servers()
+        except Exception as e:
+            self._counters['errors'] += 1
+            LOG.warning(_LW("Failed to list the VMs from Nova: %s"), e)
+            return
+        expires_at = self.timefunc() + self._ttl
+        with self._lock:
+            # Names of VMs which are gone expire by themselves
+            for server in servers:
+                self._names[server.id] = (server.name, expires_at)
+            self._counters['refreshes'] += 1
+
+    def counters(self):
+        return dict(self._counters)
+
+
+_CACHE = None
+
+
+def get_vm_name_cache():
+    """Returns the process wide VM name cache.
+
+    Starts refreshing it periodically, when a refresh interval is set.
+    """
+    global _CACHE
+    if _CACHE is None:
+        _CACHE = VMNameCache()
+        interval = cfg.CONF.apic_mapping.vm_name_cache_refresh_interval
+        if interval > 0:
+            loopingcall.FixedIntervalLoopingCall(_CACHE.refresh).start(
+                interval=interval)
+    return _CACHE
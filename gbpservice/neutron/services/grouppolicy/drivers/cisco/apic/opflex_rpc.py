@@ -0,0 +1,35 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from opflexagent import rpc as o_rpc
+
+
+class GBPServerRpcCallback(o_rpc.GBPServerRpcCallback):
+    """Opflex RPC endpoint, with the bulk calls served by the driver.
+
+    The bulk calls take all the devices of a host, the driver retrieves
+    the objects the devices share only once for all of them. The single
+    device calls are left to the opflex agent endpoint as is, so agents
+    which do not use the bulk calls are not affected.
+    """
+
+    def __init__(self, gbp_driver, agent_notifier=None):
+        super(GBPServerRpcCallback, self).__init__(gbp_driver,
+                                                   agent_notifier)
+        self._gbp_driver = gbp_driver
+
+    def get_gbp_details_list(self, context, **kwargs):
+        return self._gbp_driver.get_gbp_details_list(context, **kwargs)
+
+    def request_endpoint_details_list(self, context, **kwargs):
+        return self._gbp_driver.request_endpoint_details_list(context,
+                                                              **kwargs)
@@ -50,6 +50,12 @@ class ApicReuseBdExtensionDriver(api.ExtensionDriver,
             result['reuse_bd'] = l2p['reuse_bd']
 
     def extend_l2_policy_dict(self, session, result):
-        row = self.get_reuse_bd_l2policy(session, l2_policy_id=result['id'])
-        if row:
-            result['reuse_bd'] = row.target_l2_policy_id
+        self.extend_l2_policy_dicts(session, [result])
+
+    def extend_l2_policy_dicts(self, session, results):
+        rows = self.get_reuse_bd_l2policies(
+            session, l2_policy_ids=[result['id'] for result in results])
+        targets = dict((r.l2_policy_id, r.target_l2_policy_id) for r in rows)
+        for result in results:
+            if result['id'] in targets:
+                result['reuse_bd'] = targets[result['id']]
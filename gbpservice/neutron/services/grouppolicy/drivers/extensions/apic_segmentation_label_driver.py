@@ -64,7 +64,13 @@ class ApicSegmentationLabelExtensionDriver(api.ExtensionDriver,
                 segmentation_label=label)
 
     def extend_policy_target_dict(self, session, result):
-        rows = self.get_policy_target_segmentation_labels(
-            session, policy_target_id=result['id'])
-        labels = [r.segmentation_label for r in rows]
-        result['segmentation_labels'] = labels
+        self.extend_policy_target_dicts(session, [result])
+
+    def extend_policy_target_dicts(self, session, results):
+        labels = dict((result['id'], []) for result in results)
+        rows = self.get_policy_targets_segmentation_labels(
+            session, policy_target_ids=list(labels))
+        for r in rows:
+            labels[r.policy_target_id].append(r.segmentation_label)
+        for result in results:
+            result['segmentation_labels'] = labels[result['id']]
@@ -69,8 +69,11 @@ class ProxyGroupDriver(api.ExtensionDriver):
     def process_update_policy_target_group(self, session, data, result):
         pass
 
-    @api.default_extension_behavior(db.GroupProxyMapping)
     def extend_policy_target_group_dict(self, session, result):
+        self.extend_policy_target_group_dicts(session, [result])
+
+    @api.default_extension_behavior(db.GroupProxyMapping)
+    def extend_policy_target_group_dicts(self, session, results):
         pass
 
     @api.default_extension_behavior(db.ProxyGatewayMapping)
@@ -81,8 +84,11 @@ class ProxyGroupDriver(api.ExtensionDriver):
     def process_update_policy_target(self, session, data, result):
         self._validate_proxy_gateway(session, data, result)
 
-    @api.default_extension_behavior(db.ProxyGatewayMapping)
     def extend_policy_target_dict(self, session, result):
+        self.extend_policy_target_dicts(session, [result])
+
+    @api.default_extension_behavior(db.ProxyGatewayMapping)
+    def extend_policy_target_dicts(self, session, results):
         pass
 
     def _validate_proxy_gateway(self, session, data, result):
@@ -113,6 +119,9 @@ class ProxyGroupDriver(api.ExtensionDriver):
                 result['ip_version'], data['proxy_subnet_prefix_length'],
                 result['proxy_ip_pool'])
 
-    @api.default_extension_behavior(db.ProxyIPPoolMapping)
     def extend_l3_policy_dict(self, session, result):
+        self.extend_l3_policy_dicts(session, [result])
+
+    @api.default_extension_behavior(db.ProxyIPPoolMapping)
+    def extend_l3_policy_dicts(self, session, results):
         pass
@@ -26,6 +26,27 @@ od_driver_opts = [
     cfg.StrOpt('odl_port',
                default='8080',
                help=_("OpenDaylight Controller Rest API port number")),
+    cfg.BoolOpt('write_behind',
+                default=True,
+                help=_("Record the writes to the OpenDaylight Controller "
+                       "in a journal, sent to it in batches by a background "
+                       "worker, rather than sending them inline")),
+    cfg.IntOpt('journal_batch_size',
+               default=100,
+               help=_("Maximum number of journal entries sent to the "
+                      "OpenDaylight Controller in a batch")),
+    cfg.FloatOpt('journal_sync_interval',
+                 default=1.0,
+                 help=_("Interval in seconds between two runs of the "
+                        "journal worker")),
+    cfg.IntOpt('journal_max_retries',
+               default=5,
+               help=_("Number of times a journal entry is sent before it "
+                      "is marked failed")),
+    cfg.IntOpt('journal_processing_timeout',
+               default=100,
+               help=_("Time in seconds after which a journal entry being "
+                      "sent by a worker which died is sent again")),
 ]
 
 
@@ -0,0 +1,150 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import datetime
+
+from neutron.db import model_base
+from oslo_serialization import jsonutils
+from oslo_utils import timeutils
+import sqlalchemy as sa
+
+PENDING = 'pending'
+PROCESSING = 'processing'
+FAILED = 'failed'
+
+
+class OdlJournalEntry(model_base.BASEV2):
+    """A write to the ODL controller, waiting to be sent to it."""
+
+    __tablename__ = 'gp_odl_journal'
+    __table_args__ = (
+        sa.Index('ix_gp_odl_journal_state_seqnum', 'state', 'seqnum'),
+        model_base.BASEV2.__table_args__
+    )
+    seqnum = sa.Column(sa.Integer, primary_key=True, autoincrement=True)
+    tenant_id = sa.Column(sa.String(255), nullable=True)
+    # put, delete or post
+    operation = sa.Column(sa.String(16), nullable=False)
+    object_type = sa.Column(sa.String(64), nullable=False)
+    object_id = sa.Column(sa.String(255), nullable=True)
+    # JSON of the object written
+    data = sa.Column(sa.Text, nullable=True)
+    state = sa.Column(sa.String(16), nullable=False)
+    retry_count = sa.Column(sa.Integer, nullable=False)
+    last_attempt = sa.Column(sa.DateTime, nullable=True)
+
+    def get_data(self):
+        return jsonutils.loads(self.data) if self.data else None
+
+
+def record(session, operation, object_type, tenant_id=None, object_id=None,
+           data=None):
+    with session.begin(subtransactions=True):
+        session.add(OdlJournalEntry(
+            operation=operation, object_type=object_type,
+            tenant_id=tenant_id, object_id=object_id,
+            data=jsonutils.dumps(data) if data is not None else None,
+            state=PENDING, retry_count=0))
+
+
+def has_pending_entries(session):
+    return session.query(OdlJournalEntry.seqnum).filter_by(
+        state=PENDING).first() is not None
+
+
+def _hold_entries(session, entries):
+    """Fails the entries of objects which already have a failed entry.
+
+    The later writes of an object are held with its failed entry, so
+    that they are never sent out of order. Returns the other entries.
+    """
+    object_ids = set(entry.object_id for entry in entries
+                     if entry.object_id is not None)
+    if not object_ids:
+        return entries
+    failed = set(session.query(
+        OdlJournalEntry.tenant_id, OdlJournalEntry.object_type,
+        OdlJournalEntry.object_id).filter(
+            OdlJournalEntry.state == FAILED,
+            OdlJournalEntry.object_id.in_(object_ids)).distinct())
+    claimed = []
+    for entry in entries:
+        if (entry.tenant_id, entry.object_type, entry.object_id) in failed:
+            entry.state = FAILED
+        else:
+            claimed.append(entry)
+    return claimed
+
+
+def claim_entries(session, limit, processing_timeout):
+    """Marks the oldest pending entries as being processed.
+
+    Nothing is claimed while entries are being processed by another
+    worker, so that the writes reach the controller in the order they
+    were recorded. The entries of workers which died are given back
+    after processing_timeout seconds. The entries of objects which have
+    a failed entry are failed too rather than claimed.
+    """
+    now = timeutils.utcnow()
+    with session.begin(subtransactions=True):
+        session.query(OdlJournalEntry).filter(
+            OdlJournalEntry.state == PROCESSING,
+            OdlJournalEntry.last_attempt < now - datetime.timedelta(
+                seconds=processing_timeout)).update(
+                    {'state': PENDING}, synchronize_session=False)
+        if session.query(OdlJournalEntry.seqnum).filter_by(
+                state=PROCESSING).first():
+            return []
+        entries = None
+        while not entries:
+            entries = (session.query(OdlJournalEntry).
+                       filter_by(state=PENDING).
+                       order_by(OdlJournalEntry.seqnum).limit(limit).
+                       with_lockmode('update').all())
+            if not entries:
+                return []
+            entries = _hold_entries(session, entries)
+        for entry in entries:
+            entry.state = PROCESSING
+            entry.last_attempt = now
+    return entries
+
+
+def complete_entries(session, seqnums):
+    if not seqnums:
+        return
+    with session.begin(subtransactions=True):
+        session.query(OdlJournalEntry).filter(
+            OdlJournalEntry.seqnum.in_(seqnums)).delete(
+                synchronize_session=False)
+
+
+def release_entries(session, seqnums):
+    """Gives entries which were not sent back to the next worker run."""
+    if not seqnums:
+        return
+    with session.begin(subtransactions=True):
+        session.query(OdlJournalEntry).filter(
+            OdlJournalEntry.seqnum.in_(seqnums)).update(
+                {'state': PENDING}, synchronize_session=False)
+
+
+def fail_entries(session, seqnums, max_retries):
+    """Gives entries which failed back, unless they failed too often."""
+    if not seqnums:
+        return
+    with session.begin(subtransactions=True):
+        for entry in session.query(OdlJournalEntry).filter(
+                OdlJournalEntry.seqnum.in_(seqnums)):
+            entry.retry_count += 1
+            entry.state = (FAILED if entry.retry_count >= max_retries
+                           else PENDING)
@@ -10,13 +10,22 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
+import functools
+
 import requests
 from requests import auth
 
+from neutron._i18n import _LE
 from neutron._i18n import _LI
+from neutron._i18n import _LW
+from neutron.db import api as db_api
 from oslo_config import cfg
 from oslo_log import log as logging
 from oslo_serialization import jsonutils
+from oslo_service import loopingcall
+
+from gbpservice.neutron.services.grouppolicy.drivers.odl import odl_journal
 
 
 LOG = logging.getLogger(__name__)
@@ -42,6 +51,29 @@ cfg.CONF.import_opt(
     group='odl_driver'
 )
 
+for opt in ('write_behind', 'journal_batch_size', 'journal_sync_interval',
+            'journal_max_retries', 'journal_processing_timeout'):
+    cfg.CONF.import_opt(
+        opt,
+        'gbpservice.neutron.services.grouppolicy.drivers.odl.config',
+        group='odl_driver'
+    )
+
+# Path of the objects under their tenant, and the container holding them
+# in the tenant
+TENANT_OBJECTS = {
+    'action-instance': ('subject-feature-instances/action-instance',
+                        'subject-feature-instances'),
+    'classifier-instance': ('subject-feature-instances/classifier-instance',
+                            'subject-feature-instances'),
+    'l3-context': ('l3-context', None),
+    'l2-bridge-domain': ('l2-bridge-domain', None),
+    'l2-flood-domain': ('l2-flood-domain', None),
+    'endpoint-group': ('policy:endpoint-group', None),
+    'subnet': ('subnet', None),
+    'contract': ('policy:contract', None),
+}
+
 
 class OdlManager(object):
     """Class to manage ODL translations and workflow.
@@ -87,38 +119,17 @@ class OdlManager(object):
             self._base_url +
             '/config/policy:tenants/policy:tenant/%(tenant_id)s'
         )
-        self._action_url = (
-            self._policy_url +
-            '/subject-feature-instances/action-instance/%(action)s'
-        )
-        self._classifier_url = (
-            self._policy_url +
-            '/subject-feature-instances/classifier-instance/%(classifier)s'
-        )
-        self._l3ctx_url = (
-            self._policy_url +
-            '/l3-context/%(l3ctx)s'
-        )
-        self._l2bd_url = (
-            self._policy_url +
-            '/l2-bridge-domain/%(l2bd)s'
-        )
-        self._l2fd_url = (
-            self._policy_url +
-            '/l2-flood-domain/%(l2fd)s'
-        )
-        self._epg_url = (
-            self._policy_url +
-            '/policy:endpoint-group/%(epg)s'
-        )
-        self._subnet_url = (
-            self._policy_url +
-            '/subnet/%(subnet)s'
-        )
-        self._contract_url = (
-            self._policy_url +
-            '/policy:contract/%(contract)s'
-        )
+        # A pooled session, to reuse the connections to the controller
+        self._session = requests.Session()
+        self._auth = auth.HTTPBasicAuth(self._username, self._password)
+        # Tenants known to be created on the controller
+        self._tenants = set()
+
+        self._write_behind = cfg.CONF.odl_driver.write_behind
+        self._worker = None
+        if self._write_behind and odl_journal.has_pending_entries(
+                db_api.get_session()):
+            self._start_worker()
 
     def _convert2ascii(self, obj):
         if isinstance(obj, dict):
@@ -136,33 +147,25 @@ class OdlManager(object):
 
         medium = self._convert2ascii(obj) if obj else None
         url = self._convert2ascii(url)
-        data = (
-            jsonutils.dumps(medium, indent=4, sort_keys=True) if medium
-            else None
-        )
-        LOG.debug("=========================================================")
-        LOG.debug("Sending METHOD (%(method)s) URL (%(url)s)",
-                  {'method': method, 'url': url})
-        LOG.debug("(%(data)s)", {'data': data})
-        LOG.debug("=========================================================")
-        r = requests.request(
+        data = jsonutils.dumps(medium) if medium else None
+        LOG.debug("Sending METHOD (%(method)s) URL (%(url)s) (%(data)s)",
+                  {'method': method, 'url': url, 'data': data})
+        r = self._session.request(
             method,
             url=url,
             headers=headers,
             data=data,
-            auth=auth.HTTPBasicAuth(self._username,
-                                    self._password)
+            auth=self._auth
         )
         r.raise_for_status()
 
     def _is_tenant_created(self, tenant_id):
         url = self._convert2ascii(self._policy_url % {'tenant_id': tenant_id})
-        r = requests.request(
+        r = self._session.request(
             'get',
             url=url,
             headers=self._headers,
-            auth=auth.HTTPBasicAuth(self._username,
-                                    self._password)
+            auth=self._auth
         )
         if r.status_code == 200:
             return True
@@ -171,118 +174,260 @@ class OdlManager(object):
         else:
             r.raise_for_status()
 
-    def register_endpoints(self, endpoints):
+    def _is_tenant_known(self, tenant_id):
+        if tenant_id in self._tenants:
+            return True
+        if self._is_tenant_created(tenant_id):
+            self._tenants.add(tenant_id)
+            return True
+        return False
+
+    def _object_url(self, tenant_id, object_type, object_id):
+        return (self._policy_url % {'tenant_id': tenant_id} + '/' +
+                TENANT_OBJECTS[object_type][0] + '/' + object_id)
+
+    def _send_write(self, tenant_id, object_type, object_id, obj,
+                    touch=True):
+        if touch:
+            self._touch_tenant(tenant_id)
+        url = self._object_url(tenant_id, object_type, object_id)
+        self._sendjson('put', url, self._headers, {object_type: obj})
+
+    def _send_delete(self, tenant_id, object_type, object_id):
+        url = self._object_url(tenant_id, object_type, object_id)
+        self._sendjson('delete', url, self._headers)
+
+    def _send_rpc(self, rpc, ep):
+        url = {'register-endpoint': self._reg_ep_url,
+               'unregister-endpoint': self._unreg_ep_url}[rpc]
+        self._sendjson('post', url, self._headers, {"input": ep})
+
+    def _record(self, operation, object_type, tenant_id=None,
+                object_id=None, data=None):
+        odl_journal.record(db_api.get_session(), operation, object_type,
+                           tenant_id=tenant_id, object_id=object_id,
+                           data=data)
+        self._start_worker()
+
+    def _write(self, tenant_id, object_type, object_id, obj, touch=True):
+        if self._write_behind:
+            self._record('put', object_type, tenant_id=tenant_id,
+                         object_id=object_id, data=obj)
+        else:
+            self._send_write(tenant_id, object_type, object_id, obj,
+                             touch=touch)
+
+    def _delete(self, tenant_id, object_type, object_id):
+        if self._write_behind:
+            self._record('delete', object_type, tenant_id=tenant_id,
+                         object_id=object_id)
+        else:
+            self._send_delete(tenant_id, object_type, object_id)
+
+    def _rpc(self, rpc, endpoints):
         for ep in endpoints:
-            data = {"input": ep}
-            self._sendjson('post', self._reg_ep_url, self._headers, data)
+            if self._write_behind:
+                self._record('post', rpc, data=ep)
+            else:
+                self._send_rpc(rpc, ep)
+
+    def _start_worker(self):
+        if self._worker:
+            return
+        self._worker = loopingcall.FixedIntervalLoopingCall(
+            self._sync_journal)
+        self._worker.start(
+            interval=cfg.CONF.odl_driver.journal_sync_interval)
+
+    def _sync_journal(self):
+        try:
+            self.sync_journal()
+        except Exception:
+            # Keep the worker running, the entries are sent again later
+            LOG.exception(_LE("Failed to sync the ODL journal"))
+
+    def sync_journal(self):
+        """Send the pending journal entries to ODL, a batch at a time."""
+        session = db_api.get_session()
+        while True:
+            entries = odl_journal.claim_entries(
+                session, cfg.CONF.odl_driver.journal_batch_size,
+                cfg.CONF.odl_driver.journal_processing_timeout)
+            if not entries or not self._send_entries(session, entries):
+                return
+
+    def _send_entries(self, session, entries):
+        """Send a batch of journal entries, returns whether all were sent.
+
+        The writes recorded before a RPC are sent before it, only the
+        last write of each object between two RPCs is sent.
+        """
+        # Each RPC ends a segment of the batch
+        segments = [[]]
+        for entry in entries:
+            segments[-1].append(entry)
+            if entry.operation == 'post':
+                segments.append([])
+        done = []
+        for i, segment in enumerate(segments):
+            rest = [entry.seqnum for later in segments[i + 1:]
+                    for entry in later]
+            try:
+                superseded, units = self._segment_units(segment)
+            except requests.RequestException:
+                LOG.warning(_LW("Failed to reach the ODL controller"))
+                odl_journal.complete_entries(session, done)
+                odl_journal.release_entries(
+                    session, [entry.seqnum for entry in segment] + rest)
+                return False
+            done.extend(superseded)
+            for j, (unit, send) in enumerate(units):
+                try:
+                    send()
+                except requests.RequestException as e:
+                    LOG.warning(_LW("Failed to send journal entries "
+                                    "%(seqnums)s to the ODL controller: "
+                                    "%(error)s"),
+                                {'seqnums': [entry.seqnum for entry in unit],
+                                 'error': e})
+                    self._tenants.difference_update(
+                        entry.tenant_id for entry in unit)
+                    odl_journal.complete_entries(session, done)
+                    odl_journal.fail_entries(
+                        session, [entry.seqnum for entry in unit],
+                        cfg.CONF.odl_driver.journal_max_retries)
+                    odl_journal.release_entries(
+                        session, [entry.seqnum for later, send in
+                                  units[j + 1:] for entry in later] + rest)
+                    return False
+                done.extend(entry.seqnum for entry in unit)
+        odl_journal.complete_entries(session, done)
+        return True
+
+    def _segment_units(self, segment):
+        """Returns the superseded writes of a segment and the units to send.
+
+        Tenants which are not on the controller yet are created with all
+        their objects in a single PUT, which is not done for the other
+        tenants as it would replace their existing objects.
+        """
+        def key(entry):
+            return entry.tenant_id, entry.object_type, entry.object_id
+
+        last_writes = {}
+        for entry in segment:
+            if entry.operation != 'post':
+                last_writes[key(entry)] = entry.seqnum
+        superseded = [entry.seqnum for entry in segment
+                      if entry.operation != 'post' and
+                      last_writes[key(entry)] != entry.seqnum]
+        segment = [entry for entry in segment
+                   if entry.operation == 'post' or
+                   last_writes[key(entry)] == entry.seqnum]
+
+        tenant_writes = collections.OrderedDict()
+        for entry in segment:
+            if entry.operation != 'post':
+                tenant_writes.setdefault(entry.tenant_id, []).append(entry)
+        units = []
+        for tenant_id, writes in tenant_writes.items():
+            if not self._is_tenant_known(tenant_id):
+                units.append((writes, functools.partial(
+                    self._send_tenant, tenant_id, writes)))
+        in_units = set(entry.seqnum for unit, send in units
+                       for entry in unit)
+        units.extend(([entry], functools.partial(self._send_entry, entry))
+                     for entry in segment if entry.seqnum not in in_units)
+        return superseded, units
+
+    def _send_entry(self, entry):
+        if entry.operation == 'post':
+            self._send_rpc(entry.object_type, entry.get_data())
+        elif entry.operation == 'put':
+            self._send_write(entry.tenant_id, entry.object_type,
+                             entry.object_id, entry.get_data(), touch=False)
+        else:
+            self._send_delete(entry.tenant_id, entry.object_type,
+                              entry.object_id)
+
+    def _send_tenant(self, tenant_id, writes):
+        """Create a tenant with its objects, deletes have nothing to do."""
+        tenant = {"id": tenant_id}
+        for entry in writes:
+            if entry.operation != 'put':
+                continue
+            path, container = TENANT_OBJECTS[entry.object_type]
+            parent = tenant.setdefault(container, {}) if container else tenant
+            parent.setdefault(entry.object_type, []).append(entry.get_data())
+        if len(tenant) > 1:
+            self.create_update_tenant(tenant_id, tenant)
+
+    def register_endpoints(self, endpoints):
+        self._rpc('register-endpoint', endpoints)
 
     def unregister_endpoints(self, endpoints):
-        for ep in endpoints:
-            data = {"input": ep}
-            self._sendjson('post', self._unreg_ep_url, self._headers, data)
+        self._rpc('unregister-endpoint', endpoints)
 
     def create_update_tenant(self, tenant_id, tenant):
         url = (self._policy_url % {'tenant_id': tenant_id})
         data = {"tenant": tenant}
         self._sendjson('put', url, self._headers, data)
+        self._tenants.add(tenant_id)
 
     def create_action(self, tenant_id, action):
         """Create policy action"""
-        self._touch_tenant(tenant_id)
-        url = (self._action_url %
-               {'tenant_id': tenant_id, 'action': action['name']})
-        data = {"action-instance": action}
-        self._sendjson('put', url, self._headers, data)
+        self._write(tenant_id, 'action-instance', action['name'], action)
 
     def delete_action(self, tenant_id, action):
         """Delete policy action"""
-        url = (self._action_url %
-               {'tenant_id': tenant_id, 'action': action['name']})
-        self._sendjson('delete', url, self._headers)
+        self._delete(tenant_id, 'action-instance', action['name'])
 
     def create_classifier(self, tenant_id, classifier):
         """Create policy classifier"""
-        self._touch_tenant(tenant_id)
-        url = (self._classifier_url %
-               {'tenant_id': tenant_id, 'classifier': classifier['name']})
-        data = {"classifier-instance": classifier}
-        self._sendjson('put', url, self._headers, data)
+        self._write(tenant_id, 'classifier-instance', classifier['name'],
+                    classifier)
 
     def delete_classifier(self, tenant_id, classifier):
         """Delete policy classifier"""
-        url = (self._classifier_url %
-               {'tenant_id': tenant_id, 'classifier': classifier['name']})
-        self._sendjson('delete', url, self._headers)
+        self._delete(tenant_id, 'classifier-instance', classifier['name'])
 
     def create_update_l3_context(self, tenant_id, l3ctx):
-        self._touch_tenant(tenant_id)
-        url = (self._l3ctx_url %
-               {'tenant_id': tenant_id, 'l3ctx': l3ctx['id']})
-        data = {"l3-context": l3ctx}
-        self._sendjson('put', url, self._headers, data)
+        self._write(tenant_id, 'l3-context', l3ctx['id'], l3ctx)
 
     def delete_l3_context(self, tenant_id, l3ctx):
-        url = (self._l3ctx_url %
-               {'tenant_id': tenant_id, 'l3ctx': l3ctx['id']})
-        self._sendjson('delete', url, self._headers)
+        self._delete(tenant_id, 'l3-context', l3ctx['id'])
 
     def create_update_l2_bridge_domain(self, tenant_id, l2bd):
-        self._touch_tenant(tenant_id)
-        url = (self._l2bd_url %
-               {'tenant_id': tenant_id, 'l2bd': l2bd['id']})
-        data = {"l2-bridge-domain": l2bd}
-        self._sendjson('put', url, self._headers, data)
+        self._write(tenant_id, 'l2-bridge-domain', l2bd['id'], l2bd)
 
     def delete_l2_bridge_domain(self, tenant_id, l2bd):
-        url = (self._l2bd_url %
-               {'tenant_id': tenant_id, 'l2bd': l2bd['id']})
-        self._sendjson('delete', url, self._headers)
+        self._delete(tenant_id, 'l2-bridge-domain', l2bd['id'])
 
     def create_update_l2_flood_domain(self, tenant_id, l2fd):
-        self._touch_tenant(tenant_id)
-        url = (self._l2fd_url %
-               {'tenant_id': tenant_id, 'l2fd': l2fd['id']})
-        data = {"l2-flood-domain": l2fd}
-        self._sendjson('put', url, self._headers, data)
+        self._write(tenant_id, 'l2-flood-domain', l2fd['id'], l2fd)
 
     def delete_l2_flood_domain(self, tenant_id, l2fd):
-        url = (self._l2fd_url %
-               {'tenant_id': tenant_id, 'l2fd': l2fd['id']})
-        self._sendjson('delete', url, self._headers)
+        self._delete(tenant_id, 'l2-flood-domain', l2fd['id'])
 
     def create_update_endpoint_group(self, tenant_id, epg):
-        self._touch_tenant(tenant_id)
-        url = (self._epg_url %
-               {'tenant_id': tenant_id, 'epg': epg['id']})
-        data = {"endpoint-group": epg}
-        self._sendjson('put', url, self._headers, data)
+        self._write(tenant_id, 'endpoint-group', epg['id'], epg)
 
     def delete_endpoint_group(self, tenant_id, epg):
-        url = (self._epg_url %
-               {'tenant_id': tenant_id, 'epg': epg['id']})
-        self._sendjson('delete', url, self._headers)
+        self._delete(tenant_id, 'endpoint-group', epg['id'])
 
     def create_update_subnet(self, tenant_id, subnet):
-        self._touch_tenant(tenant_id)
-        url = (self._subnet_url %
-               {'tenant_id': tenant_id, 'subnet': subnet['id']})
-        data = {"subnet": subnet}
-        self._sendjson('put', url, self._headers, data)
+        self._write(tenant_id, 'subnet', subnet['id'], subnet)
 
     def delete_subnet(self, tenant_id, subnet):
-        url = (self._subnet_url %
-               {'tenant_id': tenant_id, 'subnet': subnet['id']})
-        self._sendjson('delete', url, self._headers)
+        self._delete(tenant_id, 'subnet', subnet['id'])
 
     def create_update_contract(self, tenant_id, contract):
-        url = (self._contract_url %
-               {'tenant_id': tenant_id, 'contract': contract['id']})
-        data = {"contract": contract}
-        self._sendjson('put', url, self._headers, data)
+        self._write(tenant_id, 'contract', contract['id'], contract,
+                    touch=False)
 
     def _touch_tenant(self, tenant_id):
         tenant = {
             "id": tenant_id
         }
-        if not self._is_tenant_created(tenant_id):
+        if not self._is_tenant_known(tenant_id):
             self.create_update_tenant(tenant_id, tenant)
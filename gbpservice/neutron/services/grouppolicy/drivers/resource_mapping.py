@@ -11,7 +11,6 @@
 #    under the License.
 
 import netaddr
-import operator
 
 from keystoneclient import exceptions as k_exceptions
 from keystoneclient.v2_0 import client as k_client
@@ -34,6 +33,8 @@ import sqlalchemy as sa
 from gbpservice.common import utils
 from gbpservice.network.neutronv2 import local_api
 from gbpservice.neutron.db.grouppolicy import group_policy_db as gpdb
+from gbpservice.neutron.db.grouppolicy import (
+    group_policy_mapping_db as gpmdb)
 from gbpservice.neutron.db import servicechain_db  # noqa
 from gbpservice.neutron.extensions import driver_proxy_group as proxy_ext
 from gbpservice.neutron.extensions import group_policy as gp_ext
@@ -42,11 +43,16 @@ from gbpservice.neutron.services.grouppolicy import (
 from gbpservice.neutron.services.grouppolicy.common import constants as gconst
 from gbpservice.neutron.services.grouppolicy.common import exceptions as exc
 from gbpservice.neutron.services.grouppolicy.drivers import nsp_manager
+from gbpservice.neutron.services.grouppolicy.drivers import subnet_allocator
 
 
 LOG = logging.getLogger(__name__)
 DEFAULT_SG_PREFIX = 'gbp_%s'
 SCI_CONSUMER_NOT_AVAILABLE = 'N/A'
+# Attributes telling SG rules apart, the rest is ignored when diffing them
+SG_RULE_KEY_ATTRIBUTES = ('security_group_id', 'direction', 'ethertype',
+                          'protocol', 'port_range_min', 'port_range_max',
+                          'remote_ip_prefix', 'remote_group_id')
 
 opts = [
     cfg.ListOpt('dns_nameservers',
@@ -206,7 +212,8 @@ class OwnedResourcesOperations(object):
                     first() is not None)
 
 
-class ImplicitResourceOperations(local_api.LocalAPI):
+class ImplicitResourceOperations(
+        local_api.LocalAPI, subnet_allocator.L3PolicySubnetAllocatorMixin):
 
     def _create_implicit_address_scope(self, context, clean_session=True,
                                        **kwargs):
@@ -338,8 +345,34 @@ class ImplicitResourceOperations(local_api.LocalAPI):
     def _get_l3p_allocated_subnets(self, context, l3p_id, clean_session=True):
         ptgs = context._plugin._get_l3p_ptgs(
             context._plugin_context.elevated(), l3p_id)
-        return self._get_ptg_cidrs(context, None, ptg_dicts=ptgs,
-                                   clean_session=clean_session)
+        subnet_ids = [x for ptg in ptgs for x in ptg['subnets']]
+        if not subnet_ids:
+            return []
+        return self._get_subnets(context._plugin_context.elevated(),
+                                 {'id': subnet_ids},
+                                 clean_session=clean_session)
+
+    def _get_l3p_explicit_subnet_cidrs(self, session, l3p_id):
+        """Returns the CIDRs of the subnets given to the PTGs of the L3P.
+
+        The subnets allocated by the driver are not returned, their CIDRs
+        are reserved in the subnet blocks of the L3P.
+        """
+        query = (session.query(models_v2.Subnet.cidr).
+                 join(gpmdb.PTGToSubnetAssociation,
+                      gpmdb.PTGToSubnetAssociation.subnet_id ==
+                      models_v2.Subnet.id).
+                 join(gpdb.PolicyTargetGroup,
+                      gpdb.PolicyTargetGroup.id ==
+                      gpmdb.PTGToSubnetAssociation.policy_target_group_id).
+                 join(gpdb.L2Policy,
+                      gpdb.L2Policy.id ==
+                      gpdb.PolicyTargetGroup.l2_policy_id).
+                 outerjoin(OwnedSubnet,
+                           OwnedSubnet.subnet_id == models_v2.Subnet.id).
+                 filter(gpdb.L2Policy.l3_policy_id == l3p_id,
+                        OwnedSubnet.subnet_id.is_(None)).distinct())
+        return [x.cidr for x in query]
 
     def _validate_and_add_subnet(self, context, subnet, l3p_id,
                                  clean_session=True):
@@ -350,16 +383,15 @@ class ImplicitResourceOperations(local_api.LocalAPI):
             with session.begin(subtransactions=True):
                 LOG.debug("starting validate_and_add_subnet transaction for "
                           "subnet %s", subnet_id)
-                ptgs = context._plugin._get_l3p_ptgs(
-                    context._plugin_context.elevated(), l3p_id)
-                allocated = netaddr.IPSet(
-                    iterable=self._get_ptg_cidrs(context, None,
-                                                 ptg_dicts=ptgs,
-                                                 clean_session=clean_session))
+                # The CIDR is reserved in the subnet blocks of the L3P, it
+                # can only overlap with the subnets given to its PTGs.
+                explicit = netaddr.IPSet(
+                    iterable=self._get_l3p_explicit_subnet_cidrs(session,
+                                                                 l3p_id))
                 cidr = subnet['cidr']
-                if cidr in allocated:
-                    LOG.debug("CIDR %s in-use for L3P %s, allocated: %s",
-                              cidr, l3p_id, allocated)
+                if explicit & netaddr.IPSet([cidr]):
+                    LOG.debug("CIDR %s in-use for L3P %s, explicit: %s",
+                              cidr, l3p_id, explicit)
                     raise CidrInUse(cidr=cidr, l3p_id=l3p_id)
                 context.add_subnet(subnet_id)
                 LOG.debug("ending validate_and_add_subnet transaction for "
@@ -398,29 +430,36 @@ class ImplicitResourceOperations(local_api.LocalAPI):
         # algorithm that should be replaced with use of a neutron
         # subnet pool.
 
-        pool = netaddr.IPSet(
-            iterable=[l3p['proxy_ip_pool'] if is_proxy else
-                      l3p['ip_pool']])
+        ip_pool = l3p['proxy_ip_pool'] if is_proxy else l3p['ip_pool']
         prefixlen = prefix_len or (
             l3p['proxy_subnet_prefix_length'] if is_proxy
             else l3p['subnet_prefix_length'])
         l3p_id = l3p['id']
-        allocated = netaddr.IPSet(
-            iterable=self._get_l3p_allocated_subnets(
-                context, l3p_id, clean_session=clean_session))
-        available = pool - allocated
-        available.compact()
-
-        for cidr in sorted(available.iter_cidrs(),
-                           key=operator.attrgetter('prefixlen'),
-                           reverse=True):
-            if prefixlen < cidr.prefixlen:
-                # Close the loop, no remaining subnet is big enough
-                # for this allocation
-                break
+        session = context._plugin_context.session
+
+        def get_allocated():
+            return self._get_l3p_allocated_subnets(
+                context, l3p_id, clean_session=clean_session)
+
+        reset = False
+        while True:
+            cidr = self._allocate_l3p_subnet_block(
+                session, l3p_id, ip_pool, prefixlen, get_allocated)
+            if not cidr:
+                if reset:
+                    break
+                # Give the blocks of subnets deleted without being
+                # released back once, the free blocks of the pool are set
+                # up again around the subnets in use
+                self._reset_l3p_subnet_pool(session, l3p_id, ip_pool,
+                                            get_allocated)
+                reset = True
+                continue
             generator = self._generate_subnets_from_cidrs(
-                context, l2p, l3p, cidr.subnet(prefixlen),
-                subnet_specifics, clean_session=clean_session)
+                context, l2p, l3p, [cidr], subnet_specifics,
+                clean_session=clean_session)
+            # A CIDR overlapping within the network is not created, its
+            # block stays reserved and the next one is tried.
             for subnet in generator:
                 LOG.debug("Trying subnet %s for PTG %s", subnet,
                           context.current['id'])
@@ -430,15 +469,16 @@ class ImplicitResourceOperations(local_api.LocalAPI):
                                             subnet_id)
                     self._validate_and_add_subnet(context, subnet, l3p_id,
                                                   clean_session=clean_session)
+                    self._set_l3p_subnet_block_subnet(
+                        session, l3p_id, ip_pool, cidr, subnet_id)
                     LOG.debug("Using subnet %s for PTG %s", subnet,
                               context.current['id'])
                     return [subnet]
                 except CidrInUse:
-                    # This exception is expected when a concurrent
-                    # request has beat this one to calling
-                    # _validate_and_add_subnet() using the same
-                    # available CIDR. We delete the subnet and try the
-                    # next available CIDR.
+                    # The CIDR is reserved before the subnet is created,
+                    # so this is only expected when it is used by an
+                    # explicit subnet of the L3P. We delete the subnet,
+                    # keep the block reserved and try the next one.
                     self._delete_subnet(context._plugin_context,
                                         subnet['id'],
                                         clean_session=clean_session)
@@ -449,6 +489,8 @@ class ImplicitResourceOperations(local_api.LocalAPI):
                     self._delete_subnet(context._plugin_context,
                                         subnet['id'],
                                         clean_session=clean_session)
+                    self._release_l3p_subnet_block(
+                        session, l3p_id=l3p_id, ip_pool=ip_pool, cidr=cidr)
                     raise exc.GroupPolicyInternalError()
         raise exc.NoSubnetAvailable()
 
@@ -532,6 +574,8 @@ class ImplicitResourceOperations(local_api.LocalAPI):
         if self._subnet_is_owned(plugin_context.session, subnet_id):
             self._delete_subnet(plugin_context, subnet_id,
                                 clean_session=clean_session)
+            self._release_l3p_subnet_block(plugin_context.session,
+                                           subnet_id=subnet_id)
 
     def _get_default_security_group(self, plugin_context, ptg_id,
                                     tenant_id, clean_session=True):
@@ -556,18 +600,8 @@ class ImplicitResourceOperations(local_api.LocalAPI):
                                                clean_session=clean_session)
         for subnet in subnets:
             try:
-                attrs = {'tenant_id': context.current['tenant_id'],
-                         'name': 'pt_' + context.current['name'],
-                         'network_id': l2p['network_id'],
-                         'mac_address': attributes.ATTR_NOT_SPECIFIED,
-                         'fixed_ips': [{'subnet_id': subnet['id']}],
-                         'device_id': '',
-                         'device_owner': '',
-                         'security_groups': [sg_id] if sg_id else None,
-                         'admin_state_up': True}
-                if context.current.get('group_default_gateway'):
-                    attrs['fixed_ips'][0]['ip_address'] = subnet['gateway_ip']
-                attrs.update(context.current.get('port_attributes', {}))
+                attrs = self._get_implicit_port_attrs(context, l2p, subnet,
+                                                      sg_id)
                 port = self._create_port(context._plugin_context, attrs,
                                          clean_session=clean_session)
                 port_id = port['id']
@@ -580,6 +614,73 @@ class ImplicitResourceOperations(local_api.LocalAPI):
                 last = ex
         raise last
 
+    def _get_implicit_port_attrs(self, context, l2p, subnet, sg_id):
+        attrs = {'tenant_id': context.current['tenant_id'],
+                 'name': 'pt_' + context.current['name'],
+                 'network_id': l2p['network_id'],
+                 'mac_address': attributes.ATTR_NOT_SPECIFIED,
+                 'fixed_ips': [{'subnet_id': subnet['id']}],
+                 'device_id': '',
+                 'device_owner': '',
+                 'security_groups': [sg_id] if sg_id else None,
+                 'admin_state_up': True}
+        if context.current.get('group_default_gateway'):
+            attrs['fixed_ips'][0]['ip_address'] = subnet['gateway_ip']
+        attrs.update(context.current.get('port_attributes', {}))
+        return attrs
+
+    def _use_implicit_ports(self, contexts, clean_session=True):
+        """Creates the implicit ports of many policy targets at once.
+
+        The groups, L2 policies and subnets of the policy targets are
+        fetched once, and all the ports are created in a single call, on
+        the first subnet of their group. If that fails, the ports are
+        created one by one trying all the subnets of the group in turn.
+        """
+        plugin_context = contexts[0]._plugin_context
+        plugin = contexts[0]._plugin
+        ptg_ids = set(context.current['policy_target_group_id']
+                      for context in contexts)
+        ptgs = dict((ptg['id'], ptg) for ptg in
+                    plugin.get_policy_target_groups(
+                        plugin_context, filters={'id': list(ptg_ids)}))
+        l2ps = dict((l2p['id'], l2p) for l2p in plugin.get_l2_policies(
+            plugin_context, filters={'id': list(set(
+                ptg['l2_policy_id'] for ptg in ptgs.values()))}))
+        subnet_ids = [x for ptg in ptgs.values() for x in ptg['subnets']]
+        subnets = self._get_subnets(plugin_context, {'id': subnet_ids},
+                                    clean_session=clean_session)
+        first_subnets = {}
+        for ptg in ptgs.values():
+            ptg_subnets = [x for x in subnets if x['id'] in ptg['subnets']]
+            if not ptg_subnets:
+                raise exc.NoSubnetAvailable()
+            first_subnets[ptg['id']] = ptg_subnets[0]
+        sg_ids = {}
+        attrs_list = []
+        for context in contexts:
+            ptg = ptgs[context.current['policy_target_group_id']]
+            key = (ptg['id'], context.current['tenant_id'])
+            if key not in sg_ids:
+                sg_ids[key] = self._get_default_security_group(
+                    plugin_context, ptg['id'], context.current['tenant_id'],
+                    clean_session=clean_session)
+            attrs_list.append(self._get_implicit_port_attrs(
+                context, l2ps[ptg['l2_policy_id']], first_subnets[ptg['id']],
+                sg_ids[key]))
+        try:
+            ports = self._create_ports(plugin_context, attrs_list,
+                                       clean_session=clean_session)
+        except n_exc.IpAddressGenerationFailure:
+            LOG.warning(_LW("No more addresses available to create the "
+                            "ports in bulk, creating them one by one"))
+            for context in contexts:
+                self._use_implicit_port(context, clean_session=clean_session)
+            return
+        for context, port in zip(contexts, ports):
+            self._mark_port_owned(plugin_context.session, port['id'])
+            context.set_port_id(port['id'])
+
     def _cleanup_port(self, plugin_context, port_id):
         if self._port_is_owned(plugin_context.session, port_id):
             try:
@@ -782,6 +883,15 @@ class ResourceMappingDriver(api.PolicyDriver, ImplicitResourceOperations,
             if pts:
                 exc.OnlyOneGroupDefaultGatewayAllowed(group_id=group_id)
 
+    @log.log_method_call
+    def create_policy_target_bulk_postcommit(self, contexts):
+        implicit = [context for context in contexts
+                    if not context.current['port_id']]
+        if implicit:
+            self._use_implicit_ports(implicit)
+        for context in contexts:
+            self.create_policy_target_postcommit(context)
+
     @log.log_method_call
     def create_policy_target_postcommit(self, context):
         if not context.current['port_id']:
@@ -2023,6 +2133,8 @@ class ResourceMappingDriver(api.PolicyDriver, ImplicitResourceOperations,
                                      new_classifier=None):
         policy_rule_set_list = context._plugin.get_policy_rule_sets(
                 context._plugin_context, filters={'id': policy_rule_sets})
+        set_rules = []
+        unset_rules = []
         for policy_rule_set in policy_rule_set_list:
             filtered_rules = self._get_enforced_prs_rules(
                 context, policy_rule_set, subset=[policy_rule['id']])
@@ -2033,13 +2145,17 @@ class ResourceMappingDriver(api.PolicyDriver, ImplicitResourceOperations,
                         policy_rule_set['id']))
                 cidr_mapping = self._get_cidrs_mapping(
                     context, policy_rule_set)
-                self._add_or_remove_policy_rule_set_rule(
-                    context, policy_rule, policy_rule_set_sg_mappings,
-                    cidr_mapping, unset=True, unset_egress=True,
-                    classifier=old_classifier)
-                self._add_or_remove_policy_rule_set_rule(
-                    context, policy_rule, policy_rule_set_sg_mappings,
-                    cidr_mapping, classifier=new_classifier)
+                unset_rules.extend(self._get_policy_rule_set_sg_rules(
+                    context, policy_rule_set, [policy_rule],
+                    policy_rule_set_sg_mappings, cidr_mapping,
+                    classifier=old_classifier))
+                set_rules.extend(self._get_policy_rule_set_sg_rules(
+                    context, policy_rule_set, [policy_rule],
+                    policy_rule_set_sg_mappings, cidr_mapping,
+                    classifier=new_classifier))
+        self._set_and_unset_sg_rules(context._plugin_context,
+                                     set_rules=set_rules,
+                                     unset_rules=unset_rules)
 
     def _get_rule_ids_for_actions(self, context, action_id):
         policy_rule_qry = context.session.query(
@@ -2125,47 +2241,61 @@ class ResourceMappingDriver(api.PolicyDriver, ImplicitResourceOperations,
             return (session.query(PolicyRuleSetSGsMapping).
                     filter_by(policy_rule_set_id=policy_rule_set_id).one())
 
-    def _sg_rule(self, plugin_context, tenant_id, sg_id, direction,
-                 protocol=None, port_range=None, cidr=None,
-                 ethertype=const.IPv4, unset=False):
+    @staticmethod
+    def _sg_rule_attrs(tenant_id, sg_id, direction, protocol=None,
+                       port_range=None, cidr=None, ethertype=const.IPv4):
         if port_range:
             port_min, port_max = (gpdb.GroupPolicyDbPlugin.
                                   _get_min_max_ports_from_range(port_range))
         else:
             port_min, port_max = None, None
 
-        attrs = {'tenant_id': tenant_id,
-                 'security_group_id': sg_id,
-                 'direction': direction,
-                 'ethertype': ethertype,
-                 'protocol': protocol,
-                 'port_range_min': port_min,
-                 'port_range_max': port_max,
-                 'remote_ip_prefix': cidr,
-                 'remote_group_id': None}
-        if unset:
-            filters = {}
-            for key in attrs:
-                value = attrs[key]
-                if value:
-                    filters[key] = [value]
-            rule = self._get_sg_rules(plugin_context, filters)
-            if rule:
-                self._delete_sg_rule(plugin_context, rule[0]['id'])
-        else:
-            return self._create_sg_rule(plugin_context, attrs)
+        return {'tenant_id': tenant_id,
+                'security_group_id': sg_id,
+                'direction': direction,
+                'ethertype': ethertype,
+                'protocol': protocol,
+                'port_range_min': port_min,
+                'port_range_max': port_max,
+                'remote_ip_prefix': cidr,
+                'remote_group_id': None}
 
-    def _sg_ingress_rule(self, context, sg_id, protocol, port_range, cidr,
-                         tenant_id, unset=False):
-        return self._sg_rule(
-            context._plugin_context, tenant_id, sg_id,
-            'ingress', protocol, port_range, cidr, unset=unset)
+    @staticmethod
+    def _sg_rule_key(rule):
+        return tuple(rule[key] for key in SG_RULE_KEY_ATTRIBUTES)
+
+    def _set_and_unset_sg_rules(self, plugin_context, set_rules=None,
+                                unset_rules=None):
+        """Sets & unsets SG rules, given by their attributes, at once.
 
-    def _sg_egress_rule(self, context, sg_id, protocol, port_range,
-                        cidr, tenant_id, unset=False):
-        return self._sg_rule(
-            context._plugin_context, tenant_id, sg_id,
-            'egress', protocol, port_range, cidr, unset=unset)
+        The rules of the SGs involved are fetched once and diffed with
+        the requested ones: the missing rules to set are created in bulk
+        and the existing rules to unset are deleted. A rule both set and
+        unset is left in place.
+        """
+        set_rules = set_rules or []
+        unset_rules = unset_rules or []
+        sg_ids = set(rule['security_group_id']
+                     for rule in set_rules + unset_rules)
+        if not sg_ids:
+            return
+        existing = {}
+        for rule in self._get_sg_rules(
+                plugin_context, filters={'security_group_id': list(sg_ids)}):
+            existing.setdefault(self._sg_rule_key(rule), rule['id'])
+        to_set = {}
+        to_create = []
+        for rule in set_rules:
+            key = self._sg_rule_key(rule)
+            if key not in to_set:
+                to_set[key] = rule
+                if key not in existing:
+                    to_create.append(rule)
+        for key in set(self._sg_rule_key(rule) for rule in unset_rules):
+            if key in existing and key not in to_set:
+                self._delete_sg_rule(plugin_context, existing[key])
+        if to_create:
+            self._create_sg_rules(plugin_context, to_create)
 
     def _assoc_sgs_to_pt(self, context, pt_id, sg_list):
         try:
@@ -2302,14 +2432,18 @@ class ResourceMappingDriver(api.PolicyDriver, ImplicitResourceOperations,
                                       provided_policy_rule_sets,
                                       consumed_policy_rule_sets, unset=False):
         prov_cons = ['providing_cidrs', 'consuming_cidrs']
+        sg_rules = []
         for pos, policy_rule_sets in enumerate(
                 [provided_policy_rule_sets, consumed_policy_rule_sets]):
-            for policy_rule_set_id in policy_rule_sets:
-                policy_rule_set = context._plugin.get_policy_rule_set(
-                    context._plugin_context, policy_rule_set_id)
+            if not policy_rule_sets:
+                continue
+            for policy_rule_set in context._plugin.get_policy_rule_sets(
+                    context._plugin_context,
+                    filters={'id': policy_rule_sets}):
                 policy_rule_set_sg_mappings = (
                     self._get_policy_rule_set_sg_mapping(
-                        context._plugin_context.session, policy_rule_set_id))
+                        context._plugin_context.session,
+                        policy_rule_set['id']))
                 cidr_mapping = {prov_cons[pos]: cidr_list,
                                 prov_cons[pos - 1]: []}
                 if not unset:
@@ -2320,10 +2454,15 @@ class ResourceMappingDriver(api.PolicyDriver, ImplicitResourceOperations,
                     policy_rules = context._plugin.get_policy_rules(
                         context._plugin_context,
                         {'id': policy_rule_set['policy_rules']})
-                for policy_rule in policy_rules:
-                    self._add_or_remove_policy_rule_set_rule(
-                        context, policy_rule, policy_rule_set_sg_mappings,
-                        cidr_mapping, unset=unset)
+                sg_rules.extend(self._get_policy_rule_set_sg_rules(
+                    context, policy_rule_set, policy_rules,
+                    policy_rule_set_sg_mappings, cidr_mapping))
+        if unset:
+            self._set_and_unset_sg_rules(context._plugin_context,
+                                         unset_rules=sg_rules)
+        else:
+            self._set_and_unset_sg_rules(context._plugin_context,
+                                         set_rules=sg_rules)
 
     def _manage_policy_rule_set_rules(self, context, policy_rule_set,
                                       policy_rules, unset=False,
@@ -2333,45 +2472,61 @@ class ResourceMappingDriver(api.PolicyDriver, ImplicitResourceOperations,
         policy_rule_set = context._plugin.get_policy_rule_set(
             context._plugin_context, policy_rule_set['id'])
         cidr_mapping = self._get_cidrs_mapping(context, policy_rule_set)
-        for policy_rule in policy_rules:
-            self._add_or_remove_policy_rule_set_rule(
-                context, policy_rule, policy_rule_set_sg_mappings,
-                cidr_mapping, unset=unset, unset_egress=unset_egress)
-
-    def _add_or_remove_policy_rule_set_rule(self, context, policy_rule,
-                                            policy_rule_set_sg_mappings,
-                                            cidr_mapping, unset=False,
-                                            unset_egress=False,
-                                            classifier=None):
+        sg_rules = self._get_policy_rule_set_sg_rules(
+            context, policy_rule_set, policy_rules,
+            policy_rule_set_sg_mappings, cidr_mapping)
+        if unset or unset_egress:
+            self._set_and_unset_sg_rules(context._plugin_context,
+                                         unset_rules=sg_rules)
+        else:
+            self._set_and_unset_sg_rules(context._plugin_context,
+                                         set_rules=sg_rules)
+
+    def _get_policy_rule_set_sg_rules(self, context, policy_rule_set,
+                                      policy_rules,
+                                      policy_rule_set_sg_mappings,
+                                      cidr_mapping, classifier=None,
+                                      classifiers=None):
+        """Returns the attributes of the SG rules enforcing policy_rules.
+
+        The rules go in the SGs of the PRS and allow the traffic of the
+        rule classifiers from the CIDRs of cidr_mapping. The classifier,
+        if given, is used in place of the ones of the rules. Classifiers
+        already fetched can be passed by id in classifiers.
+        """
         in_out = [gconst.GP_DIRECTION_IN, gconst.GP_DIRECTION_OUT]
         prov_cons = [policy_rule_set_sg_mappings['provided_sg_id'],
                      policy_rule_set_sg_mappings['consumed_sg_id']]
         cidr_prov_cons = [cidr_mapping['providing_cidrs'],
                           cidr_mapping['consuming_cidrs']]
-
-        if not classifier:
-            classifier_id = policy_rule['policy_classifier_id']
-            classifier = context._plugin.get_policy_classifier(
-                context._plugin_context, classifier_id)
-
-        protocol = classifier['protocol']
-        port_range = classifier['port_range']
-        admin_context = n_context.get_admin_context()
-        prs = context._plugin.get_policy_rule_set(
-            admin_context, policy_rule_set_sg_mappings.policy_rule_set_id)
-        tenant_id = prs['tenant_id']
-        for pos, sg in enumerate(prov_cons):
-            if classifier['direction'] in [gconst.GP_DIRECTION_BI,
-                                           in_out[pos]]:
-                for cidr in cidr_prov_cons[pos - 1]:
-                    self._sg_ingress_rule(context, sg, protocol, port_range,
-                                          cidr, tenant_id, unset=unset)
-            if classifier['direction'] in [gconst.GP_DIRECTION_BI,
-                                           in_out[pos - 1]]:
-                for cidr in cidr_prov_cons[pos - 1]:
-                    self._sg_egress_rule(context, sg, protocol, port_range,
-                                         cidr, tenant_id,
-                                         unset=unset or unset_egress)
+        tenant_id = policy_rule_set['tenant_id']
+
+        if not policy_rules:
+            return []
+        if not classifier and classifiers is None:
+            classifiers = dict(
+                (x['id'], x) for x in context._plugin.get_policy_classifiers(
+                    context._plugin_context,
+                    filters={'id': list(set(
+                        x['policy_classifier_id'] for x in policy_rules))}))
+        sg_rules = []
+        for policy_rule in policy_rules:
+            pc = classifier or classifiers[policy_rule['policy_classifier_id']]
+            protocol = pc['protocol']
+            port_range = pc['port_range']
+            for pos, sg in enumerate(prov_cons):
+                if pc['direction'] in [gconst.GP_DIRECTION_BI, in_out[pos]]:
+                    for cidr in cidr_prov_cons[pos - 1]:
+                        sg_rules.append(self._sg_rule_attrs(
+                            tenant_id, sg, 'ingress', protocol, port_range,
+                            cidr))
+                if pc['direction'] in [gconst.GP_DIRECTION_BI,
+                                       in_out[pos - 1]]:
+                    for cidr in cidr_prov_cons[pos - 1]:
+                        sg_rules.append(self._sg_rule_attrs(
+                            tenant_id, sg, 'egress', protocol, port_range,
+                            cidr))
+        return sg_rules
 
     def _apply_policy_rule_set_rules(self, context, policy_rule_set,
                                      policy_rules):
@@ -2390,31 +2545,66 @@ class ResourceMappingDriver(api.PolicyDriver, ImplicitResourceOperations,
     def _recompute_policy_rule_sets(self, context, children):
         # Rules in child but not in parent shall be removed
         # Child rules will be set after being filtered by the parent
+        # The children, their parents, rules & classifiers are fetched
+        # once, and the SG rules of all the children changed at once.
+        if not children:
+            return
+        plugin_context = context._plugin_context
+        children = context._plugin.get_policy_rule_sets(
+            plugin_context, filters={'id': list(children)})
+        parent_ids = set(x['parent_id'] for x in children if x['parent_id'])
+        parents = {}
+        if parent_ids:
+            parents = dict((x['id'], x) for x in
+                           context._plugin.get_policy_rule_sets(
+                               plugin_context,
+                               filters={'id': list(parent_ids)}))
+        rule_ids = set()
+        for prs in children + parents.values():
+            rule_ids.update(prs['policy_rules'])
+        rules = {}
+        classifiers = {}
+        if rule_ids:
+            rules = dict(
+                (x['id'], x) for x in context._plugin.get_policy_rules(
+                    plugin_context, filters={'id': list(rule_ids)}))
+            classifiers = dict(
+                (x['id'], x) for x in context._plugin.get_policy_classifiers(
+                    plugin_context, filters={'id': list(set(
+                        x['policy_classifier_id'] for x in rules.values()))}))
+
+        set_rules = []
+        unset_rules = []
         for child in children:
-            child = context._plugin.get_policy_rule_set(
-                context._plugin_context, child)
-            child_rule_ids = set(child['policy_rules'])
+            child_rules = [rules[x] for x in child['policy_rules']
+                           if x in rules]
+            removed_rules = []
             if child['parent_id']:
-                parent = context._plugin.get_policy_rule_set(
-                    context._plugin_context, child['parent_id'])
-                parent_policy_rules = context._plugin.get_policy_rules(
-                                        context._plugin_context,
-                                        filters={'id': parent['policy_rules']})
-                child_rules = context._plugin.get_policy_rules(
-                                        context._plugin_context,
-                                        filters={'id': child['policy_rules']})
-                parent_classifier_ids = [x['policy_classifier_id']
-                                     for x in parent_policy_rules]
-                delta_rules = [x['id'] for x in child_rules
+                parent = parents.get(child['parent_id'])
+                parent_classifier_ids = set(
+                    rules[x]['policy_classifier_id']
+                    for x in (parent['policy_rules'] if parent else [])
+                    if x in rules)
+                removed_rules = [x for x in child_rules
+                                 if x['policy_classifier_id']
+                                 not in parent_classifier_ids]
+                child_rules = [x for x in child_rules
                                if x['policy_classifier_id']
-                               not in set(parent_classifier_ids)]
-                delta_rules = context._plugin.get_policy_rules(
-                                context._plugin_context, {'id': delta_rules})
-                self._remove_policy_rule_set_rules(context, child, delta_rules)
+                               in parent_classifier_ids]
+            if not child_rules and not removed_rules:
+                continue
+            policy_rule_set_sg_mappings = self._get_policy_rule_set_sg_mapping(
+                plugin_context.session, child['id'])
+            cidr_mapping = self._get_cidrs_mapping(context, child)
+            unset_rules.extend(self._get_policy_rule_set_sg_rules(
+                context, child, removed_rules, policy_rule_set_sg_mappings,
+                cidr_mapping, classifiers=classifiers))
             # Old parent may have filtered some rules, need to add them again
-            child_rules = context._plugin.get_policy_rules(
-                context._plugin_context, filters={'id': child_rule_ids})
-            self._apply_policy_rule_set_rules(context, child, child_rules)
+            set_rules.extend(self._get_policy_rule_set_sg_rules(
+                context, child, child_rules, policy_rule_set_sg_mappings,
+                cidr_mapping, classifiers=classifiers))
+        self._set_and_unset_sg_rules(plugin_context, set_rules=set_rules,
+                                     unset_rules=unset_rules)
 
     def _update_default_security_group(self, plugin_context, ptg_id,
                                        tenant_id, subnets=None):
@@ -2428,14 +2618,15 @@ class ResourceMappingDriver(api.PolicyDriver, ImplicitResourceOperations,
                                      description='default GBP security group')
             sg_id = sg['id']
 
+        sg_rules = []
         for subnet in self._get_subnets(
                 plugin_context, filters={'id': subnets or []}):
-            self._sg_rule(plugin_context, tenant_id, sg_id,
-                          'ingress', cidr=subnet['cidr'],
-                          ethertype=ip_v[subnet['ip_version']])
-            self._sg_rule(plugin_context, tenant_id, sg_id,
-                          'egress', cidr=subnet['cidr'],
-                          ethertype=ip_v[subnet['ip_version']])
+            sg_rules.append(self._sg_rule_attrs(
+                tenant_id, sg_id, 'ingress', cidr=subnet['cidr'],
+                ethertype=ip_v[subnet['ip_version']]))
+            sg_rules.append(self._sg_rule_attrs(
+                tenant_id, sg_id, 'egress', cidr=subnet['cidr'],
+                ethertype=ip_v[subnet['ip_version']]))
 
         # The following rules are added for access to the link local
         # network (metadata server in most cases), and to the DNS
@@ -2446,13 +2637,15 @@ class ResourceMappingDriver(api.PolicyDriver, ImplicitResourceOperations,
         # default SG we cannot delete all the rules in it.
         # We can also consider reading these rules from a config which
         # would make it more flexible to add any rules if required.
-        self._sg_rule(plugin_context, tenant_id, sg_id, 'egress',
-                      cidr='169.254.0.0/16', ethertype=ip_v[4])
+        sg_rules.append(self._sg_rule_attrs(
+            tenant_id, sg_id, 'egress', cidr='169.254.0.0/16',
+            ethertype=ip_v[4]))
         for ether_type in ip_v:
             for proto in [const.PROTO_NAME_TCP, const.PROTO_NAME_UDP]:
-                self._sg_rule(plugin_context, tenant_id, sg_id, 'egress',
-                              protocol=proto, port_range='53',
-                              ethertype=ip_v[ether_type])
+                sg_rules.append(self._sg_rule_attrs(
+                    tenant_id, sg_id, 'egress', protocol=proto,
+                    port_range='53', ethertype=ip_v[ether_type]))
+        self._set_and_unset_sg_rules(plugin_context, set_rules=sg_rules)
 
         return sg_id
 
@@ -2644,20 +2837,18 @@ class ResourceMappingDriver(api.PolicyDriver, ImplicitResourceOperations,
         if prs['parent_id']:
             parent = context._plugin.get_policy_rule_set(
                 context._plugin_context, prs['parent_id'])
-            parent_policy_rules = context._plugin.get_policy_rules(
-                context._plugin_context,
-                filters={'id': parent['policy_rules']})
-            subset_rules = context._plugin.get_policy_rules(
-                                        context._plugin_context,
-                                        filters={'id': subset})
-            parent_classifier_ids = set(x['policy_classifier_id']
-                                        for x in parent_policy_rules)
-            policy_rules = [x['id'] for x in subset_rules
-                            if x['policy_classifier_id']
-                            in parent_classifier_ids]
-            return context._plugin.get_policy_rules(
+            # Parent and subset rules are fetched together
+            policy_rules = context._plugin.get_policy_rules(
                 context._plugin_context,
-                {'id': policy_rules})
+                filters={'id': list(set(subset) |
+                                    set(parent['policy_rules']))})
+            parent_classifier_ids = set(
+                x['policy_classifier_id'] for x in policy_rules
+                if x['id'] in parent['policy_rules'])
+            subset = set(subset)
+            return [x for x in policy_rules
+                    if x['id'] in subset and
+                    x['policy_classifier_id'] in parent_classifier_ids]
         else:
             return context._plugin.get_policy_rules(
                 context._plugin_context, {'id': set(subset)})
@@ -0,0 +1,221 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import netaddr
+from neutron.db import model_base
+from oslo_db import exception as db_exc
+from oslo_log import log as logging
+import sqlalchemy as sa
+
+LOG = logging.getLogger(__name__)
+
+
+class L3PolicySubnetPool(model_base.BASEV2):
+    """An IP pool of a L3 Policy whose blocks are tracked in the DB."""
+
+    __tablename__ = 'gpm_l3p_subnet_pools'
+    l3_policy_id = sa.Column(sa.String(36),
+                             sa.ForeignKey('gp_l3_policies.id',
+                                           ondelete='CASCADE'),
+                             nullable=False, primary_key=True)
+    ip_pool = sa.Column(sa.String(64), nullable=False, primary_key=True)
+
+
+class L3PolicySubnetBlock(model_base.BASEV2):
+    """A CIDR of a L3 Policy IP pool, either free or allocated.
+
+    The free blocks are the largest aligned CIDRs not allocated, the way
+    a buddy allocator keeps them.
+    """
+
+    __tablename__ = 'gpm_l3p_subnet_blocks'
+    __table_args__ = (
+        sa.Index('ix_gpm_l3p_subnet_blocks_free', 'l3_policy_id', 'ip_pool',
+                 'allocated', 'prefixlen', 'address'),
+        model_base.BASEV2.__table_args__
+    )
+    l3_policy_id = sa.Column(sa.String(36),
+                             sa.ForeignKey('gp_l3_policies.id',
+                                           ondelete='CASCADE'),
+                             nullable=False, primary_key=True)
+    ip_pool = sa.Column(sa.String(64), nullable=False, primary_key=True)
+    cidr = sa.Column(sa.String(64), nullable=False, primary_key=True)
+    prefixlen = sa.Column(sa.Integer, nullable=False)
+    # First address in zero padded hex, sorts as the addresses do
+    address = sa.Column(sa.String(32), nullable=False)
+    allocated = sa.Column(sa.Boolean, nullable=False)
+    # Subnet created on an allocated block, unset till it is created
+    subnet_id = sa.Column(sa.String(36), nullable=True, index=True)
+
+
+def _block(l3p_id, ip_pool, cidr, allocated=False, subnet_id=None):
+    width = 8 if cidr.version == 4 else 32
+    return L3PolicySubnetBlock(
+        l3_policy_id=l3p_id, ip_pool=ip_pool, cidr=str(cidr),
+        prefixlen=cidr.prefixlen, address='%0*x' % (width, cidr.first),
+        allocated=allocated, subnet_id=subnet_id)
+
+
+class L3PolicySubnetAllocatorMixin(object):
+    """Allocates subnet CIDRs from the IP pools of L3 Policies.
+
+    The pool blocks are kept in the DB, the allocation of a CIDR takes
+    the smallest free block it fits in, with the lowest address, and
+    splits it. Releasing a CIDR merges it back with its free buddies.
+    Both are done with a few indexed queries, whatever the number of
+    subnets already allocated from the pool.
+
+    A pool is set up on its first allocation from the subnets already in
+    use. Allocating reserves the CIDR in the DB before any subnet is
+    created on it, so that concurrent allocations never hand out the
+    same CIDR.
+    """
+
+    def _ensure_l3p_subnet_pool(self, session, l3p_id, ip_pool,
+                                get_allocated):
+        """Sets the blocks of a pool up, unless they already are.
+
+        :param get_allocated: returns the subnets, with id & cidr, already
+            allocated from the pool.
+        """
+        if session.query(L3PolicySubnetPool).filter_by(
+                l3_policy_id=l3p_id, ip_pool=ip_pool).first():
+            return
+        with session.begin(subtransactions=True):
+            session.add(L3PolicySubnetPool(l3_policy_id=l3p_id,
+                                           ip_pool=ip_pool))
+            self._add_l3p_subnet_blocks(session, l3p_id, ip_pool,
+                                        get_allocated(), netaddr.IPSet())
+
+    def _add_l3p_subnet_blocks(self, session, l3p_id, ip_pool, subnets,
+                               used):
+        """Adds the blocks of subnets and the free ones around them.
+
+        :param used: the CIDRs of the pool already in a block.
+        """
+        pool = netaddr.IPNetwork(ip_pool).cidr
+        for subnet in subnets:
+            cidr = netaddr.IPNetwork(subnet['cidr']).cidr
+            if (cidr.version != pool.version or cidr not in pool or
+                    used & netaddr.IPSet([cidr])):
+                continue
+            used.add(cidr)
+            session.add(_block(l3p_id, ip_pool, cidr, allocated=True,
+                               subnet_id=subnet['id']))
+        for cidr in (netaddr.IPSet([pool]) - used).iter_cidrs():
+            session.add(_block(l3p_id, ip_pool, cidr))
+
+    def _reset_l3p_subnet_pool(self, session, l3p_id, ip_pool,
+                               get_allocated):
+        """Sets the free blocks of a pool up again from the subnets in use.
+
+        Gives back the blocks of subnets which got deleted without being
+        released. The blocks of subnets in use are kept, as are the ones
+        reserved by allocations whose subnet is not set yet, so that a
+        CIDR being allocated concurrently is never handed out again.
+        """
+        LOG.debug("Resetting subnet blocks of pool %s of L3P %s",
+                  ip_pool, l3p_id)
+        with session.begin(subtransactions=True):
+            blocks = (session.query(L3PolicySubnetBlock).
+                      filter_by(l3_policy_id=l3p_id, ip_pool=ip_pool).
+                      with_lockmode('update').all())
+            subnets = get_allocated()
+            in_use = set(subnet['id'] for subnet in subnets)
+            kept = netaddr.IPSet()
+            for block in blocks:
+                if block.allocated and (block.subnet_id is None or
+                                        block.subnet_id in in_use):
+                    kept.add(netaddr.IPNetwork(block.cidr))
+                else:
+                    session.delete(block)
+            session.flush()
+            self._add_l3p_subnet_blocks(session, l3p_id, ip_pool, subnets,
+                                        kept)
+
+    def _allocate_l3p_subnet_block(self, session, l3p_id, ip_pool,
+                                   prefixlen, get_allocated):
+        """Reserves a CIDR of prefixlen in the pool, None if none is free.
+        """
+        try:
+            return self._do_allocate_l3p_subnet_block(
+                session, l3p_id, ip_pool, prefixlen, get_allocated)
+        except db_exc.DBDuplicateEntry:
+            # The pool got set up concurrently, use it
+            return self._do_allocate_l3p_subnet_block(
+                session, l3p_id, ip_pool, prefixlen, get_allocated)
+
+    def _do_allocate_l3p_subnet_block(self, session, l3p_id, ip_pool,
+                                      prefixlen, get_allocated):
+        with session.begin(subtransactions=True):
+            self._ensure_l3p_subnet_pool(session, l3p_id, ip_pool,
+                                         get_allocated)
+            # Concurrent allocations wait for the block locked here
+            block = (session.query(L3PolicySubnetBlock).
+                     filter_by(l3_policy_id=l3p_id, ip_pool=ip_pool,
+                               allocated=False).
+                     filter(L3PolicySubnetBlock.prefixlen <= prefixlen).
+                     order_by(L3PolicySubnetBlock.prefixlen.desc(),
+                              L3PolicySubnetBlock.address).
+                     with_lockmode('update').first())
+            if not block:
+                return
+            cidr = netaddr.IPNetwork(block.cidr)
+            session.delete(block)
+            # Keep the first half, the second one is free
+            while cidr.prefixlen < prefixlen:
+                cidr, buddy = cidr.subnet(cidr.prefixlen + 1)
+                session.add(_block(l3p_id, ip_pool, buddy))
+            session.add(_block(l3p_id, ip_pool, cidr, allocated=True))
+        LOG.debug("Allocated %s from pool %s of L3P %s", cidr, ip_pool,
+                  l3p_id)
+        return str(cidr)
+
+    def _set_l3p_subnet_block_subnet(self, session, l3p_id, ip_pool, cidr,
+                                     subnet_id):
+        with session.begin(subtransactions=True):
+            session.query(L3PolicySubnetBlock).filter_by(
+                l3_policy_id=l3p_id, ip_pool=ip_pool, cidr=cidr).update(
+                    {'subnet_id': subnet_id}, synchronize_session=False)
+
+    def _release_l3p_subnet_block(self, session, subnet_id=None,
+                                  l3p_id=None, ip_pool=None, cidr=None):
+        """Frees the block of subnet_id, or the one of cidr in the pool.
+        """
+        with session.begin(subtransactions=True):
+            query = session.query(L3PolicySubnetBlock).filter_by(
+                allocated=True)
+            if subnet_id:
+                query = query.filter_by(subnet_id=subnet_id)
+            else:
+                query = query.filter_by(l3_policy_id=l3p_id,
+                                        ip_pool=ip_pool, cidr=cidr)
+            block = query.with_lockmode('update').first()
+            if not block:
+                return
+            l3p_id, ip_pool = block.l3_policy_id, block.ip_pool
+            pool_prefixlen = netaddr.IPNetwork(ip_pool).prefixlen
+            cidr = netaddr.IPNetwork(block.cidr)
+            session.delete(block)
+            # Merge with the buddy as long as it is free
+            while cidr.prefixlen > pool_prefixlen:
+                parent = cidr.supernet(cidr.prefixlen - 1)[0]
+                halves = list(parent.subnet(cidr.prefixlen))
+                buddy = halves[1] if halves[0] == cidr else halves[0]
+                if not session.query(L3PolicySubnetBlock).filter_by(
+                        l3_policy_id=l3p_id, ip_pool=ip_pool,
+                        cidr=str(buddy), allocated=False).delete(
+                            synchronize_session=False):
+                    break
+                cidr = parent
+            session.add(_block(l3p_id, ip_pool, cidr))
+        LOG.debug("Released %s to pool %s of L3P %s", cidr, ip_pool, l3p_id)
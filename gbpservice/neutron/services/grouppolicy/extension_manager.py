@@ -103,6 +103,11 @@ class ExtensionManager(stevedore.named.NamedExtensionManager):
         for driver in self.ordered_ext_drivers:
             driver.obj.extend_policy_target_dict(session, result)
 
+    def extend_policy_target_dicts(self, session, results):
+        """Call all extension drivers to extend PT dictionaries."""
+        for driver in self.ordered_ext_drivers:
+            driver.obj.extend_policy_target_dicts(session, results)
+
     def process_create_policy_target_group(self, session, data, result):
         """Call all extension drivers during PTG creation."""
         self._call_on_ext_drivers("process_create_policy_target_group",
@@ -118,6 +123,11 @@ class ExtensionManager(stevedore.named.NamedExtensionManager):
         for driver in self.ordered_ext_drivers:
             driver.obj.extend_policy_target_group_dict(session, result)
 
+    def extend_policy_target_group_dicts(self, session, results):
+        """Call all extension drivers to extend PTG dictionaries."""
+        for driver in self.ordered_ext_drivers:
+            driver.obj.extend_policy_target_group_dicts(session, results)
+
     def process_create_l2_policy(self, session, data, result):
         """Call all extension drivers during L2P creation."""
         self._call_on_ext_drivers("process_create_l2_policy",
@@ -133,6 +143,11 @@ class ExtensionManager(stevedore.named.NamedExtensionManager):
         for driver in self.ordered_ext_drivers:
             driver.obj.extend_l2_policy_dict(session, result)
 
+    def extend_l2_policy_dicts(self, session, results):
+        """Call all extension drivers to extend L2P dictionaries."""
+        for driver in self.ordered_ext_drivers:
+            driver.obj.extend_l2_policy_dicts(session, results)
+
     def process_create_l3_policy(self, session, data, result):
         """Call all extension drivers during L3P creation."""
         self._call_on_ext_drivers("process_create_l3_policy",
@@ -148,6 +163,11 @@ class ExtensionManager(stevedore.named.NamedExtensionManager):
         for driver in self.ordered_ext_drivers:
             driver.obj.extend_l3_policy_dict(session, result)
 
+    def extend_l3_policy_dicts(self, session, results):
+        """Call all extension drivers to extend L3P dictionaries."""
+        for driver in self.ordered_ext_drivers:
+            driver.obj.extend_l3_policy_dicts(session, results)
+
     def process_create_policy_classifier(self, session, data, result):
         """Call all extension drivers during PC creation."""
         self._call_on_ext_drivers("process_create_policy_classifier",
@@ -163,6 +183,11 @@ class ExtensionManager(stevedore.named.NamedExtensionManager):
         for driver in self.ordered_ext_drivers:
             driver.obj.extend_policy_classifier_dict(session, result)
 
+    def extend_policy_classifier_dicts(self, session, results):
+        """Call all extension drivers to extend PC dictionaries."""
+        for driver in self.ordered_ext_drivers:
+            driver.obj.extend_policy_classifier_dicts(session, results)
+
     def process_create_policy_action(self, session, data, result):
         """Call all extension drivers during PA creation."""
         self._call_on_ext_drivers("process_create_policy_action",
@@ -178,6 +203,11 @@ class ExtensionManager(stevedore.named.NamedExtensionManager):
         for driver in self.ordered_ext_drivers:
             driver.obj.extend_policy_action_dict(session, result)
 
+    def extend_policy_action_dicts(self, session, results):
+        """Call all extension drivers to extend PA dictionaries."""
+        for driver in self.ordered_ext_drivers:
+            driver.obj.extend_policy_action_dicts(session, results)
+
     def process_create_policy_rule(self, session, data, result):
         """Call all extension drivers during PR creation."""
         self._call_on_ext_drivers("process_create_policy_rule",
@@ -193,6 +223,11 @@ class ExtensionManager(stevedore.named.NamedExtensionManager):
         for driver in self.ordered_ext_drivers:
             driver.obj.extend_policy_rule_dict(session, result)
 
+    def extend_policy_rule_dicts(self, session, results):
+        """Call all extension drivers to extend PR dictionaries."""
+        for driver in self.ordered_ext_drivers:
+            driver.obj.extend_policy_rule_dicts(session, results)
+
     def process_create_policy_rule_set(self, session, data, result):
         """Call all extension drivers during PRS creation."""
         self._call_on_ext_drivers("process_create_policy_rule_set",
@@ -208,6 +243,11 @@ class ExtensionManager(stevedore.named.NamedExtensionManager):
         for driver in self.ordered_ext_drivers:
             driver.obj.extend_policy_rule_set_dict(session, result)
 
+    def extend_policy_rule_set_dicts(self, session, results):
+        """Call all extension drivers to extend PRS dictionaries."""
+        for driver in self.ordered_ext_drivers:
+            driver.obj.extend_policy_rule_set_dicts(session, results)
+
     def process_create_network_service_policy(self, session, data, result):
         """Call all extension drivers during NSP creation."""
         self._call_on_ext_drivers("process_create_network_service_policy",
@@ -223,6 +263,11 @@ class ExtensionManager(stevedore.named.NamedExtensionManager):
         for driver in self.ordered_ext_drivers:
             driver.obj.extend_network_service_policy_dict(session, result)
 
+    def extend_network_service_policy_dicts(self, session, results):
+        """Call all extension drivers to extend NSP dictionaries."""
+        for driver in self.ordered_ext_drivers:
+            driver.obj.extend_network_service_policy_dicts(session, results)
+
     def process_create_external_segment(self, session, data, result):
         """Call all extension drivers during EP creation."""
         self._call_on_ext_drivers("process_create_external_segment",
@@ -238,6 +283,11 @@ class ExtensionManager(stevedore.named.NamedExtensionManager):
         for driver in self.ordered_ext_drivers:
             driver.obj.extend_external_segment_dict(session, result)
 
+    def extend_external_segment_dicts(self, session, results):
+        """Call all extension drivers to extend EP dictionaries."""
+        for driver in self.ordered_ext_drivers:
+            driver.obj.extend_external_segment_dicts(session, results)
+
     def process_create_external_policy(self, session, data, result):
         """Call all extension drivers during EP creation."""
         self._call_on_ext_drivers("process_create_external_policy",
@@ -253,6 +303,11 @@ class ExtensionManager(stevedore.named.NamedExtensionManager):
         for driver in self.ordered_ext_drivers:
             driver.obj.extend_external_policy_dict(session, result)
 
+    def extend_external_policy_dicts(self, session, results):
+        """Call all extension drivers to extend EP dictionaries."""
+        for driver in self.ordered_ext_drivers:
+            driver.obj.extend_external_policy_dicts(session, results)
+
     def process_create_nat_pool(self, session, data, result):
         """Call all extension drivers during NP creation."""
         self._call_on_ext_drivers("process_create_nat_pool",
@@ -267,3 +322,8 @@ class ExtensionManager(stevedore.named.NamedExtensionManager):
         """Call all extension drivers to extend NP dictionary."""
         for driver in self.ordered_ext_drivers:
             driver.obj.extend_nat_pool_dict(session, result)
+
+    def extend_nat_pool_dicts(self, session, results):
+        """Call all extension drivers to extend NP dictionaries."""
+        for driver in self.ordered_ext_drivers:
+            driver.obj.extend_nat_pool_dicts(session, results)
@@ -541,6 +541,28 @@ class PolicyDriver(object):
         """
         pass
 
+    def create_policy_target_bulk_precommit(self, contexts):
+        """Allocate resources for a list of new policy_targets.
+
+        :param contexts: list of PolicyTargetContext instances, one for each
+        policy_target created in bulk, within the same transaction. Drivers
+        able to handle many resources at once override this to do so, by
+        default create_policy_target_precommit is called for each context.
+        """
+        for context in contexts:
+            self.create_policy_target_precommit(context)
+
+    def create_policy_target_bulk_postcommit(self, contexts):
+        """Create a list of policy_targets.
+
+        :param contexts: list of PolicyTargetContext instances, one for each
+        policy_target created in bulk. Drivers able to handle many resources
+        at once override this to do so, by default
+        create_policy_target_postcommit is called for each context.
+        """
+        for context in contexts:
+            self.create_policy_target_postcommit(context)
+
     def update_policy_target_precommit(self, context):
         """Update resources of a policy_target.
 
@@ -585,6 +607,17 @@ class PolicyDriver(object):
         """
         pass
 
+    def get_policy_target_statuses(self, contexts):
+        """Get most recent status of a list of policy_targets.
+
+        :param contexts: list of PolicyTargetContext instances, one for each
+        policy_target resource listed. Drivers able to get the status of many
+        resources at once override this to do so, by default
+        get_policy_target_status is called for each context.
+        """
+        for context in contexts:
+            self.get_policy_target_status(context)
+
     def create_policy_target_group_precommit(self, context):
         """Allocate resources for a new policy_target_group.
 
@@ -601,6 +634,29 @@ class PolicyDriver(object):
         """
         pass
 
+    def create_policy_target_group_bulk_precommit(self, contexts):
+        """Allocate resources for a list of new policy_target_groups.
+
+        :param contexts: list of PolicyTargetGroupContext instances, one for
+        each policy_target_group created in bulk, within the same transaction.
+        Drivers able to handle many resources at once override this to do so,
+        by default create_policy_target_group_precommit is called for each
+        context.
+        """
+        for context in contexts:
+            self.create_policy_target_group_precommit(context)
+
+    def create_policy_target_group_bulk_postcommit(self, contexts):
+        """Create a list of policy_target_groups.
+
+        :param contexts: list of PolicyTargetGroupContext instances, one for
+        each policy_target_group created in bulk. Drivers able to handle many
+        resources at once override this to do so, by default
+        create_policy_target_group_postcommit is called for each context.
+        """
+        for context in contexts:
+            self.create_policy_target_group_postcommit(context)
+
     def update_policy_target_group_precommit(self, context):
         """Update resources of a policy_target_group.
 
@@ -648,6 +704,17 @@ class PolicyDriver(object):
         """
         pass
 
+    def get_policy_target_group_statuses(self, contexts):
+        """Get most recent status of a list of policy_target_groups.
+
+        :param contexts: list of PolicyTargetGroupContext instances, one for
+        each policy_target_group resource listed. Drivers able to get the
+        status of many resources at once override this to do so, by default
+        get_policy_target_group_status is called for each context.
+        """
+        for context in contexts:
+            self.get_policy_target_group_status(context)
+
     def create_l2_policy_precommit(self, context):
         """Allocate resources for a new l2_policy.
 
@@ -708,6 +775,17 @@ class PolicyDriver(object):
         """
         pass
 
+    def get_l2_policy_statuses(self, contexts):
+        """Get most recent status of a list of l2_policies.
+
+        :param contexts: list of L2PolicyContext instances, one for each
+        l2_policy resource listed. Drivers able to get the status of many
+        resources at once override this to do so, by default
+        get_l2_policy_status is called for each context.
+        """
+        for context in contexts:
+            self.get_l2_policy_status(context)
+
     def create_l3_policy_precommit(self, context):
         """Allocate resources for a new l3_policy.
 
@@ -768,6 +846,17 @@ class PolicyDriver(object):
         """
         pass
 
+    def get_l3_policy_statuses(self, contexts):
+        """Get most recent status of a list of l3_policies.
+
+        :param contexts: list of L3PolicyContext instances, one for each
+        l3_policy resource listed. Drivers able to get the status of many
+        resources at once override this to do so, by default
+        get_l3_policy_status is called for each context.
+        """
+        for context in contexts:
+            self.get_l3_policy_status(context)
+
     def create_policy_classifier_precommit(self, context):
         """Allocate resources for a new policy_classifier.
 
@@ -828,6 +917,17 @@ class PolicyDriver(object):
         """
         pass
 
+    def get_policy_classifier_statuses(self, contexts):
+        """Get most recent status of a list of policy_classifiers.
+
+        :param contexts: list of PolicyClassifierContext instances, one for
+        each policy_classifier resource listed. Drivers able to get the status
+        of many resources at once override this to do so, by default
+        get_policy_classifier_status is called for each context.
+        """
+        for context in contexts:
+            self.get_policy_classifier_status(context)
+
     def create_policy_action_precommit(self, context):
         """Allocate resources for a new policy_action.
 
@@ -888,6 +988,17 @@ class PolicyDriver(object):
         """
         pass
 
+    def get_policy_action_statuses(self, contexts):
+        """Get most recent status of a list of policy_actions.
+
+        :param contexts: list of PolicyActionContext instances, one for each
+        policy_action resource listed. Drivers able to get the status of many
+        resources at once override this to do so, by default
+        get_policy_action_status is called for each context.
+        """
+        for context in contexts:
+            self.get_policy_action_status(context)
+
     def create_policy_rule_precommit(self, context):
         """Allocate resources for a new policy_rule.
 
@@ -948,6 +1059,17 @@ class PolicyDriver(object):
         """
         pass
 
+    def get_policy_rule_statuses(self, contexts):
+        """Get most recent status of a list of policy_rules.
+
+        :param contexts: list of PolicyRuleContext instances, one for each
+        policy_rule resource listed. Drivers able to get the status of many
+        resources at once override this to do so, by default
+        get_policy_rule_status is called for each context.
+        """
+        for context in contexts:
+            self.get_policy_rule_status(context)
+
     def create_policy_rule_set_precommit(self, context):
         """Allocate resources for a new policy_rule_set.
 
@@ -1008,6 +1130,17 @@ class PolicyDriver(object):
         """
         pass
 
+    def get_policy_rule_set_statuses(self, contexts):
+        """Get most recent status of a list of policy_rule_sets.
+
+        :param contexts: list of PolicyRuleSetContext instances, one for each
+        policy_rule_set resource listed. Drivers able to get the status of many
+        resources at once override this to do so, by default
+        get_policy_rule_set_status is called for each context.
+        """
+        for context in contexts:
+            self.get_policy_rule_set_status(context)
+
     def create_network_service_policy_precommit(self, context):
         """Allocate resources for a new network service policy.
 
@@ -1071,6 +1204,17 @@ class PolicyDriver(object):
         """
         pass
 
+    def get_network_service_policy_statuses(self, contexts):
+        """Get most recent status of a list of network_service_policies.
+
+        :param contexts: list of NetworkServicePolicyContext instances, one for
+        each network_service_policy resource listed. Drivers able to get the
+        status of many resources at once override this to do so, by default
+        get_network_service_policy_status is called for each context.
+        """
+        for context in contexts:
+            self.get_network_service_policy_status(context)
+
     def create_external_segment_precommit(self, context):
         """Allocate resources for a new network service policy.
 
@@ -1133,6 +1277,17 @@ class PolicyDriver(object):
         """
         pass
 
+    def get_external_segment_statuses(self, contexts):
+        """Get most recent status of a list of external_segments.
+
+        :param contexts: list of ExternalSegmentContext instances, one for each
+        external_segment resource listed. Drivers able to get the status of
+        many resources at once override this to do so, by default
+        get_external_segment_status is called for each context.
+        """
+        for context in contexts:
+            self.get_external_segment_status(context)
+
     def create_external_policy_precommit(self, context):
         """Allocate resources for a new network service policy.
 
@@ -1195,6 +1350,17 @@ class PolicyDriver(object):
         """
         pass
 
+    def get_external_policy_statuses(self, contexts):
+        """Get most recent status of a list of external_policies.
+
+        :param contexts: list of ExternalPolicyContext instances, one for each
+        external_policy resource listed. Drivers able to get the status of many
+        resources at once override this to do so, by default
+        get_external_policy_status is called for each context.
+        """
+        for context in contexts:
+            self.get_external_policy_status(context)
+
     def create_nat_pool_precommit(self, context):
         """Allocate resources for a new network service policy.
 
@@ -1257,6 +1423,17 @@ class PolicyDriver(object):
         """
         pass
 
+    def get_nat_pool_statuses(self, contexts):
+        """Get most recent status of a list of nat_pools.
+
+        :param contexts: list of NatPoolContext instances, one for each
+        nat_pool resource listed. Drivers able to get the status of many
+        resources at once override this to do so, by default
+        get_nat_pool_status is called for each context.
+        """
+        for context in contexts:
+            self.get_nat_pool_status(context)
+
     # REVISIT(rkukura): Is this needed for all operations, or just for
     # create operations? If its needed for all operations, should the
     # method be specific to the resource and operation, and include
@@ -1348,6 +1525,20 @@ class ExtensionDriver(object):
         """
         pass
 
+    def extend_policy_target_dicts(self, session, results):
+        """Add extended attributes to policy_target dictionaries.
+
+        :param session: database session
+        :param results: list of policy_target dictionaries to extend
+
+        Called inside transaction context on session when listing, to
+        add any extended attributes defined by this driver to all the
+        dictionaries at once. Defaults to calling
+        extend_policy_target_dict on each of them.
+        """
+        for result in results:
+            self.extend_policy_target_dict(session, result)
+
     def process_create_policy_target_group(self, session, data, result):
         """Process extended attributes for policy_target_group creation.
 
@@ -1390,6 +1581,20 @@ class ExtensionDriver(object):
         """
         pass
 
+    def extend_policy_target_group_dicts(self, session, results):
+        """Add extended attributes to policy_target_group dictionaries.
+
+        :param session: database session
+        :param results: list of policy_target_group dictionaries to extend
+
+        Called inside transaction context on session when listing, to
+        add any extended attributes defined by this driver to all the
+        dictionaries at once. Defaults to calling
+        extend_policy_target_group_dict on each of them.
+        """
+        for result in results:
+            self.extend_policy_target_group_dict(session, result)
+
     def process_create_l2_policy(self, session, data, result):
         """Process extended attributes for l2_policy creation.
 
@@ -1431,6 +1636,20 @@ class ExtensionDriver(object):
         """
         pass
 
+    def extend_l2_policy_dicts(self, session, results):
+        """Add extended attributes to l2_policy dictionaries.
+
+        :param session: database session
+        :param results: list of l2_policy dictionaries to extend
+
+        Called inside transaction context on session when listing, to
+        add any extended attributes defined by this driver to all the
+        dictionaries at once. Defaults to calling
+        extend_l2_policy_dict on each of them.
+        """
+        for result in results:
+            self.extend_l2_policy_dict(session, result)
+
     def process_create_l3_policy(self, session, data, result):
         """Process extended attributes for l3_policy creation.
 
@@ -1472,6 +1691,20 @@ class ExtensionDriver(object):
         """
         pass
 
+    def extend_l3_policy_dicts(self, session, results):
+        """Add extended attributes to l3_policy dictionaries.
+
+        :param session: database session
+        :param results: list of l3_policy dictionaries to extend
+
+        Called inside transaction context on session when listing, to
+        add any extended attributes defined by this driver to all the
+        dictionaries at once. Defaults to calling
+        extend_l3_policy_dict on each of them.
+        """
+        for result in results:
+            self.extend_l3_policy_dict(session, result)
+
     def process_create_policy_classifier(self, session, data, result):
         """Process extended attributes for policy_classifier creation.
 
@@ -1514,6 +1747,20 @@ class ExtensionDriver(object):
         """
         pass
 
+    def extend_policy_classifier_dicts(self, session, results):
+        """Add extended attributes to policy_classifier dictionaries.
+
+        :param session: database session
+        :param results: list of policy_classifier dictionaries to extend
+
+        Called inside transaction context on session when listing, to
+        add any extended attributes defined by this driver to all the
+        dictionaries at once. Defaults to calling
+        extend_policy_classifier_dict on each of them.
+        """
+        for result in results:
+            self.extend_policy_classifier_dict(session, result)
+
     def process_create_policy_action(self, session, data, result):
         """Process extended attributes for policy_action creation.
 
@@ -1555,6 +1802,20 @@ class ExtensionDriver(object):
         """
         pass
 
+    def extend_policy_action_dicts(self, session, results):
+        """Add extended attributes to policy_action dictionaries.
+
+        :param session: database session
+        :param results: list of policy_action dictionaries to extend
+
+        Called inside transaction context on session when listing, to
+        add any extended attributes defined by this driver to all the
+        dictionaries at once. Defaults to calling
+        extend_policy_action_dict on each of them.
+        """
+        for result in results:
+            self.extend_policy_action_dict(session, result)
+
     def process_create_policy_rule(self, session, data, result):
         """Process extended attributes for policy_rule creation.
 
@@ -1596,6 +1857,20 @@ class ExtensionDriver(object):
         """
         pass
 
+    def extend_policy_rule_dicts(self, session, results):
+        """Add extended attributes to policy_rule dictionaries.
+
+        :param session: database session
+        :param results: list of policy_rule dictionaries to extend
+
+        Called inside transaction context on session when listing, to
+        add any extended attributes defined by this driver to all the
+        dictionaries at once. Defaults to calling
+        extend_policy_rule_dict on each of them.
+        """
+        for result in results:
+            self.extend_policy_rule_dict(session, result)
+
     def process_create_policy_rule_set(self, session, data, result):
         """Process extended attributes for policy_rule_set creation.
 
@@ -1638,6 +1913,20 @@ class ExtensionDriver(object):
         """
         pass
 
+    def extend_policy_rule_set_dicts(self, session, results):
+        """Add extended attributes to policy_rule_set dictionaries.
+
+        :param session: database session
+        :param results: list of policy_rule_set dictionaries to extend
+
+        Called inside transaction context on session when listing, to
+        add any extended attributes defined by this driver to all the
+        dictionaries at once. Defaults to calling
+        extend_policy_rule_set_dict on each of them.
+        """
+        for result in results:
+            self.extend_policy_rule_set_dict(session, result)
+
     def process_create_network_service_policy(self, session, data, result):
         """Process extended attributes for network_service_policy creation.
 
@@ -1680,6 +1969,20 @@ class ExtensionDriver(object):
         """
         pass
 
+    def extend_network_service_policy_dicts(self, session, results):
+        """Add extended attributes to network_service_policy dictionaries.
+
+        :param session: database session
+        :param results: list of network_service_policy dictionaries to extend
+
+        Called inside transaction context on session when listing, to
+        add any extended attributes defined by this driver to all the
+        dictionaries at once. Defaults to calling
+        extend_network_service_policy_dict on each of them.
+        """
+        for result in results:
+            self.extend_network_service_policy_dict(session, result)
+
     def process_create_external_segment(self, session, data, result):
         """Process extended attributes for external_segment creation.
 
@@ -1722,6 +2025,20 @@ class ExtensionDriver(object):
         """
         pass
 
+    def extend_external_segment_dicts(self, session, results):
+        """Add extended attributes to external_segment dictionaries.
+
+        :param session: database session
+        :param results: list of external_segment dictionaries to extend
+
+        Called inside transaction context on session when listing, to
+        add any extended attributes defined by this driver to all the
+        dictionaries at once. Defaults to calling
+        extend_external_segment_dict on each of them.
+        """
+        for result in results:
+            self.extend_external_segment_dict(session, result)
+
     def process_create_external_policy(self, session, data, result):
         """Process extended attributes for external_policy creation.
 
@@ -1764,6 +2081,20 @@ class ExtensionDriver(object):
         """
         pass
 
+    def extend_external_policy_dicts(self, session, results):
+        """Add extended attributes to external_policy dictionaries.
+
+        :param session: database session
+        :param results: list of external_policy dictionaries to extend
+
+        Called inside transaction context on session when listing, to
+        add any extended attributes defined by this driver to all the
+        dictionaries at once. Defaults to calling
+        extend_external_policy_dict on each of them.
+        """
+        for result in results:
+            self.extend_external_policy_dict(session, result)
+
     def process_create_nat_pool(self, session, data, result):
         """Process extended attributes for nat_pool creation.
 
@@ -1806,6 +2137,20 @@ class ExtensionDriver(object):
         """
         pass
 
+    def extend_nat_pool_dicts(self, session, results):
+        """Add extended attributes to nat_pool dictionaries.
+
+        :param session: database session
+        :param results: list of nat_pool dictionaries to extend
+
+        Called inside transaction context on session when listing, to
+        add any extended attributes defined by this driver to all the
+        dictionaries at once. Defaults to calling
+        extend_nat_pool_dict on each of them.
+        """
+        for result in results:
+            self.extend_nat_pool_dict(session, result)
+
     def _default_process_create(self, session, data, result, type=None,
                                 table=None, keys=None):
         """Default process create behavior.
@@ -1864,6 +2209,27 @@ class ExtensionDriver(object):
         for key in keys:
             result[key] = getattr(record, key)
 
+    def _default_extend_dicts(self, session, results, type=None,
+                              table=None, keys=None):
+        """Default dictionaries extension behavior.
+
+        Same as the default dictionary extension behavior, for a list of
+        dictionaries whose records are all fetched with a single query.
+        """
+        if not results:
+            return
+        id_column = getattr(table, type + '_' + 'id')
+        records = dict((getattr(record, type + '_' + 'id'), record)
+                       for record in session.query(table).filter(
+                           id_column.in_([x['id'] for x in results])))
+        for result in results:
+            record = records.get(result['id'])
+            if not record:
+                # Preexisting object, see _default_extend_dict
+                continue
+            for key in keys:
+                result[key] = getattr(record, key)
+
 
 def default_extension_behavior(table, keys=None):
     def wrap(func):
@@ -1902,6 +2268,11 @@ def default_extension_behavior(table, keys=None):
                 type = name[len('extend_'):-len('_dict')]
                 inst._default_extend_dict(*args, type=type, table=table,
                     keys=filter_keys(inst, None, type))
+            elif name.startswith('extend_') and name.endswith('_dicts'):
+                # call default extend dicts
+                type = name[len('extend_'):-len('_dicts')]
+                inst._default_extend_dicts(*args, type=type, table=table,
+                    keys=filter_keys(inst, None, type))
             # Now exec the actual function for postprocessing
             func(inst, *args)
         return inner
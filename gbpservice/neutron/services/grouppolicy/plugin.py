@@ -366,6 +366,46 @@ class GroupPolicyPlugin(group_policy_mapping_db.GroupPolicyMappingDbPlugin):
             resource['status_details'] = updated_status_details
         return resource
 
+    def _get_statuses_from_drivers(self, context, context_name,
+                                   resource_name, resources):
+        """Batched _get_status_from_drivers, for a list of resources.
+
+        The drivers get the status of all the resources in one call and
+        the changed ones are saved in a single transaction.
+        """
+        if not resources:
+            return resources
+        policy_contexts = [
+            getattr(p_context, context_name)(self, context, resource,
+                                             resource)
+            for resource in resources]
+        saved_statuses = [(resource['status'], resource['status_details'])
+                          for resource in resources]
+        getattr(self.policy_driver_manager,
+                "get_" + resource_name + "_statuses")(policy_contexts)
+        updated = []
+        for resource, policy_context, saved in zip(
+                resources, policy_contexts, saved_statuses):
+            _resource = getattr(policy_context, "_" + resource_name)
+            status = (_resource['status'], _resource['status_details'])
+            if saved != status:
+                updated.append((resource, _resource))
+        if updated:
+            session = context.session
+            update_method = getattr(super(GroupPolicyPlugin, self),
+                                    "update_" + resource_name)
+            with session.begin(subtransactions=True):
+                for resource, _resource in updated:
+                    update_method(
+                        context, _resource['id'],
+                        {resource_name: {
+                            'status': _resource['status'],
+                            'status_details': _resource['status_details']}})
+        for resource, _resource in updated:
+            resource['status'] = _resource['status']
+            resource['status_details'] = _resource['status_details']
+        return resources
+
     def _get_resource(self, context, resource_name, resource_id,
                       gbp_context_name, fields=None):
         session = context.session
@@ -394,27 +434,95 @@ class GroupPolicyPlugin(group_policy_mapping_db.GroupPolicyMappingDbPlugin):
             results = getattr(super(GroupPolicyPlugin, self),
                               get_resources_method)(
                 context, filters, None, sorts, limit, marker, page_reverse)
+            extend_resources_method = "".join(['extend_', resource_name,
+                                               '_dicts'])
+            getattr(self.extension_manager, extend_resources_method)(
+                session, results)
             filtered_results = []
             for result in results:
-                extend_resources_method = "".join(['extend_', resource_name,
-                                                   '_dict'])
-                getattr(self.extension_manager, extend_resources_method)(
-                    session, result)
                 filtered = self._filter_extended_result(result, filters)
                 if filtered:
                     filtered_results.append(filtered)
 
-        new_filtered_results = []
         # Invoke drivers only if status attributes are requested
         if not fields or STATUS_SET.intersection(set(fields)):
-            for result in filtered_results:
-                result = self._get_status_from_drivers(
-                    context, gbp_context_name, resource_name, result['id'],
-                    result)
-                new_filtered_results.append(result)
-        new_filtered_results = new_filtered_results or filtered_results
-        return [self._fields(nfresult, fields) for nfresult in
-                new_filtered_results]
+            filtered_results = self._get_statuses_from_drivers(
+                context, gbp_context_name, resource_name, filtered_results)
+        return [self._fields(fresult, fields) for fresult in
+                filtered_results]
+
+    def _create_resources_bulk(self, context, resource_name,
+                               gbp_context_name, request_items):
+        """Creates a list of resources, calling the drivers once for all.
+
+        The resources are created and the precommit drivers called in a
+        single transaction, the postcommit drivers then get all of them
+        at once. If those fail, all the resources are deleted.
+        """
+        resource_plural = gbp_utils.get_resource_plural(resource_name)
+        items = request_items[resource_plural]
+        self._ensure_tenant_bulk(context,
+                                 [item[resource_name] for item in items])
+        create_method = getattr(super(GroupPolicyPlugin, self),
+                                'create_' + resource_name)
+        process_create_method = getattr(self.extension_manager,
+                                        'process_create_' + resource_name)
+        session = context.session
+        policy_contexts = []
+        with session.begin(subtransactions=True):
+            for item in items:
+                result = create_method(context, item)
+                process_create_method(session, item, result)
+                self._validate_shared_create(self, context, result,
+                                             resource_name)
+                policy_contexts.append(getattr(p_context, gbp_context_name)(
+                    self, context, result))
+            getattr(self.policy_driver_manager,
+                    "create_%s_bulk_precommit" % resource_name)(
+                        policy_contexts)
+
+        ids = [policy_context.current['id']
+               for policy_context in policy_contexts]
+        try:
+            getattr(self.policy_driver_manager,
+                    "create_%s_bulk_postcommit" % resource_name)(
+                        policy_contexts)
+        except Exception:
+            with excutils.save_and_reraise_exception():
+                LOG.exception(_LE("create_%(resource)s_bulk_postcommit "
+                                  "failed, deleting %(resource)s %(ids)s"),
+                              {'resource': resource_name, 'ids': ids})
+                self._delete_created_resources(context, resource_name, ids)
+
+        results = dict((result['id'], result) for result in getattr(
+            self, 'get_' + resource_plural)(context, filters={'id': ids}))
+        return [results[resource_id] for resource_id in ids]
+
+    def _create_bulk(self, resource_name, context, request_items):
+        # Resources without a bulk path of their own are created in
+        # turn, as the API does for plugins without bulk support.
+        resource_plural = gbp_utils.get_resource_plural(resource_name)
+        create_method = getattr(self, 'create_' + resource_name)
+        results = []
+        try:
+            for item in request_items[resource_plural]:
+                results.append(create_method(context, item))
+        except Exception:
+            with excutils.save_and_reraise_exception():
+                self._delete_created_resources(
+                    context, resource_name,
+                    [result['id'] for result in results])
+        return results
+
+    def _delete_created_resources(self, context, resource_name, ids):
+        delete_method = getattr(self, 'delete_' + resource_name)
+        for resource_id in ids:
+            try:
+                delete_method(context, resource_id)
+            except Exception:
+                LOG.exception(_LE("Failed to delete %(resource)s %(id)s "
+                                  "created in bulk"),
+                              {'resource': resource_name, 'id': resource_id})
 
     @resource_registry.tracked_resources(
         l3_policy=group_policy_mapping_db.L3PolicyMapping,
@@ -435,6 +543,9 @@ class GroupPolicyPlugin(group_policy_mapping_db.GroupPolicyMappingDbPlugin):
         super(GroupPolicyPlugin, self).__init__()
         self.extension_manager.initialize()
         self.policy_driver_manager.initialize()
+        # Bulk creates are done natively unless a driver can't handle them
+        self.__native_bulk_support = (
+            self.policy_driver_manager.native_bulk_support)
 
     def _filter_extended_result(self, result, filters):
         filters = filters or {}
@@ -484,6 +595,13 @@ class GroupPolicyPlugin(group_policy_mapping_db.GroupPolicyMappingDbPlugin):
 
         return self.get_policy_target(context, result['id'])
 
+    @log.log_method_call
+    def create_policy_target_bulk(self, context, policy_targets):
+        for policy_target in policy_targets['policy_targets']:
+            self._add_fixed_ips_to_port_attributes(policy_target)
+        return self._create_resources_bulk(
+            context, 'policy_target', 'PolicyTargetContext', policy_targets)
+
     @log.log_method_call
     def update_policy_target(self, context, policy_target_id, policy_target):
         self._add_fixed_ips_to_port_attributes(policy_target)
@@ -573,6 +691,12 @@ class GroupPolicyPlugin(group_policy_mapping_db.GroupPolicyMappingDbPlugin):
 
         return self.get_policy_target_group(context, result['id'])
 
+    @log.log_method_call
+    def create_policy_target_group_bulk(self, context, policy_target_groups):
+        return self._create_resources_bulk(
+            context, 'policy_target_group', 'PolicyTargetGroupContext',
+            policy_target_groups)
+
     @log.log_method_call
     def update_policy_target_group(self, context, policy_target_group_id,
                                    policy_target_group):
@@ -709,6 +833,10 @@ class GroupPolicyPlugin(group_policy_mapping_db.GroupPolicyMappingDbPlugin):
 
         return self.get_l2_policy(context, result['id'])
 
+    @log.log_method_call
+    def create_l2_policy_bulk(self, context, l2_policies):
+        return self._create_bulk('l2_policy', context, l2_policies)
+
     @log.log_method_call
     def update_l2_policy(self, context, l2_policy_id, l2_policy):
         session = context.session
@@ -798,6 +926,12 @@ class GroupPolicyPlugin(group_policy_mapping_db.GroupPolicyMappingDbPlugin):
 
         return self.get_network_service_policy(context, result['id'])
 
+    @log.log_method_call
+    def create_network_service_policy_bulk(self, context,
+                                           network_service_policies):
+        return self._create_bulk('network_service_policy', context,
+                                 network_service_policies)
+
     @log.log_method_call
     def update_network_service_policy(self, context, network_service_policy_id,
                                       network_service_policy):
@@ -893,6 +1027,10 @@ class GroupPolicyPlugin(group_policy_mapping_db.GroupPolicyMappingDbPlugin):
 
         return self.get_l3_policy(context, result['id'])
 
+    @log.log_method_call
+    def create_l3_policy_bulk(self, context, l3_policies):
+        return self._create_bulk('l3_policy', context, l3_policies)
+
     @log.log_method_call
     def update_l3_policy(self, context, l3_policy_id, l3_policy):
         session = context.session
@@ -986,6 +1124,11 @@ class GroupPolicyPlugin(group_policy_mapping_db.GroupPolicyMappingDbPlugin):
 
         return self.get_policy_classifier(context, result['id'])
 
+    @log.log_method_call
+    def create_policy_classifier_bulk(self, context, policy_classifiers):
+        return self._create_bulk('policy_classifier', context,
+                                 policy_classifiers)
+
     @log.log_method_call
     def update_policy_classifier(self, context, id, policy_classifier):
         session = context.session
@@ -1074,6 +1217,10 @@ class GroupPolicyPlugin(group_policy_mapping_db.GroupPolicyMappingDbPlugin):
 
         return self.get_policy_action(context, result['id'])
 
+    @log.log_method_call
+    def create_policy_action_bulk(self, context, policy_actions):
+        return self._create_bulk('policy_action', context, policy_actions)
+
     @log.log_method_call
     def update_policy_action(self, context, id, policy_action):
         session = context.session
@@ -1160,6 +1307,10 @@ class GroupPolicyPlugin(group_policy_mapping_db.GroupPolicyMappingDbPlugin):
 
         return self.get_policy_rule(context, result['id'])
 
+    @log.log_method_call
+    def create_policy_rule_bulk(self, context, policy_rules):
+        return self._create_bulk('policy_rule', context, policy_rules)
+
     @log.log_method_call
     def update_policy_rule(self, context, id, policy_rule):
         session = context.session
@@ -1246,6 +1397,10 @@ class GroupPolicyPlugin(group_policy_mapping_db.GroupPolicyMappingDbPlugin):
 
         return self.get_policy_rule_set(context, result['id'])
 
+    @log.log_method_call
+    def create_policy_rule_set_bulk(self, context, policy_rule_sets):
+        return self._create_bulk('policy_rule_set', context, policy_rule_sets)
+
     @log.log_method_call
     def update_policy_rule_set(self, context, id, policy_rule_set):
         session = context.session
@@ -1335,6 +1490,11 @@ class GroupPolicyPlugin(group_policy_mapping_db.GroupPolicyMappingDbPlugin):
 
         return self.get_external_segment(context, result['id'])
 
+    @log.log_method_call
+    def create_external_segment_bulk(self, context, external_segments):
+        return self._create_bulk('external_segment', context,
+                                 external_segments)
+
     @log.log_method_call
     def update_external_segment(self, context, external_segment_id,
                                 external_segment):
@@ -1432,6 +1592,10 @@ class GroupPolicyPlugin(group_policy_mapping_db.GroupPolicyMappingDbPlugin):
 
         return self.get_external_policy(context, result['id'])
 
+    @log.log_method_call
+    def create_external_policy_bulk(self, context, external_policies):
+        return self._create_bulk('external_policy', context, external_policies)
+
     @log.log_method_call
     def update_external_policy(self, context, external_policy_id,
                                external_policy):
@@ -1520,6 +1684,10 @@ class GroupPolicyPlugin(group_policy_mapping_db.GroupPolicyMappingDbPlugin):
 
         return self.get_nat_pool(context, result['id'])
 
+    @log.log_method_call
+    def create_nat_pool_bulk(self, context, nat_pools):
+        return self._create_bulk('nat_pool', context, nat_pools)
+
     @log.log_method_call
     def update_nat_pool(self, context, nat_pool_id, nat_pool):
         session = context.session
@@ -1597,3 +1765,9 @@ class GroupPolicyPlugin(group_policy_mapping_db.GroupPolicyMappingDbPlugin):
         if 'tenant_id' in resource:
             tenant_id = resource['tenant_id']
             self.policy_driver_manager.ensure_tenant(context, tenant_id)
+
+    def _ensure_tenant_bulk(self, context, resources):
+        tenant_ids = set(resource['tenant_id'] for resource in resources
+                         if 'tenant_id' in resource)
+        for tenant_id in tenant_ids:
+            self.policy_driver_manager.ensure_tenant(context, tenant_id)
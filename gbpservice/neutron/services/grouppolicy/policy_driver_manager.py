@@ -93,10 +93,7 @@ class PolicyDriverManager(stevedore.named.NamedExtensionManager):
 
     def initialize(self):
         # Group Policy bulk operations requires each driver to support them.
-        # However, this is currently not supported at the plugin level,
-        # so setting it to False. When the plugin does support it, we can
-        # set it to True such that the drivers can override it.
-        self.native_bulk_support = False
+        self.native_bulk_support = True
         for driver in self.ordered_policy_drivers:
             LOG.info(_LI("Initializing policy driver '%s'"), driver.name)
             driver.obj.initialize()
@@ -154,6 +151,12 @@ class PolicyDriverManager(stevedore.named.NamedExtensionManager):
     def create_policy_target_postcommit(self, context):
         self._call_on_drivers("create_policy_target_postcommit", context)
 
+    def create_policy_target_bulk_precommit(self, contexts):
+        self._call_on_drivers("create_policy_target_bulk_precommit", contexts)
+
+    def create_policy_target_bulk_postcommit(self, contexts):
+        self._call_on_drivers("create_policy_target_bulk_postcommit", contexts)
+
     def update_policy_target_precommit(self, context):
         self._call_on_drivers("update_policy_target_precommit", context)
 
@@ -170,12 +173,23 @@ class PolicyDriverManager(stevedore.named.NamedExtensionManager):
     def get_policy_target_status(self, context):
         self._call_on_drivers("get_policy_target_status", context)
 
+    def get_policy_target_statuses(self, contexts):
+        self._call_on_drivers("get_policy_target_statuses", contexts)
+
     def create_policy_target_group_precommit(self, context):
         self._call_on_drivers("create_policy_target_group_precommit", context)
 
     def create_policy_target_group_postcommit(self, context):
         self._call_on_drivers("create_policy_target_group_postcommit", context)
 
+    def create_policy_target_group_bulk_precommit(self, contexts):
+        self._call_on_drivers("create_policy_target_group_bulk_precommit",
+                              contexts)
+
+    def create_policy_target_group_bulk_postcommit(self, contexts):
+        self._call_on_drivers("create_policy_target_group_bulk_postcommit",
+                              contexts)
+
     def update_policy_target_group_precommit(self, context):
         self._call_on_drivers("update_policy_target_group_precommit", context)
 
@@ -192,6 +206,9 @@ class PolicyDriverManager(stevedore.named.NamedExtensionManager):
     def get_policy_target_group_status(self, context):
         self._call_on_drivers("get_policy_target_group_status", context)
 
+    def get_policy_target_group_statuses(self, contexts):
+        self._call_on_drivers("get_policy_target_group_statuses", contexts)
+
     def create_l2_policy_precommit(self, context):
         self._call_on_drivers("create_l2_policy_precommit", context)
 
@@ -214,6 +231,9 @@ class PolicyDriverManager(stevedore.named.NamedExtensionManager):
     def get_l2_policy_status(self, context):
         self._call_on_drivers("get_l2_policy_status", context)
 
+    def get_l2_policy_statuses(self, contexts):
+        self._call_on_drivers("get_l2_policy_statuses", contexts)
+
     def create_l3_policy_precommit(self, context):
         self._call_on_drivers("create_l3_policy_precommit", context)
 
@@ -236,6 +256,9 @@ class PolicyDriverManager(stevedore.named.NamedExtensionManager):
     def get_l3_policy_status(self, context):
         self._call_on_drivers("get_l3_policy_status", context)
 
+    def get_l3_policy_statuses(self, contexts):
+        self._call_on_drivers("get_l3_policy_statuses", contexts)
+
     def create_network_service_policy_precommit(self, context):
         self._call_on_drivers(
             "create_network_service_policy_precommit", context)
@@ -264,6 +287,9 @@ class PolicyDriverManager(stevedore.named.NamedExtensionManager):
     def get_network_service_policy_status(self, context):
         self._call_on_drivers("get_network_service_policy_status", context)
 
+    def get_network_service_policy_statuses(self, contexts):
+        self._call_on_drivers("get_network_service_policy_statuses", contexts)
+
     def create_policy_classifier_precommit(self, context):
         self._call_on_drivers("create_policy_classifier_precommit", context)
 
@@ -286,6 +312,9 @@ class PolicyDriverManager(stevedore.named.NamedExtensionManager):
     def get_policy_classifier_status(self, context):
         self._call_on_drivers("get_policy_classifier_status", context)
 
+    def get_policy_classifier_statuses(self, contexts):
+        self._call_on_drivers("get_policy_classifier_statuses", contexts)
+
     def create_policy_action_precommit(self, context):
         self._call_on_drivers("create_policy_action_precommit", context)
 
@@ -308,6 +337,9 @@ class PolicyDriverManager(stevedore.named.NamedExtensionManager):
     def get_policy_action_status(self, context):
         self._call_on_drivers("get_policy_action_status", context)
 
+    def get_policy_action_statuses(self, contexts):
+        self._call_on_drivers("get_policy_action_statuses", contexts)
+
     def create_policy_rule_precommit(self, context):
         self._call_on_drivers("create_policy_rule_precommit", context)
 
@@ -330,6 +362,9 @@ class PolicyDriverManager(stevedore.named.NamedExtensionManager):
     def get_policy_rule_status(self, context):
         self._call_on_drivers("get_policy_rule_status", context)
 
+    def get_policy_rule_statuses(self, contexts):
+        self._call_on_drivers("get_policy_rule_statuses", contexts)
+
     def create_policy_rule_set_precommit(self, context):
         self._call_on_drivers("create_policy_rule_set_precommit", context)
 
@@ -352,6 +387,9 @@ class PolicyDriverManager(stevedore.named.NamedExtensionManager):
     def get_policy_rule_set_status(self, context):
         self._call_on_drivers("get_policy_rule_set_status", context)
 
+    def get_policy_rule_set_statuses(self, contexts):
+        self._call_on_drivers("get_policy_rule_set_statuses", contexts)
+
     def create_external_segment_precommit(self, context):
         self._call_on_drivers("create_external_segment_precommit",
                               context)
@@ -379,6 +417,9 @@ class PolicyDriverManager(stevedore.named.NamedExtensionManager):
     def get_external_segment_status(self, context):
         self._call_on_drivers("get_external_segment_status", context)
 
+    def get_external_segment_statuses(self, contexts):
+        self._call_on_drivers("get_external_segment_statuses", contexts)
+
     def create_external_policy_precommit(self, context):
         self._call_on_drivers("create_external_policy_precommit",
                               context)
@@ -406,6 +447,9 @@ class PolicyDriverManager(stevedore.named.NamedExtensionManager):
     def get_external_policy_status(self, context):
         self._call_on_drivers("get_external_policy_status", context)
 
+    def get_external_policy_statuses(self, contexts):
+        self._call_on_drivers("get_external_policy_statuses", contexts)
+
     def create_nat_pool_precommit(self, context):
         self._call_on_drivers("create_nat_pool_precommit", context)
 
@@ -427,3 +471,6 @@ class PolicyDriverManager(stevedore.named.NamedExtensionManager):
 
     def get_nat_pool_status(self, context):
         self._call_on_drivers("get_nat_pool_status", context)
+
+    def get_nat_pool_statuses(self, contexts):
+        self._call_on_drivers("get_nat_pool_statuses", contexts)
@@ -26,6 +26,7 @@ from neutron.tests.unit.api import test_extensions
 from neutron.tests.unit.db import test_db_base_plugin_v2
 from oslo_utils import importutils
 from oslo_utils import uuidutils
+import sqlalchemy as sa
 
 from gbpservice.neutron.db.grouppolicy import group_policy_db as gpdb
 from gbpservice.neutron.db import servicechain_db as svcchain_db
@@ -282,6 +283,20 @@ class GroupPolicyDBTestBase(ApiManagerMixin):
         self.assertEqual(sorted([i['id'] for i in res[resource_plural]]),
                          sorted([i[resource]['id'] for i in items]))
 
+    def _count_queries(self, func, *args, **kwargs):
+        queries = []
+
+        def count(conn, cursor, statement, *args):
+            queries.append(statement)
+
+        engine = db_api.get_engine()
+        sa.event.listen(engine, 'before_cursor_execute', count)
+        try:
+            func(*args, **kwargs)
+        finally:
+            sa.event.remove(engine, 'before_cursor_execute', count)
+        return len(queries)
+
     def _create_profiled_servicechain_node(
             self, service_type=constants.LOADBALANCER, shared_profile=False,
             profile_tenant_id=None, **kwargs):
@@ -512,6 +527,32 @@ class TestGroupResources(GroupPolicyDbTestCase):
         self._test_list_resources('policy_target_group', ptgs,
                                   query_params='description=ptg')
 
+    def test_list_policy_target_groups_query_count(self):
+        def add_ptg():
+            prs_id = self.create_policy_rule_set()['policy_rule_set']['id']
+            ptg = self.create_policy_target_group(
+                provided_policy_rule_sets={prs_id: None},
+                consumed_policy_rule_sets={prs_id: None})
+            self.create_policy_target(
+                policy_target_group_id=ptg['policy_target_group']['id'])
+
+        add_ptg()
+        queries = self._count_queries(self.plugin.get_policy_target_groups,
+                                      context.get_admin_context())
+        for i in range(3):
+            add_ptg()
+        # Not one more query per listed PTG
+        self.assertEqual(queries, self._count_queries(
+            self.plugin.get_policy_target_groups,
+            context.get_admin_context()))
+        ptgs = self.plugin.get_policy_target_groups(
+            context.get_admin_context())
+        self.assertEqual(4, len(ptgs))
+        for ptg in ptgs:
+            self.assertEqual(1, len(ptg['policy_targets']))
+            self.assertEqual(1, len(ptg['provided_policy_rule_sets']))
+            self.assertEqual(1, len(ptg['consumed_policy_rule_sets']))
+
     def test_update_policy_target_group(self):
         name = "new_policy_target_group1"
         description = 'new desc'
@@ -1225,6 +1266,28 @@ class TestGroupResources(GroupPolicyDbTestCase):
         self._test_list_resources('policy_rule_set', policy_rule_sets,
                                   query_params='description=ct')
 
+    def test_list_policy_rule_sets_query_count(self):
+        def add_prs():
+            child_id = self.create_policy_rule_set()['policy_rule_set']['id']
+            return self.create_policy_rule_set(
+                child_policy_rule_sets=[child_id])['policy_rule_set']['id']
+
+        add_prs()
+        queries = self._count_queries(self.plugin.get_policy_rule_sets,
+                                      context.get_admin_context())
+        parents = [add_prs() for i in range(3)]
+        # Children are not queried per listed PRS
+        self.assertEqual(queries, self._count_queries(
+            self.plugin.get_policy_rule_sets, context.get_admin_context()))
+        prss = dict((prs['id'], prs) for prs in
+                    self.plugin.get_policy_rule_sets(
+                        context.get_admin_context()))
+        self.assertEqual(8, len(prss))
+        for parent_id in parents:
+            children = prss[parent_id]['child_policy_rule_sets']
+            self.assertEqual(1, len(children))
+            self.assertEqual(parent_id, prss[children[0]]['parent_id'])
+
     def test_update_policy_rule_set(self):
         name = "new_policy_rule_set"
         description = 'new desc'
@@ -0,0 +1,86 @@
+#  Licensed under the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License. You may obtain
+#  a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#  WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#  License for the specific language governing permissions and limitations
+#  under the License.
+
+import pickle
+import unittest
+
+from gbpservice.nfp.core import codec as nfp_codec
+from gbpservice.nfp.core import event as nfp_event
+
+
+class Object(object):
+
+    def __init__(self, value):
+        self.value = value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+
+class Test_Event_Codec(unittest.TestCase):
+
+    def setUp(self):
+        self.codec = nfp_codec.PickleCodec(compress_threshold=64)
+
+    def _roundtrip(self, data):
+        event = nfp_event.Event(id='CODEC_EVENT', data=data)
+        self.codec.compress(event)
+        # Event goes over the pipe pickled
+        event = pickle.loads(pickle.dumps(event, nfp_codec.PICKLE_PROTOCOL))
+        self.codec.decompress(event)
+        self.assertFalse(event.zipped)
+        return event
+
+    def test_small_data_not_encoded(self):
+        data = {'key': 'value'}
+        event = nfp_event.Event(id='CODEC_EVENT', data=data)
+        self.codec.compress(event)
+        self.assertFalse(event.zipped)
+        self.assertEqual(data, event.data)
+
+    def test_large_data_compressed(self):
+        data = {'routes': ['10.0.%d.0/24' % (i) for i in range(256)]}
+        event = nfp_event.Event(id='CODEC_EVENT', data=data)
+        self.codec.compress(event)
+        self.assertTrue(event.zipped)
+        self.assertEqual(nfp_codec.FRAME_ZLIB, event.data[:1])
+        self.assertEqual(data, self._roundtrip(data).data)
+
+    def test_non_literal_data(self):
+        # str()/literal_eval could not carry arbitrary objects
+        data = {'objects': [Object(i) for i in range(64)],
+                'set': set(range(64))}
+        self.assertEqual(data, self._roundtrip(data).data)
+
+    def test_compress_is_idempotent(self):
+        data = ['x' * 128]
+        event = nfp_event.Event(id='CODEC_EVENT', data=data)
+        self.codec.compress(event)
+        blob = event.data
+        self.codec.compress(event)
+        self.assertEqual(blob, event.data)
+        self.codec.decompress(event)
+        self.codec.decompress(event)
+        self.assertEqual(data, event.data)
+
+    def test_encode_decode(self):
+        for data in [{}, 'x', 'x' * 1024, range(10)]:
+            blob = self.codec.encode(data)
+            self.assertEqual(data, self.codec.decode(blob))
+
+    def test_decode_bad_header(self):
+        self.assertRaises(nfp_codec.EventCodecError,
+                          self.codec.decode, b'\x07garbage')
+
+    def test_get_codec_defaults(self):
+        codec = nfp_codec.get_codec(object())
+        self.assertTrue(isinstance(codec, nfp_codec.PickleCodec))
@@ -0,0 +1,100 @@
+#  Licensed under the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License. You may obtain
+#  a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#  WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#  License for the specific language governing permissions and limitations
+#  under the License.
+
+import mock
+import unittest
+
+from gbpservice.nfp.core import event as nfp_event
+from gbpservice.nfp.core import poll as nfp_poll
+
+
+class FakeTime(object):
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class Test_Poll_Handler(unittest.TestCase):
+
+    def setUp(self):
+        self.time = FakeTime()
+        self.poller = nfp_poll.NfpPollHandler({}, timefunc=self.time)
+        self.fired = []
+
+    def _callback(self, event):
+        self.fired.append(event)
+
+    def _other_callback(self, event):
+        self.fired.append(event)
+
+    def _event(self, index):
+        return nfp_event.Event(id='POLL_EVENT_%d' % (index))
+
+    def test_all_expired_events_fired_in_one_run(self):
+        events = [self._event(i) for i in range(500)]
+        for event in events:
+            self.poller.poll_add(event, 1, self._callback)
+        self.assertEqual(0, self.poller.run())
+        self.time.now += 1
+        self.assertEqual(500, self.poller.run())
+        # Same expiry, fired in the order they were added
+        self.assertEqual(events, self.fired)
+        self.assertTrue(self.poller.empty())
+        self.assertEqual(None, self.poller.next_timeout())
+
+    def test_sub_second_spacing(self):
+        event_1 = self._event(1)
+        event_2 = self._event(2)
+        self.poller.poll_add(event_2, 0.5, self._callback)
+        self.poller.poll_add(event_1, 0.25, self._callback)
+        self.assertEqual(0.25, self.poller.next_timeout())
+        self.time.now += 0.25
+        self.assertEqual(1, self.poller.run())
+        self.assertEqual([event_1], self.fired)
+        self.assertEqual(0.25, self.poller.next_timeout())
+        self.time.now += 0.25
+        self.assertEqual(1, self.poller.run())
+        self.assertEqual([event_1, event_2], self.fired)
+
+    def test_cancel_by_uuid(self):
+        event_1 = self._event(1)
+        event_2 = self._event(2)
+        self.poller.poll_add(event_1, 1, self._callback)
+        self.poller.poll_add(event_1, 2, self._other_callback)
+        self.poller.poll_add(event_2, 1, self._callback)
+        # Cancel only the timers with the given callback
+        self.assertEqual(
+            1, self.poller.poll_cancel(event_1.desc.uuid,
+                                       method=self._callback))
+        self.assertEqual(2, len(self.poller))
+        self.time.now += 1
+        self.assertEqual(1, self.poller.run())
+        self.assertEqual([event_2], self.fired)
+        self.assertEqual(1, self.poller.poll_cancel(event_1.desc.uuid))
+        self.assertEqual(0, self.poller.poll_cancel(event_1.desc.uuid))
+        self.time.now += 1
+        self.assertEqual(0, self.poller.run())
+        self.assertEqual(None, self.poller.next_timeout())
+
+    @mock.patch.object(nfp_poll.LOG, 'exception')
+    def test_failing_callback_does_not_stop_run(self, mock_log):
+        def _raise(event):
+            raise Exception("callback failed")
+
+        self.poller.poll_add(self._event(1), 0, _raise)
+        self.poller.poll_add(self._event(2), 0, self._callback)
+        self.assertEqual(2, self.poller.run())
+        self.assertEqual(1, len(self.fired))
+        self.assertTrue(mock_log.called)
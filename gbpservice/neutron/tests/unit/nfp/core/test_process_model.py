@@ -13,6 +13,7 @@
 from gbpservice.nfp.core import controller as nfp_controller
 from gbpservice.nfp.core import event as nfp_event
 from gbpservice.nfp.core import log as nfp_logging
+from gbpservice.nfp.core import stats as nfp_stats
 from gbpservice.nfp.core import worker as nfp_worker
 import mock
 import multiprocessing as multiprocessing
@@ -379,6 +380,141 @@ class Test_Process_Model(unittest.TestCase):
             called = controller.nfp_event_load_wait_obj.is_set()
             self.assertTrue(called)
 
+    @mock.patch(
+        'gbpservice.nfp.core.controller.NfpController.pipe_send'
+    )
+    def test_dispatch_latency_recorded(self, mock_pipe_send):
+        mock_pipe_send.side_effect = self.mocked_pipe_send
+        conf = oslo_config.CONF
+        conf.nfp_modules_path = NFP_MODULES_PATH
+        controller = nfp_controller.NfpController(conf)
+        self.controller = controller
+        nfp_controller.load_nfp_modules(conf, controller)
+        controller.launch(1)
+        controller._update_manager()
+
+        wait_obj = multiprocessing.Event()
+        setattr(controller, 'nfp_event_1_wait_obj', wait_obj)
+        event = controller.create_event(
+            id='EVENT_1', data='dispatch_latency')
+        controller.post_event(event)
+        self.assertTrue(event.desc.posted_at)
+        summary = controller._manager.get_dispatch_latency().summary()
+        self.assertEqual(1, summary['count'])
+
+    def test_distributor_wait_wakeup(self):
+        conf = oslo_config.CONF
+        conf.nfp_modules_path = []
+        controller = nfp_controller.NfpController(conf)
+        manager = controller._manager
+
+        # Nothing to wait for, times out
+        start_time = time.time()
+        manager.wait_for_events(timeout=0.2)
+        self.assertTrue(time.time() - start_time >= 0.2)
+
+        # Wakeup unblocks the wait right away
+        manager.wakeup()
+        manager.wakeup()
+        start_time = time.time()
+        readable = manager.wait_for_events(timeout=5)
+        self.assertTrue(time.time() - start_time < 1)
+        self.assertEqual([manager._wakeup_rfd], readable)
+
+        # Wakeup is consumed
+        start_time = time.time()
+        manager.wait_for_events(timeout=0.2)
+        self.assertTrue(time.time() - start_time >= 0.2)
+
+    def test_latency_histogram_percentiles(self):
+        histogram = nfp_stats.LatencyHistogram('test')
+        for i in range(98):
+            histogram.record(0.0015)
+        histogram.record(0.3)
+        histogram.record(0.4)
+        summary = histogram.summary()
+        self.assertEqual(100, summary['count'])
+        self.assertEqual(2, summary['p50_ms'])
+        self.assertEqual(500, summary['p99_ms'])
+
+    @mock.patch(
+        'gbpservice.nfp.core.controller.NfpController.pipe_send'
+    )
+    def test_load_balanced_with_completions(self, mock_pipe_send):
+        conf = oslo_config.CONF
+        conf.nfp_modules_path = NFP_MODULES_PATH
+        controller = nfp_controller.NfpController(conf)
+        nfp_controller.load_nfp_modules(conf, controller)
+        controller.launch(4)
+        controller._update_manager()
+        manager = controller._manager
+
+        events = []
+        for i in range(400):
+            event = controller.create_event(id='EVENT_1', data=i)
+            controller.post_event(event)
+            events.append(event)
+        loads = [em.get_load() for em in manager._resource_map.values()]
+        self.assertEqual([100] * 4, loads)
+
+        # Complete all the events handled by one worker, it must
+        # be the one picked for the next events.
+        pid = events[0].desc.worker
+        for event in events:
+            if event.desc.worker == pid:
+                controller.event_complete(event)
+        self.assertEqual(0, manager._resource_map[pid].get_load())
+        for i in range(100):
+            event = controller.create_event(id='EVENT_1', data=i)
+            controller.post_event(event)
+            self.assertEqual(pid, event.desc.worker)
+        self.assertTrue(
+            len(manager._load_heap) <= 4 * len(manager._resource_map) + 64)
+
+    @mock.patch(
+        'gbpservice.nfp.core.controller.NfpController._fork'
+    )
+    def test_least_loaded_worker_picked_after_load_change(self, mock_fork):
+        mock_fork.side_effect = self._mocked_fork
+        conf = oslo_config.CONF
+        conf.nfp_modules_path = []
+        controller = nfp_controller.NfpController(conf)
+        controller.launch(3)
+        controller._update_manager()
+        manager = controller._manager
+        ems = list(manager._resource_map.values())
+        for em in ems:
+            em._load = 3
+        manager._rebuild_load_heap()
+
+        # Load of a worker drops once the heap is built
+        ems[0]._load = 0
+        self.assertIs(ems[0], manager._get_min_loaded_em())
+        ems[0]._load = 4
+        self.assertIs(ems[1], manager._get_min_loaded_em())
+
+    def test_inflight_events_replay_order(self):
+        conf = oslo_config.CONF
+        controller = mock.Mock()
+        em = nfp_event.NfpEventManager(conf, controller, None, pid=1)
+        events = []
+        for i in range(10):
+            event = nfp_event.Event(id='EVENT_%d' % (i))
+            em.dispatch_event(event)
+            events.append(event)
+        self.assertEqual(10, em.get_load())
+        em.pop_event(events[3])
+        em.pop_event(events[7])
+        # Popping unknown event does not change load
+        em.pop_event(events[7])
+        self.assertEqual(8, em.get_load())
+
+        new_em = nfp_event.NfpEventManager(conf, controller, None, pid=2)
+        new_em.init_from_event_manager(em)
+        expected = [event.desc.uuid for i, event in enumerate(events)
+                    if i not in (3, 7)]
+        self.assertEqual(expected, new_em.get_pending_events())
+
     def test_new_event_with_sequence_and_no_binding_key(self):
         conf = oslo_config.CONF
         conf.nfp_modules_path = []
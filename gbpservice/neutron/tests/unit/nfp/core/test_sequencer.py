@@ -0,0 +1,69 @@
+#  Licensed under the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License. You may obtain
+#  a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#  WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#  License for the specific language governing permissions and limitations
+#  under the License.
+
+import unittest
+
+from gbpservice.nfp.core import event as nfp_event
+from gbpservice.nfp.core import sequencer as nfp_sequencer
+
+
+class Test_Event_Sequencer(unittest.TestCase):
+
+    def setUp(self):
+        self.sequencer = nfp_sequencer.EventSequencer()
+
+    def _event(self, key, index):
+        return nfp_event.Event(id='SEQ_EVENT_%d' % (index),
+                               serialize=True, binding_key=key)
+
+    def test_one_event_per_key_scheduled(self):
+        events = [self._event('KEY_%d' % (i % 2), i) for i in range(4)]
+        for event in events:
+            self.sequencer.sequence(event.binding_key, event)
+        scheduled = self.sequencer.run()
+        self.assertEqual([events[0], events[1]], scheduled)
+        self.assertFalse(scheduled[0].sequence)
+        # Nothing released, nothing ready
+        self.assertFalse(self.sequencer.has_ready())
+        self.assertEqual([], self.sequencer.run())
+
+    def test_release_makes_key_ready(self):
+        events = [self._event('KEY', i) for i in range(3)]
+        for event in events:
+            self.sequencer.sequence('KEY', event)
+        self.assertEqual([events[0]], self.sequencer.run())
+        # Releasing with an event which is not scheduled is ignored
+        self.sequencer.release('KEY', events[2])
+        self.assertFalse(self.sequencer.has_ready())
+        self.sequencer.release('KEY', events[0])
+        self.assertTrue(self.sequencer.has_ready())
+        self.assertEqual([events[1]], self.sequencer.run())
+        self.sequencer.release('KEY', events[1])
+        self.assertEqual([events[2]], self.sequencer.run())
+        self.sequencer.release('KEY', events[2])
+        # Idle keys are forgotten
+        self.assertEqual({}, self.sequencer._sequencer)
+        self.assertEqual([], self.sequencer.run())
+
+    def test_release_unknown_key(self):
+        event = self._event('KEY', 0)
+        self.sequencer.release('UNKNOWN', event)
+        self.assertEqual([], self.sequencer.run())
+
+    def test_sequence_after_key_idle(self):
+        event_1 = self._event('KEY', 1)
+        self.sequencer.sequence('KEY', event_1)
+        self.assertEqual([event_1], self.sequencer.run())
+        self.sequencer.release('KEY', event_1)
+        event_2 = self._event('KEY', 2)
+        self.sequencer.sequence('KEY', event_2)
+        self.assertEqual([event_2], self.sequencer.run())
@@ -0,0 +1,204 @@
+#  Licensed under the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License. You may obtain
+#  a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#  WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#  License for the specific language governing permissions and limitations
+#  under the License.
+
+import mock
+import requests
+from requests.packages.urllib3 import exceptions as urllib3_exceptions
+from six.moves import BaseHTTPServer
+import threading
+import unittest
+
+from gbpservice.nfp.core import stats as nfp_stats
+from gbpservice.nfp.lib import http_pool
+
+
+class KeepAliveHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def _reply(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        response = b'{"status": true}' if not body else body
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+    do_GET = do_POST = do_PUT = do_DELETE = _reply
+
+    def log_message(self, *args):
+        pass
+
+
+def _connect_error():
+    reason = urllib3_exceptions.NewConnectionError(None, 'refused')
+    return requests.exceptions.ConnectionError(
+        urllib3_exceptions.MaxRetryError(None, '/', reason=reason))
+
+
+def _reset_error():
+    return requests.exceptions.ConnectionError(
+        urllib3_exceptions.ProtocolError('Connection aborted.'))
+
+
+class Test_Http_Pool(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = BaseHTTPServer.HTTPServer(
+            ('127.0.0.1', 0), KeepAliveHandler)
+        cls.url = 'http://127.0.0.1:%d/v1/nfp/' % (cls.server.server_port)
+        cls.thread = threading.Thread(target=cls.server.serve_forever)
+        cls.thread.daemon = True
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.pool = http_pool.HttpPool(retries=2, retry_backoff=0)
+
+    def test_connection_reused_for_same_host(self):
+        for i in range(10):
+            resp = self.pool.post(self.url + 'add_static_ip',
+                                  data='{"index": %d}' % (i), timeout=5)
+            self.assertEqual(200, resp.status_code)
+            self.assertEqual({'index': i}, resp.json())
+        counters = self.pool.counters()
+        self.assertEqual(1, counters['pool_misses'])
+        self.assertEqual(9, counters['pool_hits'])
+        self.assertEqual(10, counters['requests'])
+        self.assertEqual(1, counters['connection_misses'])
+        self.assertEqual(9, counters['connection_hits'])
+        stats = self.pool.stats()
+        self.assertEqual(0.9, stats['pool_hit_rate'])
+        self.assertEqual(0.9, stats['connection_hit_rate'])
+        host = stats['hosts']['127.0.0.1:%d' % (self.server.server_port)]
+        self.assertEqual(10, host['count'])
+
+    def test_pooled_per_host_port(self):
+        first = self.pool._get_host_pool('http://10.0.0.1:8888/a')
+        second = self.pool._get_host_pool('http://10.0.0.1:8888/b')
+        other_port = self.pool._get_host_pool('http://10.0.0.1:8080/a')
+        other_host = self.pool._get_host_pool('http://10.0.0.2:8888/a')
+        self.assertIs(first, second)
+        self.assertIsNot(first, other_port)
+        self.assertIsNot(first, other_host)
+
+    @mock.patch.object(http_pool.time, 'sleep')
+    def test_retry_on_connection_error(self, mock_sleep):
+        self.pool = http_pool.HttpPool(retries=2, retry_backoff=0.5)
+        host_pool = self.pool._get_host_pool(self.url)
+        resp = mock.Mock(status_code=200)
+        with mock.patch.object(
+                host_pool.session, 'request',
+                side_effect=[_connect_error(),
+                             requests.exceptions.ConnectTimeout(),
+                             resp]) as mock_request, (
+                mock.patch.object(http_pool.LOG, 'warn')):
+            self.assertIs(resp, self.pool.put(self.url, data='{}'))
+        self.assertEqual(3, mock_request.call_count)
+        # Exponential backoff
+        self.assertEqual([mock.call(0.5), mock.call(1.0)],
+                         mock_sleep.call_args_list)
+        self.assertEqual(2, host_pool.retries)
+        self.assertEqual(2, host_pool.errors)
+        self.assertEqual(1, host_pool.requests)
+
+    @mock.patch.object(http_pool.time, 'sleep')
+    def test_retries_exhausted(self, mock_sleep):
+        host_pool = self.pool._get_host_pool(self.url)
+        with mock.patch.object(
+                host_pool.session, 'request',
+                side_effect=_connect_error()), (
+                mock.patch.object(http_pool.LOG, 'warn')):
+            self.assertRaises(requests.exceptions.ConnectionError,
+                              self.pool.delete, self.url, retries=1)
+        self.assertEqual(1, host_pool.retries)
+        self.assertEqual(2, host_pool.errors)
+        # Slot released even on failure
+        self.assertTrue(host_pool._semaphore.acquire(False))
+
+    def test_lost_connection_not_retried(self):
+        host_pool = self.pool._get_host_pool(self.url)
+        for method in (self.pool.post, self.pool.put, self.pool.delete):
+            with mock.patch.object(
+                    host_pool.session, 'request',
+                    side_effect=_reset_error()) as mock_request:
+                # Host may have applied the request already
+                self.assertRaises(requests.exceptions.ConnectionError,
+                                  method, self.url)
+            self.assertEqual(1, mock_request.call_count)
+        self.assertEqual(0, host_pool.retries)
+        self.assertEqual(3, host_pool.errors)
+
+    @mock.patch.object(http_pool.time, 'sleep')
+    def test_lost_connection_retried_for_get(self, mock_sleep):
+        host_pool = self.pool._get_host_pool(self.url)
+        resp = mock.Mock(status_code=200)
+        with mock.patch.object(
+                host_pool.session, 'request',
+                side_effect=[_reset_error(), resp]) as mock_request, (
+                mock.patch.object(http_pool.LOG, 'warn')):
+            self.assertIs(resp, self.pool.get(self.url))
+        self.assertEqual(2, mock_request.call_count)
+        self.assertEqual(1, host_pool.retries)
+
+    def test_refused_connection_retried(self):
+        self.pool = http_pool.HttpPool(retries=1, retry_backoff=0)
+        url = 'http://127.0.0.1:1/v1/nfp/'
+        host_pool = self.pool._get_host_pool(url)
+        with mock.patch.object(http_pool.LOG, 'warn'):
+            self.assertRaises(requests.exceptions.ConnectionError,
+                              self.pool.post, url, data='{}', timeout=5)
+        self.assertEqual(1, host_pool.retries)
+        self.assertEqual(2, host_pool.errors)
+
+    def test_timeout_not_retried(self):
+        host_pool = self.pool._get_host_pool(self.url)
+        with mock.patch.object(
+                host_pool.session, 'request',
+                side_effect=requests.exceptions.ReadTimeout()) as (
+                mock_request):
+            self.assertRaises(requests.exceptions.ReadTimeout,
+                              self.pool.get, self.url)
+        self.assertEqual(1, mock_request.call_count)
+        self.assertEqual(1, host_pool.errors)
+
+    def test_concurrency_bounded_per_host(self):
+        self.pool = http_pool.HttpPool(max_connections_per_host=2)
+        host_pool = self.pool._get_host_pool(self.url)
+        host_pool.acquire()
+        host_pool.acquire()
+        # Both slots taken, next request to host would wait
+        self.assertFalse(host_pool._semaphore.acquire(False))
+        host_pool.release()
+        self.assertTrue(host_pool._semaphore.acquire(False))
+
+    def test_worker_counters_merged(self):
+        worker_1 = {'http_pool': {'pool_hits': 9, 'pool_misses': 1,
+                                  'connection_hits': 5,
+                                  'connection_misses': 5}}
+        worker_2 = {'http_pool': {'pool_hits': 1, 'pool_misses': 9,
+                                  'connection_hits': 5,
+                                  'connection_misses': 5}}
+        merged = nfp_stats.merge_counters([worker_1, worker_2, {}])
+        self.assertEqual(10, merged['http_pool']['pool_hits'])
+        self.assertEqual(0.5, merged['http_pool']['pool_hit_rate'])
+        self.assertEqual(0.5, merged['http_pool']['connection_hit_rate'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+import unittest
+
+from gbpservice.nfp.orchestrator.openstack import client_cache
+
+
+class FakeTime(object):
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class Test_Client_Cache(unittest.TestCase):
+
+    def setUp(self):
+        self.time = FakeTime()
+        self.cache = client_cache.ClientCache(ttl=60, max_clients=2,
+                                              timefunc=self.time)
+
+    def test_client_reused_till_ttl(self):
+        create = mock.Mock(side_effect=['client-1', 'client-2'])
+        key = ('neutron', 'http://localhost:9696/', 'token')
+        for i in range(30):
+            self.assertEqual('client-1', self.cache.get(key, create))
+        self.time.now += 60
+        self.assertEqual('client-2', self.cache.get(key, create))
+        counters = self.cache.counters()
+        self.assertEqual(29, counters['client_hits'])
+        self.assertEqual(2, counters['client_misses'])
+
+    def test_lru_eviction(self):
+        create = mock.Mock(side_effect=lambda: object())
+        first = self.cache.get(('nova', 'token-1'), create)
+        self.cache.get(('nova', 'token-2'), create)
+        # token-1 used last, token-2 evicted
+        self.assertIs(first, self.cache.get(('nova', 'token-1'), create))
+        self.cache.get(('nova', 'token-3'), create)
+        self.assertEqual(2, len(self.cache))
+        self.assertEqual(1, self.cache.counters()['evictions'])
+        self.assertIs(first, self.cache.get(('nova', 'token-1'), create))
+        self.assertEqual(3, create.call_count)
+
+    def test_failed_create_not_cached(self):
+        create = mock.Mock(side_effect=[Exception('failed'), 'client'])
+        self.assertRaises(Exception, self.cache.get, ('gbp', 'token'), create)
+        self.assertEqual('client', self.cache.get(('gbp', 'token'), create))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -11,6 +11,7 @@
 #    under the License.
 
 import copy
+from heatclient import exc as heat_exc
 from keystoneclient.v2_0 import client as identity_client
 import mock
 from oslo_config import cfg
@@ -368,6 +369,38 @@ class TestHeatDriver(unittest.TestCase):
                                                                 tenant_id)
         self.assertEqual(status, expected_status)
 
+    @mock.patch.object(heat_client.HeatClient, 'get')
+    @mock.patch.object(identity_client, "Client")
+    def test_is_config_delete_complete_stack_not_found(
+            self, identity_mock_obj, heat_get_mock_obj):
+        stack_id = '70754fdd-0325-4856-8a39-f171b65617d6'
+        tenant_id = '8ae6701128994ab281dde6b92207bb19'
+        self.heat_driver_obj._assign_admin_user_to_project = mock.Mock(
+            return_value=None)
+        nfp_logging.get_logging_context = mock.Mock(
+            return_value={'auth_token': '7fd6701128994ab281ccb6b92207bb15'})
+        heat_get_mock_obj.side_effect = heat_exc.HTTPNotFound()
+        identity_mock_obj.return_value.auth_token = "1234"
+        status = self.heat_driver_obj.is_config_delete_complete(stack_id,
+                                                                tenant_id)
+        self.assertEqual('COMPLETED', status)
+
+    @mock.patch.object(heat_client.HeatClient, 'get')
+    @mock.patch.object(identity_client, "Client")
+    def test_is_config_complete_stack_not_found(self, mock_obj,
+                                                heat_get_mock_obj):
+        stack_id = '70754fdd-0325-4856-8a39-f171b65617d6'
+        tenant_id = '8ae6701128994ab281dde6b92207bb19'
+        self.heat_driver_obj._assign_admin_user_to_project = mock.Mock(
+            return_value=None)
+        nfp_logging.get_logging_context = mock.Mock(
+            return_value={'auth_token': '7fd6701128994ab281ccb6b92207bb15'})
+        heat_get_mock_obj.side_effect = heat_exc.HTTPNotFound()
+        mock_obj.return_value.auth_token = True
+        status = self.heat_driver_obj.is_config_complete(
+            stack_id, tenant_id, self.mock_dict.network_function_details)
+        self.assertEqual('ERROR', status)
+
     def test_get_site_conn_keys(self):
         is_template_aws_version = False
         resource_name = 'OS::Neutron::IPsecSiteConnection'
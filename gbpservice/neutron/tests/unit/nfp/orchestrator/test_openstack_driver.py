@@ -41,6 +41,10 @@ class SampleData(unittest.TestCase):
         self.TENANT_NAME = 'admin'
         self.USERNAME = 'admin'
 
+    def setUp(self):
+        openstack_driver.client_cache.get_cache().clear()
+        openstack_driver.token_cache.get_cache().clear()
+
 
 @mock.patch.object(identity_client, "Client")
 class TestKeystoneClient(SampleData):
@@ -50,6 +54,7 @@ class TestKeystoneClient(SampleData):
         self.keystone_obj = openstack_driver.KeystoneClient(cfg.CONF)
 
     def setUp(self):
+        super(TestKeystoneClient, self).setUp()
         cfg.CONF.set_override('admin_user',
                               'neutron',
                               group='nfp_keystone_authtoken')
@@ -97,6 +102,18 @@ class TestKeystoneClient(SampleData):
         mock_obj.assert_called_once_with(auth_url=self.AUTH_URL,
                                          token=self.AUTH_TOKEN)
 
+    def test_scoped_keystone_token_cached(self, mock_obj):
+        mock_obj.return_value.auth_token = self.AUTH_TOKEN
+        for i in range(3):
+            retval = self.keystone_obj.get_scoped_keystone_token(
+                self.USERNAME, self.PASSWORD, self.TENANT_NAME)
+            self.assertEqual(self.AUTH_TOKEN, retval)
+        self.assertEqual(1, mock_obj.call_count)
+        # Token of another tenant is fetched
+        self.keystone_obj.get_scoped_keystone_token(
+            self.USERNAME, self.PASSWORD, None, self.TENANT_ID)
+        self.assertEqual(2, mock_obj.call_count)
+
 
 @mock.patch.object(nova_client, "Client")
 class TestNovaClient(SampleData):
@@ -247,6 +264,16 @@ class TestNeutronClient(SampleData):
         mock_obj.assert_called_once_with(token=self.AUTH_TOKEN,
                                          endpoint_url=self.ENDPOINT_URL)
 
+    def test_client_reused_across_calls(self, mock_obj):
+        self.neutron_obj.get_port(self.AUTH_TOKEN, self.PORT_ID)
+        self.neutron_obj.get_floating_ips(self.AUTH_TOKEN)
+        self.neutron_obj.get_port(self.AUTH_TOKEN, self.PORT_ID)
+        mock_obj.assert_called_once_with(token=self.AUTH_TOKEN,
+                                         endpoint_url=self.ENDPOINT_URL)
+        # Another token gets its own client
+        self.neutron_obj.get_port('token', self.PORT_ID)
+        self.assertEqual(2, mock_obj.call_count)
+
     def test_get_floating_ips(self, mock_obj):
         instance = mock_obj.return_value
         obj = instance.list_floatingips()['floatingips']
@@ -0,0 +1,179 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from heatclient import exc as heat_exc
+import mock
+import unittest
+
+from gbpservice.nfp.orchestrator.config_drivers import stack_watcher
+
+
+class FakeTime(object):
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeStack(object):
+
+    def __init__(self, stack_id, stack_status):
+        self.id = stack_id
+        self.stack_status = stack_status
+
+
+class FakeHeat(object):
+    """Stand-in for heat, stacks complete after some queries.
+
+        Stack ids map to [in progress status, final status, #queries],
+        final status is reported by the #queries'th query of the stack.
+        Stacks can be purged to simulate stacks not found.
+    """
+
+    def __init__(self):
+        self.stacks = {}
+        self.list_calls = 0
+        self.get_calls = 0
+        self.list_ids = []
+
+    def add(self, stack_id, final_status='CREATE_COMPLETE', after=1,
+            status='CREATE_IN_PROGRESS'):
+        self.stacks[stack_id] = [status, final_status, after]
+
+    def _stack(self, stack_id):
+        self.stacks[stack_id][2] -= 1
+        status, final_status, after = self.stacks[stack_id]
+        return FakeStack(stack_id, final_status if after <= 0 else status)
+
+    def get(self, stack_id):
+        self.get_calls += 1
+        if stack_id not in self.stacks:
+            raise heat_exc.HTTPNotFound()
+        return self._stack(stack_id)
+
+    def list(self, show_deleted=False, filters=None):
+        self.list_calls += 1
+        self.list_ids.append(len(filters['id']))
+        return [self._stack(stack_id) for stack_id in filters['id']
+                if stack_id in self.stacks]
+
+
+class Test_Stack_Watcher(unittest.TestCase):
+
+    def setUp(self):
+        self.time = FakeTime()
+        self.watcher = stack_watcher.StackWatcher(
+            max_age=2, max_list_ids=10, timefunc=self.time)
+        self.heat = FakeHeat()
+
+    def _poll_all(self, tenant_stacks):
+        """Look every stack up, like the NFP poll events do. """
+        statuses = {}
+        for tenant_id, stack_ids in tenant_stacks.items():
+            for stack_id in stack_ids:
+                statuses[stack_id] = self.watcher.get_status(
+                    self.heat, tenant_id, stack_id)
+        return statuses
+
+    def test_stacks_of_tenant_listed_together(self):
+        tenant_stacks = {}
+        for i in range(100):
+            self.heat.add('stack-%d' % i, after=3)
+            tenant_stacks.setdefault('tenant-%d' % (i % 2), []).append(
+                'stack-%d' % i)
+        self._poll_all(tenant_stacks)
+        self.assertEqual(100, self.heat.get_calls)
+        self.assertEqual(100, len(self.watcher))
+        self.time.now += 10
+        statuses = self._poll_all(tenant_stacks)
+        self.assertEqual(set(['CREATE_IN_PROGRESS']), set(statuses.values()))
+        # Stacks of a tenant are listed in chunks, not a get per stack
+        self.assertEqual(100, self.heat.get_calls)
+        self.assertEqual(10, self.heat.list_calls)
+        self.assertEqual([10] * 10, self.heat.list_ids)
+        self.time.now += 10
+        statuses = self._poll_all(tenant_stacks)
+        self.assertEqual(set(['CREATE_COMPLETE']), set(statuses.values()))
+        self.assertEqual(20, self.heat.list_calls)
+        # Terminal status returned, stacks no more watched
+        self.assertEqual(0, len(self.watcher))
+
+    def test_status_at_most_max_age_old(self):
+        self.heat.add('stack', after=3)
+        self.assertEqual('CREATE_IN_PROGRESS', self.watcher.get_status(
+            self.heat, 'tenant', 'stack'))
+        self.assertEqual(1, self.heat.get_calls)
+        # Fresh, cached status returned
+        self.time.now += 1
+        self.watcher.get_status(self.heat, 'tenant', 'stack')
+        self.assertEqual(0, self.heat.list_calls)
+        self.time.now += 1
+        self.watcher.get_status(self.heat, 'tenant', 'stack')
+        self.assertEqual(1, self.heat.list_calls)
+        # Not backed off while the stack does not change
+        self.time.now += 2
+        self.assertEqual('CREATE_COMPLETE', self.watcher.get_status(
+            self.heat, 'tenant', 'stack'))
+        self.assertEqual(2, self.heat.list_calls)
+        self.assertEqual(0, len(self.watcher))
+
+    def test_stack_not_found(self):
+        self.assertEqual(stack_watcher.STACK_NOT_FOUND,
+                         self.watcher.get_status(self.heat, 'tenant',
+                                                 'stack'))
+        self.assertEqual(0, len(self.watcher))
+
+    def test_purged_stack_not_found(self):
+        self.heat.add('stack', after=100)
+        self.watcher.get_status(self.heat, 'tenant', 'stack')
+        del self.heat.stacks['stack']
+        self.time.now += 2
+        self.assertEqual(stack_watcher.STACK_NOT_FOUND,
+                         self.watcher.get_status(self.heat, 'tenant',
+                                                 'stack'))
+        self.assertEqual(0, len(self.watcher))
+
+    def test_list_failure_returns_cached_status(self):
+        self.heat.add('stack', after=2)
+        self.watcher.get_status(self.heat, 'tenant', 'stack')
+        self.time.now += 2
+        with mock.patch.object(self.heat, 'list',
+                               side_effect=Exception('heat down')), (
+                mock.patch.object(stack_watcher.LOG, 'warning')):
+            self.assertEqual('CREATE_IN_PROGRESS', self.watcher.get_status(
+                self.heat, 'tenant', 'stack'))
+        # Refreshed by the next lookup
+        self.assertEqual('CREATE_COMPLETE', self.watcher.get_status(
+            self.heat, 'tenant', 'stack'))
+
+    def test_get_failure_raised(self):
+        with mock.patch.object(self.heat, 'get',
+                               side_effect=Exception('heat down')):
+            self.assertRaises(Exception, self.watcher.get_status,
+                              self.heat, 'tenant', 'stack')
+        self.assertEqual(0, len(self.watcher))
+
+    def test_idle_stacks_dropped(self):
+        self.heat.add('idle', after=1000)
+        self.heat.add('stack', after=1000)
+        self.watcher.get_status(self.heat, 'tenant', 'idle')
+        self.watcher.get_status(self.heat, 'tenant', 'stack')
+        self.time.now += stack_watcher.IDLE_TIMEOUT
+        self.watcher.get_status(self.heat, 'tenant', 'stack')
+        self.assertEqual(1, len(self.watcher))
+        self.assertEqual([1], self.heat.list_ids)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+import threading
+import unittest
+
+from gbpservice.nfp.orchestrator.openstack import token_cache
+
+KEY = ('http://keystone:5000/v2.0/', 'admin', 'pass', 'service', None)
+
+
+class FakeTime(object):
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class Test_Token_Cache(unittest.TestCase):
+
+    def setUp(self):
+        self.time = FakeTime()
+        self.cache = token_cache.TokenCache(
+            stale_time=60, tenant_id_ttl=600, timefunc=self.time)
+
+    def test_token_cached_till_about_to_expire(self):
+        fetch = mock.Mock(side_effect=[('token-1', 1000.0 + 3600),
+                                       ('token-2', 1000.0 + 7200)])
+        for i in range(5):
+            self.assertEqual('token-1', self.cache.get_token(KEY, fetch))
+        self.assertEqual(1, fetch.call_count)
+        # Refreshed stale_time seconds before keystone expiry
+        self.time.now += 3600 - 60
+        self.assertEqual('token-2', self.cache.get_token(KEY, fetch))
+        counters = self.cache.counters()
+        self.assertEqual(4, counters['token_hits'])
+        self.assertEqual(2, counters['token_misses'])
+
+    def test_token_default_lifetime(self):
+        fetch = mock.Mock(return_value=('token', None))
+        self.cache.get_token(KEY, fetch)
+        self.time.now += token_cache.DEFAULT_TOKEN_TTL - 61
+        self.cache.get_token(KEY, fetch)
+        self.assertEqual(1, fetch.call_count)
+        self.time.now += 1
+        self.cache.get_token(KEY, fetch)
+        self.assertEqual(2, fetch.call_count)
+
+    def test_expired_entries_purged(self):
+        fetch = mock.Mock(return_value=('token', None))
+        self.cache.get_token(KEY, fetch)
+        self.cache.get_tenant_id(('keystone', 'service'),
+                                 mock.Mock(return_value='tenant-id'))
+        self.assertEqual(2, len(self.cache))
+        # Only the token is still valid when another user's is added
+        self.time.now += 600
+        self.cache.get_token(('keystone', 'user2'), fetch)
+        self.assertEqual(2, len(self.cache))
+        self.time.now += token_cache.DEFAULT_TOKEN_TTL
+        self.cache.get_token(('keystone', 'user3'), fetch)
+        self.assertEqual(1, len(self.cache))
+
+    def test_tenant_id_memoized(self):
+        fetch = mock.Mock(return_value='tenant-id')
+        key = ('http://keystone:5000/v2.0/', 'service')
+        for i in range(5):
+            self.assertEqual('tenant-id',
+                             self.cache.get_tenant_id(key, fetch))
+        self.assertEqual(1, fetch.call_count)
+        self.time.now += 600
+        self.cache.get_tenant_id(key, fetch)
+        self.assertEqual(2, fetch.call_count)
+        self.assertEqual(4, self.cache.counters()['tenant_id_hits'])
+
+    def test_failed_fetch_not_cached(self):
+        fetch = mock.Mock(side_effect=[Exception('keystone down'),
+                                       ('token', None)])
+        self.assertRaises(Exception, self.cache.get_token, KEY, fetch)
+        self.assertEqual('token', self.cache.get_token(KEY, fetch))
+        self.assertEqual(1, self.cache.counters()['errors'])
+
+    def test_concurrent_lookups_single_flight(self):
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            started.set()
+            release.wait()
+            return 'token', None
+
+        results = []
+
+        def lookup():
+            results.append(self.cache.get_token(KEY, fetch))
+
+        owner = threading.Thread(target=lookup)
+        owner.start()
+        started.wait()
+        waiters = [threading.Thread(target=lookup) for i in range(10)]
+        for waiter in waiters:
+            waiter.start()
+        # Waiters are blocked on the fetch in flight
+        while self.cache.counters()['inflight_waits'] < 10:
+            release.wait(0.01)
+        release.set()
+        for thread in [owner] + waiters:
+            thread.join()
+        self.assertEqual(1, len(calls))
+        self.assertEqual(['token'] * 11, results)
+        counters = self.cache.counters()
+        self.assertEqual(1, counters['token_misses'])
+        self.assertEqual(10, counters['token_hits'])
+
+    def test_failed_fetch_raised_to_waiters(self):
+        inflight = token_cache._Fetch()
+        self.cache._inflight[('token',) + KEY] = inflight
+        inflight.error = Exception('keystone down')
+        inflight.done.set()
+        fetch = mock.Mock()
+        self.assertRaises(Exception, self.cache.get_token, KEY, fetch)
+        self.assertFalse(fetch.called)
+
+
+if __name__ == '__main__':
+    unittest.main()
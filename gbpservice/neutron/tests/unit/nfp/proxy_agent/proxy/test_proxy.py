@@ -0,0 +1,148 @@
+#  Licensed under the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License. You may obtain
+#  a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#  WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#  License for the specific language governing permissions and limitations
+#  under the License.
+
+import os
+import shutil
+import socket
+import tempfile
+import unittest
+
+import eventlet
+from oslo_config import cfg as oslo_config
+
+from gbpservice.nfp.proxy_agent.proxy import proxy
+
+
+def _recv_all(sock):
+    chunks = []
+    while True:
+        data = sock.recv(65536)
+        if not data:
+            return b''.join(chunks)
+        chunks.append(data)
+
+
+class FakeController(object):
+    """Replies to each request, read until the end, with its length."""
+
+    def __init__(self):
+        self.socket = eventlet.listen(('127.0.0.1', 0))
+        self.port = self.socket.getsockname()[1]
+        self.accepted = 0
+        self._thread = eventlet.spawn(self._serve)
+
+    def _serve(self):
+        while True:
+            sock, address = self.socket.accept()
+            self.accepted += 1
+            eventlet.spawn_n(self._reply, sock)
+
+    def _reply(self, sock):
+        request = _recv_all(sock)
+        sock.sendall(b'%d:' % len(request) + request)
+        sock.close()
+
+    def stop(self):
+        self._thread.kill()
+        self.socket.close()
+
+
+class Test_Proxy(unittest.TestCase):
+
+    def setUp(self):
+        self.controller = FakeController()
+        self.addCleanup(self.controller.stop)
+        tempdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tempdir)
+        self.path = os.path.join(tempdir, 'uds_socket')
+
+        conf = oslo_config.ConfigOpts()
+        conf.register_opts(proxy.PROXY_OPTS, 'proxy')
+        conf([])
+        conf.set_override('unix_bind_path', self.path, group='proxy')
+        conf.set_override('nfp_controller_ip', '127.0.0.1', group='proxy')
+        conf.set_override('nfp_controller_port', self.controller.port,
+                          group='proxy')
+        conf.set_override('idle_max_wait_timeout', 0.2, group='proxy')
+        conf.set_override('buffer_size', 4096, group='proxy')
+        self.conf = proxy.Configuration(conf)
+
+    def _start(self):
+        self.proxy = proxy.Proxy(self.conf)
+        thread = eventlet.spawn(self.proxy.start)
+        self.addCleanup(self.proxy.server.socket.close)
+        self.addCleanup(thread.kill)
+
+    def _request(self, data):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(self.path)
+        sock.sendall(data)
+        sock.shutdown(socket.SHUT_WR)
+        reply = _recv_all(sock)
+        sock.close()
+        return reply
+
+    def test_request_reply(self):
+        self._start()
+        self.assertEqual(b'5:hello', self._request(b'hello'))
+
+    def test_large_request_reply(self):
+        self._start()
+        data = os.urandom(1024 * 1024)
+        self.assertEqual(b'%d:' % len(data) + data, self._request(data))
+
+    def test_concurrent_requests(self):
+        self._start()
+        pool = eventlet.GreenPool()
+        replies = list(pool.imap(self._request,
+                                 [b'request%d' % i for i in range(20)]))
+        self.assertEqual([b'%d:request%d' % (len(b'request%d' % i), i)
+                          for i in range(20)], replies)
+
+    def test_idle_connection_closed(self):
+        self._start()
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(self.path)
+        with eventlet.Timeout(2):
+            self.assertEqual(b'', sock.recv(1))
+        sock.close()
+
+    def test_controller_down(self):
+        self.controller.stop()
+        self._start()
+        self.assertEqual(b'', self._request(b'hello'))
+
+    def test_controller_connections_established_ahead(self):
+        self._start()
+        with eventlet.Timeout(2):
+            while len(self.proxy.client._idle) < 2:
+                eventlet.sleep(0.01)
+        self.assertEqual(2, self.controller.accepted)
+        self.assertEqual(b'5:hello', self._request(b'hello'))
+        with eventlet.Timeout(2):
+            while len(self.proxy.client._idle) < 2:
+                eventlet.sleep(0.01)
+        # The request used a connection established ahead
+        self.assertEqual(3, self.controller.accepted)
+
+    def test_closed_controller_connection_skipped(self):
+        client = proxy.TcpClient(self.conf, None)
+        closed = client._connect()
+        # The controller closes the connection once it ends
+        closed.shutdown(socket.SHUT_WR)
+        with eventlet.Timeout(2):
+            self.assertEqual(b'0:', _recv_all(closed))
+        client._idle.append(closed)
+        sock = client.connect()
+        self.assertIsNot(closed, sock)
+        self.assertTrue(proxy._is_alive(sock))
+        sock.close()
@@ -25,6 +25,7 @@ from aim.db import model_base as aim_model_base
 
 from gbpservice.neutron.plugins.ml2plus.drivers.apic_aim import (
     extension_db as extn_db)
+from keystoneclient import exceptions as ksc_exc
 from keystoneclient.v3 import client as ksc_client
 from neutron.api import extensions
 from neutron import context
@@ -80,6 +81,12 @@ class FakeProjectManager(object):
             FakeTenant('test-tenant', 'TestTenantName'),
         ]
 
+    def get(self, project_id):
+        for project in self.list():
+            if project.id == project_id:
+                return project
+        raise ksc_exc.NotFound()
+
 
 class FakeKeystoneClient(object):
     def __init__(self, **kwargs):
@@ -619,6 +626,36 @@ class TestAimMapping(ApicAimTestCase):
         self._delete('subnets', subnet_id)
         self._check_subnet_deleted(subnet)
 
+    def test_list_extended_in_bulk(self):
+        router_id = self._make_router(
+            self.fmt, 'test-tenant', 'router1')['router']['id']
+        for i in range(3):
+            net_resp = self._make_network(self.fmt, 'net%d' % i, True)
+            subnet = self._make_subnet(
+                self.fmt, net_resp, '10.0.%d.1' % i,
+                '10.0.%d.0/24' % i)['subnet']
+            if i:
+                self.l3_plugin.add_router_interface(
+                    context.get_admin_context(), router_id,
+                    {'subnet_id': subnet['id']})
+
+        for collection, resource in [('networks', 'network'),
+                                     ('subnets', 'subnet')]:
+            with mock.patch.object(
+                    self.driver, 'extend_%s_dict' % resource) as single, (
+                    mock.patch.object(
+                        self.driver, 'extend_%s_dict_bulk' % resource,
+                        wraps=getattr(self.driver, 'extend_%s_dict_bulk' %
+                                      resource))) as bulk:
+                listed = self._list(collection)[collection]
+            self.assertFalse(single.called)
+            self.assertEqual(1, bulk.call_count)
+            self.assertEqual(3, len(listed))
+            # Same as the resources extended one by one
+            for res in listed:
+                self.assertEqual(
+                    self._show(collection, res['id'])[resource], res)
+
     def test_address_scope_lifecycle(self):
         # Test create.
         orig_scope = self._make_address_scope(
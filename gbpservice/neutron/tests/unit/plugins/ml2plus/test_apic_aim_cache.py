@@ -0,0 +1,141 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+import unittest
+
+from keystoneclient import exceptions as ksc_exc
+
+from gbpservice.neutron.plugins.ml2plus.drivers.apic_aim import cache
+
+
+class FakeTime(object):
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _project(project_id, name):
+    project = mock.Mock(id=project_id)
+    project.name = name
+    return project
+
+
+class TestProjectNameCache(unittest.TestCase):
+
+    def setUp(self):
+        self.time = FakeTime()
+        self.cache = cache.ProjectNameCache(ttl=300, size=3,
+                                            timefunc=self.time)
+        self.cache.keystone = mock.Mock()
+        self.projects = self.cache.keystone.projects
+        self.projects.get.side_effect = (
+            lambda project_id: _project(project_id, 'name-' + project_id))
+        # Expired names are looked up again right away
+        self.spawn = mock.patch.object(cache.eventlet, 'spawn_n',
+                                       side_effect=lambda func: func()).start()
+        self.addCleanup(mock.patch.stopall)
+
+    def test_project_looked_up_once_per_ttl(self):
+        for i in range(10):
+            self.cache.ensure_project('p1')
+            self.assertEqual('name-p1', self.cache.get_project_name('p1'))
+        self.assertEqual(1, self.projects.get.call_count)
+        self.assertFalse(self.projects.list.called)
+
+        # Renames are picked up once the name expired
+        self.projects.get.side_effect = (
+            lambda project_id: _project(project_id, 'renamed'))
+        self.time.now += 300
+        self.cache.ensure_project('p1')
+        self.assertEqual('renamed', self.cache.get_project_name('p1'))
+        counters = self.cache.counters()
+        self.assertEqual(9, counters['hits'])
+        self.assertEqual(1, counters['stale_hits'])
+        self.assertEqual(1, counters['misses'])
+        self.assertEqual(2, counters['keystone_gets'])
+
+    def test_least_recently_used_evicted(self):
+        for project_id in ['p1', 'p2', 'p3']:
+            self.cache.ensure_project(project_id)
+        self.cache.get_project_name('p1')
+        self.time.now += cache.ENSURED_RETENTION
+        self.cache.ensure_project('p4')
+        self.assertEqual(3, len(self.cache))
+        self.assertIsNone(self.cache.get_project_name('p2'))
+        self.assertEqual('name-p1', self.cache.get_project_name('p1'))
+        self.assertEqual(1, self.cache.counters()['evictions'])
+
+    def test_ensured_names_not_evicted(self):
+        for i in range(1, 5):
+            self.cache.ensure_project('p%d' % i)
+        # The cache grows rather than evicting a name just ensured
+        self.assertEqual(4, len(self.cache))
+        for i in range(1, 5):
+            self.assertEqual('name-p%d' % i,
+                             self.cache.get_project_name('p%d' % i))
+
+        self.time.now += cache.ENSURED_RETENTION
+        self.cache.ensure_project('p5')
+        self.assertEqual(3, len(self.cache))
+        self.assertIsNone(self.cache.get_project_name('p1'))
+        self.assertIsNone(self.cache.get_project_name('p2'))
+        self.assertEqual(2, self.cache.counters()['evictions'])
+
+    def test_expired_name_looked_up_in_background(self):
+        self.spawn.side_effect = None
+        self.cache.ensure_project('p1')
+        self.time.now += 300
+        self.projects.get.side_effect = (
+            lambda project_id: _project(project_id, 'renamed'))
+        self.cache.ensure_project('p1')
+        self.cache.ensure_project('p1')
+        # The expired name is used, Keystone is not called inline
+        self.assertEqual('name-p1', self.cache.get_project_name('p1'))
+        self.assertEqual(1, self.projects.get.call_count)
+        self.assertEqual(1, self.spawn.call_count)
+
+        self.spawn.call_args[0][0]()
+        self.assertEqual('renamed', self.cache.get_project_name('p1'))
+        self.assertEqual(2, self.projects.get.call_count)
+        self.assertEqual(2, self.cache.counters()['stale_hits'])
+
+    def test_failed_lookup_keeps_stale_name(self):
+        self.cache.ensure_project('p1')
+        self.time.now += 300
+        self.projects.get.side_effect = Exception('keystone down')
+        with mock.patch.object(cache.LOG, 'warning'):
+            self.cache.ensure_project('p1')
+        self.assertEqual('name-p1', self.cache.get_project_name('p1'))
+        self.assertEqual(1, self.cache.counters()['errors'])
+
+    def test_unknown_project(self):
+        self.projects.get.side_effect = ksc_exc.NotFound()
+        with mock.patch.object(cache.LOG, 'warning'):
+            self.cache.ensure_project('p1')
+        self.assertIsNone(self.cache.get_project_name('p1'))
+
+    def test_bulk_refresh(self):
+        self.cache.ensure_project('p1')
+        self.projects.list.return_value = [
+            _project('p%d' % i, 'listed-%d' % i) for i in range(1, 10)]
+        self.cache.refresh()
+        self.assertEqual(3, len(self.cache))
+        for i in range(1, 4):
+            self.cache.ensure_project('p%d' % i)
+            self.assertEqual('listed-%d' % i,
+                             self.cache.get_project_name('p%d' % i))
+        self.assertEqual(1, self.projects.get.call_count)
+        self.assertEqual(1, self.cache.counters()['keystone_lists'])
@@ -0,0 +1,140 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+import threading
+import time
+
+from oslo_serialization import jsonutils
+from six.moves import BaseHTTPServer
+from six.moves import socketserver
+
+OPERATIONS = '/restconf/operations/endpoint:'
+TENANTS = '/restconf/config/policy:tenants/policy:tenant/'
+
+
+class _Server(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+
+class _Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    odl = None
+
+    def _handle(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = jsonutils.loads(self.rfile.read(length)) if length else None
+        status, reply = self.odl.handle(self.command.lower(), self.path,
+                                        body)
+        data = jsonutils.dumps(reply).encode() if reply is not None else b''
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/yang.data+json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_PUT = do_DELETE = do_POST = _handle
+
+    def log_message(self, *args):
+        pass
+
+
+def _object_id(obj):
+    return obj.get('id', obj.get('name'))
+
+
+class FakeOdl(object):
+    """An in-memory ODL controller, serving the RESTCONF API used by GBP.
+
+    The tenants are kept in self.tenants, the endpoint RPCs in self.rpcs,
+    the number of requests per method in self.requests and the method &
+    path of each request, in order, in self.log. The next
+    self.failures requests fail with a 503, and every request takes at
+    least latency seconds.
+    """
+
+    def __init__(self, latency=0):
+        self.tenants = {}
+        self.rpcs = []
+        self.requests = collections.Counter()
+        self.log = []
+        self.failures = 0
+        self.latency = latency
+        self._lock = threading.Lock()
+        handler = type('Handler', (_Handler,), {'odl': self})
+        self._server = _Server(('127.0.0.1', 0), handler)
+        self.host, self.port = self._server.server_address
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def handle(self, method, path, body):
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.requests[method] += 1
+            self.log.append((method, path))
+            if self.failures:
+                self.failures -= 1
+                return 503, None
+            if path.startswith(OPERATIONS):
+                self.rpcs.append((path[len(OPERATIONS):], body['input']))
+                return 200, None
+            if not path.startswith(TENANTS):
+                return 404, None
+            segments = [segment.split(':')[-1] for segment in
+                        path[len(TENANTS):].split('/')]
+            return self._handle_tenant(method, segments[0], segments[1:],
+                                       body)
+
+    def _handle_tenant(self, method, tenant_id, segments, body):
+        tenant = self.tenants.get(tenant_id)
+        if not segments:
+            if method == 'put':
+                self.tenants[tenant_id] = body['tenant']
+                return 200, None
+            if tenant is None:
+                return 404, None
+            if method == 'delete':
+                del self.tenants[tenant_id]
+                return 200, None
+            return 200, {'tenant': [tenant]}
+
+        if tenant is None:
+            if method != 'put':
+                return 404, None
+            # Like RESTCONF, a PUT creates the parents of the object
+            tenant = self.tenants[tenant_id] = {'id': tenant_id}
+        parent = tenant
+        for container in segments[:-2]:
+            parent = parent.setdefault(container, {})
+        object_type, object_id = segments[-2:]
+        objects = parent.setdefault(object_type, [])
+        existing = [obj for obj in objects if _object_id(obj) == object_id]
+        if method == 'put':
+            for obj in existing:
+                objects.remove(obj)
+            objects.append(body[object_type])
+            return 200, None
+        if not existing:
+            return 404, None
+        if method == 'delete':
+            objects.remove(existing[0])
+            return 200, None
+        return 200, {object_type: existing}
@@ -40,6 +40,8 @@ from gbpservice.neutron.services.grouppolicy.drivers.cisco.apic import (
     apic_mapping as amap)
 from gbpservice.neutron.services.grouppolicy.drivers.cisco.apic import (
     apic_mapping_lib as alib)
+from gbpservice.neutron.services.grouppolicy.drivers.cisco.apic import (
+    nova_client as nclient)
 from gbpservice.neutron.tests.unit.plugins.ml2plus import (
     test_apic_aim as test_aim_md)
 from gbpservice.neutron.tests.unit.services.grouppolicy import (
@@ -136,6 +138,7 @@ class AIMBaseTestCase(test_nr_base.CommonNeutronBaseTestCase,
         vm = mock.Mock()
         vm.name = 'someid'
         nova_client.return_value = vm
+        nclient.get_vm_name_cache().clear()
 
         self._db = model.DbModel()
 
@@ -266,6 +269,60 @@ class TestAIMStatus(AIMBaseTestCase):
 
         self.aim_mgr.get_status = orig_get_status
 
+    def test_status_merging_batch(self):
+        looked_up = []
+
+        def mock_get_aim_status(aim_context, aim_resource):
+            looked_up.append(aim_resource.dn)
+            astatus = aim_status.AciStatus()
+            if aim_resource.dn == 'error':
+                astatus.sync_status = aim_status.AciStatus.SYNC_FAILED
+            else:
+                astatus.sync_status = aim_status.AciStatus.SYNCED
+            return astatus
+
+        aim_active, aim_shared, aim_error = [
+            mock.Mock(dn=dn) for dn in ['active', 'shared', 'error']]
+        with mock.patch.object(self.aim_mgr, 'get_status',
+                               side_effect=mock_get_aim_status):
+            statuses = self.driver._merge_aim_statuses(
+                self._neutron_context.session,
+                [[aim_active, aim_shared], [aim_shared],
+                 [aim_shared, aim_error]])
+        self.assertEqual([gp_const.STATUS_ACTIVE, gp_const.STATUS_ACTIVE,
+                          gp_const.STATUS_ERROR], statuses)
+        # Status of AIM objects shared by the lists looked up once
+        self.assertEqual(['active', 'shared', 'error'], looked_up)
+
+    def test_status_merging_batch_single_query(self):
+        def mock_get_aim_statuses(aim_context, aim_resources):
+            statuses = []
+            for aim_resource in aim_resources:
+                astatus = aim_status.AciStatus()
+                astatus.resource_dn = aim_resource.dn
+                astatus.sync_status = (aim_status.AciStatus.SYNC_PENDING
+                                       if aim_resource.dn == 'build' else
+                                       aim_status.AciStatus.SYNCED)
+                statuses.append(astatus)
+            return statuses
+
+        aim_active, aim_build = [
+            mock.Mock(dn=dn) for dn in ['active', 'build']]
+        with mock.patch.object(self.aim_mgr, 'get_statuses', create=True,
+                               side_effect=mock_get_aim_statuses) as (
+                get_statuses), mock.patch.object(
+                    self.aim_mgr, 'get_status') as get_status:
+            statuses = self.driver._merge_aim_statuses(
+                self._neutron_context.session,
+                [[aim_active], [aim_active, aim_build]])
+        self.assertEqual([gp_const.STATUS_ACTIVE, gp_const.STATUS_BUILD],
+                         statuses)
+        # The statuses of all the AIM objects are fetched at once
+        self.assertEqual(1, get_statuses.call_count)
+        self.assertEqual(['active', 'build'],
+                         [x.dn for x in get_statuses.call_args[0][1]])
+        self.assertFalse(get_status.called)
+
 
 class TestL3Policy(AIMBaseTestCase):
 
@@ -1333,6 +1390,37 @@ class TestPolicyTarget(AIMBaseTestCase):
         # RPC perspective
         self._do_test_gbp_details_no_pt()
 
+    def test_get_gbp_details_list(self):
+        l3p = self.create_l3_policy(name='myl3')['l3_policy']
+        l2p = self.create_l2_policy(name='myl2',
+                                    l3_policy_id=l3p['id'])['l2_policy']
+        ptg = self.create_policy_target_group(
+            name="ptg1", l2_policy_id=l2p['id'])['policy_target_group']
+        devices = []
+        for i in range(3):
+            pt = self.create_policy_target(
+                policy_target_group_id=ptg['id'])['policy_target']
+            self._bind_port_to_host(pt['port_id'], 'h1')
+            devices.append('tap%s' % pt['port_id'])
+        expected = [self.driver.get_gbp_details(
+            self._neutron_admin_context, device=device, host='h1')
+            for device in devices]
+
+        with mock.patch.object(self.driver, '_get_address_scopes',
+                               wraps=self.driver._get_address_scopes) as (
+                get_address_scopes):
+            mappings = self.driver.get_gbp_details_list(
+                self._neutron_admin_context, devices=devices, host='h1')
+        self.assertEqual(expected, mappings)
+        # Address scope of the VRF shared by the devices retrieved once
+        self.assertEqual(1, get_address_scopes.call_count)
+
+        requests = [{'device': device, 'host': 'h1', 'timestamp': 0,
+                     'request_id': 'request_id'} for device in devices]
+        req_mappings = self.driver.request_endpoint_details_list(
+            nctx.get_admin_context(), requests=requests)
+        self.assertEqual(expected, [x['gbp_details'] for x in req_mappings])
+
 
 class TestPolicyTargetRollback(AIMBaseTestCase):
 
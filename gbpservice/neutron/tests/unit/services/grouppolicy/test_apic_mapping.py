@@ -44,6 +44,8 @@ from gbpservice.neutron.services.grouppolicy.drivers.cisco.apic import (
     apic_mapping as amap)
 from gbpservice.neutron.services.grouppolicy.drivers.cisco.apic import (
     apic_mapping_lib as alib)
+from gbpservice.neutron.services.grouppolicy.drivers.cisco.apic import (
+    nova_client as nclient)
 from gbpservice.neutron.services.l3_router import l3_apic
 from gbpservice.neutron.tests.unit.services.grouppolicy import (
     test_resource_mapping as test_rmd)
@@ -137,6 +139,7 @@ class ApicMappingTestCase(
         vm = mock.Mock()
         vm.name = 'someid'
         nova_client.return_value = vm
+        nclient.get_vm_name_cache().clear()
         super(ApicMappingTestCase, self).setUp(
             policy_drivers=['implicit_policy', 'apic', 'chain_mapping'],
             ml2_options=ml2_opts, sc_plugin=sc_plugin)
@@ -538,6 +541,66 @@ class TestPolicyTarget(ApicMappingTestCase):
         self.driver.per_tenant_nat_epg = True
         self._do_test_get_gbp_details()
 
+    def test_get_gbp_details_list(self):
+        l3p = self.create_l3_policy(name='myl3')['l3_policy']
+        l2p = self.create_l2_policy(name='myl2',
+                                    l3_policy_id=l3p['id'])['l2_policy']
+        ptg = self.create_policy_target_group(
+            name="ptg1", l2_policy_id=l2p['id'])['policy_target_group']
+        devices = []
+        for i in range(3):
+            pt = self.create_policy_target(
+                policy_target_group_id=ptg['id'])['policy_target']
+            self._bind_port_to_host(pt['port_id'], 'h1')
+            devices.append('tap%s' % pt['port_id'])
+        devices.append('tapunknown')
+        expected = [self.driver.get_gbp_details(
+            context.get_admin_context(), device=device, host='h1')
+            for device in devices]
+
+        with mock.patch.object(self.driver.gbp_plugin, 'get_l3_policy',
+                               wraps=self.driver.gbp_plugin.get_l3_policy) as (
+                get_l3p):
+            mappings = self.driver.get_gbp_details_list(
+                context.get_admin_context(), devices=devices, host='h1')
+        self.assertEqual(expected,
+                         jsonutils.loads(jsonutils.dumps(mappings)))
+        # L3 policy shared by the devices retrieved once
+        self.assertEqual(1, get_l3p.call_count)
+
+        requests = [{'device': device, 'host': 'h1', 'timestamp': 0,
+                     'request_id': 'request_id'} for device in devices[:3]]
+        req_mappings = self.driver.request_endpoint_details_list(
+            context.get_admin_context(), requests=requests, host='h1')
+        self.assertEqual(expected[:3],
+                         [jsonutils.loads(jsonutils.dumps(x['gbp_details']))
+                          for x in req_mappings])
+
+    def test_get_ptg_ports_by_addresses(self):
+        ptg = self.create_policy_target_group(
+            name="ptg1")['policy_target_group']
+        other_ptg = self.create_policy_target_group(
+            name="ptg2")['policy_target_group']
+        pts = [self.create_policy_target(
+            policy_target_group_id=ptg['id'])['policy_target']
+            for i in range(3)]
+        other_pt = self.create_policy_target(
+            policy_target_group_id=other_ptg['id'])['policy_target']
+        ports = [self._get_object('ports', pt['port_id'], self.api)['port']
+                 for pt in pts + [other_pt]]
+        self._update('ports', ports[1]['id'],
+                     {'port': {'allowed_address_pairs': [
+                         {'ip_address': '10.10.10.10'}]}})
+        addresses = set([ports[0]['fixed_ips'][0]['ip_address'],
+                         '10.10.10.10',
+                         ports[3]['fixed_ips'][0]['ip_address']])
+        self.assertEqual(
+            set([ports[0]['id'], ports[1]['id']]),
+            self.driver._get_ptg_ports_by_addresses(
+                context.get_admin_context(), ptg['id'], addresses))
+        self.assertEqual(set(), self.driver._get_ptg_ports_by_addresses(
+            context.get_admin_context(), ptg['id'], set()))
+
     def test_get_snat_ip_for_vrf(self):
         TEST_VRF1 = 'testvrf1'
         TEST_VRF2 = 'testvrf2'
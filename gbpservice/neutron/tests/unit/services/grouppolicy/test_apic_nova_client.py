@@ -0,0 +1,85 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+import unittest
+
+from gbpservice.neutron.services.grouppolicy.drivers.cisco.apic import (
+    nova_client as nclient)
+
+
+class FakeTime(object):
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _server(vm_id, name):
+    server = mock.Mock(id=vm_id)
+    server.name = name
+    return server
+
+
+class TestVMNameCache(unittest.TestCase):
+
+    def setUp(self):
+        self.time = FakeTime()
+        self.client = mock.Mock()
+        self.client.get_server.side_effect = (
+            lambda vm_id: _server(vm_id, 'name-' + vm_id))
+        self.cache = nclient.VMNameCache(client=self.client, ttl=300,
+                                         timefunc=self.time)
+
+    def test_name_looked_up_once_per_ttl(self):
+        for i in range(10):
+            self.assertEqual('name-vm1', self.cache.get_vm_name('vm1'))
+        self.assertEqual(1, self.client.get_server.call_count)
+        self.time.now += 300
+        self.cache.get_vm_name('vm1')
+        self.assertEqual(2, self.client.get_server.call_count)
+        counters = self.cache.counters()
+        self.assertEqual(9, counters['hits'])
+        self.assertEqual(2, counters['misses'])
+
+    def test_failed_lookup_named_after_id(self):
+        self.client.get_server.side_effect = None
+        self.client.get_server.return_value = None
+        self.assertEqual('vm1', self.cache.get_vm_name('vm1'))
+        self.assertEqual('vm1', self.cache.get_vm_name('vm1'))
+        self.assertEqual(1, self.client.get_server.call_count)
+        # Looked up again well before the ttl
+        self.time.now += nclient.VM_NAME_FAILURE_TTL
+        self.cache.get_vm_name('vm1')
+        self.assertEqual(2, self.client.get_server.call_count)
+
+    def test_bulk_refresh(self):
+        self.client.list_servers.return_value = [
+            _server('vm%d' % i, 'listed-%d' % i) for i in range(1000)]
+        self.cache.refresh()
+        self.assertEqual(1000, len(self.cache))
+        for i in range(1000):
+            self.assertEqual('listed-%d' % i,
+                             self.cache.get_vm_name('vm%d' % i))
+        self.assertFalse(self.client.get_server.called)
+        # VMs booted since the refresh are looked up
+        self.assertEqual('name-new', self.cache.get_vm_name('new'))
+
+    def test_failed_refresh_keeps_names(self):
+        self.cache.get_vm_name('vm1')
+        self.client.list_servers.side_effect = Exception('nova down')
+        with mock.patch.object(nclient.LOG, 'warning'):
+            self.cache.refresh()
+        self.assertEqual('name-vm1', self.cache.get_vm_name('vm1'))
+        self.assertEqual(1, self.cache.counters()['errors'])
@@ -13,6 +13,7 @@
 import os
 
 from neutron.common import config as neutron_config  # noqa
+from neutron import context
 from neutron.db import model_base
 import sqlalchemy as sa
 
@@ -84,6 +85,20 @@ class ExtensionDriverTestCase(ExtensionDriverTestBase):
         val = res['policy_target']['pt_extension']
         self.assertEqual("def", val)
 
+    def test_pt_list_queries(self):
+        self.create_policy_target(pt_extension="abc")
+        queries = self._count_queries(self._gbp_plugin.get_policy_targets,
+                                      context.get_admin_context())
+        for i in range(3):
+            self.create_policy_target(pt_extension="abc")
+        # Not one more query per listed PT
+        self.assertEqual(queries, self._count_queries(
+            self._gbp_plugin.get_policy_targets, context.get_admin_context()))
+        pts = self._gbp_plugin.get_policy_targets(context.get_admin_context())
+        self.assertEqual(4, len(pts))
+        for pt in pts:
+            self.assertEqual("abc", pt['pt_extension'])
+
     def test_ptg_attr(self):
         # Test create with default value.
         ptg = self.create_policy_target_group()
@@ -573,8 +588,11 @@ class TestExtensionDriver(api.ExtensionDriver):
     def process_update_policy_target(self, session, data, result):
         pass
 
-    @api.default_extension_behavior(TestPolicyTargetExtension)
     def extend_policy_target_dict(self, session, result):
+        self.extend_policy_target_dicts(session, [result])
+
+    @api.default_extension_behavior(TestPolicyTargetExtension)
+    def extend_policy_target_dicts(self, session, results):
         pass
 
     @api.default_extension_behavior(TestPolicyTargetGroupExtension)
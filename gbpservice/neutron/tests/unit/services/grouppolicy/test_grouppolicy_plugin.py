@@ -1039,6 +1039,33 @@ class TestResourceStatusChange(GroupPolicyPluginTestCase):
         for resource_name in gpolicy.RESOURCE_ATTRIBUTE_MAP:
             self._test_status_change_on_list(resource_name, fields=['name'])
 
+    def test_statuses_of_list_got_at_once(self):
+        ptgs = [self.create_policy_target_group()['policy_target_group']
+                for i in range(3)]
+        neutron_context = context.Context('', self._tenant_id)
+        reset_status = {'policy_target_group': {'status': None,
+                                                'status_details': None}}
+        for ptg in ptgs:
+            gpmdb.GroupPolicyMappingDbPlugin.update_policy_target_group(
+                self._gbp_plugin, neutron_context, ptg['id'], reset_status)
+        manager = self._gbp_plugin.policy_driver_manager
+        with mock.patch.object(
+                manager, 'get_policy_target_group_statuses',
+                wraps=manager.get_policy_target_group_statuses) as statuses:
+            req = self.new_list_request('policy_target_groups',
+                                        fmt=self.fmt)
+            res = self.deserialize(self.fmt, req.get_response(self.ext_api))
+        self.assertEqual(1, statuses.call_count)
+        self.assertEqual(3, len(statuses.call_args[0][0]))
+        for ptg in res['policy_target_groups']:
+            self.assertEqual(NEW_STATUS, ptg['status'])
+            self.assertEqual(NEW_STATUS_DETAILS, ptg['status_details'])
+        # Changed statuses are saved
+        for ptg in ptgs:
+            db_obj = gpmdb.GroupPolicyMappingDbPlugin.get_policy_target_group(
+                self._gbp_plugin, neutron_context, ptg['id'])
+            self.assertEqual(NEW_STATUS, db_obj['status'])
+
 
 class TestPolicyAction(GroupPolicyPluginTestCase):
 
@@ -0,0 +1,218 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+from neutron.db import api as db_api
+from neutron.tests import base
+from oslo_config import cfg
+
+from gbpservice.neutron.services.grouppolicy.drivers.odl import odl_journal
+from gbpservice.neutron.services.grouppolicy.drivers.odl import odl_manager
+from gbpservice.neutron.tests.unit.services.grouppolicy import fake_odl
+
+TENANT_ID = 'tenant1'
+
+
+class OdlJournalTestCase(base.BaseTestCase):
+
+    def setUp(self):
+        super(OdlJournalTestCase, self).setUp()
+        engine = db_api.get_engine()
+        table = odl_journal.OdlJournalEntry.__table__
+        table.create(engine, checkfirst=True)
+        self.addCleanup(engine.execute, table.delete())
+
+        self.odl = fake_odl.FakeOdl()
+        self.odl.start()
+        self.addCleanup(self.odl.stop)
+        cfg.CONF.set_override('odl_host', self.odl.host, group='odl_driver')
+        cfg.CONF.set_override('odl_port', str(self.odl.port),
+                              group='odl_driver')
+        cfg.CONF.set_override('write_behind', True, group='odl_driver')
+        cfg.CONF.set_override('journal_max_retries', 2, group='odl_driver')
+        # The journal is synced by the tests
+        mock.patch.object(odl_manager.OdlManager, '_start_worker').start()
+        self.manager = odl_manager.OdlManager()
+
+    def _entries(self):
+        entry = odl_journal.OdlJournalEntry
+        return db_api.get_session().query(entry).order_by(entry.seqnum).all()
+
+    def test_writes_journaled(self):
+        self.manager.create_update_l3_context(TENANT_ID, {'id': 'l3ctx1'})
+        self.manager.create_action(TENANT_ID, {'name': 'action1'})
+        self.assertEqual(0, sum(self.odl.requests.values()))
+        self.assertEqual(['put', 'put'],
+                         [entry.operation for entry in self._entries()])
+
+        self.manager.sync_journal()
+        # The new tenant is created with its objects in a single PUT
+        self.assertEqual({'get': 1, 'put': 1}, self.odl.requests)
+        self.assertEqual(
+            {'id': TENANT_ID, 'l3-context': [{'id': 'l3ctx1'}],
+             'subject-feature-instances': {
+                 'action-instance': [{'name': 'action1'}]}},
+            self.odl.tenants[TENANT_ID])
+        self.assertEqual([], self._entries())
+
+    def test_writes_coalesced(self):
+        self.odl.tenants[TENANT_ID] = {'id': TENANT_ID,
+                                       'endpoint-group': [{'id': 'epg1'}]}
+        for value in range(3):
+            self.manager.create_update_l3_context(
+                TENANT_ID, {'id': 'l3ctx1', 'value': value})
+        self.manager.delete_endpoint_group(TENANT_ID, {'id': 'epg1'})
+
+        self.manager.sync_journal()
+        self.assertEqual({'get': 1, 'put': 1, 'delete': 1},
+                         self.odl.requests)
+        self.assertEqual(
+            {'id': TENANT_ID, 'l3-context': [{'id': 'l3ctx1', 'value': 2}],
+             'endpoint-group': []},
+            self.odl.tenants[TENANT_ID])
+        self.assertEqual([], self._entries())
+
+    def test_tenant_cached(self):
+        self.manager.create_update_subnet(TENANT_ID, {'id': 'subnet1'})
+        self.manager.sync_journal()
+        self.odl.requests.clear()
+
+        self.manager.create_update_subnet(TENANT_ID, {'id': 'subnet2'})
+        self.manager.sync_journal()
+        self.assertEqual({'put': 1}, self.odl.requests)
+
+    def test_write_deleted_in_new_tenant(self):
+        self.manager.create_update_l2_bridge_domain(TENANT_ID,
+                                                    {'id': 'l2bd1'})
+        self.manager.delete_l2_bridge_domain(TENANT_ID, {'id': 'l2bd1'})
+
+        self.manager.sync_journal()
+        self.assertEqual({'get': 1}, self.odl.requests)
+        self.assertEqual({}, self.odl.tenants)
+        self.assertEqual([], self._entries())
+
+    def test_endpoints_in_order(self):
+        self.manager.register_endpoints([{'ep': 1}, {'ep': 2}])
+        self.manager.unregister_endpoints([{'ep': 1}])
+
+        self.manager.sync_journal()
+        self.assertEqual([('register-endpoint', {'ep': 1}),
+                          ('register-endpoint', {'ep': 2}),
+                          ('unregister-endpoint', {'ep': 1})],
+                         self.odl.rpcs)
+        self.assertEqual([], self._entries())
+
+    def test_writes_sent_before_rpcs(self):
+        self.manager.create_update_endpoint_group(
+            TENANT_ID, {'id': 'epg1', 'name': 'before'})
+        self.manager.register_endpoints([{'ep': 1}])
+        self.manager.create_update_endpoint_group(
+            TENANT_ID, {'id': 'epg1', 'name': 'after'})
+
+        self.manager.sync_journal()
+        # The EPG is created before the endpoint is registered, then
+        # updated without replacing the new tenant
+        self.assertEqual(['get', 'put', 'post', 'put'],
+                         [method for method, path in self.odl.log])
+        self.assertEqual([('register-endpoint', {'ep': 1})], self.odl.rpcs)
+        self.assertEqual([{'id': 'epg1', 'name': 'after'}],
+                         self.odl.tenants[TENANT_ID]['endpoint-group'])
+        self.assertEqual([], self._entries())
+
+    def test_failure_retried(self):
+        self.manager.register_endpoints([{'ep': 1}, {'ep': 2}])
+        self.odl.failures = 1
+
+        self.manager.sync_journal()
+        self.assertEqual([], self.odl.rpcs)
+        self.assertEqual([(odl_journal.PENDING, 1), (odl_journal.PENDING, 0)],
+                         [(entry.state, entry.retry_count)
+                          for entry in self._entries()])
+
+        self.manager.sync_journal()
+        self.assertEqual([('register-endpoint', {'ep': 1}),
+                          ('register-endpoint', {'ep': 2})], self.odl.rpcs)
+        self.assertEqual([], self._entries())
+
+    def test_failure_cached_tenant_forgotten(self):
+        self.manager.create_update_subnet(TENANT_ID, {'id': 'subnet1'})
+        self.manager.sync_journal()
+        self.manager.create_update_subnet(TENANT_ID, {'id': 'subnet2'})
+        self.odl.failures = 1
+
+        self.manager.sync_journal()
+        self.assertNotIn(TENANT_ID, self.manager._tenants)
+
+    def test_max_retries(self):
+        self.manager.create_update_contract(TENANT_ID, {'id': 'contract1'})
+        self.manager.create_update_contract(TENANT_ID, {'id': 'contract2'})
+        self.odl.tenants[TENANT_ID] = {'id': TENANT_ID}
+        self.manager._tenants.add(TENANT_ID)
+        self.odl.failures = 2
+
+        self.manager.sync_journal()
+        self.manager.sync_journal()
+        self.assertEqual([(odl_journal.FAILED, 2), (odl_journal.PENDING, 0)],
+                         [(entry.state, entry.retry_count)
+                          for entry in self._entries()])
+
+        # The failed entry is not sent again
+        self.manager.sync_journal()
+        self.assertEqual([{'id': 'contract2'}],
+                         self.odl.tenants[TENANT_ID]['contract'])
+        self.assertEqual([odl_journal.FAILED],
+                         [entry.state for entry in self._entries()])
+
+    def test_failed_object_writes_held(self):
+        self.odl.tenants[TENANT_ID] = {'id': TENANT_ID}
+        self.manager._tenants.add(TENANT_ID)
+        self.manager.create_update_contract(TENANT_ID,
+                                            {'id': 'contract1', 'v': 1})
+        self.odl.failures = 2
+        self.manager.sync_journal()
+        self.manager.sync_journal()
+
+        self.manager.create_update_contract(TENANT_ID,
+                                            {'id': 'contract1', 'v': 2})
+        self.manager.create_update_contract(TENANT_ID, {'id': 'contract2'})
+        self.manager.sync_journal()
+        # The later write of contract1 is held with its failed one
+        self.assertEqual([{'id': 'contract2'}],
+                         self.odl.tenants[TENANT_ID]['contract'])
+        self.assertEqual([(odl_journal.FAILED, 2), (odl_journal.FAILED, 0)],
+                         [(entry.state, entry.retry_count)
+                          for entry in self._entries()])
+
+    def test_batch_size(self):
+        cfg.CONF.set_override('journal_batch_size', 2, group='odl_driver')
+        self.odl.tenants[TENANT_ID] = {'id': TENANT_ID}
+        for i in range(5):
+            self.manager.create_update_subnet(TENANT_ID,
+                                              {'id': 'subnet%d' % i})
+
+        self.manager.sync_journal()
+        self.assertEqual(5, len(self.odl.tenants[TENANT_ID]['subnet']))
+        self.assertEqual([], self._entries())
+
+    def test_stale_processing_entries_released(self):
+        self.manager.create_update_subnet(TENANT_ID, {'id': 'subnet1'})
+        session = db_api.get_session()
+        self.assertEqual(1, len(odl_journal.claim_entries(session, 10, 100)))
+        # Another worker is processing the entry
+        self.manager.sync_journal()
+        self.assertEqual({}, self.odl.requests)
+
+        cfg.CONF.set_override('journal_processing_timeout', -1,
+                              group='odl_driver')
+        self.manager.sync_journal()
+        self.assertIn(TENANT_ID, self.odl.tenants)
+        self.assertEqual([], self._entries())
@@ -11,7 +11,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import requests
 import unittest
 
 import mock
@@ -122,11 +121,7 @@ class DataMatcher(object):
     """
 
     def __init__(self, obj):
-        self._data = jsonutils.dumps(
-            obj,
-            indent=4,
-            sort_keys=True
-        )
+        self._data = jsonutils.dumps(obj)
 
     def __eq__(self, obj):
         return (self._data == obj)
@@ -151,6 +146,10 @@ class OdlManagerTestCase(unittest.TestCase):
         config.cfg.CONF.set_override('odl_port',
                                      PORT,
                                      group='odl_driver')
+        # The journal is tested in test_odl_journal
+        config.cfg.CONF.set_override('write_behind',
+                                     False,
+                                     group='odl_driver')
 
         self.manager = odl_manager.OdlManager()
 
@@ -162,7 +161,8 @@ class OdlManagerTestCase(unittest.TestCase):
             *args,
             **kwargs
     ):
-        with mock.patch('requests.request') as mock_request:
+        with mock.patch.object(self.manager._session,
+                               'request') as mock_request:
             tested_method(*args)
             mock_request.assert_called_once_with(
                 http_method,
@@ -181,7 +181,8 @@ class OdlManagerTestCase(unittest.TestCase):
     ):
         with mock.patch.object(odl_manager.OdlManager,
                                '_is_tenant_created') as mock_is_tenant_created:
-            with mock.patch('requests.request') as mock_request:
+            with mock.patch.object(self.manager._session,
+                                   'request') as mock_request:
                 mock_is_tenant_created.return_value = True
                 tested_method(*args)
                 mock_request.assert_called_once_with(
@@ -189,6 +190,17 @@ class OdlManagerTestCase(unittest.TestCase):
                     **kwargs
                 )
 
+                # The tenant is known now, it is not looked up again
+                mock_is_tenant_created.reset_mock()
+                mock_request.reset_mock()
+                tested_method(*args)
+                self.assertFalse(mock_is_tenant_created.called)
+                mock_request.assert_called_once_with(
+                    http_method,
+                    **kwargs
+                )
+
+                self.manager._tenants.clear()
                 mock_is_tenant_created.return_value = False
                 mock_request.reset_mock()
                 tested_method(*args)
@@ -204,8 +216,10 @@ class OdlManagerTestCase(unittest.TestCase):
                     **kwargs
                 )
 
-    @mock.patch.object(requests, 'request')
-    def test_is_tenant_created(self, mock_request):
+    def test_is_tenant_created(self):
+        mock_request = mock.patch.object(self.manager._session,
+                                         'request').start()
+        self.addCleanup(mock.patch.stopall)
 
         mock_request.return_value = mock.Mock(
             status_code=200
@@ -0,0 +1,140 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import re
+
+from neutron import context as nctx
+from neutron.db import api as db_api
+import sqlalchemy as sa
+
+from gbpservice.neutron.db.grouppolicy import group_policy_db as gpdb
+from gbpservice.neutron.tests.unit.services.grouppolicy import (
+    test_resource_mapping as test_rmd)
+
+SEED_ROWS = 10000
+SCAN_RE = re.compile(r'^SCAN (?:TABLE )?(\w+)')
+
+
+class TestQueryPlans(test_rmd.ResourceMappingTestCase):
+    """Fails on full scans of the GBP tables with many rows.
+
+    The tables are seeded with SEED_ROWS rows and analyzed, then the SQL
+    run by each plugin operation is recorded and explained by sqlite.
+    """
+
+    def setUp(self):
+        super(TestQueryPlans, self).setUp()
+        self.engine = db_api.get_engine()
+        self._seed()
+
+    def _seed(self):
+        rows = range(SEED_ROWS)
+
+        def common(i):
+            return {'id': 'seed-%d' % i, 'tenant_id': 'seed-%d' % (i % 1000),
+                    'name': 'seed-%d' % i, 'description': 'seed-%d' % i,
+                    'type': 'mapping'}
+
+        self.engine.execute(gpdb.L3Policy.__table__.insert(), [
+            dict(common(i), ip_version=4, ip_pool='10.0.0.0/8',
+                 subnet_prefix_length=24) for i in rows])
+        self.engine.execute(gpdb.L2Policy.__table__.insert(), [
+            dict(common(i), l3_policy_id='seed-%d' % i) for i in rows])
+        self.engine.execute(gpdb.PolicyTargetGroup.__table__.insert(), [
+            dict(common(i), l2_policy_id='seed-%d' % i) for i in rows])
+        self.engine.execute(gpdb.PolicyTarget.__table__.insert(), [
+            dict(common(i), policy_target_group_id='seed-%d' % i,
+                 cluster_id='seed-%d' % i) for i in rows])
+        self.engine.execute('ANALYZE')
+        self.seeded_tables = set([
+            gpdb.L3Policy.__tablename__, gpdb.L2Policy.__tablename__,
+            gpdb.PolicyTargetGroup.__tablename__,
+            gpdb.PolicyTarget.__tablename__])
+
+    def _get_full_scans(self, func, *args, **kwargs):
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context,
+                   executemany):
+            if not executemany:
+                statements.append((statement, parameters))
+
+        sa.event.listen(self.engine, 'before_cursor_execute', record)
+        try:
+            func(*args, **kwargs)
+        finally:
+            sa.event.remove(self.engine, 'before_cursor_execute', record)
+
+        scans = []
+        conn = self.engine.raw_connection()
+        try:
+            cursor = conn.cursor()
+            for statement, parameters in statements:
+                if not statement.lstrip().upper().startswith(
+                        ('SELECT', 'UPDATE', 'DELETE')):
+                    continue
+                cursor.execute('EXPLAIN QUERY PLAN ' + statement, parameters)
+                for row in cursor.fetchall():
+                    match = SCAN_RE.match(row[-1])
+                    if not match:
+                        continue
+                    # Aliased tables are named <table>_<n>
+                    table = match.group(1)
+                    if table not in self.seeded_tables:
+                        table = re.sub(r'_\d+$', '', table)
+                    if table in self.seeded_tables:
+                        scans.append('%s: %s' % (row[-1], statement))
+        finally:
+            conn.close()
+        return scans
+
+    def _assert_no_full_scan(self, func, *args, **kwargs):
+        scans = self._get_full_scans(func, *args, **kwargs)
+        self.assertEqual([], scans)
+
+    def test_policy_target_lifecycle(self):
+        ptgs = []
+        pts = []
+        self._assert_no_full_scan(
+            lambda: ptgs.append(self.create_policy_target_group(
+                name='ptg1')['policy_target_group']))
+        self._assert_no_full_scan(
+            lambda: pts.append(self.create_policy_target(
+                policy_target_group_id=ptgs[0]['id'])['policy_target']))
+        self._assert_no_full_scan(
+            self.update_policy_target, pts[0]['id'], name='pt1')
+        self._assert_no_full_scan(
+            self.delete_policy_target, pts[0]['id'], expected_res_status=204)
+        self._assert_no_full_scan(
+            self.delete_policy_target_group, ptgs[0]['id'],
+            expected_res_status=204)
+
+    def test_lookups(self):
+        context = nctx.get_admin_context()
+        lookups = [
+            (self._gbp_plugin.get_policy_targets,
+             {'description': ['seed-42']}),
+            (self._gbp_plugin.get_policy_targets,
+             {'cluster_id': ['seed-42']}),
+            (self._gbp_plugin.get_policy_targets,
+             {'policy_target_group_id': ['seed-42']}),
+            (self._gbp_plugin.get_policy_target_groups,
+             {'description': ['seed-42']}),
+            (self._gbp_plugin.get_policy_target_groups,
+             {'l2_policy_id': ['seed-42']}),
+            (self._gbp_plugin.get_l2_policies,
+             {'l3_policy_id': ['seed-42']}),
+            (self._gbp_plugin.get_l3_policies,
+             {'tenant_id': ['seed-42']})]
+        for get, filters in lookups:
+            self._assert_no_full_scan(get, context, filters=filters)
+            self.assertTrue(get(context, filters=filters))
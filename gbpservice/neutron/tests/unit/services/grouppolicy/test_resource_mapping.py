@@ -34,6 +34,7 @@ from oslo_utils import uuidutils
 import webob.exc
 
 from gbpservice.common import utils
+from gbpservice.network.neutronv2 import local_api
 from gbpservice.neutron.db.grouppolicy import group_policy_db as gpdb
 from gbpservice.neutron.db import servicechain_db
 from gbpservice.neutron.services.grouppolicy.common import constants as gconst
@@ -42,6 +43,7 @@ from gbpservice.neutron.services.grouppolicy import config
 from gbpservice.neutron.services.grouppolicy.drivers import chain_mapping
 from gbpservice.neutron.services.grouppolicy.drivers import nsp_manager
 from gbpservice.neutron.services.grouppolicy.drivers import resource_mapping
+from gbpservice.neutron.services.grouppolicy.drivers import subnet_allocator
 from gbpservice.neutron.services.servicechain.plugins.msc import (
     config as sc_cfg)
 from gbpservice.neutron.tests.unit.db.grouppolicy import test_group_policy_db
@@ -603,6 +605,46 @@ class TestPolicyTarget(ResourceMappingTestCase, TestClusterIdMixin):
         res = req.get_response(self.api)
         self.assertEqual(webob.exc.HTTPNotFound.code, res.status_int)
 
+    def test_create_policy_targets_in_bulk(self):
+        ptg = self.create_policy_target_group(
+            name="ptg1")['policy_target_group']
+        data = {'policy_targets': [
+            {'policy_target': {'name': 'pt%d' % i,
+                               'tenant_id': self._tenant_id,
+                               'policy_target_group_id': ptg['id']}}
+            for i in range(3)]}
+        manager = self._gbp_plugin.policy_driver_manager
+        with mock.patch.object(
+                self._plugin, 'create_port_bulk',
+                wraps=self._plugin.create_port_bulk) as create_ports:
+            with mock.patch.object(
+                    manager, 'create_policy_target_bulk_postcommit',
+                    wraps=manager.create_policy_target_bulk_postcommit
+            ) as postcommit, mock.patch.object(
+                    local_api, 'send_or_queue_notification',
+                    wraps=local_api.send_or_queue_notification) as notify:
+                req = self.new_create_request('policy_targets', data,
+                                              self.fmt)
+                res = req.get_response(self.ext_api)
+        self.assertEqual(webob.exc.HTTPCreated.code, res.status_int)
+        pts = self.deserialize(self.fmt, res)['policy_targets']
+        self.assertEqual(['pt0', 'pt1', 'pt2'], [pt['name'] for pt in pts])
+        self.assertEqual(1, postcommit.call_count)
+        self.assertEqual(3, len(postcommit.call_args[0][0]))
+        # The implicit ports are created at once
+        self.assertEqual(1, create_ports.call_count)
+        # The ports are notified the way single creates are
+        notified = [call[0][3][2]['port']['id']
+                    for call in notify.call_args_list
+                    if call[0][2] == 'send_network_change' and
+                    call[0][3][0] == 'create_port']
+        self.assertEqual(sorted(pt['port_id'] for pt in pts),
+                         sorted(notified))
+        for pt in pts:
+            port = self._get_object('ports', pt['port_id'], self.api)['port']
+            self.assertEqual(ptg['subnets'][0],
+                             port['fixed_ips'][0]['subnet_id'])
+
     def test_create_policy_target_with_fixed_ip(self):
         l3p = self.create_l3_policy(name="l3p1", ip_pool='10.0.0.0/8')
         l3p_id = l3p['l3_policy']['id']
@@ -1382,6 +1424,99 @@ class TestPolicyTargetGroup(ResourceMappingTestCase):
                                     query_params='name=ptg2')
                          ['policy_target_groups'])
 
+    def test_subnet_allocation_reuses_released_blocks(self):
+        l3p = self.create_l3_policy(name="l3p", ip_pool="10.0.0.0/24",
+                                    subnet_prefix_length=26)
+        l3p_id = l3p['l3_policy']['id']
+        l2p_id = self.create_l2_policy(
+            name="l2p", l3_policy_id=l3p_id)['l2_policy']['id']
+
+        def create_ptg(name):
+            ptg = self.create_policy_target_group(
+                name=name, l2_policy_id=l2p_id)['policy_target_group']
+            subnet = self._show('subnets', ptg['subnets'][0])['subnet']
+            return ptg['id'], subnet['cidr']
+
+        def free_blocks():
+            session = nctx.get_admin_context().session
+            return sorted(x.cidr for x in session.query(
+                subnet_allocator.L3PolicySubnetBlock).filter_by(
+                    l3_policy_id=l3p_id, allocated=False))
+
+        ptg1_id, cidr1 = create_ptg("ptg1")
+        ptg2_id, cidr2 = create_ptg("ptg2")
+        self.assertEqual(['10.0.0.0/26', '10.0.0.64/26'], [cidr1, cidr2])
+        self.assertEqual(['10.0.0.128/25'], free_blocks())
+
+        # The released block is the smallest free one, it is used first.
+        self.delete_policy_target_group(ptg1_id, expected_res_status=204)
+        self.assertEqual(['10.0.0.0/26', '10.0.0.128/25'], free_blocks())
+        ptg3_id, cidr3 = create_ptg("ptg3")
+        self.assertEqual('10.0.0.0/26', cidr3)
+
+        # Released blocks are merged back with their free buddies.
+        self.delete_policy_target_group(ptg2_id, expected_res_status=204)
+        self.delete_policy_target_group(ptg3_id, expected_res_status=204)
+        self.assertEqual(['10.0.0.0/24'], free_blocks())
+
+    def test_subnet_pool_reset_keeps_reserved_blocks(self):
+        l3p = self.create_l3_policy(name="l3p", ip_pool="10.0.0.0/24",
+                                    subnet_prefix_length=26)
+        l3p_id = l3p['l3_policy']['id']
+        l2p_id = self.create_l2_policy(
+            name="l2p", l3_policy_id=l3p_id)['l2_policy']['id']
+        ptg = self.create_policy_target_group(
+            name="ptg1", l2_policy_id=l2p_id)['policy_target_group']
+        subnet = self._show('subnets', ptg['subnets'][0])['subnet']
+        driver = self._gbp_plugin.policy_driver_manager.policy_drivers[
+            'resource_mapping'].obj
+        session = nctx.get_admin_context().session
+
+        def get_allocated():
+            return [subnet]
+
+        # An allocation reserves a block, its subnet is not created yet
+        # when another allocation resets the pool
+        reserved = driver._allocate_l3p_subnet_block(
+            session, l3p_id, "10.0.0.0/24", 26, get_allocated)
+        self.assertEqual('10.0.0.64/26', reserved)
+        driver._reset_l3p_subnet_pool(session, l3p_id, "10.0.0.0/24",
+                                      get_allocated)
+        self.assertEqual(
+            [('10.0.0.0/26', True), ('10.0.0.128/25', False),
+             ('10.0.0.64/26', True)],
+            sorted((x.cidr, x.allocated) for x in session.query(
+                subnet_allocator.L3PolicySubnetBlock).filter_by(
+                    l3_policy_id=l3p_id)))
+        self.assertEqual('10.0.0.128/26', driver._allocate_l3p_subnet_block(
+            session, l3p_id, "10.0.0.0/24", 26, get_allocated))
+
+    def test_subnet_allocation_skips_explicit_subnets(self):
+        l3p = self.create_l3_policy(name="l3p", ip_pool="10.0.0.0/24",
+                                    subnet_prefix_length=26)
+        l3p_id = l3p['l3_policy']['id']
+        l2p1_id = self.create_l2_policy(
+            name="l2p1", l3_policy_id=l3p_id)['l2_policy']['id']
+        l2p2 = self.create_l2_policy(name="l2p2", l3_policy_id=l3p_id)
+        req = self.new_show_request('networks',
+                                    l2p2['l2_policy']['network_id'])
+        network = self.deserialize(self.fmt, req.get_response(self.api))
+
+        def create_ptg(name):
+            ptg = self.create_policy_target_group(
+                name=name, l2_policy_id=l2p1_id)['policy_target_group']
+            return self._show('subnets', ptg['subnets'][0])['subnet']['cidr']
+
+        self.assertEqual('10.0.0.0/26', create_ptg("ptg1"))
+        # The explicit subnet takes the next block of the pool
+        with self.subnet(network=network, cidr='10.0.0.64/26') as subnet:
+            ptg2 = self.create_policy_target_group(
+                name="ptg2", l2_policy_id=l2p2['l2_policy']['id'],
+                subnets=[subnet['subnet']['id']])['policy_target_group']
+            self.assertEqual('10.0.0.128/26', create_ptg("ptg3"))
+            self.delete_policy_target_group(ptg2['id'],
+                                            expected_res_status=204)
+
     def test_unbound_ports_deletion(self):
         ptg = self.create_policy_target_group()['policy_target_group']
         pt = self.create_policy_target(policy_target_group_id=ptg['id'])
@@ -1928,6 +2063,43 @@ class TestPolicyRuleSet(ResourceMappingTestCase):
         self.assertEqual(len(security_groups), 2)
         self._verify_prs_rules(policy_rule_set_id)
 
+    def test_consumer_rules_set_in_bulk(self):
+        policy_rules = [self._create_tcp_allow_rule(port)['id']
+                        for port in ['22', '80', '443']]
+        prs_id = self.create_policy_rule_set(
+            policy_rules=policy_rules)['policy_rule_set']['id']
+        self.create_policy_target_group(
+            provided_policy_rule_sets={prs_id: None})
+        plugin = manager.NeutronManager.get_plugin()
+        with mock.patch.object(
+                plugin, 'create_security_group_rule',
+                wraps=plugin.create_security_group_rule) as create, \
+                mock.patch.object(
+                    plugin, 'create_security_group_rule_bulk',
+                    wraps=plugin.create_security_group_rule_bulk) as bulk:
+            ptg_id = self.create_policy_target_group(
+                consumed_policy_rule_sets={prs_id: None})[
+                    'policy_target_group']['id']
+            # No rule is created on its own
+            self.assertTrue(bulk.called)
+            self.assertFalse(create.called)
+        self._verify_prs_rules(prs_id)
+
+        # Rules already in place are not created again
+        with mock.patch.object(
+                plugin, 'create_security_group_rule_bulk',
+                wraps=plugin.create_security_group_rule_bulk) as bulk:
+            self.update_policy_target_group(
+                ptg_id, consumed_policy_rule_sets={prs_id: None},
+                expected_res_status=200)
+            self.assertFalse(bulk.called)
+        self._verify_prs_rules(prs_id)
+
+        self.update_policy_target_group(
+            ptg_id, consumed_policy_rule_sets={},
+            expected_res_status=200)
+        self._verify_prs_rules(prs_id)
+
     # Test update and delete of PTG, how it affects SG mapping
     def test_policy_target_group_update(self):
         # create two policy_rule_sets: bind one to an PTG, update with
@@ -2231,6 +2403,35 @@ class TestPolicyRuleSet(ResourceMappingTestCase):
 
         # TODO(ivar): Test that redirect is allowed too
 
+    def test_hierarchical_prs_children_recomputed_at_once(self):
+        pr1 = self._create_ssh_allow_rule()
+        pr2 = self._create_http_allow_rule()
+
+        def update_parent(num_children):
+            children = []
+            for i in range(num_children):
+                child = self.create_policy_rule_set(
+                    policy_rules=[pr1['id'], pr2['id']])['policy_rule_set']
+                self._create_provider_consumer_ptgs(child['id'])
+                children.append(child['id'])
+            parent = self.create_policy_rule_set(
+                policy_rules=[pr1['id']],
+                child_policy_rule_sets=children)['policy_rule_set']
+            for child in children:
+                self._verify_prs_rules(child)
+            with mock.patch.object(
+                    self._gbp_plugin, 'get_policy_rules',
+                    wraps=self._gbp_plugin.get_policy_rules) as get_rules:
+                self.update_policy_rule_set(
+                    parent['id'], expected_res_status=200,
+                    policy_rules=[pr1['id'], pr2['id']])
+            for child in children:
+                self._verify_prs_rules(child)
+            return get_rules.call_count
+
+        # The rules are not fetched per child
+        self.assertEqual(update_parent(1), update_parent(3))
+
     def test_update_policy_classifier(self):
         pr = self._create_http_allow_rule()
         prs = self.create_policy_rule_set(
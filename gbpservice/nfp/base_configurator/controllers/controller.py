@@ -14,10 +14,10 @@ import oslo_serialization.jsonutils as jsonutils
 
 from oslo_log import log as logging
 import pecan
-import requests
 import subprocess
 import time
 
+from gbpservice.nfp.lib import http_pool
 from gbpservice.nfp.pecan import base_controller
 
 LOG = logging.getLogger(__name__)
@@ -106,7 +106,7 @@ class Controller(base_controller.BaseController):
                 return notification_data
             else:
                 for ip in cache_ips:
-                    notification_response = requests.get(
+                    notification_response = http_pool.get_pool().get(
                         'http://' + str(ip) + ':' + self.vm_port +
                         '/v1/nfp/get_notifications')
                     notification = jsonutils.loads(notification_response.text)
@@ -165,7 +165,7 @@ class Controller(base_controller.BaseController):
                 is_vm_reachable = self._verify_vm_reachability(ip,
                                                                self.vm_port)
                 if is_vm_reachable:
-                    requests.post(
+                    http_pool.get_pool().post(
                         'http://' + ip + ':' + self.vm_port + '/v1/nfp/' +
                         self.method_name, data=jsonutils.dumps(body))
                 else:
@@ -32,6 +32,18 @@ NFP_OPTS = [
         default='rpc',
         help='Backend Support for communicationg with configurator.'
     ),
+    oslo_config.StrOpt(
+        'event_codec',
+        default='pickle',
+        help='Codec used to frame event data sent between the '
+        'distributor and worker processes.'
+    ),
+    oslo_config.IntOpt(
+        'event_compress_threshold',
+        default=1024,
+        help='Event data which encodes to more than these many bytes '
+        'is compressed before it is sent to the other process.'
+    ),
 ]
 
 
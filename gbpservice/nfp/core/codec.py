@@ -0,0 +1,132 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import pickle
+import zlib
+
+from gbpservice.nfp.core import log as nfp_logging
+
+LOG = nfp_logging.getLogger(__name__)
+
+# Binary pickle protocol, understood by python 2.3 onwards.
+PICKLE_PROTOCOL = 2
+# Payloads smaller than this (in bytes) are sent uncompressed.
+DEFAULT_COMPRESS_THRESHOLD = 1024
+DEFAULT_COMPRESS_LEVEL = 1
+DEFAULT_CODEC = 'pickle'
+
+"""Frame header, first byte of every encoded blob. """
+FRAME_RAW = b'\x00'
+FRAME_ZLIB = b'\x01'
+
+
+class EventCodecError(Exception):
+    pass
+
+"""Base class for event data codecs.
+
+    A codec converts event.data to a binary blob before the
+    event is written to a worker pipe or the stash queue and
+    back after it is read. Codecs are looked up by name from
+    CODECS, see get_codec().
+"""
+
+
+class EventCodec(object):
+
+    def encode(self, data):
+        """Return the encoded blob for data. """
+        raise NotImplementedError()
+
+    def decode(self, blob):
+        """Return the data encoded in blob. """
+        raise NotImplementedError()
+
+    def compress(self, event):
+        """Encode event.data in place. """
+        if event.data is not None and not event.zipped:
+            event.data = self.encode(event.data)
+            event.zipped = True
+
+    def decompress(self, event):
+        """Decode event.data in place. """
+        if event.data is not None and event.zipped:
+            try:
+                event.data = self.decode(event.data)
+                event.zipped = False
+            except Exception as e:
+                message = "Failed to decompress event data, Reason: %s" % (
+                    e)
+                LOG.error(message)
+                raise e
+
+"""Binary pickle framing with size based compression.
+
+    Data is pickled with protocol 2, blobs larger than the
+    threshold are zlib compressed. A one byte header records
+    which framing was used so that the reader does not need
+    to guess.
+    Payloads which pickle to less than the threshold are left
+    as they are, the pipe pickles the event anyway and there
+    is nothing to gain from encoding them twice.
+"""
+
+
+class PickleCodec(EventCodec):
+
+    def __init__(self, compress_threshold=DEFAULT_COMPRESS_THRESHOLD,
+                 compress_level=DEFAULT_COMPRESS_LEVEL):
+        self._threshold = compress_threshold
+        self._level = compress_level
+
+    def encode(self, data):
+        blob = pickle.dumps(data, PICKLE_PROTOCOL)
+        if len(blob) < self._threshold:
+            return FRAME_RAW + blob
+        return FRAME_ZLIB + zlib.compress(blob, self._level)
+
+    def decode(self, blob):
+        header, payload = blob[:1], blob[1:]
+        if header == FRAME_ZLIB:
+            payload = zlib.decompress(payload)
+        elif header != FRAME_RAW:
+            raise EventCodecError("Unknown frame header %r" % (header))
+        return pickle.loads(payload)
+
+    def compress(self, event):
+        if event.data is None or event.zipped:
+            return
+        blob = pickle.dumps(event.data, PICKLE_PROTOCOL)
+        if len(blob) < self._threshold:
+            # Small payload, let the pipe carry it natively.
+            return
+        event.data = FRAME_ZLIB + zlib.compress(blob, self._level)
+        event.zipped = True
+
+
+CODECS = {
+    'pickle': PickleCodec,
+}
+
+
+def get_codec(conf):
+    """Return the event codec configured for the controller. """
+    name = getattr(conf, 'event_codec', DEFAULT_CODEC)
+    threshold = getattr(
+        conf, 'event_compress_threshold', DEFAULT_COMPRESS_THRESHOLD)
+    try:
+        codec = CODECS[name]
+    except KeyError:
+        message = "Unknown event codec %s, using %s" % (name, DEFAULT_CODEC)
+        LOG.error(message)
+        codec = CODECS[DEFAULT_CODEC]
+    return codec(compress_threshold=threshold)
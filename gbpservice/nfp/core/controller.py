@@ -10,7 +10,6 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import ast
 import eventlet
 eventlet.monkey_patch()
 
@@ -21,11 +20,11 @@ import pickle
 import Queue
 import sys
 import time
-import zlib
 
 from oslo_service import service as oslo_service
 
 from gbpservice.nfp.core import cfg as nfp_cfg
+from gbpservice.nfp.core import codec as nfp_codec
 from gbpservice.nfp.core import common as nfp_common
 from gbpservice.nfp.core import event as nfp_event
 from gbpservice.nfp.core import launcher as nfp_launcher
@@ -33,6 +32,7 @@ from gbpservice.nfp.core import log as nfp_logging
 from gbpservice.nfp.core import manager as nfp_manager
 from gbpservice.nfp.core import poll as nfp_poll
 from gbpservice.nfp.core import rpc as nfp_rpc
+from gbpservice.nfp.core import stats as nfp_stats
 from gbpservice.nfp.core import worker as nfp_worker
 
 # REVISIT (mak): Unused, but needed for orchestrator,
@@ -44,6 +44,9 @@ PIPE = multiprocessing.Pipe
 PROCESS = multiprocessing.Process
 identify = nfp_common.identify
 
+# Max time distributor waits for an event before checking on workers.
+MANAGER_MAX_WAIT_TIMEOUT = 1
+
 # REVISIT (mak): fix to pass compliance check
 config = config
 
@@ -129,6 +132,7 @@ class NfpService(object):
         event.desc.flag = nfp_event.EVENT_NEW
         event.desc.pid = os.getpid()
         event.desc.target = module
+        event.desc.posted_at = time.time()
         return event
 
     # REVISIT (mak): spacing=0, caller must explicitly specify
@@ -208,28 +212,17 @@ class NfpController(nfp_launcher.NfpLauncher, NfpService):
         self._manager = nfp_manager.NfpResourceManager(conf, self)
         self._worker = nfp_worker.NfpWorker(conf)
         self._poll_handler = nfp_poll.NfpPollHandler(conf)
+        # Codec to frame event data sent over pipes & stash queue
+        self._codec = nfp_codec.get_codec(conf)
 
         # ID of process handling this controller obj
         self.PROCESS_TYPE = "distributor"
 
     def compress(self, event):
-        # REVISIT (mak) : zip only if length is > than threshold (1k maybe)
-        if event.data and not event.zipped:
-            event.zipped = True
-            event.data = zlib.compress(str({'cdata': event.data}))
+        self._codec.compress(event)
 
     def decompress(self, event):
-        if event.data and event.zipped:
-            try:
-                data = ast.literal_eval(
-                    zlib.decompress(event.data))
-                event.data = data['cdata']
-                event.zipped = False
-            except Exception as e:
-                message = "Failed to decompress event data, Reason: %s" % (
-                    e)
-                LOG.error(message)
-                raise e
+        self._codec.decompress(event)
 
     def pipe_recv(self, pipe):
         event = pipe.recv()
@@ -249,10 +242,23 @@ class NfpController(nfp_launcher.NfpLauncher, NfpService):
 
     def _manager_task(self):
         while True:
-            # Run 'Manager' here to monitor for workers and
-            # events.
-            self._manager.manager_run()
-            eventlet.greenthread.sleep(0.1)
+            # Fire the timedout poll events & run 'Manager' here to
+            # monitor for workers and events.
+            busy = self.poll()
+            busy += self._manager.manager_run()
+            if not busy:
+                # Nothing processed, block till a worker sends an
+                # event, an event is posted in distributor or next
+                # poll event expires.
+                # Max timeout bounds the latency of detecting dead
+                # workers.
+                timeout = self._poll_handler.next_timeout()
+                if timeout is None or timeout > MANAGER_MAX_WAIT_TIMEOUT:
+                    timeout = MANAGER_MAX_WAIT_TIMEOUT
+                self._manager.wait_for_events(timeout=timeout)
+            else:
+                # Yield to other green threads
+                eventlet.greenthread.sleep(0)
 
     def _update_manager(self):
         childs = self.get_childrens()
@@ -263,6 +269,8 @@ class NfpController(nfp_launcher.NfpLauncher, NfpService):
 
     def _process_event(self, event):
         self._manager.process_events([event])
+        # Wake up the distributor loop to run the sequencer
+        self._manager.wakeup()
 
     def get_childrens(self):
         # oslo_process.ProcessLauncher has this dictionary,
@@ -328,10 +336,9 @@ class NfpController(nfp_launcher.NfpLauncher, NfpService):
                 self._conf, rpc_agent[0], workers=None)
             self._rpc_agents[index] = rpc_agent + (launcher,)
 
-        # One task to manage the resources - workers & events.
+        # One task to manage the resources - workers, events &
+        # timer events.
         eventlet.spawn_n(self._manager_task)
-        # Oslo periodic task to poll for timer events
-        nfp_poll.PollingTask(self._conf, self)
         # Oslo periodic task for state reporting
         nfp_rpc.ReportStateTask(self._conf, self)
 
@@ -339,16 +346,44 @@ class NfpController(nfp_launcher.NfpLauncher, NfpService):
         """Add an event to poller. """
         self._poll_handler.poll_add(
             event, timeout, callback)
+        # Distributor could be waiting past this expiry
+        self._manager.wakeup()
+
+    def poll_cancel(self, uuid, callback=None):
+        """Cancel the timers of event with uuid. """
+        return self._poll_handler.poll_cancel(uuid, method=callback)
 
     def poll(self):
-        """Invoked in periodic task to poll for timedout events. """
-        self._poll_handler.run()
+        """Invoked by distributor loop to fire timedout events.
+
+            Returns number of events fired.
+        """
+        return self._poll_handler.run()
 
     def report_state(self):
         """Invoked by report_task to report states of all agents. """
+        stats = self.report_stats()
         for agent in self._rpc_agents:
             rpc_agent = operator.itemgetter(0)(agent)
-            rpc_agent.report_state()
+            rpc_agent.report_state(stats=stats)
+
+    def report_stats(self):
+        """Log the distributor latency histograms & process counters.
+
+            Counters of all the workers & of the distributor are
+            merged, returns the merged counters.
+        """
+        histogram = self._manager.get_dispatch_latency()
+        message = "%s - buckets(ms) %s" % (
+            histogram.identify(), histogram.buckets())
+        LOG.info(message)
+        snapshots = self._manager.get_worker_stats()
+        snapshots.append(nfp_stats.collect())
+        stats = nfp_stats.merge_counters(snapshots)
+        for name, counters in stats.items():
+            message = "(stats - %s) %s" % (name, counters)
+            LOG.info(message)
+        return stats
 
     def post_event_graph(self, event, graph_nodes):
         """Post a new event graph into system.
@@ -381,7 +416,7 @@ class NfpController(nfp_launcher.NfpLauncher, NfpService):
             message = ("(event - %s) - new event in distributor"
                        "processing event") % (event.identify())
             LOG.debug(message)
-            self._manager.process_events([event])
+            self._process_event(event)
 
     def post_event(self, event, target=None):
         """Post a new event into the system.
@@ -411,7 +446,7 @@ class NfpController(nfp_launcher.NfpLauncher, NfpService):
             message = ("(event - %s) - new event in distributor"
                        "processing event") % (event.identify())
             LOG.debug(message)
-            self._manager.process_events([event])
+            self._process_event(event)
 
     def poll_event(self, event, spacing=2, max_times=sys.maxint):
         """Post a poll event into the system.
@@ -436,7 +471,7 @@ class NfpController(nfp_launcher.NfpLauncher, NfpService):
             # 'Service' class to construct the poll event descriptor
             event = super(NfpController, self).poll_event(
                 event, spacing=spacing, max_times=max_times)
-            self._manager.process_events([event])
+            self._process_event(event)
         else:
             '''
             # Only event which is delivered to a worker can be polled for, coz,
@@ -470,6 +505,7 @@ class NfpController(nfp_launcher.NfpLauncher, NfpService):
         else:
             message = "(event - %s) - stashed" % (event.identify())
             LOG.debug(message)
+            self.compress(event)
             self._stashq.put(event)
 
     def get_stashed_events(self):
@@ -516,7 +552,7 @@ class NfpController(nfp_launcher.NfpLauncher, NfpService):
         LOG.debug(message)
         event = super(NfpController, self).event_complete(event, result=result)
         if self.PROCESS_TYPE == "distributor":
-            self._manager.process_events([event])
+            self._process_event(event)
         else:
             # Send to the distributor process.
             self.pipe_send(self._pipe, event)
@@ -38,7 +38,7 @@ EVENT_ACK = 'event_ack'
 SequencerEmpty = nfp_seq.SequencerEmpty
 SequencerBusy = nfp_seq.SequencerBusy
 
-deque = collections.deque
+OrderedDict = collections.OrderedDict
 
 
 class EventGraphNode(object):
@@ -188,6 +188,10 @@ class EventDesc(object):
         self.poll_desc = kwargs.get('poll_desc')
         # Target module to which this event must be delivered
         self.target = None
+        # Time at which the event was posted, for latency stats
+        self.posted_at = kwargs.get('posted_at')
+        # Counters of worker process, sent along with acks
+        self.stats = kwargs.get('stats')
 
     def from_desc(self, desc):
         self.type = desc.type
@@ -395,25 +399,44 @@ class NfpEventHandlers(object):
 
 class NfpEventManager(object):
 
-    def __init__(self, conf, controller, sequencer, pipe=None, pid=-1):
+    def __init__(self, conf, controller, sequencer, pipe=None, pid=-1,
+                 load_changed=None):
         self._conf = conf
         self._controller = controller
         # PID of process to which this event manager is associated
         self._pid = pid
         # Duplex pipe to read & write events
         self._pipe = pipe
+        # Set when other end of the pipe is closed, worker died
+        self._pipe_closed = False
         # Cache of UUIDs of events which are dispatched to
-        # the worker which is handled by this em.
-        self._cache = deque()
+        # the worker which is handled by this em. Ordered, so that
+        # events are replayed in the order they were dispatched,
+        # indexed, so that completed events are popped in O(1).
+        self._cache = OrderedDict()
+        # Callback invoked with this em whenever its load changes, not
+        # named _load_changed as the resource manager, an event manager
+        # itself, implements the callback under that name.
+        self._on_load_changed = load_changed
         # Load on this event manager - num of events pending to be completed
         self._load = 0
 
+    @property
+    def _load(self):
+        return self._current_load
+
+    @_load.setter
+    def _load(self, load):
+        self._current_load = load
+        if self._on_load_changed:
+            self._on_load_changed(self)
+
     def _log_meta(self, event=None):
         if event:
             return "(event - %s) - (event_manager - %d)" % (
                 event.identify(), self._pid)
         else:
-            return "(event_manager - %d" % (self._pid)
+            return "(event_manager - %d)" % (self._pid)
 
     def _wait_for_events(self, pipe, timeout=0.01):
         """Wait & pull event from the pipe.
@@ -423,6 +446,8 @@ class NfpEventManager(object):
             Returns: Events[] pulled from pipe.
         """
         events = []
+        if self._pipe_closed:
+            return events
         try:
             while pipe.poll(timeout):
                 timeout = 0
@@ -431,8 +456,24 @@ class NfpEventManager(object):
         except multiprocessing.TimeoutError as err:
             message = "%s" % (err)
             LOG.exception(message)
+        except (EOFError, IOError) as err:
+            # Worker is gone, stop watching the pipe till the
+            # event manager is handed over to the new worker.
+            self._pipe_closed = True
+            message = "%s - pipe closed, Reason: %s" % (
+                self._log_meta(), err)
+            LOG.error(message)
         return events
 
+    def fileno(self):
+        """Return fd of the pipe to wait on, None if not waitable. """
+        if self._pipe_closed:
+            return None
+        try:
+            return self._pipe.fileno()
+        except (AttributeError, IOError, OSError):
+            return None
+
     def init_from_event_manager(self, em):
         """Initialize from existing event manager.
 
@@ -447,7 +488,10 @@ class NfpEventManager(object):
         self._cache = em._cache
 
     def get_pending_events(self):
-        return list(self._cache)
+        return list(self._cache.keys())
+
+    def get_pid(self):
+        return self._pid
 
     def get_load(self):
         """Return current load on the manager."""
@@ -465,10 +509,10 @@ class NfpEventManager(object):
         message = "%s - pop event" % (self._log_meta(event))
         LOG.debug(message)
         try:
-            self._cache.remove(event.desc.uuid)
+            del self._cache[event.desc.uuid]
             self._load -= 1
-        except ValueError as verr:
-            verr = verr
+        except KeyError as kerr:
+            kerr = kerr
             message = "%s - event not in cache" % (
                 self._log_meta(event))
             LOG.warn(message)
@@ -495,7 +539,7 @@ class NfpEventManager(object):
         self._load = (self._load + 1) if inc_load else self._load
         # Add to the cache
         if cache:
-            self._cache.append(event.desc.uuid)
+            self._cache[event.desc.uuid] = True
 
     def event_watcher(self, timeout=0.01):
         """Watch for events. """
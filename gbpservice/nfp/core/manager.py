@@ -11,12 +11,17 @@
 #    under the License.
 
 import collections
+import heapq
 import os
+import time
+
+from eventlet.green import select
 
 from gbpservice.nfp.core import event as nfp_event
 from gbpservice.nfp.core import executor as nfp_executor
 from gbpservice.nfp.core import log as nfp_logging
 from gbpservice.nfp.core import sequencer as nfp_sequencer
+from gbpservice.nfp.core import stats as nfp_stats
 
 LOG = nfp_logging.getLogger(__name__)
 NfpEventManager = nfp_event.NfpEventManager
@@ -102,6 +107,13 @@ class NfpResourceManager(NfpProcessManager, NfpEventManager):
         self._controller = controller
         # Process, Event mixin, {'pid': event_manager}
         self._resource_map = {}
+        # Heap of [load, rank, pid] of workers, least loaded on top.
+        # Entries are pushed on every load change & stale ones are
+        # dropped lazily when they surface.
+        self._load_heap = []
+        # {'pid': rank}, order of workers in resource map, ties in
+        # load are broken by it.
+        self._load_rank = {}
         # Cache of event objects - {'uuid':<event>}
         self._event_cache = {}
         # Not processed. Events Stored for future.
@@ -110,6 +122,14 @@ class NfpResourceManager(NfpProcessManager, NfpEventManager):
         self._distributor_process_id = os.getpid()
         # Single sequencer to be used by all event managers
         self._event_sequencer = nfp_sequencer.EventSequencer()
+        # Self pipe to wake up the distributor loop when events are
+        # posted from within the distributor process.
+        self._wakeup_rfd, self._wakeup_wfd = os.pipe()
+        self._wakeup_pending = False
+        # Delay between an event being posted & dispatched to worker
+        self._dispatch_latency = nfp_stats.LatencyHistogram('dispatch')
+        # {'pid': counters}, latest counters sent by worker
+        self._worker_stats = {}
 
         NfpProcessManager.__init__(self, conf, controller)
         NfpEventManager.__init__(self, conf, controller, self._event_sequencer)
@@ -127,19 +147,64 @@ class NfpResourceManager(NfpProcessManager, NfpEventManager):
         ev_manager = NfpEventManager(
             self._conf, self._controller,
             self._event_sequencer,
-            pipe=pipe, pid=pid)
+            pipe=pipe, pid=pid,
+            load_changed=self._load_changed)
         self._resource_map.update(dict({pid: ev_manager}))
+        self._rebuild_load_heap()
         super(NfpResourceManager, self).new_child(pid, pipe)
 
     def manager_run(self):
-        """Invoked periodically to check on resources.
+        """Invoked by distributor loop to check on resources.
 
             a) Checks if childrens are active or any killed.
             b) Checks if there are messages from any of workers.
             c) Dispatches the events ready to be handled to workers.
+
+            Does not block. Returns the number of events processed,
+            caller can run again right away if it is non zero as
+            completed events could have released sequenced events.
         """
         self._child_watcher()
-        self._event_watcher()
+        return self._event_watcher()
+
+    def wakeup(self):
+        """Wake up the distributor loop blocked in wait_for_events. """
+        if self._wakeup_pending:
+            return
+        self._wakeup_pending = True
+        os.write(self._wakeup_wfd, b'.')
+
+    def wait_for_events(self, timeout=None):
+        """Block till a worker pipe is readable or loop is woken up.
+
+            Multiplexes pipes of all the workers along with the
+            wakeup pipe in a single select, so that the events are
+            dispatched as soon as they arrive.
+        """
+        rfds = [self._wakeup_rfd]
+        for pid, event_manager in self._resource_map.iteritems():
+            fd = event_manager.fileno()
+            if fd is not None:
+                rfds.append(fd)
+        try:
+            readable, _, _ = select.select(rfds, [], [], timeout)
+        except (select.error, OSError) as err:
+            message = "Distributor wait interrupted, Reason: %s" % (err)
+            LOG.debug(message)
+            return []
+        if self._wakeup_rfd in readable:
+            # Drain before clearing the flag, a wakeup racing with
+            # this is covered by the manager_run() that follows.
+            os.read(self._wakeup_rfd, 4096)
+            self._wakeup_pending = False
+        return readable
+
+    def get_dispatch_latency(self):
+        return self._dispatch_latency
+
+    def get_worker_stats(self):
+        """Returns latest counters sent by each worker. """
+        return list(self._worker_stats.values())
 
     def _event_acked(self, event):
         """Post handling after event is dispatched to worker. """
@@ -152,8 +217,10 @@ class NfpResourceManager(NfpProcessManager, NfpEventManager):
 
     def _dispatch_event(self, event):
         """Dispatch event to a worker. """
-        load_info = self._load_init()
-        event_manager, load_info = self._get_min_loaded_em(load_info)
+        event_manager = self._get_min_loaded_em()
+        posted_at = getattr(event.desc, 'posted_at', None)
+        if posted_at:
+            self._dispatch_latency.record(time.time() - posted_at)
         event_manager.dispatch_event(event)
 
     def _execute_event_graph(self, event, state=None):
@@ -213,6 +280,9 @@ class NfpResourceManager(NfpProcessManager, NfpEventManager):
         return event.sequence
 
     def _scheduled_event_ack(self, ack_event):
+        stats = getattr(ack_event.desc, 'stats', None)
+        if stats:
+            self._worker_stats[ack_event.desc.worker] = stats
         try:
             event = self._event_cache[ack_event.desc.uuid]
             evmanager = self._get_event_manager(event.desc.worker)
@@ -247,6 +317,10 @@ class NfpResourceManager(NfpProcessManager, NfpEventManager):
             if expired:
                 event.desc.type = nfp_event.EVENT_EXPIRED
                 evmanager.dispatch_event(event, inc_load=False, cache=False)
+            elif cached_event.lifetime:
+                # Completed in time, stop polling for expiry
+                self._controller.poll_cancel(
+                    event.desc.uuid, callback=self._event_life_timedout)
         except KeyError as kerr:
             kerr = kerr
             message = "(event - %s) - completed, not in cache" % (
@@ -336,10 +410,11 @@ class NfpResourceManager(NfpProcessManager, NfpEventManager):
         # Get events from sequencer
         events = self._event_sequencer.run()
         for pid, event_manager in self._resource_map.iteritems():
-            events += event_manager.event_watcher(timeout=0.01)
+            events += event_manager.event_watcher(timeout=0)
         # Process the type of events received, dispatch only the
         # required ones.
         self.process_events(events)
+        return len(events)
 
     def _init_event_manager(self, from_em, to_em):
         pending_event_ids = to_em.init_from_event_manager(from_em)
@@ -387,22 +462,53 @@ class NfpResourceManager(NfpProcessManager, NfpEventManager):
             new_proc = new.pop()
             self._replace_child(killed_proc, new_proc)
             del self._resource_map[killed_proc]
+            self._rebuild_load_heap()
 
-    def _load_init(self):
-        """Intializes load with current information. """
-        load_info = []
-        for pid, event_manager in self._resource_map.iteritems():
-            load = event_manager.get_load()
-            load_info.append([event_manager, load, pid])
+    def _rebuild_load_heap(self):
+        """Rebuild the load heap from current load of each worker.
 
-        return load_info
+            Invoked when workers are added/removed and when the heap
+            has accumulated too many stale entries.
+        """
+        self._load_rank = {}
+        self._load_heap = []
+        for rank, (pid, event_manager) in enumerate(
+                self._resource_map.iteritems()):
+            self._load_rank[pid] = rank
+            self._load_heap.append([event_manager.get_load(), rank, pid])
+        heapq.heapify(self._load_heap)
+
+    def _load_changed(self, event_manager):
+        """Callback from event manager when its load changes. """
+        pid = event_manager.get_pid()
+        rank = self._load_rank.get(pid)
+        if rank is None:
+            return
+        if len(self._load_heap) > (4 * len(self._resource_map) + 64):
+            self._rebuild_load_heap()
+        else:
+            heapq.heappush(
+                self._load_heap, [event_manager.get_load(), rank, pid])
 
-    def _get_min_loaded_em(self, load_info):
-        """Returns the min loaded event_manager. """
-        minloaded = min(load_info, key=lambda x: x[1])
-        load = minloaded[1] + 1
-        load_info[load_info.index(minloaded)][1] = load
-        return minloaded[0], load_info
+    def _get_min_loaded_em(self):
+        """Returns the min loaded event_manager.
+
+            Least loaded worker is on top of the heap, entries whose
+            load or worker is outdated are discarded on the way.
+        """
+        heap = self._load_heap
+        while heap:
+            load, rank, pid = heap[0]
+            event_manager = self._resource_map.get(pid)
+            if event_manager and (event_manager.get_load() == load) and (
+                    self._load_rank.get(pid) == rank):
+                return event_manager
+            heapq.heappop(heap)
+        # Heap drained by stale entries, rebuild from the workers
+        self._rebuild_load_heap()
+        if not self._load_heap:
+            return None
+        return self._resource_map[self._load_heap[0][2]]
 
     def _get_event_manager(self, pid):
         """Returns event manager of a process. """
@@ -10,72 +10,118 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import eventlet
 import heapq
-import sched
+import itertools
 import time as pytime
 
-from oslo_service import loopingcall as oslo_looping_call
-from oslo_service import periodic_task as oslo_periodic_task
+from gbpservice.nfp.core import log as nfp_logging
 
-Scheduler = sched.scheduler
+LOG = nfp_logging.getLogger(__name__)
 
 """Handles the queue of poll events.
 
-    Derives from python scheduler, since base scheduler does
-    a tight loop and does not leave the invoked context.
-    Derived here to return if no event timedout, invoked
-    periodically by caller to check for timedout events.
+    Heap of timers ordered by expiry. Every run drains all the
+    timers which have expired, so a burst of expiries is delivered
+    at once and not one per invocation.
+    Driven by the distributor loop, which waits at most till the
+    next expiry (see next_timeout()), so timers fire with sub
+    second resolution.
+    Timers are indexed by event uuid so that they can be cancelled,
+    cancelled timers are dropped lazily when they surface.
 """
 
 
-class NfpPollHandler(Scheduler):
+class NfpPollHandler(object):
 
-    def __init__(self, conf):
+    # Entry fields
+    EXPIRY, SEQ, UUID, METHOD, EVENT = range(5)
+
+    def __init__(self, conf, timefunc=pytime.time):
         self._conf = conf
-        Scheduler.__init__(self, pytime.time, eventlet.greenthread.sleep)
+        self.timefunc = timefunc
+        # Heap of [expiry, seq, uuid, method, event]
+        self._queue = []
+        # {'uuid': [entry, ...]}, live timers of an event
+        self._timers = {}
+        # Tie breaker, timers with same expiry fire in FIFO order
+        self._seq = itertools.count()
 
-    def run(self):
-        """Run to find timedout event. """
-        q = self._queue
-        timefunc = self.timefunc
-        pop = heapq.heappop
-        if q:
-            time, priority, action, argument = checked_event = q[0]
-            now = timefunc()
-            if now < time:
-                return
-            else:
-                event = pop(q)
-                # Verify that the event was not removed or altered
-                # by another thread after we last looked at q[0].
-                if event is checked_event:
-                    action(*argument)
-                else:
-                    heapq.heappush(q, event)
+    def __len__(self):
+        return sum(len(entries) for entries in self._timers.values())
+
+    def empty(self):
+        return not self._timers
 
     def poll_add(self, event, timeout, method):
         """Enter the event to be polled. """
-        self.enter(timeout, 1, method, (event,))
-
-"""Periodic task to poll for timer events.
-
-    Periodically checks for expiry of events.
-"""
-
-
-class PollingTask(oslo_periodic_task.PeriodicTasks):
-
-    def __init__(self, conf, controller):
-        super(PollingTask, self).__init__(conf)
+        uuid = event.desc.uuid
+        entry = [self.timefunc() + timeout, next(self._seq),
+                 uuid, method, event]
+        heapq.heappush(self._queue, entry)
+        self._timers.setdefault(uuid, []).append(entry)
+        return entry
+
+    def poll_cancel(self, uuid, method=None):
+        """Cancel timers of event with uuid.
+
+            If method is passed, only the timers which invoke that
+            callback are cancelled.
+            Returns number of timers cancelled.
+        """
+        entries = self._timers.get(uuid)
+        if not entries:
+            return 0
+        cancelled = 0
+        for entry in list(entries):
+            if method is None or entry[self.METHOD] == method:
+                # Mark as cancelled, dropped from heap when popped
+                entry[self.METHOD] = None
+                entries.remove(entry)
+                cancelled += 1
+        if not entries:
+            del self._timers[uuid]
+        return cancelled
+
+    def _forget(self, entry):
+        uuid = entry[self.UUID]
+        entries = self._timers.get(uuid)
+        if entries:
+            try:
+                entries.remove(entry)
+            except ValueError:
+                pass
+            if not entries:
+                del self._timers[uuid]
+
+    def next_timeout(self):
+        """Seconds till next timer expires, None if no timers. """
+        q = self._queue
+        while q and q[0][self.METHOD] is None:
+            heapq.heappop(q)
+        if not q:
+            return None
+        return max(0, q[0][self.EXPIRY] - self.timefunc())
 
-        self._controller = controller
-        pulse = oslo_looping_call.FixedIntervalLoopingCall(
-            self.run_periodic_tasks, None, None)
-        pulse.start(
-            interval=1, initial_delay=None)
+    def run(self):
+        """Run to fire all the timedout events.
 
-    @oslo_periodic_task.periodic_task(spacing=1)
-    def poll(self, context):
-        # invoke the common class to handle event timeouts
-        self._controller.poll()
+            Returns number of timers fired.
+        """
+        q = self._queue
+        now = self.timefunc()
+        fired = 0
+        while q and q[0][self.EXPIRY] <= now:
+            entry = heapq.heappop(q)
+            method = entry[self.METHOD]
+            if method is None:
+                # Cancelled
+                continue
+            self._forget(entry)
+            fired += 1
+            try:
+                method(entry[self.EVENT])
+            except Exception as e:
+                message = "(event - %s) - poll callback failed, %s" % (
+                    entry[self.EVENT].identify(), e)
+                LOG.exception(message)
+        return fired
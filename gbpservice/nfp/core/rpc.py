@@ -51,11 +51,11 @@ class RpcAgent(n_rpc.Service):
         LOG.debug("RPCAgent listening on %s" % (self.identify))
         super(RpcAgent, self).start()
 
-    def report_state(self):
+    def report_state(self, stats=None):
         if hasattr(self, '_report_state'):
             LOG.debug("Agent (%s) reporting state" %
                       (self.identify()))
-            self._report_state.report()
+            self._report_state.report(stats=stats)
 
     def identify(self):
         return "(host=%s,topic=%s)" % (self.host, self.topic)
@@ -78,7 +78,11 @@ class ReportState(object):
         self._state_rpc = n_agent_rpc.PluginReportStateAPI(
             self._topic)
 
-    def report(self):
+    def report(self, stats=None):
+        if stats:
+            # Process counters, e.g http pool hit rate
+            configurations = self._data.setdefault('configurations', {})
+            configurations['nfp_stats'] = stats
         try:
             LOG.debug("Reporting state with data (%s)" %
                       (self._data))
@@ -26,7 +26,14 @@ class SequencerEmpty(Exception):
 class SequencerBusy(Exception):
     pass
 
-"""Sequences the events. """
+"""Sequences the events.
+
+    Keeps a queue of the keys which are runnable, i.e, have an
+    event waiting and no event in progress. A key is added to
+    this ready queue when it gets its first event or when its
+    in progress event is released, so each run only visits the
+    keys which have an event to schedule.
+"""
 
 
 class EventSequencer(object):
@@ -38,14 +45,17 @@ class EventSequencer(object):
             self._waitq = deque()
             # Currently scheduled event
             self._scheduled = None
+            # Whether the key is in the ready queue
+            self.ready = False
 
-        def _is_busy(self):
-            if self._scheduled:
-                raise SequencerBusy
+        def is_busy(self):
+            return self._scheduled is not None
+
+        def is_empty(self):
+            return not self._waitq
 
-        def _is_empty(self):
-            if not len(self._waitq):
-                raise SequencerEmpty
+        def is_runnable(self):
+            return not self.is_busy() and not self.is_empty()
 
         def sequence(self, event):
             self._waitq.append(event)
@@ -53,13 +63,12 @@ class EventSequencer(object):
         def run(self):
             """Run to get event to be scheduled.
 
-                If sequencer is busy - i.e, an event is already
-                scheduled and in progress raises busy except.
-                If sequencer is empty - i.e, no event in sequencer
-                raises empty except.
+                Returns None if sequencer is busy - i.e, an event is
+                already scheduled and in progress, or if sequencer is
+                empty - i.e, no event in sequencer.
             """
-            self._is_busy()
-            self._is_empty()
+            if not self.is_runnable():
+                return None
             # Pop the first element in the queue - FIFO
             self._scheduled = self._waitq.popleft()
             return self._scheduled
@@ -77,46 +86,60 @@ class EventSequencer(object):
         # Sequence of related events
         # {key: sequencer()}
         self._sequencer = {}
+        # Keys which have an event ready to be scheduled
+        self._ready = deque()
+
+    def _mark_ready(self, key, sequencer):
+        if not sequencer.ready and sequencer.is_runnable():
+            sequencer.ready = True
+            self._ready.append(key)
 
     def sequence(self, key, event):
         try:
-            self._sequencer[key].sequence(event)
+            sequencer = self._sequencer[key]
         except KeyError:
-            self._sequencer[key] = self.Sequencer()
-            self._sequencer[key].sequence(event)
+            sequencer = self._sequencer[key] = self.Sequencer()
+        sequencer.sequence(event)
+        self._mark_ready(key, sequencer)
         message = "Sequenced event - %s" % (event.identify())
-        LOG.error(message)
+        LOG.debug(message)
+
+    def has_ready(self):
+        return bool(self._ready)
 
     def run(self):
         events = []
-        # Loop over copy and delete from original
-        sequencers = dict(self._sequencer)
-        for key, sequencer in sequencers.iteritems():
-            try:
-                event = sequencer.run()
-                if event:
-                    message = "Desequence event - %s" % (
-                        event.identify())
-                    LOG.error(message)
-                    event.sequence = False
-                    events.append(event)
-            except SequencerBusy as exc:
-                pass
-            except SequencerEmpty as exc:
-                exc = exc
-                message = "Sequencer empty"
+        # Only the keys ready when the run started, keys getting
+        # ready while events are processed are picked in next run.
+        for i in range(len(self._ready)):
+            key = self._ready.popleft()
+            sequencer = self._sequencer.get(key)
+            if not sequencer:
+                continue
+            sequencer.ready = False
+            event = sequencer.run()
+            if event:
+                message = "Desequence event - %s" % (
+                    event.identify())
                 LOG.debug(message)
-                del self._sequencer[key]
+                event.sequence = False
+                events.append(event)
         return events
 
     def release(self, key, event):
         try:
-            message = "(event - %s) checking to release" % (event.identify())
-            LOG.debug(message)
-            if self._sequencer[key].is_scheduled(event):
-                message = "(event - %s) Releasing sequencer" % (
-                    event.identify())
-                LOG.debug(message)
-                self._sequencer[key].release()
+            sequencer = self._sequencer[key]
         except KeyError:
             return
+        message = "(event - %s) checking to release" % (event.identify())
+        LOG.debug(message)
+        if sequencer.is_scheduled(event):
+            message = "(event - %s) Releasing sequencer" % (
+                event.identify())
+            LOG.debug(message)
+            sequencer.release()
+            if sequencer.is_empty():
+                # Nothing more to sequence for this key
+                del self._sequencer[key]
+            else:
+                self._mark_ready(key, sequencer)
@@ -0,0 +1,129 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import bisect
+
+"""Upper bounds of the latency buckets, in milliseconds. """
+LATENCY_BUCKETS_MS = [
+    1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000]
+
+"""Bucketed latency histogram.
+
+    Fixed buckets keep recording O(1) in memory and time,
+    percentiles are reported as the upper bound of the bucket
+    the percentile falls in.
+"""
+
+
+class LatencyHistogram(object):
+
+    def __init__(self, name, buckets=LATENCY_BUCKETS_MS):
+        self.name = name
+        self._buckets = list(buckets)
+        # One extra bucket for samples above the largest bound
+        self._counts = [0] * (len(self._buckets) + 1)
+        self._count = 0
+        self._total = 0.0
+        self._max = 0.0
+
+    def record(self, seconds):
+        ms = seconds * 1000.0
+        self._counts[bisect.bisect_left(self._buckets, ms)] += 1
+        self._count += 1
+        self._total += ms
+        self._max = max(self._max, ms)
+
+    def percentile(self, pct):
+        """Return upper bound (ms) of bucket holding the percentile. """
+        if not self._count:
+            return 0
+        rank = max(1, int(round(self._count * pct / 100.0)))
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen >= rank:
+                if index < len(self._buckets):
+                    return self._buckets[index]
+                return self._max
+        return self._max
+
+    def summary(self):
+        return {'name': self.name,
+                'count': self._count,
+                'avg_ms': (self._total / self._count) if self._count else 0,
+                'max_ms': self._max,
+                'p50_ms': self.percentile(50),
+                'p99_ms': self.percentile(99)}
+
+    def buckets(self):
+        bounds = [str(bound) for bound in self._buckets] + ['inf']
+        return list(zip(bounds, self._counts))
+
+    def identify(self):
+        summary = self.summary()
+        return ("(histogram - %(name)s) count=%(count)d "
+                "p50=%(p50_ms)sms p99=%(p99_ms)sms "
+                "avg=%(avg_ms).2fms max=%(max_ms).2fms") % summary
+
+    def reset(self):
+        self._counts = [0] * (len(self._buckets) + 1)
+        self._count = 0
+        self._total = 0.0
+        self._max = 0.0
+
+
+"""Per process counters, sent by workers to the distributor.
+
+    Modules register a provider, a callable returning a dict of
+    counters of the process, e.g http pool lookups. Workers send
+    the collected counters to the distributor along with event
+    acks, distributor merges them for the state report.
+    Counters named <x>_hits & <x>_misses are summarized as
+    <x>_hit_rate.
+"""
+_PROVIDERS = {}
+
+
+def register_provider(name, collect):
+    _PROVIDERS[name] = collect
+
+
+def collect():
+    """Returns {provider: {counter: value}} of this process. """
+    counters = {}
+    for name, provider in list(_PROVIDERS.items()):
+        try:
+            counters[name] = provider()
+        except Exception:
+            # Stats only, never fail the caller
+            counters[name] = {}
+    return counters
+
+
+def merge_counters(snapshots):
+    """Sum the counters of collected snapshots & add hit rates. """
+    merged = {}
+    for snapshot in snapshots:
+        for name, counters in snapshot.items():
+            total = merged.setdefault(name, {})
+            for key, value in counters.items():
+                total[key] = total.get(key, 0) + value
+    for counters in merged.values():
+        for key in list(counters.keys()):
+            if not key.endswith('_hits'):
+                continue
+            prefix = key[:-len('_hits')]
+            hits = counters[key]
+            lookups = hits + counters.get(prefix + '_misses', 0)
+            counters[prefix + '_hit_rate'] = (
+                round(float(hits) / lookups, 4) if lookups else 0.0)
+    return merged
@@ -18,11 +18,15 @@ from oslo_service import service as oslo_service
 from gbpservice.nfp.core import common as nfp_common
 from gbpservice.nfp.core import event as nfp_event
 from gbpservice.nfp.core import log as nfp_logging
+from gbpservice.nfp.core import stats as nfp_stats
 
 LOG = nfp_logging.getLogger(__name__)
 Service = oslo_service.Service
 identify = nfp_common.identify
 
+# Seconds between two updates of worker counters to distributor
+STATS_INTERVAL = 5
+
 """Implements worker process.
 
     Derives from oslo service.
@@ -45,6 +49,7 @@ class NfpWorker(Service):
         self.controller = None
         self._conf = conf
         self._threads = threads
+        self._stats_sent_at = 0
 
     def start(self):
         """Service start, runs here till dies.
@@ -67,7 +72,6 @@ class NfpWorker(Service):
                     message = "%s - received event" % (
                         self._log_meta(event))
                     LOG.debug(message)
-                    self.controller.decompress(event)
                     self._process_event(event)
             except Exception as e:
                 message = "Exception - %s" % (e)
@@ -82,6 +86,15 @@ class NfpWorker(Service):
         else:
             return "(worker - %d)" % (os.getpid())
 
+    def _get_stats(self):
+        # Counters are sent at most once per interval, acks are
+        # frequent and the distributor only needs a recent view.
+        now = time.time()
+        if now - self._stats_sent_at < STATS_INTERVAL:
+            return None
+        self._stats_sent_at = now
+        return nfp_stats.collect() or None
+
     def _send_event_ack(self, event):
         # Create new event from existing one
         ack_event = nfp_event.Event(id=event.id)
@@ -89,6 +102,7 @@ class NfpWorker(Service):
         desc = nfp_event.EventDesc(**event.desc.__dict__)
         desc.uuid = event.desc.uuid
         desc.flag = nfp_event.EVENT_ACK
+        desc.stats = self._get_stats()
         setattr(ack_event, 'desc', desc)
         self.controller.pipe_send(self.pipe, ack_event)
 
@@ -0,0 +1,267 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+import time
+
+from oslo_config import cfg as oslo_config
+import requests
+from requests import adapters
+from requests.packages.urllib3 import exceptions as urllib3_exceptions
+import six.moves.urllib.parse as urlparse
+
+from gbpservice.nfp.core import log as nfp_logging
+from gbpservice.nfp.core import stats as nfp_stats
+
+LOG = nfp_logging.getLogger(__name__)
+
+http_pool_opts = [
+    oslo_config.IntOpt('max_connections_per_host',
+                       default=10,
+                       help='Max concurrent requests & keep-alive '
+                       'connections to a single (ip, port).'),
+    oslo_config.IntOpt('retries',
+                       default=2,
+                       help='Number of times a request is retried when '
+                       'connection to the host fails, or for GET, HEAD & '
+                       'OPTIONS requests, when the connection is lost.'),
+    oslo_config.FloatOpt('retry_backoff',
+                         default=0.5,
+                         help='Seconds to wait before first retry, '
+                         'doubled on every retry.'),
+]
+
+oslo_config.CONF.register_opts(http_pool_opts, "HTTP_POOL")
+
+# Methods retried whatever the connection error, the others may have
+# been applied by the host already when the connection is lost.
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+def _is_connect_error(err):
+    """Whether the request failed before it was sent to the host. """
+    if isinstance(err, requests.exceptions.ConnectTimeout):
+        return True
+    reason = getattr(err.args[0] if err.args else None, 'reason', None)
+    return isinstance(reason, (urllib3_exceptions.NewConnectionError,
+                               urllib3_exceptions.ConnectTimeoutError))
+
+
+"""Keep-alive connections & bookkeeping of a single (ip, port).
+
+    Owns a requests session whose connection pool is bounded to
+    max_connections, a semaphore bounding the concurrent requests
+    to the host & the latency/error counters.
+"""
+
+
+class HostPool(object):
+
+    def __init__(self, host, port, max_connections):
+        self.host = host
+        self.port = port
+        self.session = requests.Session()
+        adapter = adapters.HTTPAdapter(pool_connections=1,
+                                       pool_maxsize=max_connections,
+                                       pool_block=True)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._adapter = adapter
+        self._semaphore = threading.BoundedSemaphore(max_connections)
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.latency = nfp_stats.LatencyHistogram(
+            '%s:%s' % (host, port))
+
+    def identify(self):
+        return "(host - %s:%s)" % (self.host, self.port)
+
+    def acquire(self):
+        self._semaphore.acquire()
+
+    def release(self):
+        self._semaphore.release()
+
+    def connections(self):
+        """Returns (#connections opened, #requests sent on them). """
+        opened = sent = 0
+        try:
+            pools = self._adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools[key]
+                opened += getattr(pool, 'num_connections', 0)
+                sent += getattr(pool, 'num_requests', 0)
+        except Exception:
+            # Pool internals are not part of requests API, stats only.
+            pass
+        return opened, sent
+
+    def summary(self):
+        opened, sent = self.connections()
+        summary = self.latency.summary()
+        summary.update({'requests': self.requests,
+                        'errors': self.errors,
+                        'retries': self.retries,
+                        'connections': opened,
+                        'connection_requests': sent,
+                        'hit_rate': (
+                            (1.0 - float(opened) / sent) if sent else 0.0)})
+        return summary
+
+"""Shared, keep-alive HTTP client for REST calls to configurator/VMs.
+
+    Connections are pooled per (ip, port) so that consecutive config
+    pushes to a service VM reuse the TCP connection. Requests which
+    fail to connect, and GET, HEAD & OPTIONS requests which lose their
+    connection, are retried with exponential backoff.
+    Offers the requests module API - request/get/post/put/delete.
+"""
+
+
+class HttpPool(object):
+
+    def __init__(self, max_connections_per_host=10, retries=2,
+                 retry_backoff=0.5):
+        self._max_connections = max_connections_per_host
+        self._retries = retries
+        self._backoff = retry_backoff
+        # {(host, port): HostPool}
+        self._hosts = {}
+        self._lock = threading.Lock()
+        # Lookups which found an existing host pool
+        self._hits = 0
+        self._misses = 0
+
+    def _get_host_pool(self, url):
+        parsed = urlparse.urlparse(url)
+        port = parsed.port or (443 if parsed.scheme == 'https' else 80)
+        key = (parsed.hostname, port)
+        host_pool = self._hosts.get(key)
+        if host_pool:
+            self._hits += 1
+            return host_pool
+        with self._lock:
+            host_pool = self._hosts.get(key)
+            if not host_pool:
+                self._misses += 1
+                host_pool = HostPool(key[0], key[1], self._max_connections)
+                self._hosts[key] = host_pool
+            return host_pool
+
+    def request(self, method, url, retries=None, **kwargs):
+        """Send request over a pooled connection to host of url.
+
+            Requests failing to connect are retried with exponential
+            backoff, as are GET, HEAD & OPTIONS requests losing their
+            connection. Any other failure is raised as is, a config push
+            losing its connection may have been applied already.
+            Raises the requests exception of the last attempt.
+        """
+        retries = self._retries if retries is None else retries
+        host_pool = self._get_host_pool(url)
+        host_pool.acquire()
+        try:
+            attempt = 0
+            while True:
+                start = time.time()
+                try:
+                    resp = host_pool.session.request(method, url, **kwargs)
+                except requests.exceptions.ConnectionError as err:
+                    host_pool.errors += 1
+                    if attempt >= retries or not (
+                            method.upper() in SAFE_METHODS or
+                            _is_connect_error(err)):
+                        raise
+                    wait = self._backoff * (2 ** attempt)
+                    attempt += 1
+                    host_pool.retries += 1
+                    message = ("%s - %s %s failed, retry %d in %ss. "
+                               "Reason: %s" % (host_pool.identify(),
+                                               method.upper(), url,
+                                               attempt, wait, err))
+                    LOG.warn(message)
+                    time.sleep(wait)
+                    continue
+                except requests.exceptions.RequestException:
+                    host_pool.errors += 1
+                    raise
+                host_pool.requests += 1
+                host_pool.latency.record(time.time() - start)
+                if resp.status_code >= 500:
+                    host_pool.errors += 1
+                return resp
+        finally:
+            host_pool.release()
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, data=None, **kwargs):
+        return self.request('POST', url, data=data, **kwargs)
+
+    def put(self, url, data=None, **kwargs):
+        return self.request('PUT', url, data=data, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request('DELETE', url, **kwargs)
+
+    def counters(self):
+        """Returns the raw counters, summed over all hosts.
+
+            Requests sent on an already open connection count as
+            connection hits, every new connection as a miss.
+        """
+        counters = {'pool_hits': self._hits,
+                    'pool_misses': self._misses,
+                    'requests': 0, 'errors': 0, 'retries': 0,
+                    'connection_hits': 0, 'connection_misses': 0}
+        for host_pool in list(self._hosts.values()):
+            opened, sent = host_pool.connections()
+            counters['requests'] += host_pool.requests
+            counters['errors'] += host_pool.errors
+            counters['retries'] += host_pool.retries
+            counters['connection_hits'] += max(0, sent - opened)
+            counters['connection_misses'] += opened
+        return counters
+
+    def stats(self):
+        """Returns summary of the pool & of every host. """
+        lookups = self._hits + self._misses
+        opened = sent = 0
+        hosts = {}
+        for host_pool in list(self._hosts.values()):
+            summary = host_pool.summary()
+            opened += summary['connections']
+            sent += summary['connection_requests']
+            hosts['%s:%s' % (host_pool.host, host_pool.port)] = summary
+        return {'hosts': hosts,
+                'pool_hit_rate': (
+                    float(self._hits) / lookups) if lookups else 0.0,
+                'connection_hit_rate': (
+                    (1.0 - float(opened) / sent) if sent else 0.0)}
+
+
+_POOL = None
+
+
+def get_pool():
+    """Returns the process wide http pool. """
+    global _POOL
+    if _POOL is None:
+        conf = oslo_config.CONF.HTTP_POOL
+        _POOL = HttpPool(
+            max_connections_per_host=conf.max_connections_per_host,
+            retries=conf.retries,
+            retry_backoff=conf.retry_backoff)
+        nfp_stats.register_provider('http_pool', _POOL.counters)
+    return _POOL
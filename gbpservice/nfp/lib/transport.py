@@ -15,6 +15,7 @@ import exceptions
 
 from gbpservice.nfp.common import constants as nfp_constants
 from gbpservice.nfp.core import log as nfp_logging
+from gbpservice.nfp.lib import http_pool
 from gbpservice.nfp.lib import rest_client_over_unix as unix_rc
 
 from neutron.common import rpc as n_rpc
@@ -25,8 +26,6 @@ from oslo_config import cfg as oslo_config
 import oslo_messaging as messaging
 from oslo_serialization import jsonutils
 
-import requests
-
 LOG = nfp_logging.getLogger(__name__)
 Version = 'v1'  # v1/v2/v3#
 
@@ -65,6 +64,8 @@ class RestApi(object):
         self.rest_server_address = rest_server_address
         self.rest_server_port = rest_server_port
         self.url = "http://%s:%s/v1/nfp/%s"
+        # Shared keep-alive connections to the configurator
+        self.pool = http_pool.get_pool()
 
     def _response(self, resp, url):
         success_code = [200, 201, 202, 204]
@@ -117,8 +118,8 @@ class RestApi(object):
             # to send data to the rest-server.
             headers = {"content-type": "application/json",
                        "method-type": method_type}
-            resp = requests.post(url, data,
-                                 headers=headers)
+            resp = self.pool.post(url, data,
+                                  headers=headers)
             message = "POST url %s %d" % (url, resp.status_code)
             LOG.info(message)
             return self._response(resp, url)
@@ -137,8 +138,8 @@ class RestApi(object):
         data = jsonutils.dumps(body)
         try:
             headers = {"content-type": "application/json"}
-            resp = requests.put(url, data,
-                                headers=headers)
+            resp = self.pool.put(url, data,
+                                 headers=headers)
             message = "PUT url %s %d" % (url, resp.status_code)
             LOG.info(message)
             return self._response(resp, url)
@@ -156,8 +157,8 @@ class RestApi(object):
             self.rest_server_port, path)
         try:
             headers = {"content-type": "application/json"}
-            resp = requests.get(url,
-                                headers=headers)
+            resp = self.pool.get(url,
+                                 headers=headers)
             message = "GET url %s %d" % (url, resp.status_code)
             LOG.info(message)
             return self._response(resp, url)
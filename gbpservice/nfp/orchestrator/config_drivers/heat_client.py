@@ -69,3 +69,6 @@ class HeatClient(object):
 
     def get(self, stack_id):
         return self.stacks.get(stack_id)
+
+    def list(self, **kwargs):
+        return self.stacks.list(**kwargs)
@@ -32,6 +32,7 @@ from gbpservice.nfp.common import constants as nfp_constants
 from gbpservice.nfp.core import log as nfp_logging
 from gbpservice.nfp.lib import transport
 from gbpservice.nfp.orchestrator.config_drivers.heat_client import HeatClient
+from gbpservice.nfp.orchestrator.config_drivers import stack_watcher
 from gbpservice.nfp.orchestrator.db import nfp_db as nfp_db
 from gbpservice.nfp.orchestrator.openstack.openstack_driver import (
         KeystoneClient)
@@ -92,6 +93,7 @@ class HeatDriver(object):
         self.keystoneclient = KeystoneClient(config)
         self.gbp_client = GBPClient(config)
         self.neutron_client = NeutronClient(config)
+        self.stack_watcher = stack_watcher.StackWatcher()
 
         self.keystone_conf = config.nfp_keystone_authtoken
         keystone_version = self.keystone_conf.auth_version
@@ -1520,23 +1522,28 @@ class HeatDriver(object):
         if not heatclient:
             return failure_status
         try:
-            stack = heatclient.get(stack_id)
-            if stack.stack_status == 'DELETE_FAILED':
+            stack_status = self.stack_watcher.get_status(
+                heatclient, tenant_id, stack_id)
+            if stack_status == 'DELETE_FAILED':
                 return failure_status
-            elif stack.stack_status == 'CREATE_COMPLETE':
+            elif stack_status == 'CREATE_COMPLETE':
                 self.loadbalancer_post_stack_create(network_function_details)
                 return success_status
-            elif stack.stack_status == 'UPDATE_COMPLETE':
+            elif stack_status == 'UPDATE_COMPLETE':
                 return success_status
-            elif stack.stack_status == 'DELETE_COMPLETE':
+            elif stack_status == 'DELETE_COMPLETE':
                 LOG.info(_LI("Stack %(stack)s is deleted"),
                          {'stack': stack_id})
                 return failure_status
-            elif stack.stack_status == 'CREATE_FAILED':
+            elif stack_status == 'CREATE_FAILED':
                 return failure_status
-            elif stack.stack_status == 'UPDATE_FAILED':
+            elif stack_status == 'UPDATE_FAILED':
                 return failure_status
-            elif stack.stack_status not in [
+            elif stack_status == stack_watcher.STACK_NOT_FOUND:
+                LOG.error(_LE("Stack %(stack)s is not found"),
+                          {'stack': stack_id})
+                return failure_status
+            elif stack_status not in [
                     'UPDATE_IN_PROGRESS', 'CREATE_IN_PROGRESS',
                     'DELETE_IN_PROGRESS']:
                 return intermediate_status
@@ -1557,23 +1564,28 @@ class HeatDriver(object):
         if not heatclient:
             return failure_status
         try:
-            stack = heatclient.get(stack_id)
-            if stack.stack_status == 'DELETE_FAILED':
+            stack_status = self.stack_watcher.get_status(
+                heatclient, provider_tenant_id, stack_id)
+            if stack_status == 'DELETE_FAILED':
                 return failure_status
-            elif stack.stack_status == 'CREATE_COMPLETE':
+            elif stack_status == 'CREATE_COMPLETE':
                 self._post_stack_create(nfp_context)
                 return success_status
-            elif stack.stack_status == 'UPDATE_COMPLETE':
+            elif stack_status == 'UPDATE_COMPLETE':
                 return success_status
-            elif stack.stack_status == 'DELETE_COMPLETE':
+            elif stack_status == 'DELETE_COMPLETE':
                 LOG.info(_LI("Stack %(stack)s is deleted"),
                          {'stack': stack_id})
                 return failure_status
-            elif stack.stack_status == 'CREATE_FAILED':
+            elif stack_status == 'CREATE_FAILED':
                 return failure_status
-            elif stack.stack_status == 'UPDATE_FAILED':
+            elif stack_status == 'UPDATE_FAILED':
+                return failure_status
+            elif stack_status == stack_watcher.STACK_NOT_FOUND:
+                LOG.error(_LE("Stack %(stack)s is not found"),
+                          {'stack': stack_id})
                 return failure_status
-            elif stack.stack_status not in [
+            elif stack_status not in [
                     'UPDATE_IN_PROGRESS', 'CREATE_IN_PROGRESS',
                     'DELETE_IN_PROGRESS']:
                 return intermediate_status
@@ -1591,22 +1603,30 @@ class HeatDriver(object):
         if not heatclient:
             return failure_status
         try:
-            stack = heatclient.get(stack_id)
-            if stack.stack_status == 'DELETE_FAILED':
+            stack_status = self.stack_watcher.get_status(
+                heatclient, tenant_id, stack_id)
+            if stack_status == 'DELETE_FAILED':
                 return failure_status
-            elif stack.stack_status == 'CREATE_COMPLETE':
+            elif stack_status == 'CREATE_COMPLETE':
                 return failure_status
-            elif stack.stack_status == 'DELETE_COMPLETE':
+            elif stack_status == 'DELETE_COMPLETE':
                 LOG.info(_LI("Stack %(stack)s is deleted"),
                          {'stack': stack_id})
                 if network_function:
                     self._post_stack_cleanup(network_function)
                 return success_status
-            elif stack.stack_status == 'CREATE_FAILED':
+            elif stack_status == 'CREATE_FAILED':
                 return failure_status
-            elif stack.stack_status == 'UPDATE_FAILED':
+            elif stack_status == 'UPDATE_FAILED':
                 return failure_status
-            elif stack.stack_status not in [
+            elif stack_status == stack_watcher.STACK_NOT_FOUND:
+                # Deleted and purged already
+                LOG.info(_LI("Stack %(stack)s is not found, it is "
+                             "deleted"), {'stack': stack_id})
+                if network_function:
+                    self._post_stack_cleanup(network_function)
+                return success_status
+            elif stack_status not in [
                     'UPDATE_IN_PROGRESS', 'CREATE_IN_PROGRESS',
                     'DELETE_IN_PROGRESS']:
                 return intermediate_status
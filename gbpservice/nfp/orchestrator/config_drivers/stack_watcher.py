@@ -0,0 +1,191 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import threading
+import time
+
+from heatclient import exc as heat_exc
+from neutron._i18n import _LW
+
+from gbpservice.nfp.core import log as nfp_logging
+
+LOG = nfp_logging.getLogger(__name__)
+
+# Status reported for stacks which do not exist, or are missing from
+# stack list even with deleted stacks shown, i.e, purged.
+STACK_NOT_FOUND = 'NOT_FOUND'
+
+# Max age in seconds of the cached status returned by a lookup. Lower
+# than the spacing of the NFP poll events, so that a poll never sees a
+# status older than one it would have fetched itself.
+MAX_STATUS_AGE = 2
+# Max number of stack ids in the filter of a stack list query, the
+# stacks of a tenant are listed in chunks of this size.
+MAX_LIST_IDS = 50
+# Stacks are dropped when not looked up for this long, e.g, poller of
+# the stack gave up.
+IDLE_TIMEOUT = 300
+
+
+def is_stack_done(status):
+    """Whether status is a terminal stack status. """
+    return status is not None and not status.endswith('_IN_PROGRESS')
+
+
+class WatchedStack(object):
+
+    def __init__(self, stack_id):
+        self.stack_id = stack_id
+        self.status = None
+        self.stack = None
+        # Last time the status was fetched
+        self.updated = None
+        # Last time the stack was looked up
+        self.touched = None
+
+
+class TenantStacks(object):
+
+    def __init__(self, heatclient):
+        # Latest client of the tenant, its token is used for the queries
+        self.heatclient = heatclient
+        # {'stack_id': WatchedStack}
+        self.stacks = {}
+
+
+"""Caches the status of the heat stacks polled by NFP.
+
+    The stacks looked up by the NFP poll events are watched per tenant.
+    A lookup of a stack whose cached status is older than max_age
+    refreshes all the watched stacks of its tenant with stack list
+    queries, so the polls of the other stacks of the tenant within
+    max_age are served from the cache instead of a get per stack.
+"""
+
+
+class StackWatcher(object):
+
+    def __init__(self, max_age=MAX_STATUS_AGE, max_list_ids=MAX_LIST_IDS,
+                 timefunc=time.time):
+        self._max_age = max_age
+        self._max_list_ids = max_list_ids
+        self.timefunc = timefunc
+        # {'tenant_id': TenantStacks}
+        self._tenants = {}
+        self._lock = threading.RLock()
+        # Number of stack list & get queries sent to heat
+        self.list_calls = 0
+        self.get_calls = 0
+
+    def __len__(self):
+        return sum(len(tenant.stacks) for tenant in self._tenants.values())
+
+    def _watch(self, heatclient, tenant_id, stack_id, now):
+        with self._lock:
+            tenant = self._tenants.get(tenant_id)
+            if not tenant:
+                tenant = self._tenants[tenant_id] = TenantStacks(heatclient)
+            tenant.heatclient = heatclient
+            watched = tenant.stacks.get(stack_id)
+            if not watched:
+                watched = tenant.stacks[stack_id] = WatchedStack(stack_id)
+            watched.touched = now
+            return watched
+
+    def unwatch(self, tenant_id, stack_id):
+        with self._lock:
+            tenant = self._tenants.get(tenant_id)
+            if not tenant:
+                return None
+            watched = tenant.stacks.pop(stack_id, None)
+            if not tenant.stacks:
+                del self._tenants[tenant_id]
+            return watched
+
+    def get_status(self, heatclient, tenant_id, stack_id):
+        """Returns the status of stack, at most max_age seconds old.
+
+            First lookup of a stack fetches it with a get, later ones
+            return the cached status, refreshed for all the stacks of the
+            tenant if it is too old. Stack is no more watched once its
+            terminal status is returned.
+            Returns STACK_NOT_FOUND for stacks which do not exist, raises
+            the other heat client exceptions of the first get.
+        """
+        now = self.timefunc()
+        watched = self._watch(heatclient, tenant_id, stack_id, now)
+        if watched.status is None:
+            self.get_calls += 1
+            try:
+                stack = heatclient.get(stack_id)
+            except heat_exc.HTTPNotFound:
+                self.unwatch(tenant_id, stack_id)
+                return STACK_NOT_FOUND
+            except Exception:
+                self.unwatch(tenant_id, stack_id)
+                raise
+            self._update_status(watched, stack.stack_status, now,
+                                stack=stack)
+        elif watched.updated + self._max_age <= now:
+            self._refresh_tenant(tenant_id, now)
+        if is_stack_done(watched.status):
+            self.unwatch(tenant_id, stack_id)
+        return watched.status
+
+    def get_stack(self, tenant_id, stack_id):
+        """Returns the last fetched stack object, None if not watched. """
+        tenant = self._tenants.get(tenant_id)
+        watched = tenant.stacks.get(stack_id) if tenant else None
+        return watched.stack if watched else None
+
+    def _update_status(self, watched, status, now, stack=None):
+        watched.status = status
+        watched.updated = now
+        if stack is not None:
+            watched.stack = stack
+
+    def _list_stacks(self, tenant, stack_ids):
+        stacks = {}
+        for i in range(0, len(stack_ids), self._max_list_ids):
+            self.list_calls += 1
+            chunk = stack_ids[i:i + self._max_list_ids]
+            stacks.update((stack.id, stack) for stack in
+                          tenant.heatclient.list(show_deleted=True,
+                                                 filters={'id': chunk}))
+        return stacks
+
+    def _refresh_tenant(self, tenant_id, now):
+        """Fetch the status of the watched stacks of tenant. """
+        with self._lock:
+            tenant = self._tenants.get(tenant_id)
+            if not tenant:
+                return
+            # Stacks nobody looks up anymore are not queried
+            for stack_id, watched in list(tenant.stacks.items()):
+                if watched.touched + IDLE_TIMEOUT <= now:
+                    self.unwatch(tenant_id, stack_id)
+            stack_ids = [stack_id for stack_id, watched in
+                         tenant.stacks.items() if watched.status is not None]
+        try:
+            stacks = self._list_stacks(tenant, stack_ids)
+        except Exception as e:
+            # The cached status is returned, refreshed by the next lookup
+            LOG.warning(_LW("Stack list of tenant %(tenant)s failed, "
+                            "%(err)s"), {'tenant': tenant_id, 'err': e})
+            return
+        for stack_id in stack_ids:
+            watched = tenant.stacks.get(stack_id)
+            if not watched:
+                continue
+            stack = stacks.get(stack_id)
+            status = stack.stack_status if stack else STACK_NOT_FOUND
+            self._update_status(watched, status, now, stack=stack)
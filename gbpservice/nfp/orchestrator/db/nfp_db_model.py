@@ -94,7 +94,7 @@ class NetworkFunctionInstance(BASE, model_base.HasId, model_base.HasTenant,
     network_function_device_id = sa.Column(
         sa.String(36),
         sa.ForeignKey('nfp_network_function_devices.id', ondelete="SET NULL"),
-        nullable=True)
+        nullable=True, index=True)
     port_info = orm.relationship(
         NSIPortAssociation,
         cascade='all, delete-orphan')
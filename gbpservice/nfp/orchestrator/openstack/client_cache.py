@@ -0,0 +1,88 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+import threading
+import time
+
+from gbpservice.nfp.core import stats as nfp_stats
+
+# Seconds a client is reused, tokens are refreshed well before expiry
+# so a client older than this is likely holding a superseded token.
+CLIENT_TTL = 300
+# Clients of the least recently used (token, tenant) are dropped beyond
+MAX_CLIENTS = 256
+
+"""Cache of openstack python clients per (service, token, tenant).
+
+    Creating a client sets up its auth plugin & http session, i.e, a
+    new TCP connection for every API call. Caching the clients lets the
+    calls of a flow, which use the same token, reuse the session and
+    its keep-alive connections.
+    Entries expire after ttl seconds & are evicted in LRU order.
+"""
+
+
+class ClientCache(object):
+
+    def __init__(self, ttl=CLIENT_TTL, max_clients=MAX_CLIENTS,
+                 timefunc=time.time):
+        self._ttl = ttl
+        self._max_clients = max_clients
+        self.timefunc = timefunc
+        # {key: (client, expires_at)}, in LRU order
+        self._clients = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = dict.fromkeys(
+            ['client_hits', 'client_misses', 'evictions'], 0)
+
+    def __len__(self):
+        return len(self._clients)
+
+    def clear(self):
+        with self._lock:
+            self._clients.clear()
+
+    def get(self, key, create):
+        """Returns the client cached for key, create() makes a new one. """
+        now = self.timefunc()
+        with self._lock:
+            entry = self._clients.pop(key, None)
+            if entry and entry[1] > now:
+                self._clients[key] = entry
+                self._counters['client_hits'] += 1
+                return entry[0]
+            self._counters['client_misses'] += 1
+        # Created outside the lock, a concurrent miss at worst creates
+        # a client which is dropped.
+        client = create()
+        with self._lock:
+            self._clients[key] = (client, now + self._ttl)
+            while len(self._clients) > self._max_clients:
+                self._clients.popitem(last=False)
+                self._counters['evictions'] += 1
+        return client
+
+    def counters(self):
+        return dict(self._counters)
+
+
+_CACHE = None
+
+
+def get_cache():
+    """Returns the process wide client cache. """
+    global _CACHE
+    if _CACHE is None:
+        _CACHE = ClientCache()
+        nfp_stats.register_provider('client_cache', _CACHE.counters)
+    return _CACHE
@@ -10,13 +10,18 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import calendar
+
 from gbpclient.v2_0 import client as gbp_client
 from keystoneclient.v2_0 import client as identity_client
 from keystoneclient.v3 import client as keyclientv3
 from neutronclient.v2_0 import client as neutron_client
 from novaclient import client as nova_client
+from oslo_utils import timeutils
 
 from gbpservice.nfp.core import log as nfp_logging
+from gbpservice.nfp.orchestrator.openstack import client_cache
+from gbpservice.nfp.orchestrator.openstack import token_cache
 LOG = nfp_logging.getLogger(__name__)
 
 
@@ -65,7 +70,8 @@ class KeystoneClient(OpenstackApi):
                                   tenant_id=None):
         """ Get a scoped token from Openstack Keystone service.
 
-        A scoped token is bound to the specific tenant.
+        A scoped token is bound to the specific tenant. Tokens are cached
+        process wide and refreshed shortly before they expire.
 
         :param user: User name
         :param password: Password
@@ -78,6 +84,14 @@ class KeystoneClient(OpenstackApi):
             LOG.error(err)
             raise Exception(err)
 
+        key = (self.identity_service, user, password, tenant_name, tenant_id)
+        return token_cache.get_cache().get_token(
+            key, lambda: self._get_scoped_keystone_token(
+                user, password, tenant_name, tenant_id))
+
+    def _get_scoped_keystone_token(self, user, password, tenant_name,
+                                   tenant_id):
+        """Returns (token, expiry timestamp or None) from keystone. """
         keystone = identity_client.Client(
             username=user,
             password=password,
@@ -94,7 +108,15 @@ class KeystoneClient(OpenstackApi):
             LOG.error(err)
             raise Exception(err)
         else:
-            return scoped_token
+            return scoped_token, self._get_token_expiry(keystone)
+
+    def _get_token_expiry(self, keystone):
+        try:
+            expires = timeutils.normalize_time(keystone.auth_ref.expires)
+            return calendar.timegm(expires.timetuple())
+        except Exception:
+            # Expiry not reported, cache assumes the default lifetime
+            return None
 
     def get_admin_tenant_id(self, token):
         if not self.admin_tenant_id:
@@ -107,11 +129,18 @@ class KeystoneClient(OpenstackApi):
     def get_tenant_id(self, token, tenant_name):
         """ Get the tenant UUID associated to tenant name
 
+        Tenant ids are cached process wide by tenant name.
+
         :param token: A scoped token
         :param tenant: Tenant name
 
         :return: Tenant UUID
         """
+        return token_cache.get_cache().get_tenant_id(
+            (self.identity_service, tenant_name),
+            lambda: self._get_tenant_id(token, tenant_name))
+
+    def _get_tenant_id(self, token, tenant_name):
         try:
             keystone = identity_client.Client(token=token,
                                               auth_url=self.identity_service)
@@ -123,9 +152,6 @@ class KeystoneClient(OpenstackApi):
                    " Error :: %s" % (tenant_name, ex))
             LOG.error(err)
             raise Exception(err)
-        err = 'No tenant with name "%s" found in keystone db' % tenant_name
-        LOG.error(err)
-        raise Exception(err)
 
     def _get_v2_keystone_admin_client(self):
         """ Returns keystone v2 client with admin credentials
@@ -163,6 +189,14 @@ class KeystoneClient(OpenstackApi):
 class NovaClient(OpenstackApi):
     """ Nova Client Api driver. """
 
+    def _get_nova_client(self, token, tenant_id):
+        """Returns nova client of (token, tenant), reused across calls. """
+        return client_cache.get_cache().get(
+            ('nova', self.identity_service, token, tenant_id),
+            lambda: nova_client.Client(self.nova_version, auth_token=token,
+                                       tenant_id=tenant_id,
+                                       auth_url=self.identity_service))
+
     def get_image_id(self, token, tenant_id, image_name):
         """ Get the image UUID associated to image name
 
@@ -173,9 +207,7 @@ class NovaClient(OpenstackApi):
         :return: Image UUID
         """
         try:
-            nova = nova_client.Client(self.nova_version, auth_token=token,
-                                      tenant_id=tenant_id,
-                                      auth_url=self.identity_service)
+            nova = self._get_nova_client(token, tenant_id)
             image = nova.images.find(name=image_name)
             return image.id
         except Exception as ex:
@@ -194,9 +226,7 @@ class NovaClient(OpenstackApi):
         :return: Image UUID
         """
         try:
-            nova = nova_client.Client(self.nova_version, auth_token=token,
-                                      tenant_id=tenant_id,
-                                      auth_url=self.identity_service)
+            nova = self._get_nova_client(token, tenant_id)
             image = nova.images.find(name=image_name)
             return image.metadata
         except Exception as ex:
@@ -215,9 +245,7 @@ class NovaClient(OpenstackApi):
         :return: Flavor UUID or None if not found
         """
         try:
-            nova = nova_client.Client(self.nova_version, auth_token=token,
-                                      tenant_id=tenant_id,
-                                      auth_url=self.identity_service)
+            nova = self._get_nova_client(token, tenant_id)
             flavor = nova.flavors.find(name=flavor_name)
             return flavor.id
         except Exception as ex:
@@ -237,9 +265,7 @@ class NovaClient(OpenstackApi):
 
         """
         try:
-            nova = nova_client.Client(self.nova_version, auth_token=token,
-                                      tenant_id=tenant_id,
-                                      auth_url=self.identity_service)
+            nova = self._get_nova_client(token, tenant_id)
             instance = nova.servers.get(instance_id)
             if instance:
                 return instance.to_dict()
@@ -264,9 +290,7 @@ class NovaClient(OpenstackApi):
         """
         tenant_id = str(tenant_id)
         try:
-            nova = nova_client.Client(self.nova_version, auth_token=token,
-                                      tenant_id=tenant_id,
-                                      auth_url=self.identity_service)
+            nova = self._get_nova_client(token, tenant_id)
             keypair = nova.keypairs.find(name=keypair_name)
             return keypair.to_dict()
         except Exception as ex:
@@ -284,9 +308,7 @@ class NovaClient(OpenstackApi):
         :param port_id: Port UUID
         """
         try:
-            nova = nova_client.Client(self.nova_version, auth_token=token,
-                                      tenant_id=tenant_id,
-                                      auth_url=self.identity_service)
+            nova = self._get_nova_client(token, tenant_id)
             instance = nova.servers.interface_attach(instance_id, port_id,
                                                      None, None)
             return instance
@@ -304,9 +326,7 @@ class NovaClient(OpenstackApi):
         :param port_id: Port UUID
         """
         try:
-            nova = nova_client.Client(self.nova_version, auth_token=token,
-                                      tenant_id=tenant_id,
-                                      auth_url=self.identity_service)
+            nova = self._get_nova_client(token, tenant_id)
             instance = nova.servers.interface_detach(instance_id, port_id)
             return instance
         except Exception as ex:
@@ -324,9 +344,7 @@ class NovaClient(OpenstackApi):
 
         """
         try:
-            nova = nova_client.Client(self.nova_version, auth_token=token,
-                                      tenant_id=tenant_id,
-                                      auth_url=self.identity_service)
+            nova = self._get_nova_client(token, tenant_id)
             nova.servers.delete(instance_id)
         except Exception as ex:
             err = ("Failed to delete instance"
@@ -356,9 +374,7 @@ class NovaClient(OpenstackApi):
 
         tenant_id = filters.get('tenant_id')
         try:
-            nova = nova_client.Client(self.nova_version, auth_token=token,
-                                      tenant_id=tenant_id,
-                                      auth_url=self.identity_service)
+            nova = self._get_nova_client(token, tenant_id)
             instances = nova.servers.list(search_opts=filters)
             data = [instance.to_dict() for instance in instances]
             return data
@@ -445,9 +461,7 @@ class NovaClient(OpenstackApi):
             kwargs.update(security_groups=[secgroup_name])
 
         try:
-            nova = nova_client.Client(self.nova_version, auth_token=token,
-                                      tenant_id=tenant_id,
-                                      auth_url=self.identity_service)
+            nova = self._get_nova_client(token, tenant_id)
             flavor = nova.flavors.find(name=flavor)
             instance = nova.servers.create(name, nova.images.get(image_id),
                                            flavor, **kwargs)
@@ -463,6 +477,13 @@ class NovaClient(OpenstackApi):
 class NeutronClient(OpenstackApi):
     """ Neutron Client Api Driver. """
 
+    def _get_neutron_client(self, token):
+        """Returns neutron client of token, reused across calls. """
+        return client_cache.get_cache().get(
+            ('neutron', self.network_service, token),
+            lambda: neutron_client.Client(token=token,
+                                          endpoint_url=self.network_service))
+
     def get_floating_ip(self, token, floatingip_id):
         """ Get floatingip details
 
@@ -473,8 +494,7 @@ class NeutronClient(OpenstackApi):
 
         """
         try:
-            neutron = neutron_client.Client(token=token,
-                                            endpoint_url=self.network_service)
+            neutron = self._get_neutron_client(token)
             return neutron.show_floatingip(floatingip_id)['floatingip']
         except Exception as ex:
             err = ("Failed to read floatingip from"
@@ -486,8 +506,7 @@ class NeutronClient(OpenstackApi):
     def get_floating_ips(self, token, tenant_id=None, port_id=None):
         """ Get list of floatingips, associated with port if passed"""
         try:
-            neutron = neutron_client.Client(token=token,
-                                            endpoint_url=self.network_service)
+            neutron = self._get_neutron_client(token)
             if port_id:
                 return neutron.list_floatingips(port_id=port_id)['floatingips']
             else:
@@ -509,8 +528,7 @@ class NeutronClient(OpenstackApi):
 
         """
         try:
-            neutron = neutron_client.Client(token=token,
-                                            endpoint_url=self.network_service)
+            neutron = self._get_neutron_client(token)
             return neutron.show_port(port_id)
         except Exception as ex:
             err = ("Failed to read port information"
@@ -529,8 +547,7 @@ class NeutronClient(OpenstackApi):
 
         """
         try:
-            neutron = neutron_client.Client(token=token,
-                                            endpoint_url=self.network_service)
+            neutron = self._get_neutron_client(token)
             ports = neutron.list_ports(**filters).get('ports', [])
             return ports
         except Exception as ex:
@@ -551,8 +568,7 @@ class NeutronClient(OpenstackApi):
 
         """
         try:
-            neutron = neutron_client.Client(token=token,
-                                            endpoint_url=self.network_service)
+            neutron = self._get_neutron_client(token)
             subnets = neutron.list_subnets(**filters).get('subnets', [])
             return subnets
         except Exception as ex:
@@ -569,8 +585,7 @@ class NeutronClient(OpenstackApi):
         :return: Subnet details
         """
         try:
-            neutron = neutron_client.Client(token=token,
-                                            endpoint_url=self.network_service)
+            neutron = self._get_neutron_client(token)
             return neutron.show_subnet(subnet_id)
         except Exception as ex:
             err = ("Failed to read subnet from"
@@ -586,8 +601,7 @@ class NeutronClient(OpenstackApi):
         :param floatingip_id: Floatingip UUID
         """
         try:
-            neutron = neutron_client.Client(token=token,
-                                            endpoint_url=self.network_service)
+            neutron = self._get_neutron_client(token)
             return neutron.delete_floatingip(floatingip_id)
         except Exception as ex:
             err = ("Failed to delete floatingip from"
@@ -605,8 +619,7 @@ class NeutronClient(OpenstackApi):
         :return:
         """
         try:
-            neutron = neutron_client.Client(token=token,
-                                            endpoint_url=self.network_service)
+            neutron = self._get_neutron_client(token)
             port_info = dict(port={})
             port_info['port'].update(kwargs)
             return neutron.update_port(port_id, body=port_info)
@@ -625,8 +638,7 @@ class NeutronClient(OpenstackApi):
         """
         data = {'floatingips': []}
         try:
-            neutron = neutron_client.Client(token=token,
-                                            endpoint_url=self.network_service)
+            neutron = self._get_neutron_client(token)
             data = neutron.list_floatingips(port_id=[kwargs[key]
                                                      for key in kwargs])
             return data
@@ -640,8 +652,7 @@ class NeutronClient(OpenstackApi):
         :param data: data to update
         """
         try:
-            neutron = neutron_client.Client(token=token,
-                                            endpoint_url=self.network_service)
+            neutron = self._get_neutron_client(token)
             return neutron.update_floatingip(floatingip_id, body=data)
         except Exception as ex:
             err = ("Failed to update floatingip from"
@@ -690,8 +701,7 @@ class NeutronClient(OpenstackApi):
         :return:
         """
         try:
-            neutron = neutron_client.Client(token=token,
-                                            endpoint_url=self.network_service)
+            neutron = self._get_neutron_client(token)
             port_ids = port_ids if port_ids is not None else []
             ports = neutron.list_ports(id=port_ids).get('ports', [])
             return ports
@@ -708,8 +718,7 @@ class NeutronClient(OpenstackApi):
         :return:
         """
         try:
-            neutron = neutron_client.Client(token=token,
-                                            endpoint_url=self.network_service)
+            neutron = self._get_neutron_client(token)
             subnet_ids = subnet_ids if subnet_ids is not None else []
             subnets = neutron.list_subnets(id=subnet_ids).get('subnets', [])
             return subnets
@@ -731,8 +740,7 @@ class NeutronClient(OpenstackApi):
             attr['port'].update(attrs)
 
         try:
-            neutron = neutron_client.Client(token=token,
-                                            endpoint_url=self.network_service)
+            neutron = self._get_neutron_client(token)
             return neutron.create_port(body=attr)['port']
         except Exception as ex:
             raise Exception("Port creation failed in network: %r of tenant: %r"
@@ -745,8 +753,7 @@ class NeutronClient(OpenstackApi):
         :return:
         """
         try:
-            neutron = neutron_client.Client(token=token,
-                                            endpoint_url=self.network_service)
+            neutron = self._get_neutron_client(token)
             return neutron.delete_port(port_id)
         except Exception as ex:
             err = ("Failed to delete port %s"
@@ -765,8 +772,7 @@ class NeutronClient(OpenstackApi):
 
         """
         try:
-            neutron = neutron_client.Client(token=token,
-                                            endpoint_url=self.network_service)
+            neutron = self._get_neutron_client(token)
             pools = neutron.list_pools(**filters).get('pools', [])
             return pools
         except Exception as ex:
@@ -786,8 +792,7 @@ class NeutronClient(OpenstackApi):
 
         """
         try:
-            neutron = neutron_client.Client(token=token,
-                                            endpoint_url=self.network_service)
+            neutron = self._get_neutron_client(token)
             return neutron.show_vip(vip_id)
         except Exception as ex:
             err = ("Failed to read vip information"
@@ -799,6 +804,13 @@ class NeutronClient(OpenstackApi):
 class GBPClient(OpenstackApi):
     """ GBP Client Api Driver. """
 
+    def _get_gbp_client(self, token):
+        """Returns gbp client of token, reused across calls. """
+        return client_cache.get_cache().get(
+            ('gbp', self.network_service, token),
+            lambda: gbp_client.Client(token=token,
+                                      endpoint_url=self.network_service))
+
     def get_policy_target_groups(self, token, filters=None):
         """ List Policy Target Groups
 
@@ -810,8 +822,7 @@ class GBPClient(OpenstackApi):
 
         """
         try:
-            gbp = gbp_client.Client(token=token,
-                                    endpoint_url=self.network_service)
+            gbp = self._get_gbp_client(token)
             return gbp.list_policy_target_groups(
                 **filters)['policy_target_groups']
         except Exception as ex:
@@ -829,8 +840,7 @@ class GBPClient(OpenstackApi):
         :return:
         """
         try:
-            gbp = gbp_client.Client(token=token,
-                                    endpoint_url=self.network_service)
+            gbp = self._get_gbp_client(token)
             filters = filters if filters is not None else {}
             return gbp.show_policy_target_group(
                 ptg_id, **filters)['policy_target_group']
@@ -851,8 +861,7 @@ class GBPClient(OpenstackApi):
         :return: PTG dict
         """
         try:
-            gbp = gbp_client.Client(token=token,
-                                    endpoint_url=self.network_service)
+            gbp = self._get_gbp_client(token)
             return gbp.update_policy_target_group(
                 ptg_id,
                 body=policy_target_group_info)['policy_target_group']
@@ -883,8 +892,7 @@ class GBPClient(OpenstackApi):
             policy_target_info["policy_target"]["port_id"] = port_id
 
         try:
-            gbp = gbp_client.Client(token=token,
-                                    endpoint_url=self.network_service)
+            gbp = self._get_gbp_client(token)
             return gbp.create_policy_target(
                 body=policy_target_info)['policy_target']
 
@@ -901,8 +909,7 @@ class GBPClient(OpenstackApi):
         :param policy_target_id: PT UUID
         """
         try:
-            gbp = gbp_client.Client(token=token,
-                                    endpoint_url=self.network_service)
+            gbp = self._get_gbp_client(token)
             return gbp.delete_policy_target(policy_target_id)
 
         except Exception as ex:
@@ -918,8 +925,7 @@ class GBPClient(OpenstackApi):
         :param policy_target_id: PTG UUID
         """
         try:
-            gbp = gbp_client.Client(token=token,
-                                    endpoint_url=self.network_service)
+            gbp = self._get_gbp_client(token)
             return gbp.delete_policy_target_group(policy_target_group_id)
         except Exception as ex:
             err = ("Failed to delete policy target group from"
@@ -941,8 +947,7 @@ class GBPClient(OpenstackApi):
         }
 
         try:
-            gbp = gbp_client.Client(token=token,
-                                    endpoint_url=self.network_service)
+            gbp = self._get_gbp_client(token)
             return gbp.update_policy_target(
                 policy_target_id, body=policy_target_info)['policy_target']
         except Exception as ex:
@@ -974,8 +979,7 @@ class GBPClient(OpenstackApi):
                 {"l2_policy_id": l2_policy_id})
 
         try:
-            gbp = gbp_client.Client(token=token,
-                                    endpoint_url=self.network_service)
+            gbp = self._get_gbp_client(token)
             return gbp.create_policy_target_group(
                 body=policy_target_group_info)['policy_target_group']
         except Exception as ex:
@@ -996,8 +1000,7 @@ class GBPClient(OpenstackApi):
             l2_policy_info["l2_policy"].update({'l3_policy_id': l3_policy_id})
 
         try:
-            gbp = gbp_client.Client(token=token,
-                                    endpoint_url=self.network_service)
+            gbp = self._get_gbp_client(token)
             return gbp.create_l2_policy(body=l2_policy_info)['l2_policy']
         except Exception as ex:
             err = ("Failed to create l2 policy under tenant"
@@ -1012,8 +1015,7 @@ class GBPClient(OpenstackApi):
         :return:
         """
         try:
-            gbp = gbp_client.Client(token=token,
-                                    endpoint_url=self.network_service)
+            gbp = self._get_gbp_client(token)
             return gbp.delete_l2_policy(l2policy_id)
         except Exception as ex:
             err = ("Failed to delete l2 policy %s. Reason %s" %
@@ -1034,8 +1036,7 @@ class GBPClient(OpenstackApi):
 
         """
         try:
-            gbp = gbp_client.Client(token=token,
-                                    endpoint_url=self.network_service)
+            gbp = self._get_gbp_client(token)
             filters = filters if filters is not None else {}
             return gbp.list_l2_policies(**filters)['l2_policies']
         except Exception as ex:
@@ -1055,8 +1056,7 @@ class GBPClient(OpenstackApi):
 
         """
         try:
-            gbp = gbp_client.Client(token=token,
-                                    endpoint_url=self.network_service)
+            gbp = self._get_gbp_client(token)
             filters = filters if filters is not None else {}
             return gbp.show_l2_policy(
                 policy_id, **filters)['l2_policy']
@@ -1071,8 +1071,7 @@ class GBPClient(OpenstackApi):
                                       network_service_policy_info):
 
         try:
-            gbp = gbp_client.Client(token=token,
-                                    endpoint_url=self.network_service)
+            gbp = self._get_gbp_client(token)
             return gbp.create_network_service_policy(
                     body=network_service_policy_info)['network_service_policy']
         except Exception as ex:
@@ -1092,8 +1091,7 @@ class GBPClient(OpenstackApi):
 
         """
         try:
-            gbp = gbp_client.Client(token=token,
-                                    endpoint_url=self.network_service)
+            gbp = self._get_gbp_client(token)
             filters = filters if filters is not None else {}
             return gbp.list_network_service_policies(**filters)[
                                                     'network_service_policies']
@@ -1113,8 +1111,7 @@ class GBPClient(OpenstackApi):
 
         """
         try:
-            gbp = gbp_client.Client(token=token,
-                                    endpoint_url=self.network_service)
+            gbp = self._get_gbp_client(token)
             filters = filters if filters is not None else {}
             return gbp.list_external_policies(**filters)['external_policies']
         except Exception as ex:
@@ -1133,8 +1130,7 @@ class GBPClient(OpenstackApi):
 
         """
         try:
-            gbp = gbp_client.Client(token=token,
-                                    endpoint_url=self.network_service)
+            gbp = self._get_gbp_client(token)
             filters = filters if filters is not None else {}
             return gbp.list_policy_rule_sets(**filters)['policy_rule_sets']
         except Exception as ex:
@@ -1153,8 +1149,7 @@ class GBPClient(OpenstackApi):
 
         """
         try:
-            gbp = gbp_client.Client(token=token,
-                                    endpoint_url=self.network_service)
+            gbp = self._get_gbp_client(token)
             filters = filters if filters is not None else {}
             return gbp.list_policy_actions(**filters)['policy_actions']
         except Exception as ex:
@@ -1173,8 +1168,7 @@ class GBPClient(OpenstackApi):
 
         """
         try:
-            gbp = gbp_client.Client(token=token,
-                                    endpoint_url=self.network_service)
+            gbp = self._get_gbp_client(token)
             filters = filters if filters is not None else {}
             return gbp.list_policy_rules(**filters)['policy_rules']
         except Exception as ex:
@@ -1185,8 +1179,7 @@ class GBPClient(OpenstackApi):
     def create_l3_policy(self, token, l3_policy_info):  # tenant_id, name):
 
         try:
-            gbp = gbp_client.Client(token=token,
-                                    endpoint_url=self.network_service)
+            gbp = self._get_gbp_client(token)
             return gbp.create_l3_policy(body=l3_policy_info)['l3_policy']
         except Exception as ex:
             err = ("Failed to create l3 policy under tenant"
@@ -1206,8 +1199,7 @@ class GBPClient(OpenstackApi):
 
         """
         try:
-            gbp = gbp_client.Client(token=token,
-                                    endpoint_url=self.network_service)
+            gbp = self._get_gbp_client(token)
             filters = filters if filters is not None else {}
             return gbp.show_l3_policy(
                 policy_id, **filters)['l3_policy']
@@ -1229,8 +1221,7 @@ class GBPClient(OpenstackApi):
 
         """
         try:
-            gbp = gbp_client.Client(token=token,
-                                    endpoint_url=self.network_service)
+            gbp = self._get_gbp_client(token)
             filters = filters if filters is not None else {}
             return gbp.list_l3_policies(**filters)['l3_policies']
         except Exception as ex:
@@ -1249,8 +1240,7 @@ class GBPClient(OpenstackApi):
 
         """
         try:
-            gbp = gbp_client.Client(token=token,
-                                    endpoint_url=self.network_service)
+            gbp = self._get_gbp_client(token)
             filters = filters if filters is not None else {}
             return gbp.list_policy_targets(**filters)['policy_targets']
         except Exception as ex:
@@ -1265,8 +1255,7 @@ class GBPClient(OpenstackApi):
 
     def get_policy_target(self, token, pt_id, filters=None):
         try:
-            gbp = gbp_client.Client(token=token,
-                                    endpoint_url=self.network_service)
+            gbp = self._get_gbp_client(token)
             filters = filters if filters is not None else {}
             return gbp.show_policy_target(pt_id,
                                           **filters)['policy_target']
@@ -1278,17 +1267,14 @@ class GBPClient(OpenstackApi):
             raise Exception(err)
 
     def get_service_profile(self, token, service_profile_id):
-        gbp = gbp_client.Client(token=token,
-                                endpoint_url=self.network_service)
+        gbp = self._get_gbp_client(token)
         return gbp.show_service_profile(service_profile_id)['service_profile']
 
     def get_servicechain_node(self, token, node_id):
-        gbp = gbp_client.Client(token=token,
-                                endpoint_url=self.network_service)
+        gbp = self._get_gbp_client(token)
         return gbp.show_servicechain_node(node_id)['servicechain_node']
 
     def get_servicechain_instance(self, token, instance_id):
-        gbp = gbp_client.Client(token=token,
-                                endpoint_url=self.network_service)
+        gbp = self._get_gbp_client(token)
         return gbp.show_servicechain_instance(instance_id)[
                                                     'servicechain_instance']
@@ -0,0 +1,161 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+import time
+
+from gbpservice.nfp.core import log as nfp_logging
+from gbpservice.nfp.core import stats as nfp_stats
+
+LOG = nfp_logging.getLogger(__name__)
+
+# Cached token is refreshed when it expires within these many seconds
+TOKEN_STALE_TIME = 300
+# Lifetime assumed for tokens whose expiry keystone did not report
+DEFAULT_TOKEN_TTL = 3600
+# Tenant name to id mappings are looked up again after these many seconds
+TENANT_ID_TTL = 3600
+# Expired entries are dropped at most once in these many seconds
+PURGE_INTERVAL = 60
+
+
+class _Fetch(object):
+    """A fetch in flight, waited upon by concurrent lookups of the key. """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+"""Process wide cache of keystone tokens & tenant ids.
+
+    Entries expire, tokens shortly before their keystone expiry so that
+    a cached token is never handed out about to expire. Expired entries
+    are dropped when new ones are added.
+    Lookups of a key being fetched wait for that fetch instead of
+    sending their own request to keystone (single flight), a failed
+    fetch is raised to all of them and nothing is cached.
+    Counts hits & misses, which is the number of keystone requests
+    avoided & sent.
+"""
+
+
+class TokenCache(object):
+
+    def __init__(self, stale_time=TOKEN_STALE_TIME,
+                 tenant_id_ttl=TENANT_ID_TTL, timefunc=time.time):
+        self._stale_time = stale_time
+        self._tenant_id_ttl = tenant_id_ttl
+        self.timefunc = timefunc
+        # {key: (value, expires_at)}
+        self._entries = {}
+        # Time after which expired entries are purged on the next insert
+        self._next_purge = timefunc() + PURGE_INTERVAL
+        # {key: _Fetch}
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._counters = dict.fromkeys(
+            ['token_hits', 'token_misses', 'tenant_id_hits',
+             'tenant_id_misses', 'inflight_waits', 'errors'], 0)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _purge(self, now):
+        # Called with the lock held
+        if now < self._next_purge:
+            return
+        self._next_purge = now + PURGE_INTERVAL
+        for key in [key for key, (value, expires_at) in
+                    self._entries.items() if expires_at <= now]:
+            del self._entries[key]
+
+    def _lookup(self, key, fetch, kind):
+        """Returns cached value of key, fetching it if expired/missing.
+
+            fetch() returns (value, expires_at).
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[1] > self.timefunc():
+                self._counters[kind + '_hits'] += 1
+                return entry[0]
+            inflight = self._inflight.get(key)
+            if not inflight:
+                self._counters[kind + '_misses'] += 1
+                inflight = self._inflight[key] = _Fetch()
+                waiter = False
+            else:
+                self._counters['inflight_waits'] += 1
+                self._counters[kind + '_hits'] += 1
+                waiter = True
+        if waiter:
+            inflight.done.wait()
+            if inflight.error:
+                raise inflight.error
+            return inflight.value
+
+        try:
+            value, expires_at = fetch()
+        except Exception as err:
+            with self._lock:
+                self._counters['errors'] += 1
+                del self._inflight[key]
+            inflight.error = err
+            inflight.done.set()
+            raise
+        with self._lock:
+            self._purge(self.timefunc())
+            self._entries[key] = (value, expires_at)
+            del self._inflight[key]
+        inflight.value = value
+        inflight.done.set()
+        return value
+
+    def get_token(self, key, fetch):
+        """Returns token cached for key, fetched if about to expire.
+
+            :param fetch: returns (token, expiry timestamp or None).
+        """
+        def _fetch():
+            token, expires = fetch()
+            if expires is None:
+                expires = self.timefunc() + DEFAULT_TOKEN_TTL
+            return token, expires - self._stale_time
+
+        return self._lookup(('token',) + tuple(key), _fetch, 'token')
+
+    def get_tenant_id(self, key, fetch):
+        """Returns tenant id cached for key, fetch() returns the id. """
+        def _fetch():
+            return fetch(), self.timefunc() + self._tenant_id_ttl
+
+        return self._lookup(('tenant',) + tuple(key), _fetch, 'tenant_id')
+
+    def counters(self):
+        return dict(self._counters)
+
+
+_CACHE = None
+
+
+def get_cache():
+    """Returns the process wide token cache. """
+    global _CACHE
+    if _CACHE is None:
+        _CACHE = TokenCache()
+        nfp_stats.register_provider('keystone_cache', _CACHE.counters)
+    return _CACHE
@@ -13,6 +13,8 @@
 import eventlet
 eventlet.monkey_patch()
 
+import collections
+import errno
 from gbpservice.nfp.core import log as nfp_logging
 import os
 from oslo_config import cfg as oslo_config
@@ -26,20 +28,6 @@ oslo_logging.register_options(oslo_config.CONF)
 
 LOG = nfp_logging.getLogger(__name__)
 
-# Queue of proxy connections which workers will handle
-ConnQ = eventlet.queue.Queue(maxsize=0)
-
-tcp_open_connection_count = 0
-tcp_close_connection_count = 0
-
-
-class ConnectionIdleTimeOut(Exception):
-
-    '''
-    Exception raised when connection is idle for configured timeout
-    '''
-    pass
-
 
 """
 parsing the proxy configuration file
@@ -51,12 +39,12 @@ class Configuration(object):
     def __init__(self, conf):
         self.unix_bind_path = conf.proxy.unix_bind_path
         self.max_connections = conf.proxy.max_connections
-        self.worker_threads = conf.proxy.worker_threads
         self.connect_max_wait_timeout = conf.proxy.connect_max_wait_timeout
         self.idle_max_wait_timeout = conf.proxy.idle_max_wait_timeout
-        self.idle_min_wait_timeout = conf.proxy.idle_min_wait_timeout
         self.rest_server_address = conf.proxy.nfp_controller_ip
         self.rest_server_port = conf.proxy.nfp_controller_port
+        self.buffer_size = conf.proxy.buffer_size
+        self.controller_pool_size = conf.proxy.controller_pool_size
 
 
 """
@@ -91,9 +79,24 @@ class UnixServer(object):
         self.proxy.new_client(client, address)
 
 
+def _is_alive(sock):
+    """Whether an idle socket is still open on the peer side."""
+    try:
+        sock.setblocking(0)
+        sock.recv(1, socket.MSG_PEEK)
+    except socket.error as exc:
+        return exc.errno in (errno.EAGAIN, errno.EWOULDBLOCK)
+    finally:
+        sock.setblocking(1)
+    # Closed by the peer, or sent data nobody asked for
+    return False
+
+
 """
 Class to create TCP client Connection if
-TCP server is alive
+TCP server is alive. Keeps a few connections
+to the TCP server established ahead, so that
+new clients do not wait for the connect
 """
 
 
@@ -106,19 +109,55 @@ class TcpClient(object):
         self.server_port = conf.rest_server_port
         # Connect the socket to the port where the server is listening
         self.server = (self.server_address, self.server_port)
+        self.pool_size = conf.controller_pool_size
+        self._idle = collections.deque()
+        self._filling = False
 
-    def connect(self):
+    def _connect(self):
         sock = socket.socket()
         message = 'connecting to %s port %s' % self.server
-        LOG.info(message)
+        LOG.debug(message)
         sock.settimeout(self.conf.connect_max_wait_timeout)
         try:
             sock.connect(self.server)
+        except socket.error:
+            sock.close()
+            raise
+        sock.settimeout(None)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return sock
+
+    def _fill(self):
+        try:
+            while len(self._idle) < self.pool_size:
+                self._idle.append(self._connect())
         except socket.error as exc:
             message = "Caught exception socket.error : %s" % exc
             LOG.error(message)
-            return sock, False
-        return sock, True
+        finally:
+            self._filling = False
+
+    def fill(self):
+        if self.pool_size and not self._filling:
+            self._filling = True
+            eventlet.spawn_n(self._fill)
+
+    def connect(self):
+        """Returns a socket connected to the TCP server, None on failure."""
+        while self._idle:
+            sock = self._idle.popleft()
+            if _is_alive(sock):
+                self.fill()
+                return sock
+            sock.close()
+        try:
+            sock = self._connect()
+        except socket.error as exc:
+            message = "Caught exception socket.error : %s" % exc
+            LOG.error(message)
+            return None
+        self.fill()
+        return sock
 
 
 """
@@ -130,66 +169,40 @@ class Connection(object):
 
     def __init__(self, conf, socket, type='unix'):
         self._socket = socket
-        self._idle_wait = conf.idle_min_wait_timeout
-        self._idle_timeout = conf.idle_max_wait_timeout
-        self._idle_count_max = (self._idle_timeout / self._idle_wait)
-        self._idle_count = 0
-        self._start_time = time.time()
-        self._end_time = time.time()
+        self._buffer = bytearray(conf.buffer_size)
+        self._view = memoryview(self._buffer)
         self.type = type
         self.socket_id = self._socket.fileno()
 
-    def _tick(self):
-        self._idle_count += 1
-
-    def _timedout(self):
-        if self._idle_count > self._idle_count_max:
-            self._end_time = time.time()
-            raise ConnectionIdleTimeOut(
-                "Connection (%d) - stime (%s) - etime (%s) - "
-                "idle_count (%d) idle_count_max(%d)" % (
-                    self.identify(), self._start_time,
-                    self._end_time, self._idle_count, self._idle_count_max))
-
-    def idle(self):
-        self._tick()
-        self._timedout()
-
-    def idle_reset(self):
-        self._idle_count = 0
-        self._start_time = time.time()
-
-    def _wait(self, timeout):
-        if self.type == 'unix':
-            eventlet.sleep(timeout)
-            self._socket.setblocking(0)
-        else:
-            self._socket.settimeout(timeout)
-
     def recv(self):
-        self._wait(self._idle_wait)
-        try:
-            data = self._socket.recv(1024)
-            if data and len(data):
-                self.idle_reset()
-                return data
-            self.idle()
-        except socket.timeout:
-            self.idle()
-        except socket.error:
-            self.idle()
-        return None
+        """Returns the data received, empty once the peer stopped sending.
+
+        The data is a view on the buffer of the connection, which is only
+        valid until the next recv.
+        """
+        size = self._socket.recv_into(self._buffer)
+        return self._view[:size]
 
     def send(self, data):
-        self._socket.setblocking(1)
         self._socket.sendall(data)
-        self._socket.setblocking(0)
+
+    def shutdown_write(self):
+        try:
+            self._socket.shutdown(socket.SHUT_WR)
+        except socket.error as exc:
+            message = "%s - exception while shutting down - %s" % (
+                self.identify(), str(exc))
+            LOG.debug(message)
 
     def close(self):
         message = "Closing Socket - %d" % (self.identify())
         LOG.debug(message)
         try:
             self._socket.shutdown(socket.SHUT_RDWR)
+        except socket.error:
+            # Already closed by the peer
+            pass
+        try:
             self._socket.close()
         except Exception as exc:
             message = "%s - exception while closing - %s" % (
@@ -212,30 +225,64 @@ class ProxyConnection(object):
     def __init__(self, conf, unix_socket, tcp_socket):
         self._unix_conn = Connection(conf, unix_socket, type='unix')
         self._tcp_conn = Connection(conf, tcp_socket, type='tcp')
+        self._idle_timeout = conf.idle_max_wait_timeout
+        self._last_active = time.time()
+        self._timer = None
+        self._closed = False
         message = "New Proxy - Unix - %d, TCP - %d" % (
             self._unix_conn.identify(), self._tcp_conn.identify())
         LOG.debug(message)
 
     def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        if self._timer:
+            self._timer.cancel()
         self._unix_conn.close()
         self._tcp_conn.close()
 
-    def _proxy(self, rxconn, txconn):
-        data = rxconn.recv()
-        if data:
-            txconn.send(data)
+    def _check_idle(self):
+        idle = time.time() - self._last_active
+        if idle < self._idle_timeout:
+            self._timer = eventlet.spawn_after(self._idle_timeout - idle,
+                                               self._check_idle)
+            return
+        message = "Proxy %s - idle for %.1f seconds, closing" % (
+            self.identify(), idle)
+        LOG.debug(message)
+        self.close()
+
+    def _splice(self, rxconn, txconn):
+        """Copies the data from rxconn to txconn until rxconn ends.
 
-    def run(self):
+        The end of the data is passed on by shutting down the write side
+        of txconn, its peer can still reply in the other direction.
+        """
         try:
-            self._proxy(self._unix_conn, self._tcp_conn)
-            self._proxy(self._tcp_conn, self._unix_conn)
-            return True
+            while True:
+                data = rxconn.recv()
+                if not data:
+                    break
+                self._last_active = time.time()
+                txconn.send(data)
         except Exception as exc:
             message = "%s" % (exc)
             LOG.debug(message)
-            self._unix_conn.close()
-            self._tcp_conn.close()
-            return False
+            # Stops the other direction as well
+            self.close()
+            return
+        txconn.shutdown_write()
+
+    def run(self):
+        """Proxies both directions until both have ended."""
+        self._timer = eventlet.spawn_after(self._idle_timeout,
+                                           self._check_idle)
+        upstream = eventlet.spawn(self._splice, self._unix_conn,
+                                  self._tcp_conn)
+        self._splice(self._tcp_conn, self._unix_conn)
+        upstream.wait()
+        self.close()
 
     def identify(self):
         return '%d:%d' % (
@@ -243,33 +290,6 @@ class ProxyConnection(object):
             self._tcp_conn.identify())
 
 
-"""
-ADT for proxy Worker
-"""
-
-
-class Worker(object):
-
-    def run(self):
-        """
-        Worker thread will pop the Proxy Connection Object
-        from Connection Queue and Perform send and receive
-        operations. If the connection is ideal upto ideal_max_timeout
-        it will not push the Object into connection queue so Proxy Connection
-        Object is automatically destroy, otherwise it will again
-        push the Object in connection Queue
-        """
-        while True:
-            try:
-                pc = ConnQ.get()
-                call = True
-                while call:
-                    call = pc.run()
-            except eventlet.queue.Empty:
-                pass
-            eventlet.sleep(0)
-
-
 """
 ADT to  Run the configurator proxy,
         accept the Unix Client request,
@@ -286,27 +306,29 @@ class Proxy(object):
         # Be a server and wait for connections from the client
         self.server = UnixServer(conf, self)
         self.client = TcpClient(conf, self)
+        self.pool = eventlet.GreenPool(conf.max_connections)
 
     def start(self):
-        """Run each worker in new thread"""
+        """Accept clients, each proxied in its own thread"""
 
-        for i in range(self.conf.worker_threads):
-            eventlet.spawn_n(Worker().run)
+        self.client.fill()
         while True:
             self.server.listen()
 
     def new_client(self, unixsocket, address):
+        # Waits for a free thread once max_connections are proxied
+        self.pool.spawn_n(self._proxy, unixsocket)
+
+    def _proxy(self, unixsocket):
         """Establish connection with the tcp server"""
 
-        tcpsocket, connected = self.client.connect()
-        if not connected:
+        tcpsocket = self.client.connect()
+        if not tcpsocket:
             message = "Proxy -> Could not connect with tcp server"
             LOG.error(message)
             unixsocket.close()
-            tcpsocket.close()
         else:
-            pc = ProxyConnection(self.conf, unixsocket, tcpsocket)
-            ConnQ.put(pc)
+            ProxyConnection(self.conf, unixsocket, tcpsocket).run()
 
 PROXY_OPTS = [
     oslo_config.IntOpt(
@@ -317,7 +339,8 @@ PROXY_OPTS = [
     oslo_config.IntOpt(
         'worker_threads',
         default=10,
-        help='Number of threads to be used.'
+        deprecated_for_removal=True,
+        help='Unused, each connection is proxied in its own thread.'
     ),
     oslo_config.FloatOpt(
         'connect_max_wait_timeout',
@@ -332,7 +355,19 @@ PROXY_OPTS = [
     oslo_config.FloatOpt(
         'idle_min_wait_timeout',
         default=10,
-        help='Minimum time to wait on idle channel.'
+        deprecated_for_removal=True,
+        help='Unused, the proxy waits for data to be ready.'
+    ),
+    oslo_config.IntOpt(
+        'buffer_size',
+        default=65536,
+        help='Size of the buffer data is read into, per socket.'
+    ),
+    oslo_config.IntOpt(
+        'controller_pool_size',
+        default=2,
+        help='Number of connections to the NFP controller kept '
+             'established ahead of the clients.'
     ),
     oslo_config.StrOpt(
         'unix_bind_path',
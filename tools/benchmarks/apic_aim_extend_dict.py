@@ -0,0 +1,133 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Benchmark of the apic_aim network dict extension, per row vs bulk.
+
+Sets the ML2Plus plugin up with the apic_aim drivers over the unit test
+database, adds networks straight to the DB, a share of them interfaced
+to routers, and extends the dicts of all of them the way a network list
+does, one by one and then all at once. Reports the time taken and the
+number of SQL statements run.
+
+    python tools/benchmarks/apic_aim_extend_dict.py [--networks N ...]
+"""
+
+from __future__ import print_function
+
+import argparse
+import time
+import uuid
+
+from neutron.common import constants as n_constants
+from neutron import context
+from neutron.db import api as db_api
+from neutron.db import l3_db
+from neutron.db import models_v2
+import sqlalchemy as sa
+
+from gbpservice.neutron.tests.unit.plugins.ml2plus import test_apic_aim
+
+
+class _Setup(test_apic_aim.ApicAimTestCase):
+
+    def runTest(self):
+        pass
+
+
+class StatementCounter(object):
+
+    def __init__(self, engine):
+        self.count = 0
+        sa.event.listen(engine, 'before_cursor_execute', self._count)
+
+    def _count(self, *args, **kwargs):
+        self.count += 1
+
+
+def add_networks(session, num_networks, routed, tenants):
+    routers = [str(uuid.uuid4()) for i in range(max(1, num_networks // 50))]
+    with session.begin(subtransactions=True):
+        for router_id in routers:
+            session.add(l3_db.Router(id=router_id, tenant_id='test-tenant',
+                                     name='router', status='ACTIVE',
+                                     admin_state_up=True))
+        for i in range(num_networks):
+            network_id = str(uuid.uuid4())
+            session.add(models_v2.Network(
+                id=network_id, tenant_id='tenant-%d' % (i % tenants),
+                name='net%d' % i, status='ACTIVE', admin_state_up=True))
+            if i % 100 < routed * 100:
+                port_id = str(uuid.uuid4())
+                session.add(models_v2.Port(
+                    id=port_id, tenant_id='test-tenant', name='',
+                    network_id=network_id, mac_address='',
+                    admin_state_up=True, status='ACTIVE', device_id='',
+                    device_owner=n_constants.DEVICE_OWNER_ROUTER_INTF))
+                session.add(l3_db.RouterPort(
+                    router_id=routers[i % len(routers)], port_id=port_id,
+                    port_type=n_constants.DEVICE_OWNER_ROUTER_INTF))
+
+
+def run(plugin, session, counter):
+    network_dbs = session.query(models_v2.Network).all()
+    results = [(plugin._make_network_dict(network_db,
+                                          process_extensions=False),
+                network_db) for network_db in network_dbs]
+    # Names are mapped on the first extension, leave it out
+    plugin.extension_manager.extend_network_dict_bulk(session, results)
+
+    session.expire_all()
+    counter.count = 0
+    start = time.time()
+    for result, network_db in results:
+        plugin.extension_manager.extend_network_dict(session, network_db,
+                                                     result)
+    per_row = time.time() - start, counter.count
+
+    session.expire_all()
+    counter.count = 0
+    start = time.time()
+    plugin.extension_manager.extend_network_dict_bulk(session, results)
+    bulk = time.time() - start, counter.count
+    return per_row, bulk
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--networks', type=int, nargs='+',
+                        default=[1000, 5000, 10000])
+    parser.add_argument('--routed', type=float, default=0.2,
+                        help='Share of the networks on a router')
+    parser.add_argument('--tenants', type=int, default=50)
+    args = parser.parse_args()
+
+    setup = _Setup()
+    setup.setUp()
+    try:
+        session = context.get_admin_context().session
+        counter = StatementCounter(db_api.get_engine())
+        added = 0
+        for num_networks in sorted(args.networks):
+            add_networks(session, num_networks - added, args.routed,
+                         args.tenants)
+            added = num_networks
+            per_row, bulk = run(setup.plugin, session, counter)
+            print("networks=%d per-row: %.3fs %d statements, "
+                  "bulk: %.3fs %d statements" % (
+                      num_networks, per_row[0], per_row[1],
+                      bulk[0], bulk[1]))
+    finally:
+        setup.tearDown()
+
+
+if __name__ == '__main__':
+    main()
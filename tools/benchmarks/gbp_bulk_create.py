@@ -0,0 +1,111 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Benchmark of policy target creation, one request each vs bulk.
+
+Sets the GBP plugin up with the resource_mapping driver over the unit
+test database and creates policy targets with implicit ports through the
+API, first with one request per policy target and then with a single
+bulk request. Reports the time taken and the number of SQL statements
+run per policy target.
+
+    python tools/benchmarks/gbp_bulk_create.py [--targets N ...]
+"""
+
+from __future__ import print_function
+
+import argparse
+import time
+
+from neutron.db import api as db_api
+import sqlalchemy as sa
+import webob.exc
+
+from gbpservice.neutron.tests.unit.services.grouppolicy import (
+    test_resource_mapping)
+
+
+class _Setup(test_resource_mapping.ResourceMappingTestCase):
+
+    def runTest(self):
+        pass
+
+
+class StatementCounter(object):
+
+    def __init__(self, engine):
+        self.count = 0
+        sa.event.listen(engine, 'before_cursor_execute', self._count)
+
+    def _count(self, *args, **kwargs):
+        self.count += 1
+
+
+def _pt_data(setup, ptg_id, name):
+    return {'policy_target': {'name': name, 'tenant_id': setup._tenant_id,
+                              'policy_target_group_id': ptg_id}}
+
+
+def run(setup, counter, num_targets):
+    # A /16 subnet per group, so that the group has room for all its ports
+    l3p = setup.create_l3_policy(ip_pool='10.0.0.0/8',
+                                 subnet_prefix_length=16)['l3_policy']
+    l2p = setup.create_l2_policy(l3_policy_id=l3p['id'])['l2_policy']
+
+    ptg = setup.create_policy_target_group(
+        l2_policy_id=l2p['id'])['policy_target_group']
+    counter.count = 0
+    start = time.time()
+    for i in range(num_targets):
+        setup.create_policy_target(policy_target_group_id=ptg['id'],
+                                   name='pt%d' % i)
+    one_by_one = time.time() - start, counter.count
+
+    ptg = setup.create_policy_target_group(
+        l2_policy_id=l2p['id'])['policy_target_group']
+    data = {'policy_targets': [_pt_data(setup, ptg['id'], 'pt%d' % i)
+                               for i in range(num_targets)]}
+    counter.count = 0
+    start = time.time()
+    req = setup.new_create_request('policy_targets', data, setup.fmt)
+    res = req.get_response(setup.ext_api)
+    bulk = time.time() - start, counter.count
+    if res.status_int != webob.exc.HTTPCreated.code:
+        raise Exception("Bulk create failed: %s" % res.body)
+    return one_by_one, bulk
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--targets', type=int, nargs='+',
+                        default=[1, 100, 1000])
+    args = parser.parse_args()
+
+    setup = _Setup()
+    setup.setUp()
+    try:
+        counter = StatementCounter(db_api.get_engine())
+        for num_targets in args.targets:
+            one_by_one, bulk = run(setup, counter, num_targets)
+            print("targets=%d one-by-one: %.2fms %.1f statements per PT, "
+                  "bulk: %.2fms %.1f statements per PT" % (
+                      num_targets,
+                      one_by_one[0] * 1000 / num_targets,
+                      float(one_by_one[1]) / num_targets,
+                      bulk[0] * 1000 / num_targets,
+                      float(bulk[1]) / num_targets))
+    finally:
+        setup.tearDown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Micro benchmark of the NFP distributor <-> worker event framing.
+
+Sends events over a multiprocessing pipe to a child process which
+decodes and echoes them back, the way a worker acks events.
+Reports events/sec and bytes/event for the legacy framing
+(str() + zlib + ast.literal_eval) and for the pickle codec.
+
+    python tools/benchmarks/nfp_event_codec.py [--events N]
+"""
+
+from __future__ import print_function
+
+import argparse
+import ast
+import multiprocessing
+import pickle
+import time
+import zlib
+
+from gbpservice.nfp.core import codec as nfp_codec
+from gbpservice.nfp.core import event as nfp_event
+
+
+class LegacyCodec(nfp_codec.EventCodec):
+    """Framing used by NfpController before the codec was introduced. """
+
+    def compress(self, event):
+        if event.data and not event.zipped:
+            event.zipped = True
+            event.data = zlib.compress(
+                str({'cdata': event.data}).encode('utf-8'))
+
+    def decompress(self, event):
+        if event.data and event.zipped:
+            event.data = ast.literal_eval(
+                zlib.decompress(event.data).decode('utf-8'))['cdata']
+            event.zipped = False
+
+
+CODECS = {
+    'legacy': LegacyCodec,
+    'pickle': nfp_codec.PickleCodec,
+}
+
+
+def _payload(size):
+    """Event data resembling a configurator request. """
+    return {'context': {'tenant_id': 'a' * 32, 'auth_token': 'b' * 64},
+            'resource_data': [
+                {'cidr': '10.%d.%d.0/24' % (i // 256, i % 256),
+                 'gateway_ip': '10.%d.%d.1' % (i // 256, i % 256),
+                 'port_id': '%032d' % (i),
+                 'mac': 'fa:16:3e:00:%02x:%02x' % (i // 256, i % 256)}
+                for i in range(size)]}
+
+
+def _worker(pipe, name):
+    codec = CODECS[name]()
+    while True:
+        event = pipe.recv()
+        if event is None:
+            break
+        codec.decompress(event)
+        codec.compress(event)
+        pipe.send(event)
+
+
+def run(name, events, size):
+    parent, child = multiprocessing.Pipe(duplex=True)
+    proc = multiprocessing.Process(target=_worker, args=(child, name))
+    proc.daemon = True
+    proc.start()
+    codec = CODECS[name]()
+    data = _payload(size)
+    nbytes = 0
+    start = time.time()
+    for i in range(events):
+        event = nfp_event.Event(id='BENCH_EVENT', data=data)
+        codec.compress(event)
+        nbytes += len(pickle.dumps(event, pickle.HIGHEST_PROTOCOL))
+        parent.send(event)
+        event = parent.recv()
+        codec.decompress(event)
+    elapsed = time.time() - start
+    parent.send(None)
+    proc.join()
+    return events / elapsed, nbytes / events
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--events', type=int, default=2000)
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[1, 10, 100, 1000])
+    args = parser.parse_args()
+    print("%-8s %8s %14s %14s" % ('codec', 'items', 'events/sec',
+                                  'bytes/event'))
+    for size in args.sizes:
+        for name in sorted(CODECS):
+            try:
+                rate, nbytes = run(name, args.events, size)
+            except Exception as e:
+                print("%-8s %8d %14s (%s)" % (name, size, 'failed', e))
+                continue
+            print("%-8s %8d %14.1f %14d" % (name, size, rate, nbytes))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Benchmark of the NFP proxy, over a local unix socket and TCP pair.
+
+Runs the proxy between a unix socket and a local fake controller which
+sends each request back once it has read it to the end. Reports the
+latency of small requests, each on a new connection, and the throughput
+of large requests, proxied both ways, next to the same requests sent to
+the controller directly.
+
+    python tools/benchmarks/nfp_proxy.py [--requests N] [--size MB ...]
+"""
+
+from __future__ import print_function
+
+import argparse
+import os
+import shutil
+import socket
+import tempfile
+import time
+
+import eventlet
+from oslo_config import cfg as oslo_config
+
+from gbpservice.neutron.tests.unit.nfp.proxy_agent.proxy import test_proxy
+from gbpservice.nfp.proxy_agent.proxy import proxy
+
+
+CHUNK = 1024 * 1024
+
+
+def _request(family, address, data):
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.connect(address)
+    # Sent a chunk at a time, as sendall copies what remains of the data
+    # after each partial send
+    view = memoryview(data)
+    for offset in range(0, len(data), CHUNK):
+        sock.sendall(view[offset:offset + CHUNK])
+    sock.shutdown(socket.SHUT_WR)
+    reply = test_proxy._recv_all(sock)
+    sock.close()
+    if not reply.endswith(data):
+        raise Exception("Unexpected reply of %d bytes" % len(reply))
+
+
+def run(family, address, num_requests, sizes):
+    start = time.time()
+    for i in range(num_requests):
+        _request(family, address, b'{"request": %d}' % i)
+    latency = (time.time() - start) * 1000 / num_requests
+
+    throughputs = []
+    for size in sizes:
+        data = os.urandom(size * 1024 * 1024)
+        start = time.time()
+        _request(family, address, data)
+        throughputs.append(size * 2 / (time.time() - start))
+    return latency, throughputs
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--size', type=int, nargs='+', default=[1, 16, 64])
+    args = parser.parse_args()
+
+    controller = test_proxy.FakeController()
+    tempdir = tempfile.mkdtemp()
+    conf = oslo_config.ConfigOpts()
+    conf.register_opts(proxy.PROXY_OPTS, 'proxy')
+    conf([])
+    conf.set_override('unix_bind_path', os.path.join(tempdir, 'uds_socket'),
+                      group='proxy')
+    conf.set_override('nfp_controller_ip', '127.0.0.1', group='proxy')
+    conf.set_override('nfp_controller_port', controller.port, group='proxy')
+    nfp_proxy = proxy.Proxy(proxy.Configuration(conf))
+    thread = eventlet.spawn(nfp_proxy.start)
+    try:
+        for name, family, address in (
+                ('direct', socket.AF_INET, ('127.0.0.1', controller.port)),
+                ('proxied', socket.AF_UNIX, nfp_proxy.server.bind_path)):
+            latency, throughputs = run(family, address, args.requests,
+                                       args.size)
+            print("%s: %.3fms per request, %s" % (
+                name, latency, ', '.join(
+                    '%dMB request: %.1fMB/s' % (size, throughput)
+                    for size, throughput in zip(args.size, throughputs))))
+    finally:
+        thread.kill()
+        nfp_proxy.server.socket.close()
+        controller.stop()
+        shutil.rmtree(tempdir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Benchmark of the NFP event sequencer.
+
+Sequences events across keys and drives the sequencer the way the
+distributor does: each tick runs the sequencer and completes a share
+of the events that are in progress, releasing their keys.
+Reports total time and the average cost of a tick.
+
+    python tools/benchmarks/nfp_sequencer.py [--events N] [--keys K]
+"""
+
+from __future__ import print_function
+
+import argparse
+import collections
+import time
+
+from gbpservice.nfp.core import event as nfp_event
+from gbpservice.nfp.core import sequencer as nfp_sequencer
+
+
+def run(num_events, num_keys, completions):
+    sequencer = nfp_sequencer.EventSequencer()
+    events = [nfp_event.Event(id='BENCH_EVENT', serialize=True,
+                              binding_key='KEY_%d' % (i % num_keys))
+              for i in range(num_events)]
+    start = time.time()
+    for event in events:
+        sequencer.sequence(event.binding_key, event)
+    sequenced = time.time() - start
+
+    in_progress = collections.deque()
+    done = ticks = 0
+    start = time.time()
+    while done < num_events:
+        ticks += 1
+        in_progress.extend(sequencer.run())
+        for i in range(min(completions, len(in_progress))):
+            event = in_progress.popleft()
+            sequencer.release(event.binding_key, event)
+            done += 1
+    elapsed = time.time() - start
+    return sequenced, elapsed, ticks
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--events', type=int, default=100000)
+    parser.add_argument('--keys', type=int, default=10000)
+    parser.add_argument('--completions', type=int, default=100,
+                        help='Events completed per distributor tick')
+    args = parser.parse_args()
+    sequenced, elapsed, ticks = run(
+        args.events, args.keys, args.completions)
+    print("events=%d keys=%d completions/tick=%d" % (
+        args.events, args.keys, args.completions))
+    print("sequence: %.3fs (%.2fus/event)" % (
+        sequenced, sequenced * 1e6 / args.events))
+    print("schedule: %.3fs over %d ticks (%.2fus/tick, %.2fus/event)" % (
+        elapsed, ticks, elapsed * 1e6 / ticks, elapsed * 1e6 / args.events))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Benchmark of the ODL writes, sent inline vs through the journal.
+
+Runs the ODL manager against a local fake ODL controller, with the
+journal table in the unit test database. Writes objects to a number of
+tenants, each updated a few times, first sent inline and then recorded
+in the journal and sent by the worker. Reports the time taken by the
+writes, which is spent in postcommit, the time taken to drain the
+journal and the number of requests to the controller.
+
+    python tools/benchmarks/odl_journal.py [--objects N ...] [--tenants N]
+        [--updates N] [--latency SECONDS]
+"""
+
+from __future__ import print_function
+
+import argparse
+import time
+
+import mock
+from neutron.db import api as db_api
+from neutron.tests import base
+from oslo_config import cfg
+
+from gbpservice.neutron.services.grouppolicy.drivers.odl import odl_journal
+from gbpservice.neutron.services.grouppolicy.drivers.odl import odl_manager
+from gbpservice.neutron.tests.unit.services.grouppolicy import fake_odl
+
+
+class _Setup(base.BaseTestCase):
+
+    def runTest(self):
+        pass
+
+
+def _write(manager, num_objects, num_tenants, num_updates, run):
+    for i in range(num_objects):
+        tenant_id = 'tenant-%s-%d' % (run, i % num_tenants)
+        for update in range(num_updates):
+            manager.create_update_endpoint_group(
+                tenant_id, {'id': 'epg%d' % i, 'name': 'epg%d' % update})
+
+
+def run(odl, num_objects, num_tenants, num_updates):
+    results = []
+    for write_behind in (False, True):
+        cfg.CONF.set_override('write_behind', write_behind,
+                              group='odl_driver')
+        manager = odl_manager.OdlManager()
+        odl.requests.clear()
+        start = time.time()
+        _write(manager, num_objects, num_tenants, num_updates,
+               '%s-%s' % (num_objects, write_behind))
+        written = time.time()
+        manager.sync_journal()
+        results.append((written - start, time.time() - written,
+                        sum(odl.requests.values())))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--objects', type=int, nargs='+',
+                        default=[10, 100, 1000])
+    parser.add_argument('--tenants', type=int, default=10)
+    parser.add_argument('--updates', type=int, default=3)
+    parser.add_argument('--latency', type=float, default=0.001)
+    args = parser.parse_args()
+
+    setup = _Setup()
+    setup.setUp()
+    odl = fake_odl.FakeOdl(latency=args.latency)
+    odl.start()
+    try:
+        odl_journal.OdlJournalEntry.__table__.create(db_api.get_engine(),
+                                                     checkfirst=True)
+        cfg.CONF.set_override('odl_host', odl.host, group='odl_driver')
+        cfg.CONF.set_override('odl_port', str(odl.port), group='odl_driver')
+        # The journal is drained by the benchmark
+        mock.patch.object(odl_manager.OdlManager, '_start_worker').start()
+        for num_objects in args.objects:
+            inline, journal = run(odl, num_objects, args.tenants,
+                                  args.updates)
+            writes = num_objects * args.updates
+            print("writes=%d inline: %.3fms per write, %d requests; "
+                  "journal: %.3fms per write, drained in %.2fms, "
+                  "%d requests" % (
+                      writes, inline[0] * 1000 / writes, inline[2],
+                      journal[0] * 1000 / writes, journal[1] * 1000,
+                      journal[2]))
+    finally:
+        odl.stop()
+        setup.tearDown()
+
+
+if __name__ == '__main__':
+    main()